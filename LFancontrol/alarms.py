@@ -0,0 +1,147 @@
+"""hwmon alarm özniteliklerini POLLPRI ile bekleyen izleyici (Qt içermez).
+
+Bazı sürücüler `fanN_alarm`, `tempN_max_alarm`, `tempN_crit_alarm` gibi
+öznitelikler değiştiğinde `sysfs_notify()` çağırır; bu dosyalar
+`poll()` ile POLLPRI|POLLERR beklenerek izlenebilir. Böylece bir eşik
+aşıldığında sensörler sık yoklanmadan hemen tepki verilir.
+
+Hangi sensörlerin alarm özniteliği olduğu tarama sırasında bir kez
+belirlenip `SensorIndex.alarms` içinde tutulur. Bildirim, ancak dosya
+açıldıktan sonra en az bir kez okunmuşsa gelir; her bildirimden sonra da
+değer yeniden okunarak bir sonraki bildirim kurulur. Bildirim göndermeyen
+sürücüler için tüm alarm değerleri ayrıca `fallback_interval` saniyede bir
+okunur; alarm özniteliği olmayan sensörler her zamanki gibi yoklanır.
+"""
+from __future__ import annotations
+
+import os
+import select
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend import SensorIndex
+
+_WAIT_EVENTS = select.POLLPRI | select.POLLERR
+
+
+@dataclass
+class AlarmEvent:
+    """Bir alarm özniteliğinin etkinleşmesi (`active=True`) ya da sönmesi."""
+
+    slot: int
+    sensor_id: str
+    attribute: str  # "temp1_crit_alarm"
+    active: bool
+    timestamp: float  # time.monotonic()
+
+    @property
+    def message(self) -> str:
+        if self.active:
+            return f"{self.sensor_id}: {self.attribute} alarmı"
+        return f"{self.sensor_id}: {self.attribute} alarmı sona erdi"
+
+
+def _read_alarm(fd: int) -> Optional[int]:
+    try:
+        data = os.pread(fd, 32, 0)
+        return int(data.strip() or b"0")
+    except (OSError, ValueError):
+        return None
+
+
+class AlarmWatcher:
+    """`SensorIndex.alarms` dosyalarını ayrı bir iş parçacığında bekler.
+
+    Değeri değişen alarmlar `on_alarm(olaylar)` ile izleyici iş parçacığında
+    bildirilir; çağıran işi kendi iş parçacığına aktarmalıdır (ör.
+    `Sampler.submit`). Başlangıçta zaten etkin olan alarmlar da bildirilir.
+    """
+
+    def __init__(
+        self,
+        index: SensorIndex,
+        on_alarm: Callable[[List[AlarmEvent]], None],
+        fallback_interval: float = 5.0,
+    ) -> None:
+        self.on_alarm = on_alarm
+        self.fallback_interval = fallback_interval
+        # fd → (sıra, sensör kimliği, öznitelik adı)
+        self._entries: Dict[int, Tuple[int, str, str]] = {}
+        self._values: Dict[int, Optional[int]] = {}
+        for slot, path in index.alarms:
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+            except OSError:
+                continue
+            self._entries[fd] = (slot, index.sensors[slot].id, os.path.basename(path))
+            self._values[fd] = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread: Optional[threading.Thread] = None
+        # Bildirimle (zaman aşımı olmadan) uyanılan tur sayısı
+        self.notifications = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def start(self) -> None:
+        if self._thread is not None or not self._entries:
+            return
+        self._thread = threading.Thread(target=self._run, name="hwmon-alarms", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is not None:
+            os.write(self._wake_w, b"x")
+            self._thread.join(timeout)
+            self._thread = None
+        for fd in self._entries:
+            os.close(fd)
+        self._entries.clear()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _check(self, fds: List[int]) -> List[AlarmEvent]:
+        """Verilen dosyaları yeniden oku (bildirimi de yeniden kurar); değişenleri döndür."""
+        events: List[AlarmEvent] = []
+        now = time.monotonic()
+        for fd in fds:
+            value = _read_alarm(fd)
+            previous = self._values[fd]
+            self._values[fd] = value
+            # İlk okumada (previous None) yalnızca etkin alarm bildirilir.
+            if value is None or bool(value) == bool(previous):
+                continue
+            slot, sensor_id, attribute = self._entries[fd]
+            events.append(AlarmEvent(slot, sensor_id, attribute, bool(value), now))
+        return events
+
+    def _run(self) -> None:
+        poller = select.poll()
+        poller.register(self._wake_r, select.POLLIN)
+        for fd in self._entries:
+            poller.register(fd, _WAIT_EVENTS)
+        timeout_ms = int(self.fallback_interval * 1000)
+
+        events = self._check(list(self._entries))
+        while True:
+            if events:
+                self.on_alarm(events)
+            ready = poller.poll(timeout_ms)
+            if any(fd == self._wake_r for fd, _mask in ready):
+                return
+            if ready:
+                self.notifications += 1
+                fds = [fd for fd, _mask in ready]
+                events = self._check(fds)
+                for fd in fds:
+                    if self._values[fd] is None:
+                        # Okunamayan dosya sürekli hazır görünüp döngüyü meşgul etmesin.
+                        poller.unregister(fd)
+            else:
+                # Bildirim göndermeyen sürücüler için yavaş yoklama.
+                events = self._check(list(self._entries))
@@ -1,19 +1,69 @@
+import argparse
 import sys
+from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QSystemTrayIcon
 
 from main_window import MainWindow
+from privileged import HELPER
+from sensor_trace import ReplayScanner, TraceReader
+from tray import TrayController
 
 
 def main() -> None:
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Linux Fan Control")
+    parser.add_argument(
+        "--replay", type=Path, default=None, help="Donanım yerine bu kayıttaki turları göster"
+    )
+    parser.add_argument("--speed", type=float, default=1.0, help="Oynatma hızı (--replay ile)")
+    parser.add_argument(
+        "--tray",
+        action="store_true",
+        help="Pencere kapanınca kapanma; sistem tepsisinde az kaynakla çalış",
+    )
+    parser.add_argument(
+        "--hidden", action="store_true", help="Pencereyi açmadan tepside başla (--tray ile)"
+    )
+    parser.add_argument(
+        "--tray-show",
+        choices=["temp", "fan"],
+        default="temp",
+        help="Tepsi simgesinde en sıcak sensör ya da en hızlı fan",
+    )
+    parser.add_argument("--root", type=Path, default=None, help="hwmon kökü (test için)")
+    args, qt_args = parser.parse_known_args()
+    if args.hidden:
+        args.tray = True
+    if args.tray and args.replay is not None:
+        parser.error("--tray ve --replay birlikte kullanılamaz")
+
+    replay = None
+    if args.replay is not None:
+        try:
+            replay = ReplayScanner(TraceReader(args.replay), speed=args.speed)
+        except (OSError, ValueError) as exc:
+            print(f"Kayıt okunamadı: {exc}", file=sys.stderr)
+            sys.exit(1)
+        replay.install()
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Linux Fan Control")
     app.setApplicationDisplayName("Linux Fan Control")
-    window = MainWindow()
-    window.show()
+    # Kalıcı yetkili yardımcı pencere kapanınca değil, uygulama biterken kapatılır.
+    app.aboutToQuit.connect(HELPER.shutdown)
+    if args.tray and not QSystemTrayIcon.isSystemTrayAvailable():
+        print("Sistem tepsisi bulunamadı; tepsi kipi kapalı.", file=sys.stderr)
+        args.tray = False
+
+    if args.tray:
+        app.setQuitOnLastWindowClosed(False)
+        tray = TrayController(lambda: MainWindow(root=args.root), args.root, args.tray_show)
+        tray.start(hidden=args.hidden)
+    else:
+        window = MainWindow(replay=replay, root=args.root)
+        window.show()
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
     main()
-
@@ -1,33 +1,384 @@
 from __future__ import annotations
 
+import errno
+import json
 import os
-from dataclasses import dataclass
+import threading
+import time
+import weakref
+from array import array
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
 
 HWMON_ROOT = Path("/sys/class/hwmon")
 
+# Sürücü yeniden yüklendiğinde eski tanımlayıcıdan okurken alınan hatalar.
+_REOPEN_ERRNOS = frozenset({errno.ENODEV, errno.ESTALE, errno.EBADF})
+
+_ZERO = 0x30  # ord("0")
+_NINE = 0x39  # ord("9")
+_MINUS = 0x2D  # ord("-")
+
+
+class _ReaderState:
+    """Bir iş parçacığının okuma tamponu ve o an okuduğu tanımlayıcı (-1: yok)."""
+
+    __slots__ = ("view", "fd", "__weakref__")
+
+    def __init__(self, size: int) -> None:
+        self.view = memoryview(bytearray(size))
+        self.fd = -1
+
+
+class SysfsReader:
+    """sysfs dosyalarını bir kez açıp tanımlayıcılarını (fd) saklayan okuyucu.
+
+    Her okuma `os.preadv` ile 0. ofsetten, önceden ayrılmış tek bir tampona
+    yapılır; sayı geçici bir `str` oluşturulmadan baytlardan ayrıştırılır.
+    Sürücü yeniden yüklenip tanımlayıcı geçersiz kalırsa (ENODEV/ESTALE)
+    dosya sessizce yeniden açılır.
+
+    Okuma yolu kilit almaz. Bunun yerine her iş parçacığı okuduğu
+    tanımlayıcıyı kendi durumunda ilan eder; sözlükten çıkarılan
+    tanımlayıcılar hiçbir okuyucu onları tutmuyorsa kapatılır, tutuluyorsa
+    okuma bitene kadar bekletilir. Böylece kapatılan bir numara başka bir
+    dosyaya verilip yanlış dosya okunamaz.
+
+    `set_recorder()` ile okuma (ve `HwmonFan` yazma) süreleri bir
+    `latency.LatencyRecorder`'a kaydedilebilir. `set_source()` okumaları
+    sysfs yerine başka bir kaynağa (ör. `sensor_trace.ReplayScanner`) yönlendirir.
+    """
+
+    BUFFER_SIZE = 32
+
+    def __init__(self) -> None:
+        self._fds: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._states: "weakref.WeakSet[_ReaderState]" = weakref.WeakSet()
+        # Sözlükten çıkarılmış ama bir okuyucunun hâlâ tutabileceği tanımlayıcılar
+        self._retired: List[int] = []
+        # Gecikme kayıtçısı (None: kapalı); yazan taraflar da buna bakar.
+        self.recorder = None
+        # Okumaların yapıldığı kaynak (None: sysfs)
+        self.source = None
+
+    def set_recorder(self, recorder) -> None:
+        """Okuma sürelerini `recorder.record_read(yol, saniye)` ile kaydet; None kapatır.
+
+        Açıkken `read_int` örnek özniteliğiyle zamanlayan bir sürümle
+        değiştirilir; kapalıyken okuma yoluna hiçbir denetim eklenmez.
+        """
+        self.recorder = recorder
+        source = self.source
+        if recorder is None:
+            if source is None:
+                self.__dict__.pop("read_int", None)
+            else:
+                self.read_int = source.read_int
+            return
+        untimed = source.read_int if source is not None else SysfsReader.read_int.__get__(self)
+        record = recorder.record_read
+        clock = time.perf_counter
+
+        def read_int(path: Union[str, Path]) -> Optional[int]:
+            start = clock()
+            try:
+                return untimed(path)
+            finally:
+                record(os.fspath(path), clock() - start)
+
+        self.read_int = read_int
+
+    def set_source(self, source) -> None:
+        """Okumaları sysfs yerine `source.read_int(yol)` ile yap; None sysfs'e döndürür.
+
+        Kayıttan oynatırken denetim döngüsü, örnekleme zamanlayıcısı ve
+        eğriler aynı `SENSOR_READER` üzerinden okumaya devam eder.
+        """
+        self.source = source
+        self.set_recorder(self.recorder)
+
+    def _state(self) -> _ReaderState:
+        # Durum (ve tampon) iş parçacığı başına bir kez ayrılır; pread zaten konumsal.
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = _ReaderState(self.BUFFER_SIZE)
+            self._local.state = state
+            with self._lock:
+                self._states.add(state)
+        return state
+
+    def _open(self, key: str) -> int:
+        with self._lock:
+            fd = self._fds.get(key)
+            if fd is None:
+                fd = os.open(key, os.O_RDONLY | os.O_CLOEXEC)
+                self._fds[key] = fd
+            return fd
+
+    def _acquire(self, state: _ReaderState, key: str) -> int:
+        """`key` tanımlayıcısını `state` üzerinde ilan edip döndür."""
+        fds = self._fds
+        while True:
+            fd = fds.get(key)
+            if fd is None:
+                fd = self._open(key)
+            state.fd = fd
+            # İlandan sonra hâlâ sözlükteyse emekliye ayıran taraf ilanı görür.
+            if fds.get(key) == fd:
+                return fd
+
+    def _retire(self, fds: Iterable[int]) -> None:
+        """Çıkarılan tanımlayıcıları emekliye ayır; tutulmayanları hemen kapat (kilit altında)."""
+        self._retired.extend(fds)
+        busy = {state.fd for state in self._states}
+        keep: List[int] = []
+        for fd in self._retired:
+            if fd in busy:
+                keep.append(fd)
+                continue
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._retired = keep
+
+    def _reclaim(self) -> None:
+        with self._lock:
+            self._retire(())
+
+    def _forget(self, key: str, stale: Optional[int] = None) -> None:
+        """`key` tanımlayıcısını bırak; `stale` verilirse yalnızca hâlâ o ise."""
+        with self._lock:
+            fd = self._fds.get(key)
+            if fd is None or (stale is not None and fd != stale):
+                return
+            del self._fds[key]
+            self._retire((fd,))
+
+    def read_int(self, path: Union[str, Path]) -> Optional[int]:
+        """Dosyadaki tam sayıyı oku. Boş/geçersiz içerikte None döndür.
+
+        FileNotFoundError ve PermissionError `_read_int_file` ile aynı
+        anlamı korumak için çağırana iletilir.
+        """
+        key = os.fspath(path)
+        state = self._state()
+        buf = state.view
+        try:
+            fd = self._acquire(state, key)
+            try:
+                n = os.preadv(fd, (buf,), 0)
+            except OSError as exc:
+                if exc.errno not in _REOPEN_ERRNOS:
+                    raise
+                # Tanımlayıcı bayatladı; bir kez yeniden açıp tekrar dene.
+                self._forget(key, fd)
+                fd = self._acquire(state, key)
+                n = os.preadv(fd, (buf,), 0)
+        finally:
+            state.fd = -1
+        if self._retired:
+            self._reclaim()
+        return _parse_int(buf, n)
+
+    def close(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Verilen dosyanın (veya hepsinin) tanımlayıcısını kapat.
+
+        O an okunmakta olan tanımlayıcılar okuma bitince kapatılır.
+        """
+        if path is not None:
+            self._forget(os.fspath(path))
+            return
+        with self._lock:
+            fds = list(self._fds.values())
+            self._fds.clear()
+            self._retire(fds)
+
+
+def _parse_int(buf: memoryview, n: int) -> Optional[int]:
+    """Tampondaki ilk `n` bayttan ondalık tam sayıyı ayrıştır."""
+    i = 0
+    # Baştaki boşlukları atla
+    while i < n and buf[i] <= 0x20:
+        i += 1
+    negative = i < n and buf[i] == _MINUS
+    if negative:
+        i += 1
+    start = i
+    value = 0
+    while i < n:
+        c = buf[i]
+        if c < _ZERO or c > _NINE:
+            break
+        value = value * 10 + (c - _ZERO)
+        i += 1
+    if i == start:
+        return None
+    # Sayıdan sonra yalnızca boşluk gelebilir ("1200\n").
+    while i < n:
+        if buf[i] > 0x20:
+            return None
+        i += 1
+    return -value if negative else value
+
+
+# Tüm fanların paylaştığı varsayılan okuyucu.
+SENSOR_READER = SysfsReader()
+
+# Anlık görüntüde okunamayan sensörler için kullanılan değer (int32 alt sınırı).
+MISSING = -(1 << 31)
+
+
+# hwmon sysfs arayüzü `pwmN` değerini tüm sürücüler için 0–255 olarak tanımlar;
+# kanal başına bir sınır özniteliği yoktur. Fanın gerçek alt sınırı ölçülerek
+# bulunur (`calibration.apply_calibration` `HwmonFan.min_pwm`'i daraltır).
+PWM_MIN = 0
+PWM_MAX = 255
+
+
+@dataclass
+class Sensor:
+    """Örneklenebilen tek bir sysfs değeri (fan RPM'i, PWM veya sıcaklık).
+
+    `min_value`/`max_value` sürücünün bildirdiği sınırlardır: fanlar için
+    `fanN_min`/`fanN_max` (RPM), sıcaklıklar için `tempN_max`/`tempN_crit`
+    (milidereceler). PWM sensörlerinde `temp_channels`, sürücünün otomatik
+    modda izlediği sıcaklık kanallarıdır (`pwmN_auto_channels_temp`).
+    `alarms`, kanalın aynı dizindeki alarm öznitelikleridir (ör. `fan1_alarm`,
+    `temp1_crit_alarm`); sürücü destekliyorsa bunlar POLLPRI ile beklenebilir.
+    """
+
+    id: str
+    kind: str  # "fan", "pwm" veya "temp"
+    label: str
+    path: Path
+    chip: str = ""
+    index: int = 0
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+    temp_channels: Tuple[int, ...] = ()
+    alarms: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON'a yazılabilir sözlük (kayıt dosyası ve paylaşılan bellek meta verisi)."""
+        data = asdict(self)
+        data["path"] = os.fspath(self.path)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "Sensor":
+        return cls(
+            **{
+                **data,
+                "path": Path(data["path"]),
+                "temp_channels": tuple(data["temp_channels"]),
+                "alarms": tuple(data["alarms"]),
+            }
+        )
+
+
+class SensorIndex:
+    """Taranan tüm sensörler; sıra numarası ve kimliğe göre O(1) erişim.
+
+    `alarms`, alarm özniteliği olan sensörlerin (sıra, alarm dosyası yolu)
+    çiftleridir; tarama sırasında bir kez kurulur.
+    """
+
+    def __init__(self) -> None:
+        self.sensors: List[Sensor] = []
+        self.paths: List[str] = []
+        self.fans: List[int] = []
+        self.pwms: List[int] = []
+        self.temps: List[int] = []
+        self.alarms: List[Tuple[int, str]] = []
+        self._slots: Dict[str, int] = {}
+
+    def add(self, sensor: Sensor) -> int:
+        slot = len(self.sensors)
+        self.sensors.append(sensor)
+        self.paths.append(os.fspath(sensor.path))
+        self._slots[sensor.id] = slot
+        {"fan": self.fans, "pwm": self.pwms, "temp": self.temps}[sensor.kind].append(slot)
+        if sensor.alarms:
+            directory = os.fspath(sensor.path.parent)
+            self.alarms.extend((slot, os.path.join(directory, name)) for name in sensor.alarms)
+        return slot
+
+    def slot(self, sensor_id: str) -> int:
+        """Sensör kimliğinin anlık görüntüdeki sırasını döndür (-1: bilinmiyor)."""
+        return self._slots.get(sensor_id, -1)
+
+    def get(self, sensor_id: str) -> Optional[Sensor]:
+        slot = self._slots.get(sensor_id, -1)
+        return self.sensors[slot] if slot >= 0 else None
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+
+@dataclass
+class Snapshot:
+    """Tüm sensörlerin tek bir turdaki değerleri.
+
+    `values[i]`, tarayıcının `sensors[i]` sensörüne karşılık gelir; okunamayan
+    değerler `MISSING` ile işaretlenir.
+    """
+
+    timestamp: float
+    values: array
+
+    def get(self, slot: int) -> Optional[int]:
+        if slot < 0 or slot >= len(self.values):
+            return None
+        value = self.values[slot]
+        return None if value == MISSING else value
+
+    def copy(self) -> "Snapshot":
+        return Snapshot(self.timestamp, array(self.values.typecode, self.values))
+
 
 @dataclass
 class HwmonFan:
-    """Tek bir fan sensörü ve (varsa) PWM kontrolünü temsil eder."""
+    """Tek bir fan sensörü ve (varsa) PWM kontrolünü temsil eder.
+
+    `min_pwm`/`max_pwm` tarayıcıda sabit `PWM_MIN`–`PWM_MAX` aralığıyla
+    başlar; kalibre edilmiş fanlarda `min_pwm` kalkış noktasına yükseltilir.
+    """
 
     id: str
     label: str
     rpm_path: Path
     pwm_path: Optional[Path] = None
     pwm_enable_path: Optional[Path] = None
-    min_pwm: int = 0
-    max_pwm: int = 255
+    min_pwm: int = PWM_MIN
+    max_pwm: int = PWM_MAX
+    # HwmonScanner.sample_all() anlık görüntüsündeki sıra numaraları (-1: yok).
+    rpm_slot: int = -1
+    pwm_slot: int = -1
+
+    def to_dict(self) -> Dict[str, object]:
+        """JSON'a yazılabilir sözlük; yollar dizgi olarak."""
+        data = asdict(self)
+        for key in ("rpm_path", "pwm_path", "pwm_enable_path"):
+            if data[key] is not None:
+                data[key] = os.fspath(data[key])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "HwmonFan":
+        paths = {
+            key: None if data.get(key) is None else Path(data[key])
+            for key in ("rpm_path", "pwm_path", "pwm_enable_path")
+        }
+        return cls(**{**data, **paths})
 
     def _read_int_file(self, path: Path) -> Optional[int]:
         try:
-            with path.open("r", encoding="utf-8") as f:
-                value = f.read().strip()
-            if not value:
-                return None
-            return int(value)
+            return SENSOR_READER.read_int(path)
         except FileNotFoundError:
             return None
         except PermissionError:
@@ -37,6 +388,8 @@ class HwmonFan:
             return None
 
     def _write_int_file(self, path: Path, value: int) -> None:
+        recorder = SENSOR_READER.recorder
+        start = time.perf_counter() if recorder is not None else 0.0
         try:
             with path.open("w", encoding="utf-8") as f:
                 f.write(f"{value}\n")
@@ -46,6 +399,9 @@ class HwmonFan:
         except OSError as exc:
             # Diğer yazma hatalarını üst kata ilet.
             raise exc
+        finally:
+            if recorder is not None:
+                recorder.record_write(os.fspath(path), time.perf_counter() - start)
 
     def read_rpm(self) -> Optional[int]:
         """RPM değerini oku. Okunamazsa None döndür."""
@@ -91,8 +447,12 @@ class HwmonFan:
             return
         self._write_int_file(self.pwm_enable_path, 2)
 
-    def set_pwm(self, value: int) -> None:
-        """PWM değerini ayarla. İzin yoksa PermissionError fırlatabilir."""
+    def set_pwm(self, value: int, ensure_manual: bool = True) -> None:
+        """PWM değerini ayarla. İzin yoksa PermissionError fırlatabilir.
+
+        Fanın zaten manuel modda olduğu biliniyorsa `ensure_manual=False`
+        ile pwm_enable okuması atlanabilir.
+        """
         if self.pwm_path is None:
             raise RuntimeError("Bu fan için PWM kontrolü desteklenmiyor.")
 
@@ -100,74 +460,365 @@ class HwmonFan:
         clamped = max(self.min_pwm, min(self.max_pwm, value))
 
         # Mümkünse manuel moda çek
-        self._ensure_manual_mode()
+        if ensure_manual:
+            self._ensure_manual_mode()
 
         # Değeri yaz
         self._write_int_file(self.pwm_path, clamped)
 
 
+def _default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "lfancontrol" / "scan.json"
+
+
+SCAN_CACHE_PATH = _default_cache_path()
+_SCAN_CACHE_VERSION = 1
+
+
+def scan_cache_path(root: Path) -> Path:
+    """`root` ağacının tarama önbelleği; gerçek kökün dosyası `SCAN_CACHE_PATH`'tir.
+
+    Test ağaçları (`--root`) kendi dosyalarına yazar, böylece gerçek
+    önbelleğin üzerine yazmazlar.
+    """
+    if root == HWMON_ROOT:
+        return SCAN_CACHE_PATH
+    name = os.path.abspath(root).strip(os.sep).replace(os.sep, "_")
+    return SCAN_CACHE_PATH.with_name(f"scan-{name}.json")
+
+
+# Tarama sırasında içeriği okunup saklanan küçük öznitelik dosyaları.
+_INFO_SUFFIXES = ("_label", "_min", "_max", "_crit", "_auto_channels_temp")
+
+
+@dataclass
+class _ChipInfo:
+    """Bir hwmonN dizininin tarama için gereken içeriği (disk önbelleğine yazılır)."""
+
+    entry: str  # "hwmon2"
+    key: str  # dizinin kimliği: sembolik bağ hedefi veya değişiklik zamanı
+    name: str  # sürücü adı ("nct6775")
+    device: str  # aygıt adı ("nct6775.656"); yoksa ""
+    names: List[str]
+    texts: Dict[str, str]
+
+
 class HwmonScanner:
-    """`/sys/class/hwmon` altında fanları tarar."""
+    """`/sys/class/hwmon` altında fanları ve sıcaklık sensörlerini tarar.
+
+    Tarama sonucu `cache_path` dosyasına (varsayılan: `scan_cache_path(root)`)
+    yazılır. Sonraki başlangıçlarda hwmonN girdileri ve bağlı oldukları aygıt
+    yolları değişmemişse çipler yeniden gezilmez. Çalışırken eklenen/çıkarılan aygıtlar
+    `rescan_entries()` ile yalnızca değişen çipler okunarak işlenir.
+
+    Kimlikler hwmonN numarasını içermez; sürücü ve aygıt adından oluşur
+    (`nct6775@nct6775.656_fan1`, aygıtı olmayan çiplerde `acpitz_temp1`).
+    Böylece açılışlar arasında hwmonN numaraları değişse de, aynı adlı başka
+    bir çip takılsa da kimlikler aynı kalır.
+    """
 
-    def __init__(self, root: Path = HWMON_ROOT) -> None:
+    def __init__(self, root: Path = HWMON_ROOT, cache_path: Optional[Path] = SCAN_CACHE_PATH) -> None:
         self.root = root
+        if cache_path is SCAN_CACHE_PATH:
+            cache_path = scan_cache_path(root)
+        self.cache_path = cache_path
+        self.index = SensorIndex()
+        self.fans: List[HwmonFan] = []
+        self._chips: Dict[str, _ChipInfo] = {}
+        self._scanned = False
+
+    @property
+    def sensors(self) -> List[Sensor]:
+        return self.index.sensors
+
+    def slot(self, sensor_id: str) -> int:
+        """Sensör kimliğinin anlık görüntüdeki sırasını döndür (-1: bilinmiyor)."""
+        return self.index.slot(sensor_id)
 
     def scan(self) -> List[HwmonFan]:
-        fans: List[HwmonFan] = []
+        self._scanned = True
+        keys = self._entry_keys()
+        chips = self._load_cache(keys)
+        if chips is None:
+            chips = [self._read_chip(entry, key) for entry, key in sorted(keys.items())]
+            self._chips = {chip.entry: chip for chip in chips}
+            self._save_cache()
+        else:
+            self._chips = {chip.entry: chip for chip in chips}
+        return self._build()
+
+    def rescan_entries(self, entries: Iterable[str]) -> List[HwmonFan]:
+        """Yalnızca verilen hwmonN girdilerini yeniden oku (eklenen/çıkarılan aygıtlar).
+
+        Diğer çipler bellekteki bilgilerden yeniden dizinlenir; sysfs'e
+        dokunulmaz. Yeni fan listesini döndürür.
+        """
+        for entry in entries:
+            hwmon_dir = self.root / entry
+            key = self._entry_key(hwmon_dir)
+            if key is None:
+                self._chips.pop(entry, None)
+            else:
+                self._chips[entry] = self._read_chip(entry, key)
+        self._save_cache()
+        return self._build()
+
+    def entry_names(self) -> List[str]:
+        """Şu anda bilinen hwmonN girdileri."""
+        return sorted(self._chips)
+
+    def sample_all(self, out: Optional[Snapshot] = None) -> Snapshot:
+        """Bilinen tüm sensörleri tek geçişte oku.
+
+        Anlık görüntü dizindeki her yuvayı kapsar: fan devirleri, PWM
+        değerleri ve sıcaklıklar (fanı olmayan çiplerinkiler de). Sıra
+        `slot()` ile bulunur; okunamayan yuvalar `MISSING` olur.
+
+        `out` verilirse dizisi yeniden kullanılır; böylece her turda yeni
+        bellek ayrılmaz. Henüz tarama yapılmadıysa önce `scan()` çağrılır.
+        """
+        if not self._scanned:
+            self.scan()
 
-        if not self.root.exists():
-            return fans
+        paths = self.index.paths
+        count = len(paths)
+        if out is None or len(out.values) != count:
+            out = Snapshot(0.0, array("i", [MISSING]) * count)
 
-        for entry in sorted(self.root.iterdir()):
-            if not entry.name.startswith("hwmon"):
-                continue
-            if not entry.is_dir():
+        values = out.values
+        read = SENSOR_READER.read_int
+        for i in range(count):
+            try:
+                value = read(paths[i])
+            except OSError:
+                value = None
+            values[i] = MISSING if value is None else value
+        out.timestamp = time.time()
+        return out
+
+    # --- Çip okuma ve önbellek ---
+
+    @staticmethod
+    def _entry_key(hwmon_dir: Path) -> Optional[str]:
+        """hwmonN girdisinin kimliği; girdi yoksa None.
+
+        Gerçek sysfs'te girdiler aygıt dizinine sembolik bağdır ve hedef yol
+        aygıtı tanımlar. Sahte ağaçlardaki normal dizinlerde değişiklik zamanı
+        kullanılır.
+        """
+        try:
+            return "link:" + os.readlink(hwmon_dir)
+        except OSError:
+            pass
+        try:
+            st = os.stat(hwmon_dir)
+        except OSError:
+            return None
+        return f"mtime:{st.st_mtime_ns}"
+
+    def _entry_keys(self) -> Dict[str, str]:
+        try:
+            entries = os.listdir(self.root)
+        except OSError:
+            return {}
+        keys: Dict[str, str] = {}
+        for entry in entries:
+            if not entry.startswith("hwmon"):
                 continue
+            key = self._entry_key(self.root / entry)
+            if key is not None and (self.root / entry).is_dir():
+                keys[entry] = key
+        return keys
+
+    def _read_chip(self, entry: str, key: str) -> _ChipInfo:
+        hwmon_dir = self.root / entry
+        # Dizini tek seferde listele; var/yok kontrolleri bu liste üzerinden yapılır.
+        try:
+            with os.scandir(hwmon_dir) as it:
+                names = sorted(e.name for e in it)
+        except OSError:
+            names = []
+
+        texts: Dict[str, str] = {}
+        for name in names:
+            if name.endswith(_INFO_SUFFIXES):
+                text = self._read_text(hwmon_dir / name)
+                if text is not None:
+                    texts[name] = text
+
+        device = ""
+        if "device" in names:
+            device = os.path.basename(os.path.realpath(hwmon_dir / "device"))
+        chip_name = (self._read_chip_name(hwmon_dir) if "name" in names else None) or entry
+        return _ChipInfo(entry, key, chip_name, device, names, texts)
+
+    def _load_cache(self, keys: Dict[str, str]) -> Optional[List[_ChipInfo]]:
+        if self.cache_path is None:
+            return None
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _SCAN_CACHE_VERSION or data.get("root") != str(self.root):
+                return None
+            chips = [_ChipInfo(**chip) for chip in data["chips"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if {chip.entry: chip.key for chip in chips} != keys:
+            return None
+        return chips
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        data = {
+            "version": _SCAN_CACHE_VERSION,
+            "root": str(self.root),
+            "chips": [asdict(chip) for _, chip in sorted(self._chips.items())],
+        }
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # Önbellek yazılamazsa tarama yine de geçerlidir.
+            pass
 
-            chip_name = self._read_chip_name(entry) or entry.name
-            fans.extend(self._scan_hwmon_dir(entry, chip_name))
+    def _build(self) -> List[HwmonFan]:
+        """Bellekteki çip bilgilerinden sensör dizinini ve fan listesini kur."""
+        self.index = SensorIndex()
+        fans: List[HwmonFan] = []
 
+        used: Set[str] = set()
+        for _, chip in sorted(self._chips.items()):
+            # Kimlik yalnızca çipin kendisinden türetilir; başka bir çipin
+            # eklenmesi veya çıkarılması onu değiştirmez.
+            chip_id = f"{chip.name}@{chip.device}" if chip.device else chip.name
+            if chip_id in used:
+                # Aygıtı olmayan aynı adlı sanal çipler için son çare.
+                chip_id = f"{chip.name}@{chip.entry}"
+            used.add(chip_id)
+            fans.extend(self._scan_hwmon_dir(self.root / chip.entry, chip_id, chip))
+
+        self.fans = fans
         return fans
 
     def _read_chip_name(self, hwmon_dir: Path) -> Optional[str]:
-        name_file = hwmon_dir / "name"
+        return self._read_text(hwmon_dir / "name")
+
+    @staticmethod
+    def _read_text(path: Path) -> Optional[str]:
         try:
-            with name_file.open("r", encoding="utf-8") as f:
+            with path.open("r", encoding="utf-8") as f:
                 return f.read().strip() or None
         except (FileNotFoundError, PermissionError, OSError):
             return None
 
-    def _scan_hwmon_dir(self, hwmon_dir: Path, chip_name: str) -> List[HwmonFan]:
+    @staticmethod
+    def _channel_indices(names: Iterable[str], prefix: str, suffix: str) -> List[int]:
+        """"fan3_input" gibi adlardan kanal numaralarını sıralı olarak çıkar."""
+        indices = []
+        for name in names:
+            if name.startswith(prefix) and name.endswith(suffix):
+                number = name[len(prefix):len(name) - len(suffix)]
+                if number.isdigit():
+                    indices.append(int(number))
+        return sorted(indices)
+
+    def _scan_hwmon_dir(self, hwmon_dir: Path, chip_id: str, chip: _ChipInfo) -> List[HwmonFan]:
         fans: List[HwmonFan] = []
+        fan_by_number: Dict[int, HwmonFan] = {}
+        index = self.index
+        chip_name = chip.name
+        names: Set[str] = set(chip.names)
+        texts = chip.texts
 
-        # fanX_input dosyalarını bul
-        for file in sorted(hwmon_dir.iterdir()):
-            if not file.name.startswith("fan") or not file.name.endswith("_input"):
-                continue
-
-            base = file.name[:-len("_input")]  # "fan1_input" -> "fan1"
-            index = base[3:]  # "fan1" -> "1"
+        def optional_int(name: str) -> Optional[int]:
+            try:
+                return int(texts[name])
+            except (KeyError, ValueError):
+                return None
 
-            rpm_path = file
-            pwm_path = hwmon_dir / f"pwm{index}"
-            pwm_enable_path = hwmon_dir / f"pwm{index}_enable"
+        alarm_names = sorted(name for name in names if name.endswith("_alarm"))
 
-            pwm_exists = pwm_path.exists()
-            pwm_enable_exists = pwm_enable_path.exists()
+        def alarms_of(base: str) -> Tuple[str, ...]:
+            # fan1_alarm, temp1_max_alarm, temp1_crit_alarm, ...
+            prefix = f"{base}_"
+            return tuple(name for name in alarm_names if name.startswith(prefix))
 
-            label = f"{chip_name} - Fan {index}"
-            fan_id = f"{chip_name}_fan{index}"
+        for number in self._channel_indices(names, "fan", "_input"):
+            base = f"fan{number}"
+            pwm_name = f"pwm{number}"
+            pwm_enable_name = f"pwm{number}_enable"
+            custom_label = texts.get(f"{base}_label")
 
             fan = HwmonFan(
-                id=fan_id,
-                label=label,
-                rpm_path=rpm_path,
-                pwm_path=pwm_path if pwm_exists else None,
-                pwm_enable_path=pwm_enable_path if pwm_enable_exists else None,
-                min_pwm=0,
-                max_pwm=255,
+                id=f"{chip_id}_{base}",
+                label=f"{chip_name} - {custom_label or f'Fan {number}'}",
+                rpm_path=hwmon_dir / f"{base}_input",
+                pwm_path=hwmon_dir / pwm_name if pwm_name in names else None,
+                pwm_enable_path=(
+                    hwmon_dir / pwm_enable_name if pwm_enable_name in names else None
+                ),
+                min_pwm=PWM_MIN,
+                max_pwm=PWM_MAX,
+            )
+            fan.rpm_slot = index.add(
+                Sensor(
+                    id=fan.id,
+                    kind="fan",
+                    label=fan.label,
+                    path=fan.rpm_path,
+                    chip=chip_id,
+                    index=number,
+                    min_value=optional_int(f"{base}_min"),
+                    max_value=optional_int(f"{base}_max"),
+                    alarms=alarms_of(base),
+                )
             )
             fans.append(fan)
+            fan_by_number[number] = fan
+
+        for number in self._channel_indices(names, "pwm", ""):
+            channels = optional_int(f"pwm{number}_auto_channels_temp") or 0
+            slot = index.add(
+                Sensor(
+                    id=f"{chip_id}_pwm{number}",
+                    kind="pwm",
+                    label=f"{chip_name} - PWM {number}",
+                    path=hwmon_dir / f"pwm{number}",
+                    chip=chip_id,
+                    index=number,
+                    min_value=PWM_MIN,
+                    max_value=PWM_MAX,
+                    temp_channels=tuple(
+                        bit + 1 for bit in range(channels.bit_length()) if channels >> bit & 1
+                    ),
+                )
+            )
+            fan = fan_by_number.get(number)
+            if fan is not None:
+                fan.pwm_slot = slot
+
+        for number in self._channel_indices(names, "temp", "_input"):
+            base = f"temp{number}"
+            custom_label = texts.get(f"{base}_label")
+            crit = optional_int(f"{base}_crit")
+            index.add(
+                Sensor(
+                    id=f"{chip_id}_{base}",
+                    kind="temp",
+                    label=f"{chip_name} - {custom_label or f'Temp {number}'}",
+                    path=hwmon_dir / f"{base}_input",
+                    chip=chip_id,
+                    index=number,
+                    min_value=optional_int(f"{base}_min"),
+                    max_value=crit if crit is not None else optional_int(f"{base}_max"),
+                    alarms=alarms_of(base),
+                )
+            )
 
         return fans
 
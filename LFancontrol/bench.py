@@ -0,0 +1,856 @@
+#!/usr/bin/env python3
+"""Sahte hwmon ağacı üzerinde küçük performans ölçümleri.
+
+Kullanım:
+
+    python bench.py                 # tüm ölçümler
+    python bench.py sensor-read
+    python bench.py --save          # sonuçları temel değer olarak kaydet
+    python bench.py --check         # temel değere göre yavaşlama varsa 1 ile çık
+
+Her ölçümün neyi ölçtüğü kendi `bench_*` işlevinin açıklamasındadır; özet
+README'nin "Performans Ölçümleri" bölümündedir. Temel değerler makineye
+özgüdür; karşılaştırma aynı makinede alınmış bir kayıtla yapılmalıdır.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from backend import (
+    MISSING,
+    SENSOR_READER,
+    HwmonFan,
+    HwmonScanner,
+    Sensor,
+    Snapshot,
+    SysfsReader,
+)
+from controller import MODE_TEMP, ControlTarget, PidBank
+from fake_hwmon import FanPhysics, build_fake_hwmon
+from fan_curve import MIX_AVERAGE, MIX_MAX, MIX_WEIGHTED, CurveTable, FanCurve, mix_temps
+from fancontrold import ControlLoop, CurveBinding
+from faults import FaultDetector
+from predictive import ThermalModelBank
+from privileged import PwmHelperClient
+from profiles import ProfileConfig, apply_plan, plan_profile
+from sample_scheduler import SampleScheduler
+from sensor_trace import ReplayScanner, TraceReader, TraceWriter
+from snapshot_bus import BusScanner, SnapshotPublisher
+from write_pwm import PwmWriter
+from write_scheduler import PwmWriteScheduler
+
+DEFAULT_BASELINE = Path(__file__).with_name("bench_baseline.json")
+LFANCTL = Path(__file__).with_name("lfanctl.py")
+WRITE_PWM = Path(__file__).with_name("write_pwm.py")
+
+# `lfanctl list` çalışırken yüklenmemesi gereken modüller (önek eşleşmesi).
+CLI_FORBIDDEN_IMPORTS = (
+    "PySide6", "privileged", "calibration", "history", "sampler", "subprocess", "concurrent",
+)
+
+
+def _legacy_read_int(path: Path) -> Optional[int]:
+    """Eski yol: her okumada open/read/close."""
+    with path.open("r", encoding="utf-8") as f:
+        value = f.read().strip()
+    if not value:
+        return None
+    return int(value)
+
+
+def _timeit(func: Callable[[], None], rounds: int) -> float:
+    """`func`'ı `rounds` kez çalıştır; çağrı başına saniye döndür."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def _time_calls(func: Callable[[], None], rounds: int) -> Dict[str, float]:
+    """Her çağrıyı ayrı ölç; ortalama, medyan ve %99'luk dilimi döndür."""
+    samples: List[float] = []
+    clock = time.perf_counter
+    for _ in range(rounds):
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    samples.sort()
+    return {
+        "mean": sum(samples) / len(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def _prefixed(prefix: str, values: Dict[str, float]) -> Dict[str, float]:
+    return {f"{prefix}_{key}": value for key, value in values.items()}
+
+
+def _bindings(scanner: HwmonScanner) -> List[CurveBinding]:
+    """Her PWM'li fanı aynı çipin sıcaklıklarına bağlayan eğriler."""
+    sensors = scanner.sensors
+    bindings = []
+    for fan in scanner.fans:
+        if fan.pwm_path is None:
+            continue
+        chip = sensors[fan.rpm_slot].chip
+        temps = [sensors[slot].path for slot in scanner.index.temps if sensors[slot].chip == chip]
+        curve = FanCurve(points=[(35, 60), (55, 140), (70, 255)], hysteresis=2.0)
+        bindings.append(CurveBinding(fan=fan, curve=curve, sensors=temps))
+    return bindings
+
+
+def bench_scan(root: Path, rounds: int) -> Dict[str, float]:
+    """Önbelleksiz ve önbellekli tarama."""
+    rounds = max(1, rounds // 20)
+    with tempfile.TemporaryDirectory(prefix="scan-cache-") as tmp:
+        cache = Path(tmp) / "scan.json"
+        HwmonScanner(root, cache).scan()  # önbelleği doldur
+        return {
+            "cold_scan": _timeit(lambda: HwmonScanner(root, None).scan(), rounds),
+            "cached_scan": _timeit(lambda: HwmonScanner(root, cache).scan(), rounds),
+        }
+
+
+def bench_sensor_read(root: Path, rounds: int) -> Dict[str, float]:
+    """Okuma başına: her okumada open/read/close ile açık tanımlayıcıdan `pread`."""
+    fans = HwmonScanner(root, None).scan()
+    paths = [fan.rpm_path for fan in fans]
+    paths += [fan.pwm_path for fan in fans if fan.pwm_path is not None]
+    reader = SysfsReader()
+
+    def legacy() -> None:
+        for path in paths:
+            _legacy_read_int(path)
+
+    def persistent() -> None:
+        for path in paths:
+            reader.read_int(path)
+
+    persistent()  # tanımlayıcıları önceden aç
+    results = {
+        "legacy_open_read_close": _timeit(legacy, rounds) / len(paths),
+        "persistent_pread": _timeit(persistent, rounds) / len(paths),
+    }
+    reader.close()
+    return results
+
+
+def bench_sample_all(root: Path, rounds: int) -> Dict[str, float]:
+    """Aynı sensör kümesini (fan RPM'i, PWM ve sıcaklık) iki yoldan okur.
+
+    Tek tek okuma, nesne başına bir çağrı yapan eski turu taklit eder: fanlar
+    `read_rpm`/`read_pwm` ile, sıcaklıklar ve fansız PWM kanalları ayrı
+    çağrılarla okunur. Her iki taraf da aynı tanımlayıcı önbelleğini kullanır;
+    fark yalnızca toplu okumanın kendisidir.
+    """
+    scanner = HwmonScanner(root, None)
+    fans = scanner.scan()
+    fan_paths = {fan.rpm_path for fan in fans} | {fan.pwm_path for fan in fans}
+    others = [sensor.path for sensor in scanner.sensors if sensor.path not in fan_paths]
+    assert len(fan_paths - {None}) + len(others) == len(scanner.sensors)
+    read = SENSOR_READER.read_int
+
+    def per_object() -> None:
+        for fan in fans:
+            fan.read_rpm()
+            fan.read_pwm()
+        for path in others:
+            try:
+                read(path)
+            except OSError:
+                pass
+
+    snapshot = scanner.sample_all()
+    temps = [i for i, sensor in enumerate(scanner.sensors) if sensor.kind == "temp"]
+    assert temps and all(snapshot.values[i] != MISSING for i in temps)
+
+    def batched() -> None:
+        scanner.sample_all(snapshot)
+
+    return {
+        "per_object_reads_per_tick": _timeit(per_object, rounds),
+        "sample_all_per_tick": _timeit(batched, rounds),
+    }
+
+
+def bench_tick(root: Path, rounds: int) -> Dict[str, float]:
+    """Tek bir denetim turunun (sıcaklık okuma, eğri, yazma) maliyeti."""
+    scanner = HwmonScanner(root, None)
+    scanner.scan()
+    loop = ControlLoop(_bindings(scanner), interval=1.0, report_every=0)
+    with FanPhysics(root):
+        loop.tick()
+        results = _prefixed("control_tick", _time_calls(loop.tick, rounds))
+    loop.release()
+    return results
+
+
+def bench_write_latency(root: Path, rounds: int) -> Dict[str, float]:
+    """Tek bir PWM yazmasının gecikmesi: doğrudan, yardımcının yolu ve bastırılan istek."""
+    scanner = HwmonScanner(root, None)
+    fan = next(fan for fan in scanner.scan() if fan.pwm_path is not None)
+    writer = PwmWriter(str(root))
+    scheduler = PwmWriteScheduler()
+    values = [100, 180]
+    counter = [0]
+
+    def next_value() -> int:
+        counter[0] += 1
+        return values[counter[0] & 1]
+
+    def direct() -> None:
+        fan.set_pwm(next_value(), ensure_manual=False)
+
+    def helper() -> None:
+        writer.write(str(fan.pwm_path), next_value())
+
+    def suppressed() -> None:
+        scheduler.request_pwm(fan, 180)
+        scheduler.flush(force=True)
+
+    with FanPhysics(root):
+        results = _prefixed("direct_set_pwm", _time_calls(direct, rounds))
+        results.update(_prefixed("helper_pwrite", _time_calls(helper, rounds)))
+        suppressed()
+        results.update(_prefixed("scheduler_unchanged", _time_calls(suppressed, rounds)))
+    writer.close()
+    return results
+
+
+def bench_jitter(root: Path, rounds: int) -> Dict[str, float]:
+    """Denetim döngüsünün son tarihe göre gecikmesi (10 ms aralıkla)."""
+    scanner = HwmonScanner(root, None)
+    scanner.scan()
+    interval = 0.01
+    ticks = max(10, min(rounds, 500))
+    loop = ControlLoop(_bindings(scanner), interval=interval, report_every=0)
+    with FanPhysics(root):
+        thread = threading.Thread(target=loop.run, name="bench-jitter")
+        thread.start()
+        time.sleep(ticks * interval)
+        loop.stop()
+        thread.join()
+    loop.release()
+    stats = loop.stats
+    count = max(1, stats.ticks)
+    return {
+        "lateness_mean": stats.lateness_sum / count,
+        "lateness_max": stats.lateness_max,
+        "work_mean": stats.work_sum / count,
+        "overrun_ratio": stats.overruns / count,
+    }
+
+
+def bench_profile_switch(root: Path, rounds: int, fans: int = 16) -> Dict[str, float]:
+    """`fans` fanlı bir makinede profil uygulama (sahte ağaçtan bağımsız, 4 fanlı çipler).
+
+    Doğrudan işlem, yardımcıya tek işlem ve kalıcı yardımcıya fan başına istek,
+    ayrıca eski yol: her dosya için ayrı bir `write_pwm.py` süreci (pkexec ve
+    parola sorma hariç; gerçek maliyetin alt sınırı).
+    """
+    counter = [0]
+
+    def next_index() -> int:
+        counter[0] += 1
+        return counter[0] & 1
+
+    with tempfile.TemporaryDirectory(prefix="helper-") as tmp:
+        tree = build_fake_hwmon(Path(tmp) / "hwmon", chips=(fans + 3) // 4, fans=4, temps=1)
+        scanner = HwmonScanner(tree, None)
+        targets = scanner.scan()[:fans]
+        config = ProfileConfig(profiles={"a": {"*": 100}, "b": {"*": 150}})
+        plans = [plan_profile(config, name, targets) for name in ("a", "b")]
+        pairs = [[pair for setting in plan for pair in setting.pairs()] for plan in plans]
+
+        def direct() -> None:
+            apply_plan(plans[next_index()])
+
+        client = PwmHelperClient(
+            os.path.join(tmp, "helper.sock"),
+            [sys.executable, str(WRITE_PWM), "--serve", "--root", str(tree)],
+        )
+
+        def transaction() -> None:
+            client.write_transaction(pairs[next_index()])
+
+        def per_fan() -> None:
+            for setting in plans[next_index()]:
+                client.write_batch(setting.pairs())
+
+        def spawn_per_fan() -> None:
+            for path, value in pairs[next_index()]:
+                subprocess.run(
+                    [sys.executable, str(WRITE_PWM), str(path), str(value)],
+                    capture_output=True,
+                    check=True,
+                )
+
+        rounds = max(10, rounds // 10)
+        try:
+            transaction()  # yardımcıyı başlat
+            results = _prefixed("direct_transaction", _time_calls(direct, rounds))
+            results.update(_prefixed("helper_transaction", _time_calls(transaction, rounds)))
+            results.update(_prefixed("helper_per_fan", _time_calls(per_fan, rounds)))
+        finally:
+            client.shutdown()
+        results.update(
+            _prefixed("spawn_per_fan", _time_calls(spawn_per_fan, max(3, rounds // 50)))
+        )
+    return results
+
+
+def bench_faults(root: Path, rounds: int, channels: int = 200) -> Dict[str, float]:
+    """Arıza algılayıcısının bir turu: `channels` fan + PWM + sıcaklık (sahte ağaçtan bağımsız)."""
+    sensors: List[Sensor] = []
+    fans: List[HwmonFan] = []
+    for n in range(channels):
+        fan = HwmonFan(id=f"bench_fan{n}", label="", rpm_path=Path(f"/bench/fan{n}"))
+        fan.rpm_slot = len(sensors)
+        sensors.append(Sensor(fan.id, "fan", "", fan.rpm_path))
+        fan.pwm_slot = len(sensors)
+        fan.pwm_path = Path(f"/bench/pwm{n}")
+        sensors.append(Sensor(f"bench_pwm{n}", "pwm", "", fan.pwm_path))
+        sensors.append(Sensor(f"bench_temp{n}", "temp", "", Path(f"/bench/temp{n}"), max_value=100000))
+        fans.append(fan)
+    detector = FaultDetector(sensors, fans)
+    # Önceden üretilmiş, hafifçe değişen değer dizileri; ölçüme yalnızca güncelleme girer.
+    frames = [
+        array("i", [v for n in range(channels) for v in (1200 + (t + n) % 7, 150, 45000 + (t * 13 + n) % 500)])
+        for t in range(16)
+    ]
+    snapshot = Snapshot(0.0, frames[0])
+    tick = [0]
+
+    def update() -> None:
+        t = tick[0] = tick[0] + 1
+        snapshot.values = frames[t % len(frames)]
+        snapshot.timestamp = float(t)
+        detector.update(snapshot)
+
+    update()
+    return _prefixed(f"update_{len(sensors)}", _time_calls(update, rounds))
+
+
+def bench_predictive(root: Path, rounds: int, channels: int = 64) -> Dict[str, float]:
+    """`channels` sıcaklık kanalının bir turu: öngörülü bankayla aynı kanalların PID'i."""
+    sensors: List[Sensor] = []
+    targets: List[ControlTarget] = []
+    for n in range(channels):
+        fan = HwmonFan(id=f"bench_fan{n}", label="", rpm_path=Path(f"/bench/fan{n}"))
+        fan.pwm_path = Path(f"/bench/pwm{n}")
+        fan.pwm_slot = len(sensors)
+        sensors.append(Sensor(f"bench_pwm{n}", "pwm", "", fan.pwm_path))
+        sensors.append(Sensor(f"bench_temp{n}", "temp", "", Path(f"/bench/temp{n}")))
+        targets.append(
+            ControlTarget(
+                name=f"k{n}", fans=[fan], mode=MODE_TEMP, setpoint=60.0, sensors=[len(sensors) - 1]
+            )
+        )
+    frames = [
+        array("i", [v for n in range(channels) for v in (120 + t % 5, 55000 + (t * 37 + n) % 900)])
+        for t in range(16)
+    ]
+    snapshot = Snapshot(0.0, frames[0])
+    results: Dict[str, float] = {}
+    for name, bank in (("pid", PidBank(targets)), ("model", ThermalModelBank(targets, sensors))):
+        tick = [0]
+
+        def step() -> None:
+            t = tick[0] = tick[0] + 1
+            snapshot.values = frames[t % len(frames)]
+            bank.step(snapshot, 1.0)
+
+        # Isınma: model öğrenip karar kuralına geçsin.
+        for _ in range(100):
+            step()
+        results.update(_prefixed(f"{name}_{channels}", _time_calls(step, rounds)))
+    return results
+
+
+def bench_curves(
+    root: Path, rounds: int, fans: int = 64, inputs: int = 32
+) -> Dict[str, float]:
+    """`fans` eğri fanının bir turu: derlenmiş tablo ile eğri başına ara değer hesabı.
+
+    Her fan `inputs` sıcaklıktan üçünü sırasıyla max, average ve weighted ile
+    karıştırır. Dosya okunmaz; yalnızca turun hesabı ölçülür. `compile`,
+    yeniden yüklemede tabloların derlenme süresidir.
+    """
+    kinds = (MIX_MAX, MIX_AVERAGE, MIX_WEIGHTED)
+    curves = [
+        FanCurve(points=[(30, 50 + n % 20), (50, 120), (65 + n % 10, 200), (85, 255)])
+        for n in range(fans)
+    ]
+    slots = [[n % inputs, (n * 7 + 1) % inputs, (n * 13 + 2) % inputs] for n in range(fans)]
+    mixes = [kinds[n % 3] for n in range(fans)]
+    weights = [[3.0, 2.0, 1.0] if kind == MIX_WEIGHTED else None for kind in mixes]
+    frames = [
+        array("l", [40000 + ((t * 37 + n * 11) % 160) * 250 for n in range(inputs)])
+        for t in range(16)
+    ]
+    for frame in frames[::5]:
+        frame[3] = MISSING
+    results: Dict[str, float] = {}
+    tick = [0]
+
+    def naive() -> None:
+        t = tick[0] = tick[0] + 1
+        values = frames[t % len(frames)]
+        temps = [None if v == MISSING else v / 1000.0 for v in values]
+        for curve, chosen, kind, weight in zip(curves, slots, mixes, weights):
+            temp = mix_temps(kind, [temps[k] for k in chosen], weight)
+            if temp is not None:
+                curve.evaluate(temp)
+
+    table = CurveTable(curves, slots, mixes, weights)
+
+    def compiled() -> None:
+        t = tick[0] = tick[0] + 1
+        table.evaluate(frames[t % len(frames)])
+
+    results.update(_prefixed(f"naive_{fans}", _time_calls(naive, rounds)))
+    results.update(_prefixed(f"table_{fans}", _time_calls(compiled, rounds)))
+    results.update(
+        _prefixed(
+            f"compile_{fans}",
+            _time_calls(lambda: CurveTable(curves, slots, mixes, weights), max(1, rounds // 20)),
+        )
+    )
+    return results
+
+
+def bench_adaptive_sampling(root: Path, rounds: int, count: int = 3000) -> Dict[str, float]:
+    """Uyarlamalı zamanlayıcının 1 s'lik sanal turları (dosya okunmaz).
+
+    Sensörlerin %10'u her saniye eşikten fazla değişir, %1'i okunamaz, %1'i
+    yavaştır (20 ms); 8 sensör arayüz tarafından istenir. `read_ratio`,
+    yapılan okumaların her turda tüm sensörleri okumaya oranıdır.
+    """
+    kinds = ("temp", "fan", "pwm")
+    sensors = [
+        Sensor(f"bench_s{n}", kinds[n % 3], "", Path(f"/bench/s{n}")) for n in range(count)
+    ]
+    schedule = SampleScheduler(sensors, now=0.0)
+    schedule.set_demand("view", range(8), 1.0, now=0.0)
+    clock = [0.0]
+
+    def tick() -> None:
+        now = clock[0] = clock[0] + 1.0
+        step = int(now)
+        for slot in schedule.pop_due(now):
+            if slot % 100 == 1:
+                schedule.record(slot, None, 0.0, now)
+                continue
+            busy = slot % 10 == 0
+            value = 40000 + (step * 1000 if busy else 0) % 20000 + slot % 50
+            schedule.record(slot, value, 0.02 if slot % 100 == 2 else 0.00002, now)
+
+    # Isınma: aralıklar kararlı duruma otursun.
+    for _ in range(120):
+        tick()
+    reads_before = schedule.reads
+    result = _prefixed(f"tick_{count}", _time_calls(tick, rounds))
+    result["read_ratio"] = (schedule.reads - reads_before) / (rounds * count)
+    return result
+
+
+def bench_trace(root: Path, rounds: int, ticks: int = 86400) -> Dict[str, float]:
+    """Sahte ağacın sensörleriyle `ticks` turluk sentetik kayıt (1 s aralıklı).
+
+    Sıcaklıklar ara sıra 250/1000 milidereceli adımlarla, devirler birkaç RPM
+    oynar; PWM'ler saatte bir değişir, bir sensör okunamaz. Yazma, açma ve bir
+    sütunun çözülmesi ölçülür; `bytes_per_tick` tur başına dosya boyudur.
+    """
+    scanner = HwmonScanner(root, cache_path=None)
+    scanner.scan()
+    sensors = scanner.sensors
+    rng = random.Random(0)
+    start = {"temp": 40000, "fan": 1200, "pwm": 128}
+    values = array("i", [start[sensor.kind] for sensor in sensors])
+    # Son sıcaklık sensörü okunamıyor.
+    temps = scanner.index.temps[:-1]
+    values[scanner.index.temps[-1]] = MISSING
+    fans = scanner.index.fans
+    pwms = scanner.index.pwms
+    snapshot = Snapshot(1.7e9, values)
+
+    def advance(tick: int) -> None:
+        for slot in temps:
+            if rng.random() < 0.2:
+                values[slot] += rng.choice((-1000, -250, 250, 1000))
+        for slot in fans:
+            values[slot] = 1200 + rng.randint(-15, 15)
+        if tick % 3600 == 0:
+            for slot in pwms:
+                values[slot] = rng.randint(60, 255)
+        snapshot.timestamp = 1.7e9 + tick
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.lft"
+        writer = TraceWriter(path, sensors, scanner.fans)
+        for tick in range(ticks - rounds):
+            advance(tick)
+            writer.append(snapshot)
+        counter = [ticks - rounds]
+
+        def append() -> None:
+            advance(counter[0])
+            writer.append(snapshot)
+            counter[0] += 1
+
+        result = _prefixed("append", _time_calls(append, rounds))
+        writer.close()
+        result["bytes_per_tick"] = path.stat().st_size / ticks
+
+        readers: List[TraceReader] = []
+
+        def open_trace() -> None:
+            readers.append(TraceReader(path))
+
+        result[f"open_{ticks}"] = _timeit(open_trace, 20)
+        reader = readers[0]
+        result[f"column_{ticks}"] = _timeit(lambda: reader.column(temps[0]), 5)
+        replay = ReplayScanner(reader)
+        replay.scan()
+        out = replay.sample_all()
+
+        def replay_tick() -> None:
+            if not replay.advance():
+                replay.seek(0)
+            replay.sample_all(out)
+
+        result["replay_tick"] = _timeit(replay_tick, min(rounds, ticks))
+        for opened in readers:
+            opened.close()
+    return result
+
+
+def bench_bus(root: Path, rounds: int) -> Dict[str, float]:
+    """Veri yoluna yayın ve okuyucunun bir turu; karşılaştırma için doğrudan sysfs turu."""
+    scanner = HwmonScanner(root, cache_path=None)
+    scanner.scan()
+    snapshot = scanner.sample_all()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.bus"
+        publisher = SnapshotPublisher(scanner.sensors, scanner.fans, 1.0, path)
+        publisher.publish(snapshot)
+        reader = BusScanner(path)
+        out = reader.sample_all()
+        result = {
+            "publish": _timeit(lambda: publisher.publish(snapshot), rounds),
+            "bus_read": _timeit(lambda: reader.sample_all(out), rounds),
+            "sysfs_read": _timeit(lambda: scanner.sample_all(snapshot), rounds),
+        }
+        reader.close()
+        publisher.close()
+    return result
+
+
+def _import_times(command: List[str], env: Dict[str, str]) -> Dict[str, int]:
+    """`-X importtime` çıktısından en üst düzey modüllerin toplam süreleri (µs).
+
+    Anahtarlar modül adlarıdır; iç içe yüklenen modüller de (üst düzeyde
+    olmasalar bile) 0 süreyle listeye eklenir, böylece hangi modüllerin
+    yüklendiği de görülebilir.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    modules: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # başlık satırı
+        name = parts[2][1:]
+        top_level = not name.startswith(" ")
+        modules[name.strip()] = int(parts[1]) if top_level else 0
+    return modules
+
+
+# Tepsi ölçümünün alt süreci: tepside başla, pencereyi aç, kapat, yeniden aç.
+# Her aşamada bellek ve tüm iş parçacıklarının bağlam değişimleri /proc'tan okunur.
+_TRAY_PROBE = r"""
+import glob, json, sys, time
+from pathlib import Path
+from PySide6 import QtCore, QtWidgets
+from main_window import MainWindow
+from tray import TrayController
+
+def memory(prefix):
+    # VmRSS paylaşılan kütüphane sayfalarını da sayar; RssAnon sürecin kendi belleğidir.
+    values = {}
+    for line in open("/proc/self/status"):
+        if line.startswith(("VmRSS:", "RssAnon:")):
+            name, value = line.split()[:2]
+            values[name] = int(value) * 1024
+    return {prefix + "_rss": values["VmRSS:"], prefix + "_anon": values["RssAnon:"]}
+
+def switches():
+    total = 0
+    for status in glob.glob("/proc/self/task/*/status"):
+        try:
+            for line in open(status):
+                if "ctxt_switches" in line:
+                    total += int(line.split()[1])
+        except OSError:
+            pass
+    return total
+
+def idle(seconds):
+    start, begin = switches(), time.monotonic()
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+    return (switches() - start) / (time.monotonic() - begin)
+
+root, tray_seconds = Path(sys.argv[1]), float(sys.argv[2])
+app = QtWidgets.QApplication(["bench"])
+app.setQuitOnLastWindowClosed(False)
+tray = TrayController(lambda: MainWindow(root=root), root)
+tray.start(hidden=True)
+idle(1.0)
+result = memory("hidden")
+start = time.perf_counter()
+tray.show_window()
+app.processEvents()
+result["open"] = time.perf_counter() - start
+result["window_wakeups"] = idle(3.0)
+result.update(memory("window"))
+tray.window.close()
+app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+idle(1.0)
+refreshes = tray.refreshes
+result["tray_wakeups"] = idle(tray_seconds)
+result["tray_refreshes"] = tray.refreshes - refreshes
+result.update(memory("tray"))
+# Pencerenin kapandıktan sonra geride bıraktığı özel bellek
+result["tray_extra_anon"] = result["tray_anon"] - result["hidden_anon"]
+start = time.perf_counter()
+tray.show_window()
+app.processEvents()
+result["reopen"] = time.perf_counter() - start
+tray.quit()
+print(json.dumps(result))
+"""
+
+
+def bench_tray(root: Path, rounds: int, seconds: float = 15.0) -> Dict[str, float]:
+    """Tepsi kipi: pencere açıkken ve tepsideyken RSS ile saniyedeki uyanma, yeniden açılış.
+
+    Qt gerektirir (offscreen); PySide6 yoksa ölçüm boş döner.
+    """
+    env = dict(
+        os.environ,
+        QT_QPA_PLATFORM="offscreen",
+        XDG_CACHE_HOME=str(root.parent / "tray-cache"),
+        LFANCONTROL_BUS=str(root.parent / "tray.bus"),
+    )
+    command = [sys.executable, "-c", _TRAY_PROBE, str(root), str(seconds)]
+    proc = subprocess.run(
+        command, cwd=Path(__file__).parent, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        print(f"  ! tepsi ölçümü çalışmadı: {proc.stderr.strip().splitlines()[-1:]}", file=sys.stderr)
+        return {}
+    return {key: float(value) for key, value in json.loads(proc.stdout).items()}
+
+
+def bench_cli_startup(root: Path, rounds: int) -> Dict[str, float]:
+    """`lfanctl list` başlangıcı: yorumlayıcının kendi yüklemeleri dışındaki içe aktarma süresi.
+
+    `-X importtime` çıktısından ölçülür; yüklenmemesi gereken modüller (Qt,
+    yetkili yardımcı vb.) de sayılır ve `--check` bunlara mutlak bütçe uygular.
+    """
+    rounds = max(3, min(rounds // 100, 20))
+    env = dict(os.environ, XDG_CACHE_HOME=str(root.parent / "cli-cache"))
+    command = [str(LFANCTL), "--root", str(root), "list", "--format", "json"]
+    import_us: List[int] = []
+    wall: List[float] = []
+    bare_wall: List[float] = []
+    modules: Dict[str, int] = {}
+    bare = _import_times(["-c", "pass"], env)
+    for _ in range(rounds):
+        start = time.perf_counter()
+        modules = _import_times(command, env)
+        wall.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        bare_wall.append(time.perf_counter() - start)
+        import_us.append(sum(t for name, t in modules.items() if name not in bare))
+
+    forbidden = sorted(
+        name for name in modules if name.split(".")[0] in CLI_FORBIDDEN_IMPORTS
+    )
+    for name in forbidden:
+        print(f"  ! yüklenmemesi gereken modül: {name}", file=sys.stderr)
+    return {
+        "list_imports": min(import_us) / 1e6,
+        "list_wall": min(wall),
+        "interpreter_wall": min(bare_wall),
+        "forbidden_imports": float(len(forbidden)),
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Dict[str, float]]] = {
+    "scan": bench_scan,
+    "sensor-read": bench_sensor_read,
+    "sample-all": bench_sample_all,
+    "tick": bench_tick,
+    "write-latency": bench_write_latency,
+    "jitter": bench_jitter,
+    "cli-startup": bench_cli_startup,
+    "faults": bench_faults,
+    "predictive": bench_predictive,
+    "curves": bench_curves,
+    "profile-switch": bench_profile_switch,
+    "adaptive-sampling": bench_adaptive_sampling,
+    "trace": bench_trace,
+    "bus": bench_bus,
+    "tray": bench_tray,
+}
+
+# Temel değerden bağımsız mutlak üst sınırlar (--check).
+BUDGETS: Dict[str, Dict[str, float]] = {
+    # backend'in dataclasses (inspect), pathlib ve json yüklemesi ~45–60 ms tutar;
+    # ölçüm makine yüküyle ±%20 oynar, bütçe bu aralığın üstünde pay bırakır.
+    "cli-startup": {"list_imports": 0.090, "list_wall": 0.150, "forbidden_imports": 0.0},
+    # 1 s'lik örnekleme turunun küçük bir kısmı
+    "faults": {"update_600_p99": 0.010},
+    "adaptive-sampling": {"tick_3000_p99": 0.020},
+    # Kanal başına sabit iş; 64 kanal 1 s'lik turun çok küçük bir kısmı
+    "predictive": {"model_64_p99": 0.005},
+    # Derlenmiş eğriler 64 fanı ara değer hesabından çok daha kısa sürede değerlendirir
+    "curves": {"table_64_p99": 0.001},
+    # Bir günlük kayıt milisaniyeler içinde açılmalı; tur başına sütun başına ~1 bayt
+    "trace": {"open_86400": 0.010, "bytes_per_tick": 40.0},
+    # Okuyucu turu sistem çağrısı yapmaz; sensör sayısından bağımsız birkaç µs
+    "bus": {"bus_read": 0.000050},
+    # Tepside saniyede en fazla bir uyanma; kapanan pencere en fazla 4 MiB özel bellek bırakır
+    "tray": {"tray_wakeups": 1.0, "tray_extra_anon": 4 * 2**20, "reopen": 0.250},
+}
+
+# Oran olan (saniye olmayan) sonuçlar
+_RATIO_KEYS = {"overrun_ratio", "read_ratio"}
+# Sayı olan sonuçlar
+_COUNT_KEYS = {"forbidden_imports", "bytes_per_tick", "tray_refreshes"}
+# Saniyedeki olay sayıları ve bayt cinsinden bellek
+_RATE_KEYS = {"window_wakeups", "tray_wakeups"}
+_BYTES_KEYS = {
+    f"{stage}_{kind}" for stage in ("hidden", "window", "tray") for kind in ("rss", "anon")
+} | {"tray_extra_anon"}
+_UNTIMED_KEYS = _RATIO_KEYS | _COUNT_KEYS | _RATE_KEYS | _BYTES_KEYS
+
+
+def _format(key: str, value: float) -> str:
+    if key in _RATIO_KEYS:
+        return f"{value * 100:10.2f} %"
+    if key in _COUNT_KEYS:
+        return f"{value:10.0f}"
+    if key in _RATE_KEYS:
+        return f"{value:10.2f} /s"
+    if key in _BYTES_KEYS:
+        return f"{value / 2**20:10.1f} MiB"
+    return f"{value * 1e6:10.2f} µs"
+
+
+def _compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float
+) -> List[str]:
+    """Temel değerden `tolerance` oranından fazla yavaşlayan veya bütçeyi aşan ölçümler."""
+    regressions = []
+    for name, values in results.items():
+        for key, value in values.items():
+            old = baseline.get(name, {}).get(key)
+            budget = BUDGETS.get(name, {}).get(key)
+            if budget is not None and value > budget:
+                regressions.append(
+                    f"{name}.{key}: {_format(key, value).strip()} > bütçe {_format(key, budget).strip()}"
+                )
+            if old is None or key in _UNTIMED_KEYS:
+                continue
+            if value > old * (1.0 + tolerance):
+                regressions.append(f"{name}.{key}: {_format(key, old).strip()} → {_format(key, value).strip()}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="NAME", help=", ".join(BENCHMARKS))
+    parser.add_argument("--chips", type=int, default=3)
+    parser.add_argument("--fans", type=int, default=4)
+    parser.add_argument("--temps", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Sonuçları temel değer olarak kaydet")
+    parser.add_argument("--check", action="store_true", help="Temel değerle karşılaştır")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="İzin verilen yavaşlama oranı (--check)"
+    )
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"bilinmeyen ölçüm: {', '.join(unknown)}")
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    if args.check or args.save:
+        try:
+            with args.baseline.open("r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            if args.check:
+                print(f"Temel değer dosyası yok ({args.baseline}); yalnızca bütçeler denetlenecek.")
+        except (OSError, ValueError) as exc:
+            parser.error(f"temel değer dosyası okunamadı: {exc}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory(prefix="fake-hwmon-") as tmp:
+        for name in names:
+            # Her ölçüm temiz bir ağaçla başlasın (önceki yazmalar etkilemesin).
+            root = build_fake_hwmon(
+                Path(tmp) / name, chips=args.chips, fans=args.fans, temps=args.temps
+            )
+            results[name] = BENCHMARKS[name](root, args.rounds)
+            print(f"[{name}]")
+            for key, value in results[name].items():
+                old = baseline.get(name, {}).get(key)
+                ratio = ""
+                if old and key not in _UNTIMED_KEYS:
+                    ratio = f"  ×{value / old:.2f}"
+                print(f"  {key:<28} {_format(key, value)}{ratio}")
+
+    if args.save:
+        baseline.update(results)
+        with args.baseline.open("w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"Temel değerler kaydedildi: {args.baseline}")
+    if args.check:
+        regressions = _compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"YAVAŞLAMA {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""Fanların PWM → RPM eğrisini ölçen kalibrasyon motoru (Qt içermez).
+
+Her PWM kanalı en yüksek değerden aşağı doğru adım adım indirilir; her adımda
+RPM sabit bir süre beklenmeden, oturduğu (son örneklerin yayılımı eşiğin
+altına indiği) anda kaydedilir. Fanın durduğu nokta (`min_stop`) bulunduktan
+sonra değer yeniden yukarı çıkarılarak duran fanı kaldıran en düşük PWM
+(`min_start`) ölçülür.
+
+Farklı çiplerdeki fanlar paralel, aynı çipteki fanlar sırayla kalibre edilir.
+Süpürme boyunca tüm sıcaklıklar izlenir; herhangi biri sürücünün kritik
+sınırına ya da `max_temp` tavanına ulaşırsa tüm fanlarda ölçüm durdurulur ve
+fanların önceki modu ile PWM değeri geri yüklenir.
+Sonuçlar fan kimliğine göre saklanır; kalkış noktası fanın `min_pwm` alt sınırı,
+doyma noktası yalnızca arayüzdeki 0–7 seviye ve devir eşlemesi için kullanılır.
+`max_pwm` donanım en yüksek değerinde kalır ki tam hız gerçekten 255 yazsın.
+
+Kullanım (root olarak):
+
+    sudo python calibration.py               # tüm PWM'li fanlar
+    sudo python calibration.py nct6775@nct6775.656_fan2  # yalnızca verilen fanlar
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend import PWM_MAX, PWM_MIN, SENSOR_READER, HwmonFan, HwmonScanner, Sensor
+
+_CACHE_VERSION = 1
+SYSTEM_CALIBRATION_PATH = Path("/var/lib/lfancontrol/calibration.json")
+
+
+def default_calibration_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "lfancontrol" / "calibration.json"
+
+
+class CalibrationError(RuntimeError):
+    """Fan kalibre edilemediğinde (ör. PWM değişimine tepki vermiyorsa) fırlatılır."""
+
+
+class CalibrationAborted(CalibrationError):
+    """Bir sıcaklık sınırı aşıldığı için ölçüm durdurulduğunda fırlatılır."""
+
+
+@dataclass
+class CalibrationSettings:
+    """Süpürme ve oturma testinin parametreleri."""
+
+    step: int = 16  # aşağı süpürmede PWM adımı
+    start_step: int = 4  # kalkış noktası aranırken PWM adımı
+    poll: float = 0.25  # RPM örnekleme aralığı (s)
+    settle_window: float = 2.0  # yayılımın bakıldığı son örneklerin süresi (s)
+    tolerance_rpm: int = 30
+    tolerance_ratio: float = 0.02
+    timeout: float = 15.0  # bir adımın en fazla bekleme süresi (s)
+    stall_rpm: int = 50  # bunun altındaki devir "durmuş" sayılır
+    saturation_ratio: float = 0.02  # en yüksek devrin bu oranı içindeki ilk PWM = max_pwm
+    max_temp: float = 85.0  # herhangi bir sıcaklık buna (veya sürücü sınırına) ulaşırsa dur (°C)
+
+
+@dataclass
+class FanCalibration:
+    """Bir fanın ölçülen PWM → RPM eğrisi ve türetilmiş sınırları."""
+
+    fan_id: str
+    points: List[Tuple[int, int]]  # (pwm, rpm), pwm'e göre artan
+    min_stop: int  # çalışan fanın hâlâ döndüğü en düşük PWM
+    min_start: int  # duran fanı kaldıran en düşük PWM
+    max_pwm: int  # devrin doyduğu ilk PWM
+    max_rpm: int
+    unsettled: int = 0  # zaman aşımıyla kaydedilen adım sayısı
+    created: float = field(default_factory=time.time)
+
+    @property
+    def min_pwm(self) -> int:
+        """Fanı her durumda döndüren en düşük PWM."""
+        return self.min_start
+
+    def rpm_at(self, pwm: int) -> int:
+        """Ölçülen noktalar arasında doğrusal ara değerlemeyle beklenen devir."""
+        points = self.points
+        if pwm <= points[0][0]:
+            return points[0][1]
+        for (p0, r0), (p1, r1) in zip(points, points[1:]):
+            if pwm <= p1:
+                return int(r0 + (r1 - r0) * (pwm - p0) / max(1, p1 - p0))
+        return points[-1][1]
+
+    def pwm_for_rpm(self, rpm: float) -> int:
+        """`rpm` devre ulaşan en düşük PWM (min_pwm–max_pwm aralığında)."""
+        lo, hi = self.min_pwm, self.max_pwm
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.rpm_at(mid) < rpm:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def level_to_pwm(self, level: int, top: int = 7) -> int:
+        """Seviyeleri devirde eşit aralıklı olacak şekilde PWM'e çevir.
+
+        0 en düşük güvenli devir (`min_pwm`), `top` doyma noktasıdır (`max_pwm`).
+        """
+        level = max(0, min(top, level))
+        low = self.rpm_at(self.min_pwm)
+        high = self.rpm_at(self.max_pwm)
+        return self.pwm_for_rpm(low + (high - low) * level / top)
+
+    def pwm_to_level(self, pwm: int, top: int = 7) -> int:
+        low = self.rpm_at(self.min_pwm)
+        high = self.rpm_at(self.max_pwm)
+        if high <= low:
+            return top if pwm >= self.max_pwm else 0
+        ratio = (self.rpm_at(pwm) - low) / (high - low)
+        return max(0, min(top, int(round(ratio * top))))
+
+    def to_json(self) -> dict:
+        data = dataclasses.asdict(self)
+        data["points"] = [list(p) for p in self.points]
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict) -> "FanCalibration":
+        data = dict(data)
+        data["points"] = [(int(p), int(r)) for p, r in data["points"]]
+        return cls(**data)
+
+
+# --- Önbellek ---
+
+
+def load_calibrations(paths: Optional[Iterable[Path]] = None) -> Dict[str, FanCalibration]:
+    """Kullanıcı ve sistem önbelleklerini oku; aynı fan için ilk bulunan kazanır."""
+    if paths is None:
+        paths = (default_calibration_path(), SYSTEM_CALIBRATION_PATH)
+    result: Dict[str, FanCalibration] = {}
+    for path in paths:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != _CACHE_VERSION:
+                continue
+            for fan_id, entry in data.get("fans", {}).items():
+                if fan_id not in result:
+                    result[fan_id] = FanCalibration.from_json(entry)
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return result
+
+
+def save_calibrations(calibrations: Dict[str, FanCalibration], path: Path) -> None:
+    """Sonuçları `path` dosyasındaki mevcut kayıtlarla birleştirerek yaz."""
+    existing = load_calibrations([path])
+    existing.update(calibrations)
+    data = {
+        "version": _CACHE_VERSION,
+        "fans": {fan_id: cal.to_json() for fan_id, cal in sorted(existing.items())},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def apply_calibration(fans: Iterable[HwmonFan], calibrations: Dict[str, FanCalibration]) -> None:
+    """Kalibre edilmiş fanların `min_pwm` alt sınırını ayarla.
+
+    Doyma noktası (`cal.max_pwm`) üst sınır yapılmaz: arıza güvenliğinin tam
+    hızı ve profillerdeki `100%` donanımın en yüksek değerini yazabilmelidir.
+    """
+    for fan in fans:
+        cal = calibrations.get(fan.id)
+        if cal is None:
+            continue
+        fan.min_pwm = cal.min_pwm
+
+
+# --- Ölçüm ---
+
+
+class TemperatureGuard:
+    """Kalibrasyon boyunca sıcaklıkları izler; bir sınır aşılınca tüm süpürmeleri durdurur.
+
+    Her sensörün sınırı `ceiling` (°C) ile sürücünün bildirdiği
+    `tempN_crit`/`tempN_max` değerinin küçüğüdür. Çip iş parçacıkları
+    `check()`'i her örneklemede çağırır; sensörler en fazla `period` saniyede
+    bir okunur. Sınır bir kez aşıldıktan sonra `check()` hep hata fırlatır.
+    """
+
+    def __init__(
+        self,
+        sensors: Sequence[Sensor],
+        ceiling: float = CalibrationSettings.max_temp,
+        period: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        top = int(ceiling * 1000)
+        self.limits = [
+            (sensor, min(top, sensor.max_value) if sensor.max_value else top)
+            for sensor in sensors
+            if sensor.kind == "temp"
+        ]
+        self.period = period
+        self.clock = clock
+        self.tripped: Optional[str] = None
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        """Sınır aşıldıysa `CalibrationAborted` fırlat."""
+        if self.tripped is None:
+            with self._lock:
+                now = self.clock()
+                if self.tripped is None and now >= self._next:
+                    self._next = now + self.period
+                    for sensor, limit in self.limits:
+                        try:
+                            value = SENSOR_READER.read_int(sensor.path)
+                        except OSError:
+                            continue
+                        if value is not None and value >= limit:
+                            self.tripped = (
+                                f"{sensor.id} {value / 1000:.1f} °C ≥ {limit / 1000:.0f} °C"
+                            )
+                            break
+        if self.tripped is not None:
+            raise CalibrationAborted(f"sıcaklık sınırı aşıldı: {self.tripped}")
+
+
+def wait_settled(
+    read: Callable[[], Optional[int]],
+    settings: CalibrationSettings,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+    check: Optional[Callable[[], None]] = None,
+) -> Tuple[int, bool]:
+    """RPM oturana kadar örnekle; (devir, oturdu_mu) döndür.
+
+    Son `settle_window` saniyedeki örneklerin yayılımı mutlak ya da göreli
+    eşiğin altına indiğinde devir oturmuş sayılır ve pencerenin ortalaması
+    döner. Zaman aşımında son pencerenin ortalaması `False` ile döner.
+    `check` her örneklemede çağrılır; fırlattığı hata beklemeyi keser.
+    """
+    start = clock()
+    window: List[Tuple[float, int]] = []
+    while True:
+        if check is not None:
+            check()
+        now = clock()
+        rpm = read()
+        window.append((now, 0 if rpm is None else rpm))
+        while window and window[0][0] < now - settings.settle_window:
+            window.pop(0)
+        values = [v for _t, v in window]
+        mean = sum(values) / len(values)
+        if now - start >= settings.settle_window and len(values) >= 2:
+            spread = max(values) - min(values)
+            if spread <= max(settings.tolerance_rpm, settings.tolerance_ratio * mean):
+                return int(round(mean)), True
+        if now - start >= settings.timeout:
+            return int(round(mean)), False
+        sleep(settings.poll)
+
+
+class FanCalibrator:
+    """Tek bir fanı kalibre eder; işlem bitince fanın önceki durumunu geri yükler."""
+
+    def __init__(
+        self,
+        fan: HwmonFan,
+        settings: Optional[CalibrationSettings] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        progress: Optional[Callable[[str, int, int], None]] = None,
+        guard: Optional[TemperatureGuard] = None,
+    ) -> None:
+        if fan.pwm_path is None:
+            raise CalibrationError(f"{fan.id}: PWM kontrolü yok.")
+        # Önceki kalibrasyonun sınırları ölçümü kısıtlamasın.
+        self.fan = dataclasses.replace(fan, min_pwm=PWM_MIN, max_pwm=PWM_MAX)
+        self.settings = settings or CalibrationSettings()
+        self.sleep = sleep
+        self.clock = clock
+        self.progress = progress
+        self.guard = guard
+        self.unsettled = 0
+
+    def _measure(self, pwm: int) -> int:
+        self.fan.set_pwm(pwm, ensure_manual=False)
+        check = None if self.guard is None else self.guard.check
+        rpm, settled = wait_settled(
+            self.fan.read_rpm, self.settings, self.sleep, self.clock, check
+        )
+        if not settled:
+            self.unsettled += 1
+        if self.progress is not None:
+            self.progress(self.fan.id, pwm, rpm)
+        return rpm
+
+    def run(self) -> FanCalibration:
+        fan = self.fan
+        if self.guard is not None:
+            self.guard.check()
+        old_enable = SENSOR_READER.read_int(fan.pwm_enable_path) if fan.pwm_enable_path else None
+        old_pwm = fan.read_pwm()
+        fan.set_manual_mode()
+        try:
+            return self._sweep()
+        finally:
+            self._restore(old_enable, old_pwm)
+
+    def _sweep(self) -> FanCalibration:
+        settings = self.settings
+        stall = settings.stall_rpm
+        curve: Dict[int, int] = {}
+
+        # Yukarıdan aşağı: fan durana kadar (veya 0'a kadar) in.
+        pwm = PWM_MAX
+        min_stop = 0
+        stopped_at: Optional[int] = None
+        while True:
+            rpm = curve[pwm] = self._measure(pwm)
+            if rpm <= stall:
+                stopped_at = pwm
+                break
+            min_stop = pwm
+            if pwm == PWM_MIN:
+                break
+            pwm = max(PWM_MIN, pwm - settings.step)
+
+        max_rpm = max(curve.values())
+        if max_rpm <= stall:
+            raise CalibrationError(f"{self.fan.id}: en yüksek PWM'de bile fan dönmüyor.")
+        if stopped_at is None and curve[PWM_MIN] >= max_rpm * (1 - settings.saturation_ratio):
+            raise CalibrationError(f"{self.fan.id}: devir PWM değişimine tepki vermiyor.")
+
+        if stopped_at is None:
+            # Fan 0'da bile dönüyor; durma/kalkış noktası yok.
+            min_start = PWM_MIN
+        else:
+            # Durma noktasını ince adımlarla daralt, sonra duran fanı kaldıran ilk değeri ara.
+            pwm = stopped_at + settings.start_step
+            while pwm < min_stop:
+                rpm = curve[pwm] = self._measure(pwm)
+                if rpm <= stall:
+                    break
+                min_stop = pwm
+                pwm += settings.start_step
+            self._measure(PWM_MIN)  # fanın tamamen durduğundan emin ol
+            pwm = min_stop
+            while True:
+                if self._measure(pwm) > stall:
+                    min_start = pwm
+                    break
+                if pwm == PWM_MAX:
+                    raise CalibrationError(f"{self.fan.id}: durduktan sonra fan yeniden kalkmadı.")
+                pwm = min(PWM_MAX, pwm + settings.start_step)
+
+        points = sorted(curve.items())
+        # Gürültüden kaynaklanan küçük düşüşleri yok say: eğri PWM ile azalmasın.
+        monotonic: List[Tuple[int, int]] = []
+        best = 0
+        for p, r in points:
+            best = max(best, r)
+            monotonic.append((p, best))
+        threshold = max_rpm * (1 - settings.saturation_ratio)
+        max_pwm = next(p for p, r in monotonic if r >= threshold)
+        return FanCalibration(
+            fan_id=self.fan.id,
+            points=monotonic,
+            min_stop=min_stop,
+            min_start=min_start,
+            max_pwm=max(max_pwm, min_start),
+            max_rpm=max_rpm,
+            unsettled=self.unsettled,
+        )
+
+    def _restore(self, old_enable: Optional[int], old_pwm: Optional[int]) -> None:
+        fan = self.fan
+        try:
+            if old_pwm is not None:
+                fan.set_pwm(old_pwm, ensure_manual=False)
+            if old_enable is not None and old_enable != 1:
+                fan._write_int_file(fan.pwm_enable_path, old_enable)  # pylint: disable=protected-access
+        except OSError as exc:
+            print(f"{fan.id}: önceki durum geri yüklenemedi: {exc}", file=sys.stderr)
+
+
+def _chip_key(fan: HwmonFan) -> str:
+    return str(fan.rpm_path.parent)
+
+
+def calibrate_fans(
+    fans: Iterable[HwmonFan],
+    settings: Optional[CalibrationSettings] = None,
+    progress: Optional[Callable[[str, int, int], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+    guard: Optional[TemperatureGuard] = None,
+) -> Tuple[Dict[str, FanCalibration], Dict[str, Exception]]:
+    """Fanları çip başına bir iş parçacığıyla kalibre et.
+
+    Aynı çipteki fanlar birbirinin hava akışını ve (bazı kartlarda) ortak
+    PWM hattını etkileyebileceği için sırayla ölçülür. Dönen değer
+    (sonuçlar, hatalar) çiftidir; ikisi de fan kimliğine göre anahtarlanır.
+    `guard` sınır aşıldığını bildirince tüm çiplerdeki ölçümler durur ve
+    henüz ölçülmemiş fanlar da `CalibrationAborted` ile hatalara eklenir.
+    """
+    by_chip: Dict[str, List[HwmonFan]] = {}
+    for fan in fans:
+        if fan.pwm_path is not None:
+            by_chip.setdefault(_chip_key(fan), []).append(fan)
+
+    results: Dict[str, FanCalibration] = {}
+    errors: Dict[str, Exception] = {}
+    lock = threading.Lock()
+
+    def calibrate_chip(chip_fans: List[HwmonFan]) -> None:
+        for fan in chip_fans:
+            try:
+                cal = FanCalibrator(fan, settings, sleep, clock, progress, guard).run()
+            except (OSError, CalibrationError) as exc:
+                with lock:
+                    errors[fan.id] = exc
+                continue
+            with lock:
+                results[fan.id] = cal
+
+    if by_chip:
+        # lfanctl gibi yalnızca önbelleği okuyan araçlar bu modülü yüklemesin diye burada.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=len(by_chip), thread_name_prefix="calibrate") as pool:
+            list(pool.map(calibrate_chip, by_chip.values()))
+    return results, errors
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fan PWM → RPM kalibrasyonu")
+    parser.add_argument("fans", nargs="*", help="Kalibre edilecek fan kimlikleri (varsayılan: tümü)")
+    parser.add_argument("--root", type=Path, default=None, help="hwmon kökü (test için)")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Sonuç dosyası (varsayılan: root için sistem, diğerleri için kullanıcı önbelleği)",
+    )
+    parser.add_argument("--step", type=int, default=CalibrationSettings.step)
+    parser.add_argument("--timeout", type=float, default=CalibrationSettings.timeout)
+    parser.add_argument(
+        "--max-temp",
+        type=float,
+        default=CalibrationSettings.max_temp,
+        help="Herhangi bir sıcaklık buna ulaşırsa kalibrasyonu durdur (°C)",
+    )
+    args = parser.parse_args(argv)
+
+    scanner = HwmonScanner(args.root) if args.root else HwmonScanner()
+    fans = [fan for fan in scanner.scan() if fan.pwm_path is not None]
+    if args.fans:
+        unknown = set(args.fans) - {fan.id for fan in fans}
+        if unknown:
+            parser.error(f"PWM'li fan bulunamadı: {', '.join(sorted(unknown))}")
+        fans = [fan for fan in fans if fan.id in args.fans]
+    if not fans:
+        print("Kalibre edilecek PWM'li fan yok.", file=sys.stderr)
+        sys.exit(1)
+
+    output = args.output
+    if output is None:
+        output = SYSTEM_CALIBRATION_PATH if os.geteuid() == 0 else default_calibration_path()
+
+    def report(fan_id: str, pwm: int, rpm: int) -> None:
+        print(f"{fan_id}: pwm={pwm} rpm={rpm}", flush=True)
+
+    settings = CalibrationSettings(
+        step=max(1, args.step), timeout=args.timeout, max_temp=args.max_temp
+    )
+    guard = TemperatureGuard(scanner.sensors, settings.max_temp)
+    started = time.monotonic()
+    results, errors = calibrate_fans(fans, settings, report, guard=guard)
+    if guard.tripped is not None:
+        print(
+            f"Kalibrasyon durduruldu, fanlar önceki durumlarına alındı: {guard.tripped}",
+            file=sys.stderr,
+        )
+    for fan_id, exc in sorted(errors.items()):
+        print(f"{fan_id}: kalibre edilemedi: {exc}", file=sys.stderr)
+    for fan_id, cal in sorted(results.items()):
+        print(
+            f"{fan_id}: durma={cal.min_stop} kalkış={cal.min_start} "
+            f"doyma={cal.max_pwm} en yüksek={cal.max_rpm} RPM"
+            + (f" (oturmayan adım: {cal.unsettled})" if cal.unsettled else "")
+        )
+    if results:
+        save_calibrations(results, output)
+        print(f"{len(results)} fan {time.monotonic() - started:.0f} s içinde kalibre edildi → {output}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
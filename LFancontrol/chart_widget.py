@@ -0,0 +1,159 @@
+"""Sensör geçmişinden canlı grafik çizen Qt bileşeni."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from backend import MISSING, Snapshot
+from history import HistoryStore, MinMaxBuckets
+
+SERIES_COLORS = ["#1f77b4", "#d62728", "#2ca02c", "#ff7f0e", "#9467bd", "#8c564b", "#e377c2"]
+
+
+@dataclass
+class ChartSeries:
+    """Grafikte çizilecek tek bir sensör sütunu."""
+
+    slot: int
+    label: str
+    color: str
+    unit: str = ""
+    scale: float = 1.0  # gösterilen değer = ham değer / scale (ör. milidereceler için 1000)
+
+
+class HistoryChart(QtWidgets.QWidget):
+    """Seçili sensörlerin son `span` saniyesini min/max indirgemesiyle çizer.
+
+    Her piksel sütunu bir kovadır: yeni örnek geldiğinde yalnızca ilgili kova
+    güncellenir ve bileşen yeniden çizilir, bu yüzden çizim maliyeti pencerede
+    kaç örnek olduğundan bağımsızdır. Geçmişten tam doldurma yalnızca boyut,
+    pencere veya seri listesi değiştiğinde yapılır. Her seri kendi görünür
+    aralığına göre ölçeklenir.
+    """
+
+    MARGIN = 6
+    LEGEND_HEIGHT = 18
+
+    def __init__(self, parent: Optional[QtWidgets.QWidget] = None, span: float = 600.0) -> None:
+        super().__init__(parent)
+        self.setMinimumHeight(150)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
+        self._history: Optional[HistoryStore] = None
+        self._series: List[ChartSeries] = []
+        self._buckets: List[MinMaxBuckets] = []
+        self._latest: List[Optional[int]] = []
+        self._span = span
+
+    # --- Yapılandırma ---
+
+    def set_history(self, history: HistoryStore) -> None:
+        self._history = history
+        self._rebuild()
+
+    def set_series(self, series: List[ChartSeries]) -> None:
+        self._series = series
+        self._rebuild()
+
+    def set_span(self, seconds: float) -> None:
+        self._span = seconds
+        self._rebuild()
+
+    def _plot_rect(self) -> QtCore.QRect:
+        m = self.MARGIN
+        return self.rect().adjusted(m, m + self.LEGEND_HEIGHT, -m, -m)
+
+    def _rebuild(self) -> None:
+        width = max(1, self._plot_rect().width())
+        history = self._history
+        now = (history.latest_timestamp() if history else None) or time.time()
+        self._buckets = []
+        self._latest = []
+        for series in self._series:
+            buckets = MinMaxBuckets(width, self._span)
+            if history is not None and series.slot < history.columns:
+                buckets.rebuild(history.segments(series.slot, since=now - self._span), now)
+            else:
+                buckets.advance(now)
+            self._buckets.append(buckets)
+            self._latest.append(None)
+        self.update()
+
+    # --- Veri ---
+
+    def append(self, snapshot: Snapshot) -> None:
+        """Yeni anlık görüntüyü ekle ve yalnızca bu durumda yeniden çiz."""
+        values = snapshot.values
+        for i, series in enumerate(self._series):
+            if series.slot >= len(values):
+                continue
+            value = values[series.slot]
+            self._buckets[i].add(snapshot.timestamp, value)
+            self._latest[i] = None if value == MISSING else value
+        if self._series:
+            self.update()
+
+    # --- Qt olayları ---
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:  # noqa: N802
+        super().resizeEvent(event)
+        self._rebuild()
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:  # noqa: N802
+        painter = QtGui.QPainter(self)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QtGui.QPalette.Base))
+        plot = self._plot_rect()
+        painter.setPen(palette.color(QtGui.QPalette.Mid))
+        painter.drawRect(plot.adjusted(0, 0, -1, -1))
+
+        legend_x = self.MARGIN
+        metrics = painter.fontMetrics()
+        for series, buckets, latest in zip(self._series, self._buckets, self._latest):
+            color = QtGui.QColor(series.color)
+            self._draw_series(painter, plot, buckets, color)
+
+            if latest is None:
+                text = f"{series.label}: -"
+            elif series.scale != 1.0:
+                text = f"{series.label}: {latest / series.scale:.1f} {series.unit}"
+            else:
+                text = f"{series.label}: {latest} {series.unit}"
+            painter.setPen(color)
+            painter.drawText(legend_x, self.MARGIN + metrics.ascent(), text.strip())
+            legend_x += metrics.horizontalAdvance(text) + 12
+        painter.end()
+
+    @staticmethod
+    def _draw_series(
+        painter: QtGui.QPainter, plot: QtCore.QRect, buckets: MinMaxBuckets, color: QtGui.QColor
+    ) -> None:
+        columns = list(buckets.columns())
+        if not columns:
+            return
+        low = min(c[1] for c in columns)
+        high = max(c[2] for c in columns)
+        if high == low:
+            # Sabit değer: çizgiyi alt kenara değil ortaya yerleştir.
+            low -= 1
+            high += 1
+        scale = (plot.height() - 1) / (high - low)
+        bottom = plot.bottom()
+        left = plot.left()
+
+        lines = []
+        prev_x = prev_y = None
+        for x, column_min, column_max in columns:
+            px = left + x
+            y_min = bottom - (column_min - low) * scale
+            y_max = bottom - (column_max - low) * scale
+            # Kovadaki değer aralığı dikey çizgi; komşu kovalarla birleştirme çizgisi.
+            lines.append(QtCore.QLineF(px, y_min, px, y_max))
+            if prev_x is not None and x == prev_x + 1:
+                lines.append(QtCore.QLineF(left + prev_x, prev_y, px, (y_min + y_max) / 2))
+            prev_x, prev_y = x, (y_min + y_max) / 2
+
+        painter.setPen(QtGui.QPen(color, 1))
+        painter.drawLines(lines)
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""Hedef sıcaklık veya hedef devir tutan PID denetleyicisi (Qt içermez).
+
+Her kanal bir fanı ya da aynı PWM değerini alan bir fan grubunu sürer ve
+şunlardan birini hedefler:
+
+- `temp`: izlenen sıcaklıkların en yükseği `setpoint` °C'de tutulur,
+- `rpm`: grubun ortalama devri `setpoint` RPM'de tutulur.
+
+Çıkış `kp·e + ∫ki·e + kd·(ölçüm türevi) + ileri besleme` olarak hesaplanır;
+türev ölçüm üzerinden alınır (hedef değişince sıçrama yapmaz). Çıkış
+`min_pwm`–`max_pwm` aralığına ve saniyede `slew` PWM'lik değişime
+sınırlanır; sınırlamaya takılan kısım integrale geri yansıtılır (geri
+hesaplamalı integral doyması önleme). `rpm` kipinde kalibrasyon eğrisi
+varsa ileri besleme hedef devre karşılık gelen PWM'dir; böylece PI terimi
+yalnızca kalan hatayı düzeltir.
+
+Tüm kanalların durumu paralel `array('d')` sütunlarında tutulur; bir tur
+bu sütunlar üzerinde bellek ayırmayan tek bir Python döngüsüdür. Döngü
+kanal başına yürüdüğünden maliyet fan grubu sayısıyla doğrusal artar
+(NumPy kullanılmaz). Ölçümler `HwmonScanner.sample_all()` anlık
+görüntüsünden sıra numarasıyla alınır, kanal başına dosya okunmaz.
+
+Benzetim (donanım gerektirmez):
+
+    python controller.py --mode temp --setpoint 55
+    python controller.py --mode rpm --setpoint 1500 --feedforward --reference-tau 1.5
+
+Benzetim sonunda basamak yanıtının aşımı, oturma süresi ve kalıcı hatası
+yazdırılır; kazançlar `--kp/--ki/--kd` ile denenebilir.
+"""
+from __future__ import annotations
+
+import argparse
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from backend import MISSING, PWM_MAX, PWM_MIN, HwmonFan, Snapshot
+from calibration import FanCalibration
+
+MODE_TEMP = "temp"
+MODE_RPM = "rpm"
+
+_NAN = float("nan")
+
+
+@dataclass
+class PidGains:
+    kp: float
+    ki: float
+    kd: float = 0.0
+
+
+DEFAULT_GAINS = {
+    MODE_TEMP: PidGains(kp=8.0, ki=1.0, kd=0.0),  # PWM / °C
+    MODE_RPM: PidGains(kp=0.02, ki=0.04, kd=0.0),  # PWM / RPM
+}
+
+
+@dataclass
+class ControlTarget:
+    """Bir denetim kanalı: hangi fanlar, neye göre, hangi hedefte."""
+
+    name: str
+    fans: List[HwmonFan]
+    mode: str
+    setpoint: float
+    sensors: List[int] = field(default_factory=list)  # `temp` kipinde sıcaklık sıraları
+    gains: Optional[PidGains] = None
+    slew: float = 60.0  # saniyede en fazla PWM değişimi
+    calibration: Optional[FanCalibration] = None  # `rpm` kipinde ileri besleme için
+    bias: float = 0.0  # kalibrasyon yoksa sabit ileri besleme (PWM)
+    # >0 ise PI terimi hedefin kendisini değil, hedefe bu zaman sabitiyle (s)
+    # yaklaşan bir referansı izler; ileri beslemeyle birlikte aşımı önler.
+    reference_tau: float = 0.0
+
+    def limits(self) -> Tuple[int, int]:
+        """Gruptaki tüm fanlar için geçerli ortak PWM aralığı."""
+        low = max((fan.min_pwm for fan in self.fans), default=PWM_MIN)
+        high = min((fan.max_pwm for fan in self.fans), default=PWM_MAX)
+        return low, max(low, high)
+
+
+class PidBank:
+    """Birden çok kanalın PID durumunu sütunlar hâlinde tutan denetleyici (kanal başına döngü)."""
+
+    def __init__(self, targets: Sequence[ControlTarget]) -> None:
+        for target in targets:
+            if target.mode not in (MODE_TEMP, MODE_RPM):
+                raise ValueError(f"{target.name}: bilinmeyen kip: {target.mode}")
+            if target.mode == MODE_TEMP and not target.sensors:
+                raise ValueError(f"{target.name}: sıcaklık sensörü belirtilmemiş.")
+            if not target.fans:
+                raise ValueError(f"{target.name}: fan belirtilmemiş.")
+        self.targets = list(targets)
+        count = len(self.targets)
+
+        def column(values: Sequence[float]) -> array:
+            return array("d", values)
+
+        gains = [t.gains or DEFAULT_GAINS[t.mode] for t in self.targets]
+        limits = [t.limits() for t in self.targets]
+        self.kp = column([g.kp for g in gains])
+        self.ki = column([g.ki for g in gains])
+        self.kd = column([g.kd for g in gains])
+        # temp: e = ölçüm - hedef (ısınınca PWM artar); rpm: e = hedef - ölçüm
+        self.sign = column([1.0 if t.mode == MODE_TEMP else -1.0 for t in self.targets])
+        self.low = column([lo for lo, _hi in limits])
+        self.high = column([hi for _lo, hi in limits])
+        self.slew = column([t.slew for t in self.targets])
+        self.setpoint = column([t.setpoint for t in self.targets])
+        self.tau = column([t.reference_tau for t in self.targets])
+        self.reference = column([_NAN] * count)
+        self.feedforward = column([0.0] * count)
+        self.integral = column([0.0] * count)
+        self.previous = column([_NAN] * count)  # önceki ölçüm
+        self.output = column([_NAN] * count)  # son uygulanan PWM
+        self.measured = column([_NAN] * count)
+        # Ölçüm için okunacak sıralar: temp → sıcaklıklar (en yükseği), rpm → fan devirleri (ortalaması)
+        self._slots: List[Tuple[int, ...]] = [
+            tuple(t.sensors) if t.mode == MODE_TEMP else tuple(f.rpm_slot for f in t.fans)
+            for t in self.targets
+        ]
+        self._scale = column([1000.0 if t.mode == MODE_TEMP else 1.0 for t in self.targets])
+        self._use_max = [t.mode == MODE_TEMP for t in self.targets]
+        for i in range(count):
+            self._update_feedforward(i)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def _update_feedforward(self, i: int) -> None:
+        target = self.targets[i]
+        if target.mode == MODE_RPM and target.calibration is not None:
+            self.feedforward[i] = target.calibration.pwm_for_rpm(self.setpoint[i])
+        else:
+            self.feedforward[i] = target.bias
+
+    def set_setpoint(self, i: int, value: float) -> None:
+        self.setpoint[i] = value
+        self._update_feedforward(i)
+
+    def reset(self) -> None:
+        """Tüm kanalların integral ve geçmiş durumunu sıfırla."""
+        for i in range(len(self.targets)):
+            self.integral[i] = 0.0
+            self.previous[i] = _NAN
+            self.output[i] = _NAN
+            self.reference[i] = _NAN
+
+    def measure(self, snapshot: Snapshot) -> array:
+        """Anlık görüntüden kanal ölçümlerini çıkar (okunamayan kanal: NaN)."""
+        values = snapshot.values
+        measured = self.measured
+        for i, slots in enumerate(self._slots):
+            total = 0.0
+            best = -math.inf
+            count = 0
+            for slot in slots:
+                if 0 <= slot < len(values):
+                    raw = values[slot]
+                    if raw != MISSING:
+                        total += raw
+                        if raw > best:
+                            best = raw
+                        count += 1
+            if not count:
+                measured[i] = _NAN
+            elif self._use_max[i]:
+                measured[i] = best / self._scale[i]
+            else:
+                measured[i] = total / count / self._scale[i]
+        return measured
+
+    def update(self, measured: Sequence[float], dt: float) -> array:
+        """Bir tur ilerle; kanal başına uygulanacak PWM'i (`output`) döndür.
+
+        Kanallar sütunlar üzerinde sırayla, yeni bellek ayırmadan işlenir.
+        Ölçümü olmayan `temp` kanalı güvenlik için üst sınıra çekilir;
+        `rpm` kanalı son çıkışını korur. İki durumda da integral donar.
+        """
+        kp, ki, kd, sign = self.kp, self.ki, self.kd, self.sign
+        low, high, slew = self.low, self.high, self.slew
+        setpoint, feedforward = self.setpoint, self.feedforward
+        tau, reference = self.tau, self.reference
+        integral, previous, output = self.integral, self.previous, self.output
+        dt = max(dt, 1e-6)
+
+        for i in range(len(output)):
+            value = measured[i]
+            last = output[i]
+            if value != value:  # NaN: ölçüm yok
+                if sign[i] > 0:
+                    output[i] = high[i]
+                elif last != last:
+                    output[i] = feedforward[i] if feedforward[i] > 0 else high[i]
+                previous[i] = _NAN
+                continue
+
+            target = setpoint[i]
+            if tau[i] > 0:
+                ref = reference[i]
+                if ref != ref:
+                    ref = value
+                ref += (target - ref) * min(1.0, dt / tau[i])
+                reference[i] = target = ref
+            error = sign[i] * (value - target)
+            integ = integral[i] + ki[i] * error * dt
+            prev = previous[i]
+            derivative = 0.0 if prev != prev else kd[i] * sign[i] * (value - prev) / dt
+            raw = feedforward[i] + kp[i] * error + integ + derivative
+
+            applied = raw
+            if applied < low[i]:
+                applied = low[i]
+            elif applied > high[i]:
+                applied = high[i]
+            if last == last:
+                step = slew[i] * dt
+                if applied > last + step:
+                    applied = last + step
+                elif applied < last - step:
+                    applied = last - step
+
+            # Geri hesaplama: sınırlanan kısım integrale yansır, integral şişmez.
+            integral[i] = integ + (applied - raw)
+            previous[i] = value
+            output[i] = applied
+        return output
+
+    def step(self, snapshot: Snapshot, dt: float) -> array:
+        return self.update(self.measure(snapshot), dt)
+
+    def pwm_requests(self) -> List[Tuple[HwmonFan, int]]:
+        """Son çıkışın (fan, PWM) çiftleri; yazma katmanına verilmek üzere."""
+        requests: List[Tuple[HwmonFan, int]] = []
+        for target, value in zip(self.targets, self.output):
+            if value != value:
+                continue
+            pwm = int(round(value))
+            for fan in target.fans:
+                requests.append((fan, pwm))
+        return requests
+
+
+# --- Benzetim ---
+
+
+@dataclass
+class StepResponse:
+    """Benzetimdeki basamak yanıtının özeti."""
+
+    setpoint: float
+    initial: float
+    final: float
+    overshoot: float  # hedefin ötesine en fazla taşma, basamağın yüzdesi
+    settling_time: Optional[float]  # bant içinde kalmaya başladığı an (s); hiç oturmazsa None
+    steady_error: float
+    trace: List[Tuple[float, float, float]]  # (zaman, ölçüm, pwm)
+
+    def summary(self) -> str:
+        settling = "oturmadı" if self.settling_time is None else f"{self.settling_time:.1f} s"
+        return (
+            f"başlangıç={self.initial:.1f} hedef={self.setpoint:.1f} son={self.final:.1f} "
+            f"aşım=%{self.overshoot:.1f} oturma={settling} kalıcı hata={self.steady_error:+.2f}"
+        )
+
+
+def simulate(
+    mode: str,
+    setpoint: float,
+    gains: Optional[PidGains] = None,
+    duration: float = 120.0,
+    dt: float = 0.5,
+    slew: float = 60.0,
+    feedforward: bool = False,
+    band: Optional[float] = None,
+    model: Optional["FanModel"] = None,
+    reference_tau: float = 0.0,
+) -> StepResponse:
+    """Tek fanlı bir modelde basamak yanıtını benzet (donanım ve süreç gerektirmez).
+
+    Model `fake_hwmon.FanModel` ile aynıdır: durma/kalkış eşikli, birinci
+    dereceden gecikmeli devir ve fanların hava akışıyla soğuyan çip.
+    `band`, oturma süresi için kabul edilen mutlak hatadır (varsayılan:
+    `temp` için 0.5 °C, `rpm` için 30 RPM).
+    """
+    from pathlib import Path
+
+    from fake_hwmon import FanModel
+
+    model = model or FanModel()
+    band = band if band is not None else (0.5 if mode == MODE_TEMP else 30.0)
+    fan = HwmonFan(id="sim_fan1", label="sim", rpm_path=Path("/sim/fan1_input"))
+    fan.pwm_path = Path("/sim/pwm1")
+    fan.rpm_slot = 0
+    calibration = None
+    if feedforward:
+        calibration = _model_calibration(model)
+        fan.min_pwm = calibration.min_pwm
+    target = ControlTarget(
+        name="sim",
+        fans=[fan],
+        mode=mode,
+        setpoint=setpoint,
+        sensors=[1],
+        gains=gains,
+        slew=slew,
+        calibration=calibration,
+        reference_tau=reference_tau,
+    )
+    bank = PidBank([target])
+
+    # Başlangıç: fan 128'de dengede.
+    pwm = 128.0
+    rpm = model.target_rpm(128, False)
+    airflow = rpm / model.max_rpm
+    temp = model.ambient + model.load * (1.0 - model.cooling * airflow)
+    snapshot = Snapshot(0.0, array("i", [int(rpm), int(temp * 1000)]))
+    initial = temp if mode == MODE_TEMP else rpm
+
+    trace: List[Tuple[float, float, float]] = []
+    substeps = 10
+    t = 0.0
+    while t < duration:
+        pwm = bank.step(snapshot, dt)[0]
+        written = int(round(pwm))
+        for _ in range(substeps):
+            h = dt / substeps
+            rpm += (model.target_rpm(written, rpm >= model.idle_rpm / 2) - rpm) * min(1.0, h / model.time_constant)
+            goal = model.ambient + model.load * (1.0 - model.cooling * rpm / model.max_rpm)
+            temp += (goal - temp) * min(1.0, h / model.thermal_time_constant)
+        t += dt
+        snapshot.values[0] = int(rpm)
+        snapshot.values[1] = int(temp * 1000)
+        snapshot.timestamp = t
+        trace.append((t, temp if mode == MODE_TEMP else rpm, float(written)))
+
+    values = [v for _t, v, _p in trace]
+    step = setpoint - initial
+    if step > 0:
+        overshoot = max(0.0, max(values) - setpoint)
+    else:
+        overshoot = max(0.0, setpoint - min(values))
+    settling: Optional[float] = 0.0
+    for time_, value, _p in trace:
+        if abs(value - setpoint) > band:
+            settling = None
+        elif settling is None:
+            settling = time_
+    final = values[-1]
+    return StepResponse(
+        setpoint=setpoint,
+        initial=initial,
+        final=final,
+        overshoot=100.0 * overshoot / abs(step) if step else 0.0,
+        settling_time=settling,
+        steady_error=final - setpoint,
+        trace=trace,
+    )
+
+
+def _model_calibration(model: "FanModel") -> FanCalibration:
+    """Modelin gerçek PWM → RPM eğrisinden kalibrasyon kaydı üret."""
+    points = [(p, int(model.target_rpm(p, True))) for p in range(PWM_MIN, PWM_MAX + 1, 8)]
+    points.append((PWM_MAX, int(model.target_rpm(PWM_MAX, True))))
+    max_rpm = max(r for _p, r in points)
+    return FanCalibration(
+        fan_id="sim_fan1",
+        points=points,
+        min_stop=model.stop_pwm,
+        min_start=model.start_pwm,
+        max_pwm=min(PWM_MAX, model.saturation_pwm),
+        max_rpm=max_rpm,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="PID denetleyici benzetimi")
+    parser.add_argument("--mode", choices=(MODE_TEMP, MODE_RPM), default=MODE_TEMP)
+    parser.add_argument("--setpoint", type=float, default=None)
+    parser.add_argument("--kp", type=float, default=None)
+    parser.add_argument("--ki", type=float, default=None)
+    parser.add_argument("--kd", type=float, default=None)
+    parser.add_argument("--slew", type=float, default=60.0, help="PWM/s")
+    parser.add_argument("--duration", type=float, default=120.0)
+    parser.add_argument("--dt", type=float, default=0.5)
+    parser.add_argument("--feedforward", action="store_true", help="Kalibrasyon eğrisinden ileri besleme")
+    parser.add_argument(
+        "--reference-tau", type=float, default=0.0, help="Hedef referansının zaman sabiti (s)"
+    )
+    parser.add_argument("--trace", action="store_true", help="Her adımı yazdır")
+    args = parser.parse_args(argv)
+
+    defaults = DEFAULT_GAINS[args.mode]
+    gains = PidGains(
+        kp=defaults.kp if args.kp is None else args.kp,
+        ki=defaults.ki if args.ki is None else args.ki,
+        kd=defaults.kd if args.kd is None else args.kd,
+    )
+    setpoint = args.setpoint
+    if setpoint is None:
+        setpoint = 55.0 if args.mode == MODE_TEMP else 1500.0
+    result = simulate(
+        args.mode,
+        setpoint,
+        gains,
+        duration=args.duration,
+        dt=args.dt,
+        slew=args.slew,
+        feedforward=args.feedforward,
+        reference_tau=args.reference_tau,
+    )
+    if args.trace:
+        for t, value, pwm in result.trace:
+            print(f"{t:7.1f}  {value:8.1f}  pwm={pwm:.0f}")
+    print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
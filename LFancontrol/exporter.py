@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Sensör değerlerini Prometheus metin biçiminde sunan dışa aktarıcı (Qt içermez).
+
+Kullanım:
+
+    python exporter.py --listen 127.0.0.1:9779 --interval 1.0
+
+Okumalar yalnızca örnekleyici iş parçacığında, `--interval` aralığıyla
+yapılır. Her turda `/metrics` yanıtının gövdesi bir kez üretilir ve
+saklanır; istekler bu hazır baytları döndürür. Böylece kaç tane toplayıcı
+ve ne sıklıkla bağlanırsa bağlansın sysfs'e ek okuma yapılmaz. Etiketler
+(sensör kimliği, çip, ad) tarama sırasında bir kez hesaplanır.
+
+Canlı bir yayıncı varsa (`snapshot_bus.py`) değerler sysfs yerine paylaşılan
+bellekten alınır; `--no-bus` bunu kapatır.
+"""
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from backend import MISSING, HwmonFan, HwmonScanner, Sensor, Snapshot
+from hotplug import HotplugMonitor
+from sampler import Sampler, SamplerStats
+from snapshot_bus import BusMonitor, BusScanner, open_bus
+
+DEFAULT_LISTEN = "127.0.0.1:9779"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sensör türü → (metrik adı, açıklama, ölçek)
+_FAMILIES: Dict[str, Tuple[str, str, float]] = {
+    "fan": ("lfancontrol_fan_rpm", "Fan devri (RPM).", 1.0),
+    "pwm": ("lfancontrol_pwm", "PWM görev döngüsü (0-255).", 1.0),
+    "temp": ("lfancontrol_temperature_celsius", "Sıcaklık (°C).", 1000.0),
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(sensor: Sensor) -> str:
+    return (
+        f'{{sensor="{_escape(sensor.id)}",chip="{_escape(sensor.chip)}",'
+        f'label="{_escape(sensor.label)}"}}'
+    )
+
+
+def _help(name: str, text: str, kind: str) -> str:
+    return f"# HELP {name} {text}\n# TYPE {name} {kind}\n"
+
+
+class MetricsRenderer:
+    """Anlık görüntüyü Prometheus metin gövdesine çevirir.
+
+    Sensör başına satır önekleri (`ad{etiketler} `) kurulurken bir kez
+    hesaplanır; `render()` yalnızca değerleri ekler. Okunamayan sensörler
+    için değer satırı yazılmaz, okuma hata sayacı artırılır. Sayaçlar
+    yeniden taramadan sonra sensör kimliğine göre korunur.
+    """
+
+    def __init__(self, sensors: List[Sensor], errors: Optional[Dict[str, int]] = None) -> None:
+        self.sensors = sensors
+        previous = errors or {}
+        self.errors = [previous.get(sensor.id, 0) for sensor in sensors]
+        self._error_prefixes = [
+            f'lfancontrol_sensor_read_errors_total{{sensor="{_escape(sensor.id)}"}} '
+            for sensor in sensors
+        ]
+        # (başlık, [(sıra, önek, ölçek), ...]) — aile başına bir grup
+        self._families: List[Tuple[str, List[Tuple[int, str, float]]]] = []
+        for kind, (name, text, scale) in _FAMILIES.items():
+            rows = [
+                (slot, f"{name}{_labels(sensor)} ", scale)
+                for slot, sensor in enumerate(sensors)
+                if sensor.kind == kind
+            ]
+            if rows:
+                self._families.append((_help(name, text, "gauge"), rows))
+
+    def error_counts(self) -> Dict[str, int]:
+        return {sensor.id: count for sensor, count in zip(self.sensors, self.errors)}
+
+    def render(self, snapshot: Snapshot, stats: SamplerStats) -> bytes:
+        values = snapshot.values
+        errors = self.errors
+        parts: List[str] = []
+        for header, rows in self._families:
+            parts.append(header)
+            for slot, prefix, scale in rows:
+                value = values[slot] if slot < len(values) else MISSING
+                if value == MISSING:
+                    errors[slot] += 1
+                    continue
+                if scale == 1.0:
+                    parts.append(f"{prefix}{value}\n")
+                else:
+                    parts.append(f"{prefix}{value / scale:g}\n")
+
+        parts.append(
+            _help(
+                "lfancontrol_sensor_read_errors_total",
+                "Sensörün okunamadığı tur sayısı.",
+                "counter",
+            )
+        )
+        for prefix, count in zip(self._error_prefixes, errors):
+            parts.append(f"{prefix}{count}\n")
+
+        parts.append(
+            _help("lfancontrol_sample_timestamp_seconds", "Son örneğin Unix zamanı.", "gauge")
+            + f"lfancontrol_sample_timestamp_seconds {snapshot.timestamp:.3f}\n"
+            + _help("lfancontrol_sampler_ticks_total", "Örnekleme turu sayısı.", "counter")
+            + f"lfancontrol_sampler_ticks_total {stats.ticks}\n"
+            + _help(
+                "lfancontrol_sampler_lateness_seconds",
+                "Turun planlanan zamandan gecikmesi (önceki turlar).",
+                "summary",
+            )
+            + f"lfancontrol_sampler_lateness_seconds_sum {stats.lateness_sum:.6f}\n"
+            + f"lfancontrol_sampler_lateness_seconds_count {stats.ticks}\n"
+            + _help(
+                "lfancontrol_sampler_duration_seconds",
+                "Bir örnekleme turunun süresi (önceki turlar).",
+                "summary",
+            )
+            + f"lfancontrol_sampler_duration_seconds_sum {stats.duration_sum:.6f}\n"
+            + f"lfancontrol_sampler_duration_seconds_count {stats.ticks}\n"
+            + _help(
+                "lfancontrol_sampler_duration_max_seconds",
+                "En uzun örnekleme turu.",
+                "gauge",
+            )
+            + f"lfancontrol_sampler_duration_max_seconds {stats.duration_max:.6f}\n"
+            + _help(
+                "lfancontrol_sampler_lateness_max_seconds",
+                "En büyük tur gecikmesi.",
+                "gauge",
+            )
+            + f"lfancontrol_sampler_lateness_max_seconds {stats.lateness_max:.6f}\n"
+        )
+        return "".join(parts).encode("utf-8")
+
+
+class MetricsExporter:
+    """Örnekleyiciyi ve `/metrics` sunan HTTP sunucusunu bir araya getirir."""
+
+    def __init__(
+        self,
+        scanner: Union[HwmonScanner, BusScanner],
+        interval: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 9779,
+        hotplug: Optional[Union[HotplugMonitor, BusMonitor]] = None,
+    ) -> None:
+        self.scanner = scanner
+        scanner.scan()
+        self._renderer = MetricsRenderer(scanner.sensors)
+        # İstekler yalnızca bu referansı okur; örnekleyici her turda değiştirir.
+        self.body = b""
+        self.sampler = Sampler(
+            scanner,
+            interval,
+            on_snapshot=self._on_snapshot,
+            hotplug=hotplug,
+            on_rescan=self._on_rescan,
+        )
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    def _on_rescan(self, _fans: List[HwmonFan]) -> None:
+        # Örnekleyici iş parçacığında çalışır; etiketleri yeni sensör listesine göre kur.
+        self._renderer = MetricsRenderer(self.scanner.sensors, self._renderer.error_counts())
+
+    def _on_snapshot(self, snapshot: Snapshot) -> None:
+        self.body = self._renderer.render(snapshot, self.sampler.stats)
+
+    def _handler_class(self) -> type:
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.body
+                if not body:
+                    # Durum satırı latin-1 olmalı; açıklama gövdeye yazılır.
+                    self.send_error(503, None, "İlk örnek henüz alınmadı")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        return Handler
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def serve_forever(self) -> None:
+        self.sampler.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.sampler.stop()
+            self.server.server_close()
+
+    def shutdown(self) -> None:
+        """Başka bir iş parçacığından (ör. sinyal işleyicisi) çağrılabilir."""
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+def _parse_listen(text: str) -> Tuple[str, int]:
+    host, sep, port = text.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Geçersiz adres: {text} (beklenen: host:port)")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Prometheus dışa aktarıcısı")
+    parser.add_argument("--listen", default=DEFAULT_LISTEN, help="host:port")
+    parser.add_argument("--interval", type=float, default=1.0, help="Örnekleme aralığı (s)")
+    parser.add_argument("--root", type=Path, default=None, help="hwmon kökü (test için)")
+    parser.add_argument(
+        "--no-bus", action="store_true", help="Yayıncı olsa da sensörleri doğrudan oku"
+    )
+    args = parser.parse_args(argv)
+    try:
+        host, port = _parse_listen(args.listen)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    scanner = None if args.root or args.no_bus else open_bus()
+    if scanner is not None:
+        print(f"Değerler {scanner.path} veri yolundan okunuyor", flush=True)
+        hotplug = scanner.monitor()
+    else:
+        scanner = HwmonScanner(args.root) if args.root else HwmonScanner()
+        hotplug = HotplugMonitor(args.root) if args.root else HotplugMonitor()
+    try:
+        exporter = MetricsExporter(scanner, args.interval, host, port, hotplug)
+    except OSError as exc:
+        print(f"{args.listen} dinlenemedi: {exc}", file=sys.stderr)
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, lambda *_: exporter.shutdown())
+    signal.signal(signal.SIGINT, lambda *_: exporter.shutdown())
+    print(f"http://{host}:{exporter.address[1]}/metrics adresinde sunuluyor", flush=True)
+    try:
+        exporter.serve_forever()
+    finally:
+        hotplug.close()
+
+
+if __name__ == "__main__":
+    main()
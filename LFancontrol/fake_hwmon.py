@@ -0,0 +1,183 @@
+"""Gerçek donanım olmadan deneme yapmak için sahte `/sys/class/hwmon` ağacı.
+
+`build_fake_hwmon()` dosyaları bir kez yazar; değerler sabit kalır.
+`FanPhysics` ise ayrı bir süreçte çalışıp `pwmN` değerlerine göre
+`fanN_input` ve `tempN_input` dosyalarını günceller, böylece yazma yolu ve
+denetim döngüsü gerçeğe yakın tepkilerle denenebilir.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+def _write(path: Path, value: object) -> None:
+    path.write_text(f"{value}\n", encoding="utf-8")
+
+
+def build_fake_hwmon(
+    root: Path, chips: int = 2, fans: int = 4, temps: int = 2, alarms: bool = False
+) -> Path:
+    """`root` altında `chips` adet hwmonN dizini ve her birinde `fans` fan oluştur.
+
+    Her fan için `fanN_input`, `pwmN` ve `pwmN_enable`, her sıcaklık için
+    `tempN_input`, `tempN_label` ve `tempN_crit` dosyaları yazılır. `alarms`
+    True ise `fanN_alarm` ve `tempN_crit_alarm` dosyaları da (0) eklenir.
+    Oluşturulan kök dizini döndürür (HwmonScanner'a verilebilir).
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    for chip in range(chips):
+        hwmon_dir = root / f"hwmon{chip}"
+        hwmon_dir.mkdir(exist_ok=True)
+        _write(hwmon_dir / "name", f"fakechip{chip}")
+        for index in range(1, fans + 1):
+            _write(hwmon_dir / f"fan{index}_input", 1000 + 100 * index)
+            _write(hwmon_dir / f"pwm{index}", 128)
+            _write(hwmon_dir / f"pwm{index}_enable", 2)
+            if alarms:
+                _write(hwmon_dir / f"fan{index}_alarm", 0)
+        for index in range(1, temps + 1):
+            _write(hwmon_dir / f"temp{index}_input", 40000 + 1000 * index)
+            _write(hwmon_dir / f"temp{index}_label", f"Core {index - 1}")
+            _write(hwmon_dir / f"temp{index}_crit", 100000)
+            if alarms:
+                _write(hwmon_dir / f"temp{index}_crit_alarm", 0)
+    return root
+
+
+@dataclass
+class FanModel:
+    """Sahte fanların ve çip sıcaklığının basit birinci dereceden modeli."""
+
+    max_rpm: int = 2400
+    idle_rpm: int = 400  # kalkış noktasındaki devir
+    stop_pwm: int = 60  # dönen fan bu değerin altında durur
+    start_pwm: int = 90  # duran fan bu değerde kalkar
+    saturation_pwm: int = 220  # bu değerin üstünde devir artmaz
+    time_constant: float = 0.8  # devrin hedefe yaklaşma süresi (s)
+    noise_rpm: int = 10
+    ambient: float = 30.0  # °C
+    load: float = 45.0  # fanlar dururken ortam üstüne eklenen ısı (°C)
+    cooling: float = 0.7  # tam devirde ısının giderilen oranı
+    thermal_time_constant: float = 8.0  # sıcaklığın hedefe yaklaşma süresi (s)
+
+    def target_rpm(self, pwm: int, spinning: bool) -> float:
+        threshold = self.stop_pwm if spinning else self.start_pwm
+        if pwm < threshold:
+            return 0.0
+        pwm = min(pwm, self.saturation_pwm)
+        span = max(1, self.saturation_pwm - self.stop_pwm)
+        return self.idle_rpm + (self.max_rpm - self.idle_rpm) * (pwm - self.stop_pwm) / span
+
+
+class _FixedWidthFile:
+    """Değeri sabit genişlikte `pwrite` ile yazar; okuyucu hiçbir zaman boş dosya görmez."""
+
+    WIDTH = 8
+
+    def __init__(self, path: Path) -> None:
+        self.fd = os.open(path, os.O_RDWR | os.O_CLOEXEC)
+        os.ftruncate(self.fd, 0)
+        self.write(0)
+
+    def write(self, value: int) -> None:
+        os.pwrite(self.fd, f"{value:>{self.WIDTH - 1}}\n".encode("ascii"), 0)
+
+
+def _read_pwm(path: Path, last: int) -> int:
+    try:
+        return int(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # Uygulama o anda dosyayı yeniden yazıyor olabilir.
+        return last
+
+
+def _simulate(root: str, model: FanModel, period: float, stop: "multiprocessing.synchronize.Event") -> None:
+    """`FanPhysics` sürecinin gövdesi."""
+    rng = random.Random(0)
+    chips: List[Tuple[List[Tuple[Path, _FixedWidthFile]], List[_FixedWidthFile]]] = []
+    for hwmon_dir in sorted(Path(root).iterdir()):
+        fans = [
+            (hwmon_dir / f"pwm{p.name[3:-6]}", _FixedWidthFile(p))
+            for p in sorted(hwmon_dir.glob("fan*_input"))
+        ]
+        temps = [_FixedWidthFile(p) for p in sorted(hwmon_dir.glob("temp*_input"))]
+        chips.append(([(pwm, out) for pwm, out in fans if pwm.exists()], temps))
+
+    rpm: Dict[Path, float] = {}
+    pwm_values: Dict[Path, int] = {}
+    temp: Dict[int, float] = {}
+    last = time.monotonic()
+    while not stop.wait(period):
+        now = time.monotonic()
+        dt = now - last
+        last = now
+        alpha = min(1.0, dt / model.time_constant)
+        beta = min(1.0, dt / model.thermal_time_constant)
+        for chip_index, (fans, temps) in enumerate(chips):
+            airflow = 0.0
+            for pwm_path, out in fans:
+                pwm = pwm_values[pwm_path] = _read_pwm(pwm_path, pwm_values.get(pwm_path, 128))
+                current = rpm.get(pwm_path, 0.0)
+                current += (model.target_rpm(pwm, current >= model.idle_rpm / 2) - current) * alpha
+                if current < 1.0:
+                    current = 0.0
+                rpm[pwm_path] = current
+                airflow += current / model.max_rpm
+                noise = rng.randint(-model.noise_rpm, model.noise_rpm) if current else 0
+                out.write(max(0, int(current) + noise))
+            if fans:
+                airflow /= len(fans)
+            goal = model.ambient + model.load * (1.0 - model.cooling * airflow)
+            value = temp.get(chip_index, goal)
+            value += (goal - value) * beta
+            temp[chip_index] = value
+            for offset, out in enumerate(temps):
+                out.write(int((value + offset) * 1000))
+
+
+class FanPhysics:
+    """Sahte ağaçtaki fanları arka plandaki bir süreçte canlandırır.
+
+    `with FanPhysics(root):` bloğu boyunca `pwmN` dosyasına yazılan değer
+    `fanN_input` devrini (durma/kalkış eşikleri ve gecikmeyle), fanların
+    ortalama devri de çipin sıcaklıklarını değiştirir. Süreç ayrı olduğu için
+    ölçülen kodun GIL'ini paylaşmaz.
+    """
+
+    def __init__(self, root: Path, model: Optional[FanModel] = None, period: float = 0.02) -> None:
+        self.root = root
+        self.model = model or FanModel()
+        self.period = period
+        self._stop = multiprocessing.Event()
+        self._process: Optional[multiprocessing.Process] = None
+
+    def start(self) -> None:
+        if self._process is not None:
+            return
+        self._process = multiprocessing.Process(
+            target=_simulate,
+            args=(str(self.root), self.model, self.period, self._stop),
+            name="fake-hwmon-physics",
+            daemon=True,
+        )
+        self._process.start()
+
+    def stop(self) -> None:
+        if self._process is None:
+            return
+        self._stop.set()
+        self._process.join(5.0)
+        self._process = None
+
+    def __enter__(self) -> "FanPhysics":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
@@ -0,0 +1,304 @@
+"""Sıcaklık → PWM eğrileri ve derlenmiş arama tabloları (Qt içermez)."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend import MISSING
+
+
+@dataclass
+class FanCurve:
+    """Parçalı doğrusal sıcaklık (°C) → PWM eğrisi, histerezisli.
+
+    Sıcaklık yükselirken eğri hemen izlenir; düşerken PWM ancak sıcaklık son
+    referansın `hysteresis` derece altına indiğinde azaltılır. Böylece eşik
+    çevresinde dolaşan sıcaklık fanı sürekli hızlandırıp yavaşlatmaz.
+    """
+
+    points: List[Tuple[float, int]]
+    hysteresis: float = 2.0
+    _temps: List[float] = field(init=False, repr=False)
+    _pwms: List[int] = field(init=False, repr=False)
+    _reference: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if not self.points:
+            raise ValueError("Eğri en az bir nokta içermeli.")
+        ordered = sorted((float(t), int(p)) for t, p in self.points)
+        self.points = ordered
+        self._temps = [t for t, _ in ordered]
+        self._pwms = [p for _, p in ordered]
+
+    def pwm_at(self, temp: float) -> int:
+        """Histerezis uygulamadan eğrinin `temp` noktasındaki değeri."""
+        temps = self._temps
+        pwms = self._pwms
+        if temp <= temps[0]:
+            return pwms[0]
+        if temp >= temps[-1]:
+            return pwms[-1]
+        i = bisect_right(temps, temp)
+        t0, t1 = temps[i - 1], temps[i]
+        p0, p1 = pwms[i - 1], pwms[i]
+        return int(round(p0 + (p1 - p0) * (temp - t0) / (t1 - t0)))
+
+    def evaluate(self, temp: float) -> int:
+        """Histerezisli değerlendirme; her turda bir kez çağrılmalı."""
+        ref = self._reference
+        if ref is None or temp > ref or temp <= ref - self.hysteresis:
+            self._reference = ref = temp
+        return self.pwm_at(ref)
+
+    def reset(self) -> None:
+        self._reference = None
+
+
+def mix_max(temps: Sequence[Optional[float]]) -> Optional[float]:
+    """Okunabilen sıcaklıkların en yükseğini döndür (hiçbiri yoksa None)."""
+    best: Optional[float] = None
+    for temp in temps:
+        if temp is not None and (best is None or temp > best):
+            best = temp
+    return best
+
+
+def mix_average(temps: Sequence[Optional[float]]) -> Optional[float]:
+    """Okunabilen sıcaklıkların ortalaması (hiçbiri yoksa None)."""
+    values = [temp for temp in temps if temp is not None]
+    return sum(values) / len(values) if values else None
+
+
+def mix_weighted(temps: Sequence[Optional[float]], weights: Sequence[float]) -> Optional[float]:
+    """Okunabilen sıcaklıkların ağırlıklı ortalaması; okunamayanın ağırlığı dağıtılır."""
+    total = weight_sum = 0.0
+    for temp, weight in zip(temps, weights):
+        if temp is not None:
+            total += temp * weight
+            weight_sum += weight
+    return total / weight_sum if weight_sum > 0 else None
+
+
+MIX_MAX = "max"
+MIX_AVERAGE = "average"
+MIX_WEIGHTED = "weighted"
+_MIX_CODES = {MIX_MAX: 0, MIX_AVERAGE: 1, MIX_WEIGHTED: 2}
+
+# Tablo kovasının genişliği (m°C). hwmon sürücüleri sıcaklığı genellikle 1, 0.5,
+# 0.25 veya 0.125 °C adımlarla bildirir; bu değerler kova sınırına denk gelir.
+TABLE_STEP = 125
+# Tablo başına en fazla kova sayısı (~1000 °C'lik aralık); bozuk yapılandırmaya karşı.
+_MAX_BUCKETS = 1 << 13
+
+
+def mix_temps(
+    kind: str, temps: Sequence[Optional[float]], weights: Optional[Sequence[float]] = None
+) -> Optional[float]:
+    """`kind` karıştırma işleviyle sıcaklıkları tek değere indir."""
+    if kind == MIX_MAX:
+        return mix_max(temps)
+    if kind == MIX_AVERAGE:
+        return mix_average(temps)
+    if kind == MIX_WEIGHTED:
+        return mix_weighted(temps, weights or [1.0] * len(temps))
+    raise ValueError(f"Bilinmeyen karıştırma işlevi: {kind}")
+
+
+class CurveTable:
+    """Eğrilerin tamsayı milidereceli kovalara göre önceden hesaplanmış PWM tabloları.
+
+    Derleme sırasında her eğri, tüm eğrilerin ortak sıcaklık aralığında
+    `step` m°C aralıklı kovalarda bir kez değerlendirilir; tablolar tek bir
+    düz dizide uç uca durur, aynı noktalı eğriler tabloyu paylaşır. Eğriler
+    karıştırma işlevi ve girdi sayısına göre gruplanır. Tur toplu yapılır:
+    girdiler sütun sütun tek çağrıyla okunur; karıştırma, histerezis ve
+    tablo okuması tüm eğriler üzerinde birer geçiştir, ondalık ara değer
+    hesabı ve ikili arama yoktur. Eğri başına ayrı iş yalnızca okunamayan
+    girdisi olan eğriler için yapılır. Kova sınırına denk gelmeyen ölçümler
+    alt sınırın değerini alır (en fazla bir kovalık fark).
+
+    `inputs[i]`, eğri i'nin `evaluate()`'e verilen değer dizisindeki
+    girdilerinin sıralarıdır; değerler ham milidereceler, okunamayanlar
+    `MISSING`'dir.
+    """
+
+    def __init__(
+        self,
+        curves: Sequence[FanCurve],
+        inputs: Sequence[Sequence[int]],
+        mixes: Optional[Sequence[str]] = None,
+        weights: Optional[Sequence[Optional[Sequence[float]]]] = None,
+        step: int = TABLE_STEP,
+    ) -> None:
+        count = len(curves)
+        mixes = list(mixes) if mixes is not None else [MIX_MAX] * count
+        weights = list(weights) if weights is not None else [None] * count
+        if len(inputs) != count or len(mixes) != count or len(weights) != count:
+            raise ValueError("Her eğri için girdi, karıştırma ve ağırlık verilmeli.")
+        for slots, kind, weight in zip(inputs, mixes, weights):
+            if kind not in _MIX_CODES:
+                raise ValueError(f"Bilinmeyen karıştırma işlevi: {kind}")
+            if not slots:
+                raise ValueError("Her eğrinin en az bir girdisi olmalı.")
+            if kind == MIX_WEIGHTED and (weight is None or len(weight) != len(slots)):
+                raise ValueError("Ağırlıklı karıştırmada her girdi için bir ağırlık verilmeli.")
+        self.count = count
+        self.step = step
+
+        # İç sıra: aynı karıştırma ve girdi sayısındaki eğriler art arda durur.
+        def group_key(i: int) -> Tuple[int, int]:
+            return _MIX_CODES[mixes[i]], len(inputs[i])
+
+        order = sorted(range(count), key=group_key)
+        self._position = [0] * count  # eğri → iç sıra
+        for position, i in enumerate(order):
+            self._position[i] = position
+        # Gruplar: (karıştırma, sütun okuyucuları, ağırlık sütunları, ağırlık toplamları)
+        self._groups: List[Tuple[int, List[Callable], List[List[float]], List[float]]] = []
+        for (code, width), members in groupby(order, group_key):
+            members = list(members)
+            if code == _MIX_CODES[MIX_WEIGHTED]:
+                rows = [[float(w) for w in weights[i]] for i in members]
+            else:
+                rows = [[1] * width for _ in members]
+            columns = [_column_reader([inputs[i][j] for i in members]) for j in range(width)]
+            weight_columns = [[row[j] for row in rows] for j in range(width)]
+            self._groups.append((code, columns, weight_columns, [sum(row) for row in rows]))
+
+        # Tüm tablolar eğrilerin ortak aralığını kapsar. Eğriler kendi uçlarının
+        # dışında sabit olduğundan sıcaklığı bu aralığa sıkıştırmak sonucu değiştirmez;
+        # böylece tabloya eğri başına sınır denetimi yapmadan girilir.
+        low = int(min(curve.points[0][0] for curve in curves) * 1000 // step) * step if count else 0
+        high = max((curve.points[-1][0] * 1000 for curve in curves), default=0)
+        buckets = int(-(-(high - low) // step)) + 1
+        if buckets > _MAX_BUCKETS:
+            raise ValueError(f"Eğri aralığı çok geniş: {low / 1000}–{high / 1000} °C")
+        self._low = low
+        self._high = low + (buckets - 1) * step
+        self.table = array("H")
+        # Tablo sırası = (başvuru + kayma) // step; kayma = tablo başı * step - low
+        self._shift: List[int] = []
+        self._hysteresis: List[int] = []
+        # Aynı noktalı eğriler aynı tabloyu paylaşır.
+        offsets: Dict[Tuple[Tuple[float, int], ...], int] = {}
+        for i in order:
+            curve = curves[i]
+            key = tuple(curve.points)
+            if key not in offsets:
+                offsets[key] = len(self.table)
+                self.table.extend(_sample(curve, low, step, buckets))
+            self._shift.append(offsets[key] * step - low)
+            self._hysteresis.append(int(round(curve.hysteresis * 1000)))
+        # Histerezis başvuruları (iç sırada, m°C); MISSING: henüz ölçüm yok
+        self._reference = [MISSING] * count
+        # Son turun PWM'leri (eğri sırasında); -1: girdilerin hiçbiri okunamadı
+        self.output: List[int] = [-1] * count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def reset(self) -> None:
+        self._reference = [MISSING] * self.count
+
+    def reference(self, i: int) -> int:
+        """Eğri i'nin histerezis başvurusu (m°C; yoksa `MISSING`)."""
+        return self._reference[self._position[i]]
+
+    def set_reference(self, i: int, value: int) -> None:
+        self._reference[self._position[i]] = value
+
+    def _mix(self, values: Sequence[int]) -> List[int]:
+        """Her eğrinin karıştırılmış sıcaklığı (iç sırada)."""
+        temps: List[int] = []
+        for code, columns, weight_columns, sums in self._groups:
+            read = [column(values) for column in columns]
+            if code == 0:
+                # MISSING en küçük tamsayı; okunan her değer ondan büyüktür.
+                best = read[0]
+                for column in read[1:]:
+                    best = [a if a > b else b for a, b in zip(best, column)]
+                temps.extend(best)
+            else:
+                if code == 1:
+                    total = read[0]
+                    for column in read[1:]:
+                        total = [t + v for t, v in zip(total, column)]
+                    mixed = [t // n for t, n in zip(total, sums)]
+                else:
+                    total = [v * w for v, w in zip(read[0], weight_columns[0])]
+                    for column, weight_column in zip(read[1:], weight_columns[1:]):
+                        total = [t + v * w for t, v, w in zip(total, column, weight_column)]
+                    mixed = [int(t // n) for t, n in zip(total, sums)]
+                if any(MISSING in column for column in read):
+                    # Okunamayan girdinin ağırlığı diğerlerine dağıtılır.
+                    for k in {k for column in read for k, v in enumerate(column) if v == MISSING}:
+                        pairs = [
+                            (column[k], weight_column[k])
+                            for column, weight_column in zip(read, weight_columns)
+                            if column[k] != MISSING
+                        ]
+                        weight_sum = sum(w for _v, w in pairs)
+                        if weight_sum > 0:
+                            mixed[k] = int(sum(v * w for v, w in pairs) // weight_sum)
+                        else:
+                            mixed[k] = MISSING
+                temps.extend(mixed)
+        return temps
+
+    def evaluate(self, values: Sequence[int]) -> List[int]:
+        """Tüm eğrileri toplu değerlendir; eğri sırasındaki `output` listesini döndür."""
+        temps = self._mix(values)
+        previous = self._reference
+        # Histerezis: başvuru - histerezis < sıcaklık <= başvuru ise başvuru korunur.
+        reference = [
+            ref if 0 <= ref - temp < hold else temp
+            for temp, ref, hold in zip(temps, previous, self._hysteresis)
+        ]
+        keys = reference
+        low, high = self._low, self._high
+        if reference and (min(reference) < low or max(reference) > high):
+            keys = [low if r < low else high if r > high else r for r in reference]
+        table, step = self.table, self.step
+        pwms = [table[(key + shift) // step] for key, shift in zip(keys, self._shift)]
+        if MISSING in temps:
+            for position, temp in enumerate(temps):
+                if temp == MISSING:
+                    reference[position] = previous[position]
+                    pwms[position] = -1
+        self._reference = reference
+        self.output = list(map(pwms.__getitem__, self._position))
+        return self.output
+
+
+def _column_reader(slots: List[int]) -> Callable[[Sequence[int]], Sequence[int]]:
+    """Değer dizisinden `slots` sıralarını tek çağrıda okuyan işlev."""
+    if len(slots) == 1:
+        slot = slots[0]
+        return lambda values: (values[slot],)
+    return itemgetter(*slots)
+
+
+def _sample(curve: FanCurve, base: int, step: int, buckets: int) -> List[int]:
+    """`curve.pwm_at` değerlerini `base`'den başlayan `buckets` kova için tek geçişte hesapla."""
+    temps = [t for t, _ in curve.points]
+    pwms = [p for _, p in curve.points]
+    values = []
+    j = 0
+    for n in range(buckets):
+        temp = (base + n * step) / 1000.0
+        if temp <= temps[0]:
+            values.append(pwms[0])
+            continue
+        if temp >= temps[-1]:
+            values.append(pwms[-1])
+            continue
+        while temps[j + 1] <= temp:
+            j += 1
+        t0, t1 = temps[j], temps[j + 1]
+        p0, p1 = pwms[j], pwms[j + 1]
+        values.append(int(round(p0 + (p1 - p0) * (temp - t0) / (t1 - t0))))
+    return values
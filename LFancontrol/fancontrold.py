@@ -0,0 +1,879 @@
+#!/usr/bin/env python3
+"""Qt gerektirmeyen, sabit hızlı fan eğrisi ve hedef denetim servisi.
+
+Yapılandırmadaki eğrileri (`fans`) ve PID/öngörülü hedefleri (`targets`)
+her turda tek bir anlık görüntü üzerinden uygular; kapanırken denetlediği
+fanları otomatik moda bırakır. Yapılandırma biçimi ve anahtarları README'nin
+"Arayüzsüz Servis" bölümünde anlatılmıştır.
+
+Kullanım:
+
+    python fancontrold.py --config /etc/lfancontrol/fancontrold.json
+    python fancontrold.py --config yeni.json --replay ~/iz.lft
+
+SIGHUP `fans` eğrilerini yeniden yükler; SIGUSR1 okuma/yazma gecikmesi
+kaydını açıp kapatır.
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, Dict, List, Optional, Set, Tuple, Union
+
+from alarms import AlarmEvent, AlarmWatcher
+from backend import MISSING, SENSOR_READER, HwmonFan, HwmonScanner, Sensor, SensorIndex, Snapshot
+from calibration import FanCalibration, apply_calibration, load_calibrations
+from controller import MODE_RPM, MODE_TEMP, ControlTarget, PidBank, PidGains
+from faults import ACTION_AUTO, ACTION_FULL, FailSafe, FaultDetector, FaultEvent, FaultSettings
+from fan_curve import MIX_AVERAGE, MIX_MAX, MIX_WEIGHTED, CurveTable, FanCurve
+from latency import LATENCY, format_rows
+from predictive import (
+    ModelSettings,
+    ThermalModelBank,
+    default_models_path,
+    load_models,
+    save_models,
+)
+from sample_scheduler import SampleScheduler, ScheduleSettings
+from sensor_trace import ReplayScanner, TraceReader, TraceWriter
+from snapshot_bus import SnapshotPublisher
+from write_scheduler import PwmWriteScheduler
+
+DEFAULT_CONFIG = Path("/etc/lfancontrol/fancontrold.json")
+
+
+@dataclass
+class CurveBinding:
+    """Bir fanı, ona bağlı sıcaklık sensörleri ve eğrisiyle birlikte tutar."""
+
+    fan: HwmonFan
+    curve: FanCurve
+    sensors: List[Path]
+    failing: bool = False
+    mix: str = MIX_MAX
+    weights: Optional[List[float]] = None
+
+
+class CompiledCurves:
+    """Eğri bağlarının `CurveTable` ile derlenmiş hâli.
+
+    Bağların sensör yolları tekilleştirilip ortak bir girdi dizisine
+    yerleştirilir. Tarayıcının dizinindeki yollar turun anlık görüntüsünden
+    kopyalanır; dizinde olmayanlar (ör. dosya yoluyla verilenler) ve anlık
+    görüntü yokken hepsi doğrudan okunur.
+    """
+
+    def __init__(self, bindings: List[CurveBinding], index: Optional[SensorIndex] = None) -> None:
+        positions: Dict[str, int] = {}
+        inputs = [
+            [positions.setdefault(os.fspath(path), len(positions)) for path in binding.sensors]
+            for binding in bindings
+        ]
+        slot_of = {} if index is None else {path: slot for slot, path in enumerate(index.paths)}
+        self.bindings = bindings
+        self.paths = list(positions)
+        # Her girdinin anlık görüntüdeki sırası; -1: doğrudan okunur
+        self.slots = array("l", [slot_of.get(path, -1) for path in self.paths])
+        self.values = array("l", [MISSING]) * len(self.paths)
+        self.table = CurveTable(
+            [binding.curve for binding in bindings],
+            inputs,
+            [binding.mix for binding in bindings],
+            [binding.weights for binding in bindings],
+        )
+
+    def adopt(self, previous: "CompiledCurves") -> None:
+        """Yeniden yüklemede aynı fanların histerezis başvurularını devral."""
+        old = {
+            binding.fan.id: previous.table.reference(i)
+            for i, binding in enumerate(previous.bindings)
+        }
+        for i, binding in enumerate(self.bindings):
+            if binding.fan.id in old:
+                self.table.set_reference(i, old[binding.fan.id])
+
+    def evaluate(self, snapshot: Optional[Snapshot]) -> List[int]:
+        """Girdileri topla ve tüm eğrileri değerlendir; -1, sıcaklık okunamadı demektir."""
+        values, slots, paths = self.values, self.slots, self.paths
+        current = None if snapshot is None else snapshot.values
+        for k in range(len(paths)):
+            slot = slots[k]
+            if current is not None and slot >= 0:
+                values[k] = current[slot]
+                continue
+            try:
+                value = SENSOR_READER.read_int(paths[k])
+            except OSError:
+                value = None
+            values[k] = MISSING if value is None else value
+        return self.table.evaluate(values)
+
+
+class ConfigReloader:
+    """Yapılandırma dosyası değişince eğrileri arka planda yeniden derler.
+
+    `poll()` denetim döngüsünde her turda çağrılır ve hiç beklemez: dosyanın
+    durumuna (i-düğüm, boyut, değişiklik zamanı) en fazla `check_interval`
+    saniyede bir bakılır. Değişmişse yapılandırma ayrı bir iş parçacığında
+    okunup derlenir; sonuç bir sonraki `poll()` ile teslim edilir. Okunamayan
+    ya da geçersiz yapılandırma bildirilir ve eski eğriler kullanılmaya
+    devam eder. Yalnızca `fans` girdileri yeniden yüklenir; çalışan denetim
+    kanallarının fanları (`reserved`) eğriye bağlanamaz.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fans: List[HwmonFan],
+        index: SensorIndex,
+        check_interval: float = 1.0,
+        reserved: Collection[str] = (),
+    ) -> None:
+        self.path = path
+        self.fans = fans
+        self.index = index
+        self.reserved = frozenset(reserved)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.errors = 0
+        self._signature = self._stat()
+        self._next_check = 0.0
+        self._force = False
+        self._worker: Optional[threading.Thread] = None
+        # Derleyici iş parçacığının bıraktığı sonuç; döngü tek atamayla alır.
+        self._result: Optional[CompiledCurves] = None
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def request(self) -> None:
+        """Dosya değişmemiş olsa da bir sonraki turda yeniden yükle (SIGHUP)."""
+        self._force = True
+        self._next_check = 0.0
+
+    def poll(self, now: float) -> Optional[CompiledCurves]:
+        """Hazır yeni eğriler varsa döndür; gerekiyorsa derlemeyi başlat."""
+        result = self._result
+        if result is not None:
+            self._result = None
+            return result
+        if now < self._next_check:
+            return None
+        if self._worker is not None and self._worker.is_alive():
+            return None
+        self._next_check = now + self.check_interval
+        signature = self._stat()
+        # Düzenleyici dosyayı değiştirirken kısa süre yok olabilir; eskisiyle sür.
+        if signature is None or (signature == self._signature and not self._force):
+            return None
+        self._signature = signature
+        self._force = False
+        self._worker = threading.Thread(target=self._compile, name="lfc-reload", daemon=True)
+        self._worker.start()
+        return None
+
+    def _compile(self) -> None:
+        try:
+            _data, bindings = load_config(self.path, self.fans, self.index, self.reserved)
+            compiled = CompiledCurves(bindings, self.index)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            self.errors += 1
+            print(
+                f"Yapılandırma yeniden yüklenemedi; eski eğriler kullanılıyor: {exc}",
+                file=sys.stderr,
+                flush=True,
+            )
+            return
+        self.reloads += 1
+        self._result = compiled
+
+
+@dataclass
+class LoopStats:
+    """Denetim döngüsünün tur zamanlamaları (saniye)."""
+
+    ticks: int = 0
+    overruns: int = 0
+    lateness_sum: float = 0.0
+    lateness_max: float = 0.0
+    work_sum: float = 0.0
+    work_max: float = 0.0
+
+    def record(self, lateness: float, work: float) -> None:
+        self.ticks += 1
+        self.lateness_sum += lateness
+        self.work_sum += work
+        if lateness > self.lateness_max:
+            self.lateness_max = lateness
+        if work > self.work_max:
+            self.work_max = work
+
+    def summary(self) -> str:
+        ticks = max(1, self.ticks)
+        return (
+            f"tur={self.ticks} aşım={self.overruns} "
+            f"gecikme ort/maks={self.lateness_sum / ticks * 1e3:.3f}/"
+            f"{self.lateness_max * 1e3:.3f} ms "
+            f"iş ort/maks={self.work_sum / ticks * 1e3:.3f}/{self.work_max * 1e3:.3f} ms"
+        )
+
+
+def _resolve_temp(name: str, index: SensorIndex) -> Path:
+    if "/" in name:
+        return Path(name)
+    sensor = index.get(name)
+    if sensor is None or sensor.kind != "temp":
+        raise ValueError(f"Sıcaklık sensörü bulunamadı: {name}")
+    return sensor.path
+
+
+def load_config(
+    path: Path, fans: List[HwmonFan], index: SensorIndex, reserved: Collection[str] = ()
+) -> Tuple[dict, List[CurveBinding]]:
+    """Yapılandırma dosyasını oku ve kimlikleri taranmış fan/sensörlerle eşle.
+
+    Bir fanı tek bir denetçi sürer: `targets` içindeki (ya da `reserved` ile
+    verilen, çalışan kanalların) fanlara ve aynı fana ikinci kez eğri
+    bağlanamaz.
+    """
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    by_id = {fan.id: fan for fan in fans}
+    controlled = set(reserved)
+    for entry in data.get("targets", []):
+        controlled.update(entry.get("fans", []))
+    bound: Set[str] = set()
+    bindings: List[CurveBinding] = []
+    for entry in data.get("fans", []):
+        fan = by_id.get(entry["fan"])
+        if fan is None:
+            raise ValueError(f"Fan bulunamadı: {entry['fan']}")
+        if fan.pwm_path is None:
+            raise ValueError(f"Bu fan için PWM kontrolü desteklenmiyor: {fan.id}")
+        if fan.id in controlled:
+            raise ValueError(f"{fan.id} hem 'fans' hem 'targets' içinde; yalnızca birinde olmalı.")
+        if fan.id in bound:
+            raise ValueError(f"{fan.id} için birden çok eğri verilmiş.")
+        bound.add(fan.id)
+        curve = FanCurve(
+            points=[(t, p) for t, p in entry["points"]],
+            hysteresis=float(entry.get("hysteresis", 2.0)),
+        )
+        sensors = [_resolve_temp(name, index) for name in entry.get("sensors", [])]
+        if not sensors:
+            raise ValueError(f"{fan.id} için sıcaklık sensörü belirtilmemiş.")
+        mix = entry.get("mix", MIX_MAX)
+        if mix not in (MIX_MAX, MIX_AVERAGE, MIX_WEIGHTED):
+            raise ValueError(f"{fan.id}: bilinmeyen karıştırma işlevi: {mix}")
+        weights = None
+        if mix == MIX_WEIGHTED:
+            weights = [float(w) for w in entry.get("weights", [])]
+            if len(weights) != len(sensors) or min(weights) < 0 or sum(weights) <= 0:
+                raise ValueError(f"{fan.id}: her sensöre negatif olmayan bir ağırlık verilmeli.")
+        bindings.append(
+            CurveBinding(fan=fan, curve=curve, sensors=sensors, mix=mix, weights=weights)
+        )
+
+    return data, bindings
+
+
+def load_faults(
+    data: dict, scanner: HwmonScanner
+) -> Tuple[Optional[FaultDetector], str]:
+    """`faults` ayarından algılayıcıyı ve güvenli durum eylemini kur (kapalıysa None)."""
+    entry = data.get("faults", {})
+    if entry is False:
+        return None, ACTION_AUTO
+    if not isinstance(entry, dict):
+        raise ValueError("'faults' bir nesne ya da false olmalı.")
+    entry = dict(entry)
+    action = entry.pop("action", ACTION_AUTO)
+    if action not in (ACTION_AUTO, ACTION_FULL):
+        raise ValueError(f"Geçersiz güvenli durum eylemi: {action}")
+    settings = FaultSettings.from_dict(entry)
+    return FaultDetector(scanner.sensors, scanner.fans, settings), action
+
+
+def load_schedule(
+    data: dict, scanner: HwmonScanner, interval: float
+) -> Optional[SampleScheduler]:
+    """`adaptive_sampling` ayarından örnekleme zamanlayıcısını kur (kapalıysa None)."""
+    entry = data.get("adaptive_sampling", True)
+    if entry is False:
+        return None
+    if entry is True:
+        entry = {}
+    if not isinstance(entry, dict):
+        raise ValueError("'adaptive_sampling' bir nesne ya da true/false olmalı.")
+    entry = dict(entry)
+    entry.setdefault("quantum", interval)
+    return SampleScheduler(scanner.sensors, ScheduleSettings.from_dict(entry))
+
+
+def load_targets(
+    data: dict,
+    fans: List[HwmonFan],
+    index: SensorIndex,
+    calibrations: Dict[str, FanCalibration],
+) -> List[ControlTarget]:
+    """Yapılandırmadaki `targets` girdilerini denetim kanallarına çevir."""
+    by_id = {fan.id: fan for fan in fans}
+    owners: Dict[str, str] = {}
+    targets: List[ControlTarget] = []
+    for number, entry in enumerate(data.get("targets", []), 1):
+        name = entry.get("name", f"hedef{number}")
+        group: List[HwmonFan] = []
+        for fan_id in entry.get("fans", []):
+            fan = by_id.get(fan_id)
+            if fan is None:
+                raise ValueError(f"{name}: fan bulunamadı: {fan_id}")
+            if fan.pwm_path is None:
+                raise ValueError(f"{name}: bu fan için PWM kontrolü desteklenmiyor: {fan_id}")
+            if fan_id in owners:
+                raise ValueError(f"{name}: {fan_id} zaten '{owners[fan_id]}' hedefinde.")
+            owners[fan_id] = name
+            group.append(fan)
+
+        if ("temp" in entry) == ("rpm" in entry):
+            raise ValueError(f"{name}: 'temp' veya 'rpm' hedeflerinden yalnızca biri verilmeli.")
+        mode = MODE_TEMP if "temp" in entry else MODE_RPM
+        if entry.get("model") and mode != MODE_TEMP:
+            raise ValueError(f"{name}: öngörülü denetim ('model') yalnızca 'temp' hedefiyle olur.")
+        sensors: List[int] = []
+        for sensor_id in entry.get("sensors", []):
+            sensor = index.get(sensor_id)
+            if sensor is None or sensor.kind != "temp":
+                raise ValueError(f"{name}: sıcaklık sensörü bulunamadı: {sensor_id}")
+            sensors.append(index.slot(sensor_id))
+
+        gains = None
+        if "pid" in entry:
+            gains = PidGains(*(float(k) for k in entry["pid"]))
+        calibration = None
+        if entry.get("feedforward") and group:
+            calibration = calibrations.get(group[0].id)
+            if calibration is None:
+                print(f"{name}: {group[0].id} kalibre edilmemiş; ileri besleme yok.", file=sys.stderr)
+        targets.append(
+            ControlTarget(
+                name=name,
+                fans=group,
+                mode=mode,
+                setpoint=float(entry[mode]),
+                sensors=sensors,
+                gains=gains,
+                slew=float(entry.get("slew", 60.0)),
+                calibration=calibration,
+                bias=float(entry.get("bias", 0.0)),
+                reference_tau=float(entry.get("reference_tau", 0.0)),
+            )
+        )
+    return targets
+
+
+def load_controllers(
+    data: dict,
+    targets: List[ControlTarget],
+    sensors: List[Sensor],
+    states: Optional[Dict[str, dict]] = None,
+) -> Tuple[Optional[PidBank], Optional[ThermalModelBank]]:
+    """Kanalları `model` anahtarına göre PID ve öngörülü bankalara ayır."""
+    pid_targets: List[ControlTarget] = []
+    model_targets: List[ControlTarget] = []
+    settings: List[ModelSettings] = []
+    for entry, target in zip(data.get("targets", []), targets):
+        model = entry.get("model", False)
+        if not model:
+            pid_targets.append(target)
+            continue
+        model_targets.append(target)
+        if isinstance(model, dict):
+            settings.append(ModelSettings.from_dict(model))
+        else:
+            settings.append(ModelSettings())
+    pid = PidBank(pid_targets) if pid_targets else None
+    bank = None
+    if model_targets:
+        bank = ThermalModelBank(model_targets, sensors, settings, states)
+    return pid, bank
+
+
+class ControlLoop:
+    """Eğrileri sabit aralıklarla değerlendirip fanlara uygulayan döngü.
+
+    Bekleme mutlak son tarihlere göre yapılır; böylece tur süreleri birikip
+    kaymaz. Kaçırılan turlar art arda çalıştırılmaz, atlanır ve sayılır.
+    """
+
+    def __init__(
+        self,
+        bindings: List[CurveBinding],
+        interval: float,
+        report_every: float = 60.0,
+        trace: bool = False,
+        write_window: float = 0.0,
+        pid: Optional[PidBank] = None,
+        scanner: Optional[HwmonScanner] = None,
+        faults: Optional[FaultDetector] = None,
+        fault_action: str = ACTION_AUTO,
+        schedule: Optional[SampleScheduler] = None,
+        recorder: Optional[TraceWriter] = None,
+        publisher: Optional[SnapshotPublisher] = None,
+        model: Optional[ThermalModelBank] = None,
+        models_path: Optional[Path] = None,
+        checkpoint_every: float = 300.0,
+        reloader: Optional[ConfigReloader] = None,
+    ) -> None:
+        if any(len(bank) for bank in (pid, model) if bank is not None) and scanner is None:
+            raise ValueError("PID ve öngörülü kanallar için tarayıcı gerekli.")
+        if faults is not None and scanner is None:
+            raise ValueError("Arıza algılama için tarayıcı gerekli.")
+        if recorder is not None and scanner is None:
+            raise ValueError("Tur kaydı için tarayıcı gerekli.")
+        if publisher is not None and scanner is None:
+            raise ValueError("Yayın için tarayıcı gerekli.")
+        # Eğriler ve bağları tek nesnede durur; yeniden yükleme tek atamayla değiştirir.
+        self.curves = CompiledCurves(bindings, scanner.index if scanner is not None else None)
+        self.reloader = reloader
+        self.pid = pid
+        self.model = model
+        # Öngörülü modellerin kaydedileceği dosya; None ise kaydedilmez (ör. oynatma).
+        self.models_path = models_path
+        self.checkpoint_every = checkpoint_every
+        self.scanner = scanner
+        self.faults = faults
+        self.schedule = schedule
+        self.recorder = recorder
+        self.publisher = publisher
+        self._snapshot: Optional[Snapshot] = None
+        self._last_tick: Optional[float] = None
+        self._failing: Set[str] = set()
+        self.interval = interval
+        self.writes = PwmWriteScheduler(write_window)
+        self.fail_safe: Optional[FailSafe] = None
+        if faults is not None:
+            self.fail_safe = FailSafe(self.controlled_fans(), fault_action, self.writes)
+        if schedule is not None:
+            schedule.set_demand("control", self._demanded_slots(), interval)
+            if faults is not None:
+                # Kritik sıcaklık ve hızlı ısınma bir tur içinde görülsün.
+                schedule.set_demand("faults", faults.temp_slots(), interval)
+        self.report_every = report_every
+        self.trace = trace
+        self.stats = LoopStats()
+        self.alarm_ticks = 0
+        self._stop = threading.Event()
+        # Alarm izleyicisi başka bir iş parçacığından olay ekleyip döngüyü uyandırır.
+        self._wake = threading.Event()
+        self._alarms: "collections.deque[AlarmEvent]" = collections.deque()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def notify_alarms(self, events: List[AlarmEvent]) -> None:
+        """Alarm izleyicisinin iş parçacığında çağrılır; bir sonraki turu öne alır."""
+        self._alarms.extend(events)
+        self._wake.set()
+
+    def _handle_alarms(self) -> None:
+        slots = []
+        while self._alarms:
+            event = self._alarms.popleft()
+            prefix = "alarm" if event.active else "bilgi"
+            print(f"{prefix}: {event.message}", file=sys.stderr, flush=True)
+            slots.append(event.slot)
+        if self.schedule is not None:
+            self.schedule.expedite(slots)
+
+    @property
+    def bindings(self) -> List[CurveBinding]:
+        return self.curves.bindings
+
+    def controllers(self) -> List[Union[PidBank, ThermalModelBank]]:
+        """Kanalı olan denetleyici bankaları (PID ve öngörülü)."""
+        return [bank for bank in (self.pid, self.model) if bank is not None and len(bank)]
+
+    def controlled_fans(self) -> List[HwmonFan]:
+        fans = [binding.fan for binding in self.bindings]
+        for bank in self.controllers():
+            fans += [fan for target in bank.targets for fan in target.fans]
+        return fans
+
+    def _demanded_slots(self) -> List[int]:
+        """Her turda okunacak sıralar: eğri/kanal girdileri, denetlenen fanların devri ve PWM'i."""
+        slots = [slot for fan in self.controlled_fans() for slot in (fan.rpm_slot, fan.pwm_slot)]
+        slots += self.curves.slots
+        for bank in self.controllers():
+            slots += [slot for target in bank.targets for slot in target.sensors]
+        return [slot for slot in slots if slot >= 0]
+
+    def _handle_faults(self, events: List[FaultEvent]) -> None:
+        fail_safe = self.fail_safe
+        was_engaged = fail_safe.engaged
+        for event in events:
+            if not event.active:
+                prefix = "bilgi"
+            else:
+                prefix = "KRİTİK" if event.critical else "uyarı"
+            print(f"{prefix}: {event.message}", file=sys.stderr, flush=True)
+        for fan, exc in fail_safe.handle(events):
+            print(f"{fan.id}: güvenli duruma alınamadı: {exc}", file=sys.stderr, flush=True)
+        if fail_safe.engaged and not was_engaged:
+            print("Güvenli duruma geçildi; denetim durduruldu.", file=sys.stderr, flush=True)
+        elif was_engaged and not fail_safe.engaged:
+            print("Kritik arızalar sona erdi; denetim sürüyor.", file=sys.stderr, flush=True)
+            for bank in self.controllers():
+                bank.reset()
+
+    def _swap_curves(self, curves: CompiledCurves) -> None:
+        """Yeniden derlenen eğrileri tur sınırında devreye al."""
+        curves.adopt(self.curves)
+        kept = {binding.fan.id for binding in curves.bindings}
+        for bank in self.controllers():
+            kept.update(fan.id for target in bank.targets for fan in target.fans)
+        for binding in self.bindings:
+            if binding.fan.id not in kept:
+                # Artık denetlenmeyen fan sürücüye bırakılır.
+                self.writes.request_auto(binding.fan)
+        self.curves = curves
+        if self.fail_safe is not None:
+            self.fail_safe.fans = [fan for fan in self.controlled_fans() if fan.pwm_path]
+        if self.schedule is not None:
+            self.schedule.set_demand("control", self._demanded_slots(), self.interval)
+        print(f"Eğriler yeniden yüklendi ({len(curves.bindings)} fan).", flush=True)
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """Tek bir denetim turu; `now` kayıttan oynatırken turun kayıt zamanıdır."""
+        writes = self.writes
+        now = time.monotonic() if now is None else now
+        if self.reloader is not None:
+            curves = self.reloader.poll(now)
+            if curves is not None:
+                self._swap_curves(curves)
+        controllers = self.controllers()
+        fresh = None
+        sampled = False
+        if (
+            controllers
+            or self.faults is not None
+            or self.recorder is not None
+            or self.publisher is not None
+        ):
+            # Denetleyiciler, arıza algılama, kayıt ve yayın tek geçişte okunan anlık görüntüyü
+            # kullanır; zamanlayıcı varsa yalnızca zamanı gelen sensörler okunur.
+            if self.schedule is not None:
+                self._snapshot = self.schedule.sample(self.scanner, self._snapshot, now)
+                fresh = self.schedule.fresh
+            else:
+                self._snapshot = self.scanner.sample_all(self._snapshot)
+            sampled = True
+            if self.recorder is not None:
+                try:
+                    self.recorder.append(self._snapshot)
+                except OSError as exc:
+                    # Kayıt yazılamıyor (ör. disk dolu); denetim kayıtsız sürsün.
+                    print(f"Tur kaydı durduruldu: {exc}", file=sys.stderr, flush=True)
+                    self.recorder = None
+            if self.publisher is not None:
+                self.publisher.publish(self._snapshot)
+        if self.faults is not None:
+            events = self.faults.update(self._snapshot, fresh)
+            if events:
+                self._handle_faults(events)
+            if self.fail_safe.engaged:
+                self._last_tick = now
+                return
+
+        curves = self.curves
+        if curves.bindings:
+            # Bu turda örneklenmiş anlık görüntü yoksa eğri girdileri doğrudan okunur.
+            pwms = curves.evaluate(self._snapshot if sampled else None)
+            for binding, pwm in zip(curves.bindings, pwms):
+                fan = binding.fan
+                # Sıcaklık okunamıyorsa fanı güvenli tarafta tut.
+                writes.request_pwm(fan, fan.max_pwm if pwm < 0 else pwm, now)
+
+        if controllers:
+            dt = self.interval if self._last_tick is None else now - self._last_tick
+            for bank in controllers:
+                bank.step(self._snapshot, dt)
+                for fan, pwm in bank.pwm_requests():
+                    writes.request_pwm(fan, pwm, now)
+        self._last_tick = now
+
+        failed = {}
+        for fan, exc in writes.flush(now):
+            failed[fan.id] = exc
+        for binding in self.bindings:
+            exc = failed.get(binding.fan.id)
+            if exc is not None and not binding.failing:
+                print(f"{binding.fan.id}: PWM yazılamadı: {exc}", file=sys.stderr, flush=True)
+            binding.failing = exc is not None
+        for bank in controllers:
+            for target in bank.targets:
+                for fan in target.fans:
+                    exc = failed.get(fan.id)
+                    if exc is not None and fan.id not in self._failing:
+                        print(f"{fan.id}: PWM yazılamadı: {exc}", file=sys.stderr, flush=True)
+                        self._failing.add(fan.id)
+                    elif exc is None:
+                        self._failing.discard(fan.id)
+
+    def run(self) -> None:
+        interval = self.interval
+        next_deadline = time.monotonic()
+        next_report = next_deadline + self.report_every
+        next_checkpoint = next_deadline + self.checkpoint_every
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now < next_deadline:
+                if not self._alarms:
+                    self._wake.wait(next_deadline - now)
+                    self._wake.clear()
+                    continue
+                # Alarm geldi: son tarihi beklemeden ek bir tur çalıştır.
+                self._handle_alarms()
+                self.tick()
+                self.alarm_ticks += 1
+                continue
+
+            lateness = now - next_deadline
+            if self._alarms:
+                self._handle_alarms()
+            self.tick()
+            finished = time.monotonic()
+            work = finished - now
+            self.stats.record(lateness, work)
+            if self.trace:
+                print(
+                    f"tur {self.stats.ticks}: gecikme={lateness * 1e3:.3f} ms "
+                    f"iş={work * 1e3:.3f} ms",
+                    flush=True,
+                )
+
+            next_deadline += interval
+            if next_deadline <= finished:
+                # Tur süresi aralığı aştı; kaçırılan turları atla.
+                missed = int((finished - next_deadline) // interval) + 1
+                self.stats.overruns += missed
+                next_deadline += missed * interval
+
+            if self.report_every > 0 and finished >= next_report:
+                print(self.summary(), flush=True)
+                if self.model is not None:
+                    for i in range(len(self.model)):
+                        print(self.model.describe(i), flush=True)
+                next_report = finished + self.report_every
+            if self.checkpoint_every > 0 and finished >= next_checkpoint:
+                self.save_models()
+                next_checkpoint = finished + self.checkpoint_every
+
+    def save_models(self) -> None:
+        """Öğrenilen modelleri kaydet; yazılamazsa denetim kayıtsız sürer."""
+        if self.model is None or self.models_path is None:
+            return
+        try:
+            save_models(self.model.states(), self.models_path)
+        except OSError as exc:
+            print(f"Isıl modeller kaydedilemedi: {exc}", file=sys.stderr, flush=True)
+
+    def summary(self) -> str:
+        writes = self.writes.stats
+        return (
+            f"{self.stats.summary()} yazma={writes.issued} "
+            f"birleştirilen={writes.coalesced} atlanan={writes.suppressed} "
+            f"alarm={self.alarm_ticks}"
+        )
+
+    def release(self) -> None:
+        """Denetlenen fanları otomatik moda geri bırak."""
+        for fan in self.controlled_fans():
+            try:
+                fan.set_auto_mode()
+            except OSError as exc:
+                print(f"{fan.id}: otomatik moda alınamadı: {exc}", file=sys.stderr)
+
+
+def replay_trace(loop: ControlLoop, scanner: ReplayScanner) -> None:
+    """Kaydın her turunu beklemeden denetim döngüsünden geçir."""
+    while True:
+        loop.tick(scanner.timestamp)
+        if not scanner.advance():
+            return
+
+
+def replay_report(loop: ControlLoop, scanner: ReplayScanner) -> str:
+    """Denetlenen her fan için oynatmada yazılan ve kayıttaki PWM ortalamaları."""
+    lines = []
+    for fan in loop.controlled_fans():
+        decided = [v for v in scanner.written(fan.pwm_path) if v != MISSING]
+        recorded = []
+        if fan.pwm_slot >= 0:
+            recorded = [v for v in scanner.reader.column(fan.pwm_slot) if v != MISSING]
+        writes = sum(1 for _t, path, _v in scanner.writes if path == str(fan.pwm_path))
+        line = f"{fan.id}: yazma={writes}"
+        if decided:
+            line += (
+                f" pwm ort/en az/en çok={sum(decided) / len(decided):.1f}"
+                f"/{min(decided)}/{max(decided)}"
+            )
+        if recorded:
+            line += f" kayıtta ort={sum(recorded) / len(recorded):.1f}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def toggle_latency(*_args: object) -> None:
+    """SIGUSR1: gecikme kaydını aç ya da kapatıp özeti yazdır."""
+    if not LATENCY.enabled:
+        LATENCY.reset()
+        LATENCY.enable()
+        print("Gecikme kaydı açıldı (kapatmak için yeniden SIGUSR1).", flush=True)
+        return
+    LATENCY.disable()
+    print(format_rows(LATENCY.rows()), flush=True)
+    print(format_rows(LATENCY.rows(by_driver=True)), flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Fan eğrisi denetim servisi")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG)
+    parser.add_argument("--root", type=Path, default=None, help="hwmon kökü (test için)")
+    parser.add_argument(
+        "--report-every",
+        type=float,
+        default=60.0,
+        help="Zamanlama özetini kaç saniyede bir yazdır (0: kapalı)",
+    )
+    parser.add_argument("--trace", action="store_true", help="Her turun zamanlamasını yazdır")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", type=Path, default=None, help="Turları bu dosyaya kaydet")
+    group.add_argument(
+        "--replay", type=Path, default=None, help="Donanım yerine kayıttaki turları kullan"
+    )
+    args = parser.parse_args(argv)
+
+    replay = None
+    if args.replay is not None:
+        try:
+            replay = ReplayScanner(TraceReader(args.replay))
+        except (OSError, ValueError) as exc:
+            print(f"Kayıt okunamadı: {exc}", file=sys.stderr)
+            sys.exit(1)
+        replay.install()
+        scanner = replay
+    else:
+        scanner = HwmonScanner(args.root) if args.root else HwmonScanner()
+    try:
+        fans = scanner.scan()
+        calibrations = load_calibrations()
+        apply_calibration(fans, calibrations)
+        config, bindings = load_config(args.config, fans, scanner.index)
+        targets = load_targets(config, fans, scanner.index, calibrations)
+        # Oynatmada modeller kayıtlı durumdan başlar ama sonuç kaydedilmez.
+        models_path = None if replay is not None else default_models_path()
+        states = {}
+        if any(entry.get("model") for entry in config.get("targets", [])):
+            states = load_models(models_path)
+        pid, model = load_controllers(config, targets, scanner.sensors, states)
+        faults, fault_action = load_faults(config, scanner)
+        # Oynatmada yapılandırma değişse de kayıt aynı kalmalı; izlenmez.
+        reloader = None
+        if replay is None:
+            reserved = [fan.id for target in targets for fan in target.fans]
+            reloader = ConfigReloader(args.config, fans, scanner.index, reserved=reserved)
+        interval = float(config.get("interval", 1.0))
+        # Kayıtta her turun tüm değerleri zaten var; oynatmada okuma azaltmaya gerek yok.
+        schedule = None if replay is not None else load_schedule(config, scanner, interval)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"Yapılandırma okunamadı: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if not bindings and pid is None and model is None:
+        print("Yapılandırmada denetlenecek fan yok.", file=sys.stderr)
+        sys.exit(1)
+    recorder = None
+    if args.record is not None:
+        try:
+            recorder = TraceWriter(args.record, scanner.sensors, fans)
+        except (OSError, ValueError) as exc:
+            print(f"Kayıt dosyası açılamadı: {exc}", file=sys.stderr)
+            sys.exit(1)
+
+    publisher = None
+    if replay is None and config.get("publish", False):
+        try:
+            publisher = SnapshotPublisher(scanner.sensors, fans, interval)
+        except OSError as exc:
+            # Yayın yalnızca diğer tüketiciler içindir; denetim yayınsız sürsün.
+            print(f"Veri yolunda yayın yapılamıyor: {exc}", file=sys.stderr, flush=True)
+        else:
+            schedule = None
+
+    loop = ControlLoop(
+        bindings,
+        interval,
+        args.report_every,
+        args.trace,
+        write_window=float(config.get("write_window", 0.0)),
+        pid=pid,
+        scanner=scanner,
+        faults=faults,
+        fault_action=fault_action,
+        schedule=schedule,
+        recorder=recorder,
+        publisher=publisher,
+        model=model,
+        models_path=models_path,
+        reloader=reloader,
+    )
+    if replay is not None:
+        started = time.perf_counter()
+        replay_trace(loop, replay)
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        print(
+            f"{len(replay)} tur {elapsed:.2f} s içinde oynatıldı "
+            f"(gerçek zamanın {replay.duration / elapsed:.0f} katı).",
+            flush=True,
+        )
+        print(replay_report(loop, replay), flush=True)
+        return
+
+    signal.signal(signal.SIGTERM, lambda *_: loop.stop())
+    signal.signal(signal.SIGINT, lambda *_: loop.stop())
+    signal.signal(signal.SIGUSR1, toggle_latency)
+    signal.signal(signal.SIGHUP, lambda *_: reloader.request())
+    watcher = None
+    if config.get("alarms", True) and scanner.index.alarms:
+        watcher = AlarmWatcher(scanner.index, loop.notify_alarms)
+        watcher.start()
+    try:
+        loop.run()
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        if loop.recorder is not None:
+            loop.recorder.close()
+        if loop.publisher is not None:
+            loop.publisher.close()
+        loop.save_models()
+        loop.release()
+        print(loop.summary(), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""Durmuş fan, donmuş sensör ve hızlı ısınma gibi arızaları algılayan katman (Qt içermez).
+
+Her sensör için kayan istatistikler (EWMA ortalama ve varyans, son
+değişimden beri geçen süre, sıcaklıklarda EWMA'lı artış hızı) her turda
+sabit sayıda işlemle güncellenir ve paralel `array('d')` sütunlarında
+tutulur; yüzlerce sensörde de bir tur milisaniye mertebesinde kalır.
+Girdi, `HwmonScanner.sample_all()` anlık görüntüsüdür; dosya okunmaz.
+
+Bir koşul oluştuğunda `active=True` olan bir `FaultEvent`, düzeldiğinde
+`active=False` olan bir olay üretilir; süren arıza her turda yeniden
+bildirilmez. Kritik arızalarda `FailSafe` denetlenen fanları otomatik moda
+(pwm_enable=2) alır ya da en yüksek PWM'e çeker.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, fields
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from backend import MISSING, HwmonFan, Sensor, Snapshot
+from write_scheduler import MODE_AUTO, MODE_MANUAL, PwmWriteScheduler
+
+# Olay türleri
+FAN_STALL = "fan_stall"  # PWM yüksekken fan dönmüyor
+TEMP_CRITICAL = "temp_critical"  # sıcaklık sürücünün (veya ayarın) kritik sınırında
+TEMP_RISE = "temp_rise"  # sıcaklık beklenenden hızlı artıyor
+SENSOR_FROZEN = "sensor_frozen"  # değer uzun süredir hiç değişmedi
+SENSOR_MISSING = "sensor_missing"  # sensör okunamıyor
+
+SEVERITY_WARNING = "warning"
+SEVERITY_CRITICAL = "critical"
+
+SEVERITIES: Dict[str, str] = {
+    FAN_STALL: SEVERITY_CRITICAL,
+    TEMP_CRITICAL: SEVERITY_CRITICAL,
+    TEMP_RISE: SEVERITY_WARNING,
+    SENSOR_FROZEN: SEVERITY_WARNING,
+    SENSOR_MISSING: SEVERITY_WARNING,
+}
+
+_TITLES = {
+    FAN_STALL: "fan durdu",
+    TEMP_CRITICAL: "kritik sıcaklık",
+    TEMP_RISE: "hızlı ısınma",
+    SENSOR_FROZEN: "donmuş sensör",
+    SENSOR_MISSING: "okunamayan sensör",
+}
+
+# Sensör başına etkin arızaların bit maskesi
+_BITS = {kind: 1 << bit for bit, kind in enumerate(SEVERITIES)}
+
+_KIND_TEMP = 0
+_KIND_FAN = 1
+_KIND_PWM = 2
+_KIND_CODES = {"temp": _KIND_TEMP, "fan": _KIND_FAN, "pwm": _KIND_PWM}
+
+_NAN = float("nan")
+
+# Güvenli durum eylemleri
+ACTION_AUTO = "auto"  # pwm_enable=2 (yoksa en yüksek PWM)
+ACTION_FULL = "full"  # en yüksek PWM
+
+
+@dataclass
+class FaultSettings:
+    """Algılama eşikleri. Süreler saniye, sıcaklıklar °C cinsindendir."""
+
+    alpha: float = 0.2  # EWMA ağırlığı (tur başına)
+    stall_rpm: int = 50  # bunun altındaki devir "dönmüyor" sayılır
+    stall_pwm: int = 100  # PWM en az bu kadarken (ve fanın min_pwm'inden büyükse) dönmemeli
+    stall_after: float = 3.0
+    missing_after: float = 5.0
+    # Yalnızca daha önce değiştiği görülmüş sıcaklık ve (dönen) fan sensörleri için
+    frozen_after: float = 120.0
+    rise_rate: float = 2.0  # °C/s; düşüş eşiği bunun yarısı
+    critical_temp: float = 95.0  # sürücü `tempN_crit`/`tempN_max` bildirmiyorsa
+    critical_margin: float = 5.0  # kritik sıcaklık bu kadar altına inince arıza biter
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "FaultSettings":
+        """Yapılandırmadaki bilinen alanları al; bilinmeyen anahtar hata verir."""
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Bilinmeyen arıza ayarı: {', '.join(sorted(unknown))}")
+        settings = cls()
+        for name, value in data.items():
+            current = getattr(settings, name)
+            setattr(settings, name, type(current)(value))
+        return settings
+
+
+@dataclass
+class FaultEvent:
+    """Bir arızanın başlaması (`active=True`) veya sona ermesi."""
+
+    kind: str
+    severity: str
+    sensor_id: str
+    slot: int
+    active: bool
+    timestamp: float
+    value: Optional[float]
+    message: str
+
+    @property
+    def critical(self) -> bool:
+        return self.severity == SEVERITY_CRITICAL
+
+
+class FaultDetector:
+    """Sensör başına kayan istatistikleri tutup arıza olayları üreten algılayıcı.
+
+    `sensors` tarayıcının sensör listesiyle aynı sırada olmalıdır (anlık
+    görüntünün sıraları); `fans` fan devir sıralarını PWM sıralarıyla
+    eşlemek için kullanılır. Tarama değişirse yeni bir algılayıcı kurulur.
+    """
+
+    def __init__(
+        self,
+        sensors: Sequence[Sensor],
+        fans: Sequence[HwmonFan] = (),
+        settings: Optional[FaultSettings] = None,
+    ) -> None:
+        self.sensors = list(sensors)
+        self.settings = settings or FaultSettings()
+        count = len(self.sensors)
+
+        def column(value: float) -> array:
+            return array("d", [value]) * count
+
+        self.mean = column(_NAN)
+        self.var = column(0.0)
+        self.rate = column(0.0)  # sıcaklıklar için °C/s
+        self.last = array("q", [MISSING]) * count
+        self.last_time = column(_NAN)
+        self.changed_at = column(_NAN)  # NaN: değiştiği henüz görülmedi
+        self.missing_since = column(_NAN)
+        self.stall_since = column(_NAN)
+        self.active = array("B", [0]) * count
+        self.spun = array("B", [0]) * count
+
+        self._kind = bytes(_KIND_CODES.get(sensor.kind, _KIND_PWM) for sensor in self.sensors)
+        # Sıcaklıklar için kritik sınır (milidereceler)
+        default_limit = self.settings.critical_temp * 1000.0
+        self._limit = array(
+            "d",
+            [
+                float(sensor.max_value) if sensor.kind == "temp" and sensor.max_value else default_limit
+                for sensor in self.sensors
+            ],
+        )
+        # Fan devir sırası → PWM sırası ve o fan için durma eşiği
+        self._pwm_slot = array("i", [-1]) * count
+        self._stall_pwm = array("i", [0]) * count
+        for fan in fans:
+            if 0 <= fan.rpm_slot < count and fan.pwm_slot >= 0:
+                self._pwm_slot[fan.rpm_slot] = fan.pwm_slot
+                self._stall_pwm[fan.rpm_slot] = max(self.settings.stall_pwm, fan.min_pwm + 1)
+
+    def __len__(self) -> int:
+        return len(self.sensors)
+
+    def temp_slots(self) -> List[int]:
+        """Kritik sıcaklık ve hızlı ısınma için izlenen sıcaklık sıraları.
+
+        Uyarlamalı örneklemede bunlar denetim aralığında okunmalıdır; yoksa
+        boştaki bir sensörün ani ısınması ancak onlarca saniye sonra görülür.
+        """
+        return [slot for slot, sensor in enumerate(self.sensors) if sensor.kind == "temp"]
+
+    def stddev(self, slot: int) -> float:
+        return math.sqrt(self.var[slot])
+
+    def unchanged_for(self, slot: int, now: float) -> Optional[float]:
+        """Sensörün değeri en son ne kadar önce değişti (bilinmiyorsa None)."""
+        changed = self.changed_at[slot]
+        return None if changed != changed else now - changed
+
+    def active_faults(self) -> List[Tuple[str, str]]:
+        """Sürmekte olan arızalar: (tür, sensör kimliği) çiftleri."""
+        result = []
+        for slot, mask in enumerate(self.active):
+            if mask:
+                for kind, bit in _BITS.items():
+                    if mask & bit:
+                        result.append((kind, self.sensors[slot].id))
+        return result
+
+    def _event(
+        self,
+        events: List[FaultEvent],
+        kind: str,
+        slot: int,
+        active: bool,
+        now: float,
+        value: Optional[float],
+        detail: str = "",
+    ) -> None:
+        bit = _BITS[kind]
+        if active:
+            self.active[slot] |= bit
+        else:
+            self.active[slot] &= ~bit & 0xFF
+        sensor_id = self.sensors[slot].id
+        if active:
+            message = f"{sensor_id}: {_TITLES[kind]}" + (f" ({detail})" if detail else "")
+        else:
+            message = f"{sensor_id}: {_TITLES[kind]} sona erdi"
+        events.append(
+            FaultEvent(kind, SEVERITIES[kind], sensor_id, slot, active, now, value, message)
+        )
+
+    def update(self, snapshot: Snapshot, slots: Optional[Sequence[int]] = None) -> List[FaultEvent]:
+        """İstatistikleri anlık görüntüyle güncelle; bu turda başlayan/biten arızaları döndür.
+
+        `slots` verilirse yalnızca bu sıralar (uyarlamalı örneklemede bu turda
+        gerçekten okunan sensörler) işlenir; okunmayanların eski değeri yeni
+        bir ölçüm gibi sayılmaz, artış hızı da iki okuma arasındaki süreyle
+        hesaplanır.
+        """
+        settings = self.settings
+        alpha = settings.alpha
+        keep = 1.0 - alpha
+        now = snapshot.timestamp
+        values = snapshot.values
+        mean, var, rate = self.mean, self.var, self.rate
+        last, last_time, changed_at = self.last, self.last_time, self.changed_at
+        missing_since, stall_since, active = self.missing_since, self.stall_since, self.active
+        spun = self.spun
+        kinds, limits, pwm_slots, stall_pwms = self._kind, self._limit, self._pwm_slot, self._stall_pwm
+        missing_bit = _BITS[SENSOR_MISSING]
+        frozen_bit = _BITS[SENSOR_FROZEN]
+        rise_bit = _BITS[TEMP_RISE]
+        critical_bit = _BITS[TEMP_CRITICAL]
+        stall_bit = _BITS[FAN_STALL]
+        rise_rate = settings.rise_rate
+        rise_clear = rise_rate / 2
+        critical_margin = settings.critical_margin * 1000.0
+        stall_rpm = settings.stall_rpm
+        stall_after = settings.stall_after
+        events: List[FaultEvent] = []
+
+        count = min(len(kinds), len(values))
+        if slots is None:
+            slots = range(count)
+        else:
+            slots = [i for i in slots if i < count]
+        for i in slots:
+            value = values[i]
+            if value == MISSING:
+                since = missing_since[i]
+                if since != since:
+                    missing_since[i] = now
+                elif not active[i] & missing_bit and now - since >= settings.missing_after:
+                    self._event(events, SENSOR_MISSING, i, True, now, None, f"{now - since:.0f} s")
+                continue
+            if active[i] & missing_bit:
+                self._event(events, SENSOR_MISSING, i, False, now, value)
+                missing_since[i] = _NAN
+            elif missing_since[i] == missing_since[i]:
+                missing_since[i] = _NAN
+
+            previous_time = last_time[i]
+            if previous_time != previous_time:
+                # İlk geçerli okuma
+                mean[i] = value
+                last[i] = value
+                last_time[i] = now
+                continue
+
+            # EWMA ortalama ve varyans (tek geçişte, sabit bellek)
+            diff = value - mean[i]
+            increment = alpha * diff
+            mean[i] += increment
+            var[i] = keep * (var[i] + diff * increment)
+
+            kind = kinds[i]
+            previous = last[i]
+            if value != previous:
+                changed_at[i] = now
+                if active[i] & frozen_bit:
+                    self._event(events, SENSOR_FROZEN, i, False, now, value)
+            elif kind != _KIND_PWM and value != 0 and not active[i] & frozen_bit:
+                changed = changed_at[i]
+                if changed == changed and now - changed >= settings.frozen_after:
+                    self._event(
+                        events, SENSOR_FROZEN, i, True, now, value, f"{now - changed:.0f} s"
+                    )
+
+            if kind == _KIND_TEMP:
+                dt = now - previous_time
+                if dt > 0:
+                    rate[i] += alpha * ((value - previous) / dt / 1000.0 - rate[i])
+                # Koşullar histerezisli: başlama ve bitiş eşikleri ayrı.
+                mask = active[i]
+                slope = rate[i]
+                if mask & rise_bit:
+                    if slope < rise_clear:
+                        self._event(events, TEMP_RISE, i, False, now, value / 1000.0)
+                elif slope >= rise_rate:
+                    self._event(events, TEMP_RISE, i, True, now, value / 1000.0, f"{slope:.1f} °C/s")
+                limit = limits[i]
+                if mask & critical_bit:
+                    if value < limit - critical_margin:
+                        self._event(events, TEMP_CRITICAL, i, False, now, value / 1000.0)
+                elif value >= limit:
+                    self._event(
+                        events, TEMP_CRITICAL, i, True, now, value / 1000.0,
+                        f"{value / 1000.0:.1f} °C ≥ {limit / 1000.0:.1f} °C",
+                    )
+            elif kind == _KIND_FAN and pwm_slots[i] >= 0:
+                pwm = values[pwm_slots[i]]
+                if value >= stall_rpm:
+                    spun[i] = 1
+                    stalled = False
+                else:
+                    # Boş fan soketleri hep 0 okur; yalnızca dönerken görülmüş fanlar durabilir.
+                    stalled = spun[i] and pwm != MISSING and pwm >= stall_pwms[i]
+                if stalled:
+                    since = stall_since[i]
+                    if since != since:
+                        stall_since[i] = now
+                    elif now - since >= stall_after and not active[i] & stall_bit:
+                        self._event(events, FAN_STALL, i, True, now, value, f"PWM {pwm}, {value} RPM")
+                else:
+                    stall_since[i] = _NAN
+                    if active[i] & stall_bit:
+                        self._event(events, FAN_STALL, i, False, now, value)
+
+            last[i] = value
+            last_time[i] = now
+        return events
+
+
+class FailSafe:
+    """Kritik arızada fanları güvenli duruma alır ve arıza sürdükçe `engaged` kalır.
+
+    Güvenli durum ilk kritik arızada bir kez uygulanır; denetleyiciler
+    `engaged` iken kendi yazmalarını yapmamalıdır. `writes` verilirse
+    yapılan yazmalar zamanlayıcıya bildirilir, böylece arıza bitince
+    denetleyicinin istediği değer mutlaka yeniden yazılır.
+    """
+
+    def __init__(
+        self,
+        fans: Sequence[HwmonFan],
+        action: str = ACTION_AUTO,
+        writes: Optional[PwmWriteScheduler] = None,
+    ) -> None:
+        if action not in (ACTION_AUTO, ACTION_FULL):
+            raise ValueError(f"Bilinmeyen güvenli durum eylemi: {action}")
+        self.fans = [fan for fan in fans if fan.pwm_path is not None]
+        self.action = action
+        self.writes = writes
+        self.causes: Set[Tuple[str, str]] = set()
+
+    @property
+    def engaged(self) -> bool:
+        return bool(self.causes)
+
+    def handle(self, events: Sequence[FaultEvent]) -> List[Tuple[HwmonFan, Exception]]:
+        """Kritik olayları işle; güvenli duruma yeni geçildiyse yazma hatalarını döndür."""
+        was_engaged = self.engaged
+        for event in events:
+            if not event.critical:
+                continue
+            key = (event.kind, event.sensor_id)
+            if event.active:
+                self.causes.add(key)
+            else:
+                self.causes.discard(key)
+        if self.engaged and not was_engaged:
+            return self.apply()
+        return []
+
+    def apply(self) -> List[Tuple[HwmonFan, Exception]]:
+        errors: List[Tuple[HwmonFan, Exception]] = []
+        for fan in self.fans:
+            try:
+                if self.action == ACTION_AUTO and fan.pwm_enable_path is not None:
+                    fan.set_auto_mode()
+                    mode, value = MODE_AUTO, None
+                else:
+                    fan.set_pwm(fan.max_pwm)
+                    mode, value = MODE_MANUAL, fan.max_pwm
+            except (OSError, RuntimeError) as exc:
+                if self.writes is not None:
+                    self.writes.forget(fan)
+                errors.append((fan, exc))
+                continue
+            if self.writes is not None:
+                self.writes.note_written(fan, mode, value)
+        return errors
@@ -0,0 +1,245 @@
+"""Sabit bellekli, halka tamponlu sensör geçmişi (Qt içermez).
+
+Tüm değerler tek bir `mmap` bölgesinde tutulur:
+
+    [başlık 64 bayt][zaman damgaları float64 × kapasite][değerler int32 × kapasite × sütun]
+
+Değerler satır sırasıyla (tur başına bir satır) yazılır; böylece bir ekleme
+tek bir bellek kopyasıdır. Bir sütunun zaman penceresi, kopyalamadan adımlı
+`memoryview` dilimi olarak okunur. Dosya yolu verilirse bölge dosyaya
+eşlenir ve geçmiş yeniden başlatmalardan sonra da korunur; çekirdek sayfaları
+kendi zamanında diske yazar, her turda dosya yeniden yazılmaz.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from backend import MISSING, Snapshot
+
+_MAGIC = b"LFHIST\0\0"
+_VERSION = 1
+# sihirli sözcük, sürüm, sütun, kapasite, sensör kimliklerinin crc32'si, toplam ekleme
+_HEADER = struct.Struct("<8sIIIIQ")
+_HEADER_SIZE = 64
+_TOTAL_OFFSET = 24
+_TOTAL = struct.Struct("<Q")
+
+Segment = Tuple[memoryview, memoryview]
+
+
+def default_history_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "lfancontrol" / "history.bin"
+
+
+def footprint(columns: int, capacity: int) -> int:
+    """Verilen boyutlardaki bir deponun bayt cinsinden kapladığı alan."""
+    return _HEADER_SIZE + 8 * capacity + 4 * columns * capacity
+
+
+class HistoryStore:
+    """Her sensör için sabit kapasiteli halka tampon.
+
+    `append()` O(1) (sütun sayısı kadar baytın tek kopyası), `segments()`
+    kopyasız okumadır. Depo, sensör listesi ve kapasite aynı kaldığı sürece
+    aynı dosyadan devam eder; değişirse dosya sıfırlanır.
+    """
+
+    def __init__(
+        self, sensor_ids: Sequence[str], capacity: int, path: Optional[Path] = None
+    ) -> None:
+        if capacity <= 0:
+            raise ValueError("Kapasite pozitif olmalı.")
+        self.sensor_ids = list(sensor_ids)
+        self.columns = len(self.sensor_ids)
+        self.capacity = capacity
+        self.path = path
+        size = footprint(self.columns, capacity)
+        ids_crc = zlib.crc32("\n".join(self.sensor_ids).encode("utf-8"))
+        expected = (_MAGIC, _VERSION, self.columns, capacity, ids_crc)
+
+        if path is None:
+            self._mm = mmap.mmap(-1, size)
+            self._total = 0
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            try:
+                reuse = False
+                if os.fstat(fd).st_size == size:
+                    header = _HEADER.unpack(os.pread(fd, _HEADER.size, 0))
+                    reuse = header[:5] == expected
+                if not reuse:
+                    # Biçim değişti: dosyayı sıfırla (ftruncate seyrek dosya oluşturur).
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                self._mm = mmap.mmap(fd, size)
+            finally:
+                os.close(fd)
+            self._total = _TOTAL.unpack_from(self._mm, _TOTAL_OFFSET)[0] if reuse else 0
+
+        _HEADER.pack_into(self._mm, 0, *expected, self._total)
+        view = memoryview(self._mm)
+        ts_end = _HEADER_SIZE + 8 * capacity
+        self._ts = view[_HEADER_SIZE:ts_end].cast("d")
+        self._values = view[ts_end:size].cast("i")
+        view.release()
+
+    # --- Yazma ---
+
+    def append(self, snapshot: Snapshot) -> None:
+        values = snapshot.values
+        if len(values) != self.columns:
+            raise ValueError("Anlık görüntünün sütun sayısı depoyla uyuşmuyor.")
+        i = self._total % self.capacity
+        self._ts[i] = snapshot.timestamp
+        base = i * self.columns
+        self._values[base:base + self.columns] = memoryview(values)
+        self._total += 1
+        _TOTAL.pack_into(self._mm, _TOTAL_OFFSET, self._total)
+
+    # --- Okuma ---
+
+    def __len__(self) -> int:
+        return min(self._total, self.capacity)
+
+    def _physical(self, logical: int) -> int:
+        return (self._total - len(self) + logical) % self.capacity
+
+    def _lower_bound(self, timestamp: float) -> int:
+        """Zaman damgası `timestamp` veya sonrası olan ilk mantıksal sıra."""
+        lo, hi = 0, len(self)
+        ts = self._ts
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ts[self._physical(mid)] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def latest_timestamp(self) -> Optional[float]:
+        if not len(self):
+            return None
+        return self._ts[self._physical(len(self) - 1)]
+
+    def segments(
+        self, slot: int, since: Optional[float] = None, until: Optional[float] = None
+    ) -> List[Segment]:
+        """`slot` sütununun [since, until) penceresini kopyasız döndür.
+
+        Halka sınırı nedeniyle en fazla iki (zaman damgaları, değerler)
+        parçası döner; parçalar zamana göre sıralıdır. Değerlerde okunamayan
+        örnekler `MISSING` ile işaretlidir.
+        """
+        if not 0 <= slot < self.columns:
+            raise IndexError(slot)
+        start = 0 if since is None else self._lower_bound(since)
+        end = len(self) if until is None else self._lower_bound(until)
+        if start >= end:
+            return []
+
+        cols = self.columns
+        first = self._physical(start)
+        last = self._physical(end - 1) + 1
+        if first < last:
+            ranges = [(first, last)]
+        else:
+            ranges = [(first, self.capacity), (0, last)]
+        return [
+            (self._ts[a:b], self._values[a * cols + slot:b * cols:cols])
+            for a, b in ranges
+        ]
+
+    # --- Kapatma ---
+
+    def flush(self) -> None:
+        if self.path is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._ts.release()
+        self._values.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # Dışarıda hâlâ tutulan dilimler varsa eşleme onlarla birlikte kapanır.
+            pass
+
+
+class MinMaxBuckets:
+    """Zaman eksenini `width` kovaya bölüp her kovada en küçük/en büyük değeri tutar.
+
+    Grafik çizimi için kullanılır: her piksel sütunu bir kovadır, böylece
+    pencerede kaç örnek olursa olsun çizim maliyeti piksel sayısıyla sınırlı
+    kalır. `add()` O(1)'dir; `rebuild()` yalnızca genişlik veya pencere
+    değiştiğinde geçmişten bir kez doldurma yapar.
+    """
+
+    def __init__(self, width: int, span: float) -> None:
+        self.width = max(1, width)
+        self.span = span
+        self.bucket_seconds = span / self.width
+        self.mins = array("i", [MISSING]) * self.width
+        self.maxs = array("i", [MISSING]) * self.width
+        self.newest: Optional[int] = None  # en yeni kovanın mutlak numarası
+
+    def _shift_to(self, bucket: int) -> None:
+        """En yeni kovayı `bucket` yap; aradaki (en fazla `width`) kovayı boşalt."""
+        width = self.width
+        first = bucket - width + 1 if self.newest is None else self.newest + 1
+        for old in range(max(first, bucket - width + 1), bucket + 1):
+            pos = old % width
+            self.mins[pos] = MISSING
+            self.maxs[pos] = MISSING
+        self.newest = bucket
+
+    def add(self, timestamp: float, value: int) -> None:
+        bucket = int(timestamp // self.bucket_seconds)
+        if self.newest is None or bucket > self.newest:
+            self._shift_to(bucket)
+        elif bucket <= self.newest - self.width:
+            return  # pencerenin dışında kalan eski örnek
+        if value == MISSING:
+            return
+        pos = bucket % self.width
+        low = self.mins[pos]
+        if low == MISSING or value < low:
+            self.mins[pos] = value
+        high = self.maxs[pos]
+        if high == MISSING or value > high:
+            self.maxs[pos] = value
+
+    def advance(self, timestamp: float) -> None:
+        """Yeni örnek olmasa da pencereyi `timestamp` anına kaydır."""
+        bucket = int(timestamp // self.bucket_seconds)
+        if self.newest is None or bucket > self.newest:
+            self._shift_to(bucket)
+
+    def rebuild(self, segments: List[Segment], now: float) -> None:
+        self.newest = None
+        self.advance(now)
+        for timestamps, values in segments:
+            for i in range(len(timestamps)):
+                self.add(timestamps[i], values[i])
+
+    def columns(self) -> Iterator[Tuple[int, int, int]]:
+        """Soldan sağa (piksel sırası, min, max) üçlüleri; boş kovalar atlanır."""
+        if self.newest is None:
+            return
+        width = self.width
+        oldest = self.newest - width + 1
+        mins = self.mins
+        maxs = self.maxs
+        for x in range(width):
+            pos = (oldest + x) % width
+            low = mins[pos]
+            if low != MISSING:
+                yield x, low, maxs[pos]
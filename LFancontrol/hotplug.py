@@ -0,0 +1,104 @@
+"""hwmon aygıtlarının eklenip çıkarılmasını izler (Qt içermez).
+
+Gerçek `/sys/class/hwmon` için çekirdeğin uevent netlink yayınını dinler;
+netlink kullanılamıyorsa veya sahte bir kök verilmişse, hwmonN girdilerini
+belirli aralıklarla listeleyip karşılaştırır.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Optional, Set
+
+from backend import HWMON_ROOT
+
+# NETLINK_KOBJECT_UEVENT ve çekirdeğin yayın grubu
+_NETLINK_KOBJECT_UEVENT = 15
+_KERNEL_GROUP = 1
+
+
+class HotplugMonitor:
+    """Değişen hwmonN girdilerini bildirir; `poll()` hiçbir zaman bloklamaz."""
+
+    def __init__(self, root: Path = HWMON_ROOT, fallback_interval: float = 5.0) -> None:
+        self.root = root
+        self.fallback_interval = fallback_interval
+        self._sock: Optional[socket.socket] = None
+        self._known: Set[str] = self._list_entries()
+        self._next_check = 0.0
+        if root == HWMON_ROOT:
+            self._sock = self._open_netlink()
+
+    @staticmethod
+    def _open_netlink() -> Optional[socket.socket]:
+        try:
+            sock = socket.socket(
+                socket.AF_NETLINK, socket.SOCK_DGRAM, _NETLINK_KOBJECT_UEVENT
+            )
+        except (OSError, AttributeError):
+            return None
+        try:
+            # Port kimliği 0: çekirdek benzersiz bir kimlik atar. pid kullanmak,
+            # aynı süreçte ikinci bir izleyici açıldığında (ör. tepsiden pencere
+            # yeniden kurulurken) EADDRINUSE verir.
+            sock.bind((0, _KERNEL_GROUP))
+        except OSError:
+            sock.close()
+            return None
+        sock.setblocking(False)
+        return sock
+
+    def _list_entries(self) -> Set[str]:
+        try:
+            return {e for e in os.listdir(self.root) if e.startswith("hwmon")}
+        except OSError:
+            return set()
+
+    def fileno(self) -> int:
+        """select/poll için netlink soketi; yoklama kipinde -1."""
+        return self._sock.fileno() if self._sock is not None else -1
+
+    def poll(self) -> Set[str]:
+        """Son çağrıdan bu yana eklenen veya çıkarılan hwmonN girdileri."""
+        if self._sock is not None:
+            return self._drain_netlink()
+
+        now = time.monotonic()
+        if now < self._next_check:
+            return set()
+        self._next_check = now + self.fallback_interval
+        current = self._list_entries()
+        changed = current ^ self._known
+        self._known = current
+        return changed
+
+    def _drain_netlink(self) -> Set[str]:
+        changed: Set[str] = set()
+        while True:
+            try:
+                message = self._sock.recv(16384)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                return changed
+            fields = {}
+            for part in message.split(b"\0")[1:]:
+                key, sep, value = part.partition(b"=")
+                if sep:
+                    fields[key] = value
+            if fields.get(b"SUBSYSTEM") != b"hwmon":
+                continue
+            if fields.get(b"ACTION") not in (b"add", b"remove"):
+                continue
+            entry = os.path.basename(fields.get(b"DEVPATH", b"")).decode(
+                "utf-8", "replace"
+            )
+            if entry.startswith("hwmon"):
+                changed.add(entry)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
@@ -0,0 +1,214 @@
+"""sysfs okuma/yazma gecikmelerinin dosya başına histogramları (Qt içermez).
+
+Bazı hwmon sürücüleri (ör. ACPI/EC üzerinden okuyan thinkpad_acpi ya da
+Super I/O çipleri) bir değeri döndürmek için milisaniyeler harcayabilir.
+Kayıt açıkken `SENSOR_READER` üzerinden yapılan her okuma ve
+`HwmonFan`/profil yazmaları dosya yoluna göre histograma eklenir:
+
+    from latency import LATENCY
+    LATENCY.enable()
+    ...
+    for row in LATENCY.rows(by_driver=True):
+        print(row.name, row.p99)
+
+Histogramlar HDR benzeridir: her ikinin kuvveti aralığı dört alt kovaya
+bölünür (yaklaşık %25 çözünürlük, 1 µs – 16 s). Kayıt sabit boyutlu bir
+diziye tek bir artırmadır; kapalıyken okuma yoluna hiçbir ek iş girmez.
+`lfanctl latency` ve `fancontrold` (SIGUSR1) kaydı çalışma anında açıp
+kapatır.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# 4 µs altı doğrudan, sonrası ikinin kuvveti başına 4 alt kova; 2**24 µs üstü son kovada.
+_SUB_BITS = 2
+_SUB = 1 << _SUB_BITS
+BUCKETS = (23 - _SUB_BITS + 2) * _SUB
+
+OP_READ = "read"
+OP_WRITE = "write"
+
+
+def _bucket(micros: int) -> int:
+    if micros < _SUB:
+        return micros
+    shift = micros.bit_length() - _SUB_BITS - 1
+    index = shift * _SUB + (micros >> shift)
+    return index if index < BUCKETS else BUCKETS - 1
+
+
+def _upper_bound(index: int) -> float:
+    """Kovadaki en büyük gecikme (saniye)."""
+    if index < _SUB:
+        return (index + 1) / 1e6
+    shift = index // _SUB - 1
+    sub = index % _SUB + _SUB
+    return ((sub + 1) << shift) / 1e6
+
+
+class LatencyHistogram:
+    """Sabit kovalı gecikme histogramı; toplam ve en büyük değer ayrıca tutulur."""
+
+    __slots__ = ("counts", "count", "total", "maximum")
+
+    def __init__(self) -> None:
+        self.counts = array("Q", [0]) * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[_bucket(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        if other.maximum > self.maximum:
+            self.maximum = other.maximum
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """`q` (0–1) dilimini içeren kovanın üst sınırı; en büyük değeri aşmaz."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(_upper_bound(i), self.maximum)
+        return self.maximum
+
+
+@dataclass
+class LatencyRow:
+    """Rapor satırı: bir dosya (veya sürücü) ve işlem türü için özet (saniye)."""
+
+    name: str
+    op: str
+    count: int
+    mean: float
+    p50: float
+    p99: float
+    maximum: float
+
+    @classmethod
+    def from_histogram(cls, name: str, op: str, hist: LatencyHistogram) -> "LatencyRow":
+        return cls(
+            name, op, hist.count, hist.mean, hist.quantile(0.5), hist.quantile(0.99), hist.maximum
+        )
+
+
+def driver_name(path: str) -> str:
+    """Dosyanın bulunduğu hwmon aygıtının sürücü adı (`name`), okunamazsa dizin adı."""
+    directory = os.path.dirname(path)
+    try:
+        with open(os.path.join(directory, "name"), "r", encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        name = ""
+    return name or os.path.basename(directory)
+
+
+class LatencyRecorder:
+    """Dosya yolu başına okuma ve yazma histogramları.
+
+    `record_read`/`record_write` yalnızca kayıt açıkken çağrılır; sözlüğe
+    ekleme GIL altında atomik olduğundan kilit yalnızca sıfırlama ve rapor
+    sırasında kullanılır.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.reads: Dict[str, LatencyHistogram] = {}
+        self.writes: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._drivers: Dict[str, str] = {}
+
+    def enable(self, reader: Optional[object] = None) -> None:
+        """Kaydı aç; `reader` verilmezse paylaşılan `SENSOR_READER` kullanılır."""
+        if reader is None:
+            from backend import SENSOR_READER as reader
+        reader.set_recorder(self)
+        self.enabled = True
+
+    def disable(self, reader: Optional[object] = None) -> None:
+        if reader is None:
+            from backend import SENSOR_READER as reader
+        reader.set_recorder(None)
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.reads = {}
+            self.writes = {}
+
+    def record_read(self, path: str, seconds: float) -> None:
+        hist = self.reads.get(path)
+        if hist is None:
+            hist = self.reads.setdefault(path, LatencyHistogram())
+        hist.add(seconds)
+
+    def record_write(self, path: str, seconds: float) -> None:
+        hist = self.writes.get(path)
+        if hist is None:
+            hist = self.writes.setdefault(path, LatencyHistogram())
+        hist.add(seconds)
+
+    def _driver(self, path: str) -> str:
+        name = self._drivers.get(path)
+        if name is None:
+            name = self._drivers[path] = driver_name(path)
+        return name
+
+    def rows(self, by_driver: bool = False) -> List[LatencyRow]:
+        """Okuma ve yazma özetleri; en yavaş (p99) önce.
+
+        `by_driver` True ise aynı sürücüye ait dosyaların histogramları birleştirilir.
+        """
+        with self._lock:
+            groups: List[Tuple[str, Dict[str, LatencyHistogram]]] = [
+                (OP_READ, dict(self.reads)),
+                (OP_WRITE, dict(self.writes)),
+            ]
+        rows: List[LatencyRow] = []
+        for op, table in groups:
+            if by_driver:
+                merged: Dict[str, LatencyHistogram] = {}
+                for path, hist in table.items():
+                    merged.setdefault(self._driver(path), LatencyHistogram()).merge(hist)
+                table = merged
+            rows.extend(LatencyRow.from_histogram(name, op, hist) for name, hist in table.items())
+        rows.sort(key=lambda row: row.p99, reverse=True)
+        return rows
+
+
+def format_rows(rows: List[LatencyRow]) -> str:
+    """Satırları µs cinsinden hizalı bir metin tablosuna çevir."""
+    lines = [f"{'ad':<40} {'işlem':<5} {'sayı':>8} {'ort':>9} {'p50':>9} {'p99':>9} {'en çok':>9}"]
+    for row in rows:
+        lines.append(
+            f"{row.name:<40} {row.op:<5} {row.count:>8} {row.mean * 1e6:>9.1f} "
+            f"{row.p50 * 1e6:>9.1f} {row.p99 * 1e6:>9.1f} {row.maximum * 1e6:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+# Süreç genelinde paylaşılan kayıtçı.
+LATENCY = LatencyRecorder()
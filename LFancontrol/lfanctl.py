@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""Fanları komut satırından sorgulayan ve ayarlayan araç (Qt gerektirmez).
+
+Kullanım:
+
+    python lfanctl.py list [--sensors] [--format table|json|csv]
+    python lfanctl.py watch [--interval 1.0] [--count N] [--sensors] [--format ...]
+    python lfanctl.py set <fan> <pwm | yüzde% > [--level]
+    python lfanctl.py auto <fan> [<fan> ...] | --all
+    python lfanctl.py profile [<ad>] [--dry-run]
+    python lfanctl.py latency [--duration 5] [--interval 0.1] [--by-driver]
+    python lfanctl.py record <dosya> [--interval 1.0] [--duration 0]
+    python lfanctl.py publish [--interval 1.0]
+
+Betiklerden ve cron işlerinden ucuzca çağrılabilmesi için her alt komut
+yalnızca ihtiyaç duyduğu modülleri, komut çalışırken yükler; örneğin
+yetkili yardımcı yalnızca doğrudan yazma izni yoksa içe aktarılır.
+
+`list`, `watch` ve `record` canlı bir yayıncı varsa (`lfanctl publish` ya da
+`fancontrold`) değerleri sysfs yerine paylaşılan bellekteki veri yolundan
+okur; `--no-bus` bunu kapatır.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Dict, List, NoReturn, Optional, Sequence, Union
+
+EXIT_ERROR = 1
+
+
+def _fail(message: str) -> NoReturn:
+    print(f"lfanctl: {message}", file=sys.stderr)
+    sys.exit(EXIT_ERROR)
+
+
+def _scan(args: argparse.Namespace, bus: bool = False) -> "HwmonScanner":
+    """Tarayıcı; `bus` True ise ve canlı bir yayıncı varsa veri yolu tarayıcısı."""
+    if bus and not args.root and not args.no_bus:
+        from snapshot_bus import open_bus
+
+        scanner = open_bus()
+        if scanner is not None:
+            return scanner
+
+    from backend import HwmonScanner
+
+    scanner = HwmonScanner(args.root) if args.root else HwmonScanner()
+    scanner.scan()
+    return scanner
+
+
+def _find_fan(scanner: "HwmonScanner", fan_id: str) -> "HwmonFan":
+    for fan in scanner.fans:
+        if fan.id == fan_id:
+            return fan
+    _fail(f"fan bulunamadı: {fan_id} (kimlikler için: lfanctl list)")
+
+
+def _format_value(sensor: "Sensor", raw: Optional[int]) -> Union[int, float, None]:
+    if raw is None:
+        return None
+    if sensor.kind == "temp":
+        return raw / 1000.0
+    return raw
+
+
+# --- Çıktı ---
+
+
+def _emit(
+    rows: List[Dict[str, object]], columns: Sequence[str], fmt: str, header: bool = True
+) -> None:
+    """`rows` (sözlük listesi) tablo, JSON satırları veya CSV olarak yazdır."""
+    out = sys.stdout
+    if fmt == "json":
+        import json
+
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    elif fmt == "csv":
+        import csv
+
+        writer = csv.DictWriter(out, columns, extrasaction="ignore", lineterminator="\n")
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+    else:
+        cells = [["" if row.get(c) is None else str(row.get(c)) for c in columns] for row in rows]
+        widths = [len(c) for c in columns]
+        for line in cells:
+            widths = [max(w, len(cell)) for w, cell in zip(widths, line)]
+        if header:
+            out.write("  ".join(c.upper().ljust(w) for c, w in zip(columns, widths)).rstrip() + "\n")
+        for line in cells:
+            out.write("  ".join(cell.ljust(w) for cell, w in zip(line, widths)).rstrip() + "\n")
+    out.flush()
+
+
+# --- Alt komutlar ---
+
+_MODES: Dict[int, str] = {0: "full", 1: "manual", 2: "auto"}
+
+
+def cmd_list(args: argparse.Namespace) -> None:
+    from backend import SENSOR_READER
+
+    scanner = _scan(args, bus=True)
+    snapshot = scanner.sample_all()
+    if args.sensors:
+        rows = [
+            {
+                "id": sensor.id,
+                "kind": sensor.kind,
+                "label": sensor.label,
+                "value": _format_value(sensor, snapshot.get(slot)),
+            }
+            for slot, sensor in enumerate(scanner.sensors)
+        ]
+        _emit(rows, ["id", "kind", "label", "value"], args.format)
+        return
+
+    rows: List[Dict[str, object]] = []
+    for fan in scanner.fans:
+        mode = None
+        if fan.pwm_enable_path is not None:
+            try:
+                enable = SENSOR_READER.read_int(fan.pwm_enable_path)
+            except OSError:
+                enable = None
+            mode = _MODES.get(enable, enable)
+        rows.append(
+            {
+                "id": fan.id,
+                "label": fan.label,
+                "rpm": snapshot.get(fan.rpm_slot),
+                "pwm": snapshot.get(fan.pwm_slot),
+                "mode": mode,
+            }
+        )
+    _emit(rows, ["id", "label", "rpm", "pwm", "mode"], args.format)
+
+
+def cmd_watch(args: argparse.Namespace) -> None:
+    import time
+
+    scanner = _scan(args, bus=True)
+    if args.sensors:
+        slots = list(range(len(scanner.sensors)))
+    else:
+        slots = [fan.rpm_slot for fan in scanner.fans]
+    sensors = scanner.sensors
+    columns = ["time"] + [sensors[slot].id for slot in slots]
+
+    snapshot = scanner.sample_all()
+    deadline = time.monotonic()
+    emitted = 0
+    try:
+        while True:
+            scanner.sample_all(snapshot)
+            if args.format == "table":
+                row = {"time": time.strftime("%H:%M:%S", time.localtime(snapshot.timestamp))}
+            else:
+                row = {"time": round(snapshot.timestamp, 3)}
+            for slot in slots:
+                row[sensors[slot].id] = _format_value(sensors[slot], snapshot.get(slot))
+            _emit([row], columns, args.format, header=emitted == 0)
+            emitted += 1
+            if args.count and emitted >= args.count:
+                return
+            # Mutlak son tarihler: yazdırma süresi aralığı kaydırmasın.
+            deadline += args.interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+    except (KeyboardInterrupt, BrokenPipeError):
+        # `watch | head` gibi kullanımlarda sessizce çık.
+        return
+
+
+def _parse_pwm(text: str, fan: "HwmonFan", level: bool) -> int:
+    try:
+        if level:
+            from calibration import load_calibrations
+
+            calibration = load_calibrations().get(fan.id)
+            number = int(text)
+            if calibration is not None:
+                return calibration.level_to_pwm(number)
+            return int(max(0, min(7, number)) / 7.0 * fan.max_pwm)
+        if text.endswith("%"):
+            return int(round(float(text[:-1]) / 100.0 * fan.max_pwm))
+        return int(text)
+    except ValueError:
+        _fail(f"geçersiz değer: {text}")
+
+
+def cmd_set(args: argparse.Namespace) -> None:
+    from calibration import apply_calibration, load_calibrations
+
+    scanner = _scan(args)
+    fan = _find_fan(scanner, args.fan)
+    if fan.pwm_path is None:
+        _fail(f"{fan.id}: PWM kontrolü desteklenmiyor.")
+    apply_calibration([fan], load_calibrations())
+    value = _parse_pwm(args.value, fan, args.level)
+    clamped = max(fan.min_pwm, min(fan.max_pwm, value))
+    try:
+        fan.set_pwm(clamped)
+    except PermissionError:
+        from privileged import PrivilegedWriteError, pkexec_set_pwm
+
+        try:
+            pkexec_set_pwm(fan, clamped)
+        except PrivilegedWriteError as exc:
+            _fail(f"{exc.title}: {exc.message}")
+    except OSError as exc:
+        _fail(f"{fan.id}: PWM yazılamadı: {exc}")
+    if not args.quiet:
+        print(f"{fan.id}: pwm={clamped}")
+
+
+def cmd_auto(args: argparse.Namespace) -> None:
+    scanner = _scan(args)
+    if args.all:
+        fans = [fan for fan in scanner.fans if fan.pwm_enable_path is not None]
+    elif args.fans:
+        fans = [_find_fan(scanner, fan_id) for fan_id in args.fans]
+    else:
+        _fail("fan kimliği veya --all verilmeli.")
+
+    denied: List["HwmonFan"] = []
+    for fan in fans:
+        if fan.pwm_enable_path is None:
+            print(f"{fan.id}: pwm_enable yok, atlandı.", file=sys.stderr)
+            continue
+        try:
+            fan.set_auto_mode()
+        except PermissionError:
+            denied.append(fan)
+        except OSError as exc:
+            _fail(f"{fan.id}: otomatik moda alınamadı: {exc}")
+    if denied:
+        from privileged import HELPER, PrivilegedWriteError
+
+        try:
+            HELPER.write_batch([(fan.pwm_enable_path, 2) for fan in denied])
+        except PrivilegedWriteError as exc:
+            _fail(f"{exc.title}: {exc.message}")
+    if not args.quiet:
+        for fan in fans:
+            if fan.pwm_enable_path is not None:
+                print(f"{fan.id}: auto")
+
+
+def cmd_profile(args: argparse.Namespace) -> None:
+    from profiles import ProfileError, load_profiles
+
+    try:
+        config = load_profiles()
+    except ProfileError as exc:
+        _fail(str(exc))
+    if not args.name:
+        import json
+
+        source = str(config.path) if config.path else "yerleşik"
+        rows = [
+            {
+                "profile": name,
+                "settings": ", ".join(
+                    f"{key}={json.dumps(value, ensure_ascii=False) if isinstance(value, dict) else value}"
+                    for key, value in entries.items()
+                ),
+                "source": source,
+            }
+            for name, entries in config.profiles.items()
+        ]
+        _emit(rows, ["profile", "settings", "source"], args.format)
+        return
+
+    from calibration import apply_calibration, load_calibrations
+    from profiles import apply_plan, plan_profile
+
+    scanner = _scan(args)
+    calibrations = load_calibrations()
+    apply_calibration(scanner.fans, calibrations)
+    try:
+        plan = plan_profile(config, args.name, scanner.fans, calibrations)
+        if not args.dry_run:
+            apply_plan(plan)
+    except ProfileError as exc:
+        if not exc.rolled_back:
+            _fail(f"{exc} (önceki değerlere dönülemedi)")
+        _fail(str(exc))
+    if not args.quiet:
+        for setting in plan:
+            print(f"{setting.fan.id}: {setting.describe()}")
+
+
+def cmd_latency(args: argparse.Namespace) -> None:
+    import time
+
+    from backend import SENSOR_READER
+    from latency import LATENCY
+
+    scanner = _scan(args)
+    snapshot = scanner.sample_all()
+    # İlk tur dosyaları açar; ölçüme yalnızca kalıcı tanımlayıcılarla yapılan okumalar girsin.
+    LATENCY.enable(SENSOR_READER)
+    end = time.monotonic() + args.duration
+    deadline = time.monotonic()
+    try:
+        while deadline < end:
+            scanner.sample_all(snapshot)
+            deadline += args.interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        LATENCY.disable(SENSOR_READER)
+
+    rows = [
+        {
+            "name": row.name,
+            "op": row.op,
+            "count": row.count,
+            "mean_us": round(row.mean * 1e6, 1),
+            "p50_us": round(row.p50 * 1e6, 1),
+            "p99_us": round(row.p99 * 1e6, 1),
+            "max_us": round(row.maximum * 1e6, 1),
+        }
+        for row in LATENCY.rows(by_driver=args.by_driver)
+    ]
+    _emit(rows, ["name", "op", "count", "mean_us", "p50_us", "p99_us", "max_us"], args.format)
+
+
+def cmd_record(args: argparse.Namespace) -> None:
+    import time
+    from pathlib import Path
+
+    from sensor_trace import TraceWriter
+
+    scanner = _scan(args, bus=True)
+    try:
+        writer = TraceWriter(Path(args.path), scanner.sensors, scanner.fans)
+    except (OSError, ValueError) as exc:
+        _fail(f"kayıt dosyası açılamadı: {exc}")
+    snapshot = None
+    ticks = 0
+    deadline = time.monotonic()
+    end = deadline + args.duration if args.duration > 0 else None
+    try:
+        while end is None or deadline < end:
+            snapshot = scanner.sample_all(snapshot)
+            writer.append(snapshot)
+            ticks += 1
+            deadline += args.interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+    print(f"{args.path}: {ticks} tur eklendi, dosya {writer.size} bayt", file=sys.stderr)
+
+
+def cmd_publish(args: argparse.Namespace) -> None:
+    import signal
+    import time
+
+    from hotplug import HotplugMonitor
+    from snapshot_bus import SnapshotPublisher
+
+    scanner = _scan(args)
+    try:
+        publisher = SnapshotPublisher(scanner.sensors, scanner.fans, args.interval)
+    except OSError as exc:
+        _fail(f"yayın başlatılamadı: {exc}")
+    hotplug = HotplugMonitor(args.root) if args.root else HotplugMonitor()
+
+    def stop(*_args: object) -> None:
+        raise KeyboardInterrupt
+
+    # SIGTERM'de de dosya kapalı işaretlenip silinsin.
+    signal.signal(signal.SIGTERM, stop)
+    if not args.quiet:
+        print(f"{publisher.path}: {len(scanner.sensors)} sensör yayınlanıyor", file=sys.stderr)
+    snapshot = None
+    deadline = time.monotonic()
+    try:
+        while True:
+            changed = hotplug.poll()
+            if changed:
+                scanner.rescan_entries(changed)
+                publisher.reset(scanner.sensors, scanner.fans)
+                snapshot = None
+            snapshot = scanner.sample_all(snapshot)
+            publisher.publish(snapshot)
+            deadline += args.interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                deadline = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+        hotplug.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="lfanctl", description="Linux fan denetimi")
+    parser.add_argument("--root", default=None, help="hwmon kökü (test için)")
+    parser.add_argument(
+        "--no-bus", action="store_true", help="Yayıncı olsa da sensörleri doğrudan oku"
+    )
+    sub = parser.add_subparsers(dest="command", metavar="KOMUT")
+    sub.required = True
+
+    def add_format(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--format", choices=("table", "json", "csv"), default="table")
+        p.add_argument("--sensors", action="store_true", help="Tüm sensörleri göster")
+
+    p = sub.add_parser("list", help="Fanları (veya tüm sensörleri) listele")
+    add_format(p)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("watch", help="Değerleri belirli aralıklarla yazdır")
+    add_format(p)
+    p.add_argument("--interval", type=float, default=1.0, help="Saniye")
+    p.add_argument("--count", type=int, default=0, help="Bu kadar satırdan sonra çık (0: sınırsız)")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("set", help="Fanı manuel moda alıp PWM değerini ayarla")
+    p.add_argument("fan")
+    p.add_argument("value", help="PWM (0–255), yüzde (ör. 40%%) veya --level ile 0–7")
+    p.add_argument("--level", action="store_true", help="Değeri 0–7 seviye olarak yorumla")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_set)
+
+    p = sub.add_parser("auto", help="Fanları otomatik moda (pwm_enable=2) al")
+    p.add_argument("fans", nargs="*")
+    p.add_argument("--all", action="store_true", help="pwm_enable'ı olan tüm fanlar")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_auto)
+
+    p = sub.add_parser("profile", help="Profilleri listele veya bir profili uygula")
+    p.add_argument("name", nargs="?", help="Uygulanacak profil (verilmezse liste)")
+    p.add_argument("--dry-run", action="store_true", help="Yalnızca hesaplanan değerleri yazdır")
+    p.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_profile)
+
+    p = sub.add_parser("latency", help="Sensör okuma gecikmelerini ölç (dosya/sürücü başına)")
+    p.add_argument("--duration", type=float, default=5.0, help="Ölçüm süresi (s)")
+    p.add_argument("--interval", type=float, default=0.1, help="Tur aralığı (s)")
+    p.add_argument("--by-driver", action="store_true", help="Dosyaları sürücü adına göre birleştir")
+    p.add_argument("--format", choices=("table", "json", "csv"), default="table")
+    p.set_defaults(func=cmd_latency)
+
+    p = sub.add_parser("record", help="Tüm sensörleri belirli aralıklarla dosyaya kaydet")
+    p.add_argument("path", help="Kayıt dosyası (varsa sonuna eklenir)")
+    p.add_argument("--interval", type=float, default=1.0, help="Saniye")
+    p.add_argument("--duration", type=float, default=0.0, help="Süre (s; 0: Ctrl-C'ye kadar)")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("publish", help="Sensörleri okuyup paylaşılan bellekte yayınla")
+    p.add_argument("--interval", type=float, default=1.0, help="Saniye")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_publish)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.root:
+        from pathlib import Path
+
+        args.root = Path(args.root)
+    if getattr(args, "interval", 1.0) <= 0:
+        _fail("--interval pozitif olmalı.")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
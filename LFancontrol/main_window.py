@@ -1,40 +1,178 @@
 from __future__ import annotations
 
-import subprocess
-import sys
 from pathlib import Path
-from typing import List, Optional
-
-from PySide6 import QtCore, QtWidgets
-
-from backend import HwmonFan, HwmonScanner
+from typing import Dict, List, Optional
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from alarms import AlarmEvent, AlarmWatcher
+from backend import HwmonFan, HwmonScanner, Snapshot
+from calibration import FanCalibration, apply_calibration, load_calibrations
+from chart_widget import SERIES_COLORS, ChartSeries, HistoryChart
+from faults import ACTION_AUTO, FailSafe, FaultDetector, FaultEvent
+from history import HistoryStore, default_history_path
+from hotplug import HotplugMonitor
+from privileged import HELPER, HelperWriteError, PrivilegedWriteError, pkexec_set_pwm
+from profiles import (
+    FanSetting,
+    ProfileConfig,
+    ProfileError,
+    apply_plan,
+    load_profiles,
+    plan_profile,
+)
+from sample_scheduler import SampleScheduler, ScheduleSettings
+from sampler import CommandResult, Sampler
+from sensor_trace import ReplayScanner
+from snapshot_bus import open_bus
+from write_scheduler import MODE_AUTO, MODE_MANUAL, PwmWriteScheduler
+
+
+class _SamplerBridge(QtCore.QObject):
+    """Örnekleyici iş parçacığından gelen sonuçları Qt sinyallerine çevirir."""
+
+    snapshot_ready = QtCore.Signal(object)
+    command_finished = QtCore.Signal(object)
+    fans_changed = QtCore.Signal(object)
+    faults_detected = QtCore.Signal(object)
+
+
+def _flush_pwm_job(writes: PwmWriteScheduler, fan: HwmonFan) -> None:
+    """Örnekleyici iş parçacığında çalışır: yalnızca `fan`ın bekleyen PWM yazmasını uygula.
+
+    Doğrudan yazma izni yoksa aynı (sınırlanmış) değer yetkili yardımcıyla yazılır.
+    """
+    value = writes.pending_pwm(fan)
+    for _fan, exc in writes.flush(force=True, fan=fan):
+        if not isinstance(exc, PermissionError) or value is None:
+            raise exc
+        # İzin yoksa pkexec ile başlatılan kalıcı yardımcı üzerinden yaz
+        pkexec_set_pwm(fan, value)
+        writes.note_written(fan, MODE_MANUAL, value)
+
+
+def _request_pwm_job(writes: PwmWriteScheduler, fan: HwmonFan, value: int) -> None:
+    """Örnekleyici iş parçacığında çalışır: değeri yazmadan beklemeye al (slider sürükleme)."""
+    writes.request_pwm(fan, value)
+
+
+def _write_pwm_job(writes: PwmWriteScheduler, fan: HwmonFan, value: int) -> None:
+    """Örnekleyici iş parçacığında çalışır: doğrudan yaz, izin yoksa yetkili yardımcıyı dene.
+
+    Fanın zaten bu değerde olduğu biliniyorsa hiçbir şey yazılmaz.
+    """
+    writes.request_pwm(fan, value)
+    _flush_pwm_job(writes, fan)
+
+
+def _apply_profile_job(
+    writes: PwmWriteScheduler,
+    config: ProfileConfig,
+    name: str,
+    fans: List[HwmonFan],
+    calibrations: Dict[str, FanCalibration],
+) -> List[FanSetting]:
+    """Örnekleyici iş parçacığında çalışır: profili tek işlemle uygula."""
+    plan = plan_profile(config, name, fans, calibrations)
+    apply_plan(plan, writes)
+    return plan
+
+
+def _set_mode_job(writes: PwmWriteScheduler, fan: HwmonFan, mode: str) -> None:
+    """Örnekleyici iş parçacığında çalışır: fanı manuel/otomatik moda al."""
+    if mode == MODE_AUTO:
+        writes.request_auto(fan)
+        for _fan, exc in writes.flush(force=True, fan=fan):
+            raise exc
+        return
+    try:
+        fan.set_manual_mode()
+    except OSError:
+        writes.forget(fan)
+        raise
+    writes.note_written(fan, MODE_MANUAL)
 
 
 class MainWindow(QtWidgets.QMainWindow):
     """Fan listesini ve seçili fanın kontrolünü gösteren ana pencere."""
 
     RPM_UPDATE_INTERVAL_MS = 1000
-
-    def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
+    # 1 saniyelik örneklemeyle bir günlük geçmiş
+    HISTORY_CAPACITY = 24 * 3600
+    # Slider sürüklenirken bu pencere içindeki değerler tek yazmaya indirgenir.
+    SLIDER_WRITE_WINDOW_MS = 150
+
+    def __init__(
+        self,
+        parent: Optional[QtWidgets.QWidget] = None,
+        replay: Optional[ReplayScanner] = None,
+        root: Optional[Path] = None,
+    ) -> None:
         super().__init__(parent)
         # Görev çubuğu ve başlıkta görünecek isim
         self.setWindowTitle("Linux Fan Control")
-        self.resize(520, 260)
-
-        self._scanner = HwmonScanner()
+        self.resize(620, 480)
+
+        # Kayıttan oynatırken sensörler kayıttan okunur, fan yazmaları donanıma gitmez.
+        self._replay = replay
+        # Canlı bir yayıncı varsa sensörler onun paylaşılan belleğinden okunur.
+        self._bus = open_bus() if replay is None else None
+        if replay is not None:
+            self._scanner = replay
+        else:
+            self._scanner = self._bus
+            if self._scanner is None:
+                self._scanner = HwmonScanner(root) if root else HwmonScanner()
         self._fans: List[HwmonFan] = self._scanner.scan()
+        # Kalibre edilmiş fanlar için ölçülen PWM sınırları ve seviye eşlemesi
+        self._calibrations: Dict[str, FanCalibration] = load_calibrations()
+        apply_calibration(self._fans, self._calibrations)
+        try:
+            self._profiles: Optional[ProfileConfig] = load_profiles()
+            self._profile_error = ""
+        except ProfileError as exc:
+            self._profiles = None
+            self._profile_error = str(exc)
+        self._history = self._open_history()
         self._current_fan: Optional[HwmonFan] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._sync_on_next_snapshot = False
+        # Yalnızca örnekleyici iş parçacığında kullanılır.
+        self._writes = PwmWriteScheduler(self.SLIDER_WRITE_WINDOW_MS / 1000.0)
+        # Sürükleme penceresi dolunca bekleyen slider değerini yazdırır.
+        self._slider_fan: Optional[HwmonFan] = None
+        self._slider_timer = QtCore.QTimer(self)
+        self._slider_timer.setSingleShot(True)
+        self._slider_timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._slider_timer.setInterval(self.SLIDER_WRITE_WINDOW_MS)
+        self._slider_timer.timeout.connect(self._flush_slider_write)
         self.level_buttons: List[QtWidgets.QPushButton] = []
+        # Fan yoksa grafik oluşturulmaz.
+        self.chart: Optional[HistoryChart] = None
 
         self._build_ui()
+        self._setup_sampler()
         self._populate_fan_list()
-        self._setup_timer()
+        if replay is not None:
+            self.setWindowTitle(f"Linux Fan Control — {replay.root.name}")
+            self.statusBar().showMessage(
+                f"Kayıttan oynatılıyor: {replay.root} ({len(replay)} tur)"
+            )
+        elif self._bus is not None:
+            self.statusBar().showMessage(
+                f"Değerler veri yolundan okunuyor (yayıncı pid {self._bus.reader.pid})", 10000
+            )
+
+    # Grafik penceresi seçenekleri: (etiket, saniye)
+    CHART_SPANS = [("1 dk", 60.0), ("10 dk", 600.0), ("1 saat", 3600.0)]
 
     def _build_ui(self) -> None:
         central = QtWidgets.QWidget(self)
         self.setCentralWidget(central)
 
-        main_layout = QtWidgets.QHBoxLayout(central)
+        outer_layout = QtWidgets.QVBoxLayout(central)
+        main_layout = QtWidgets.QHBoxLayout()
+        outer_layout.addLayout(main_layout, 1)
 
         # Sol: fan listesi
         self.fan_list = QtWidgets.QListWidget()
@@ -64,6 +202,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pwm_slider.setRange(0, 255)
         self.pwm_slider.setEnabled(False)
         self.pwm_slider.valueChanged.connect(self._on_pwm_slider_changed)
+        # Sürükleme sırasındaki değerler pencere içinde birleştirilir; bırakınca
+        # son değer hemen yazılır.
+        self.pwm_slider.sliderMoved.connect(self._on_pwm_slider_moved)
         self.pwm_slider.sliderReleased.connect(self._apply_pwm_from_slider)
 
         self.pwm_value_label = QtWidgets.QLabel("PWM: -")
@@ -82,6 +223,20 @@ class MainWindow(QtWidgets.QMainWindow):
             row, col = divmod(level, 4)
             level_layout.addWidget(btn, row, col)
 
+        # Profiller: tüm fanlar tek işlemle (gerekirse tek yetkili istekle) ayarlanır.
+        profile_group = QtWidgets.QGroupBox("Profil")
+        profile_layout = QtWidgets.QHBoxLayout(profile_group)
+        self.profile_combo = QtWidgets.QComboBox()
+        if self._profiles is not None:
+            self.profile_combo.addItems(self._profiles.profile_names())
+        self.profile_apply_button = QtWidgets.QPushButton("Uygula")
+        self.profile_apply_button.clicked.connect(self._on_profile_apply)
+        if not self.profile_combo.count():
+            profile_group.setEnabled(False)
+            profile_group.setToolTip(self._profile_error)
+        profile_layout.addWidget(self.profile_combo, 1)
+        profile_layout.addWidget(self.profile_apply_button)
+
         self.info_label = QtWidgets.QLabel("")
         self.info_label.setWordWrap(True)
         self.info_label.setStyleSheet("color: gray;")
@@ -90,6 +245,7 @@ class MainWindow(QtWidgets.QMainWindow):
         detail_layout.addWidget(self.rpm_label)
         detail_layout.addWidget(mode_group)
         detail_layout.addWidget(level_group)
+        detail_layout.addWidget(profile_group)
         # Slider arka planda kalsın; istenirse ileride gelişmiş moda açılabilir.
         self.pwm_slider.hide()
         detail_layout.addWidget(self.pwm_slider)
@@ -109,6 +265,31 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             main_layout.addWidget(self.fan_list, 1)
             main_layout.addWidget(detail_widget, 2)
+            outer_layout.addWidget(self._build_chart_group(), 1)
+
+    def _build_chart_group(self) -> QtWidgets.QGroupBox:
+        """Seçili fanın (veya tüm fanların) geçmiş grafiği."""
+        chart_group = QtWidgets.QGroupBox("Geçmiş")
+        chart_layout = QtWidgets.QVBoxLayout(chart_group)
+
+        options_layout = QtWidgets.QHBoxLayout()
+        self.chart_span_combo = QtWidgets.QComboBox()
+        for label, _seconds in self.CHART_SPANS:
+            self.chart_span_combo.addItem(label)
+        self.chart_span_combo.setCurrentIndex(1)
+        self.chart_span_combo.currentIndexChanged.connect(self._on_chart_span_changed)
+        self.chart_all_fans_check = QtWidgets.QCheckBox("Tüm fanların RPM'i")
+        self.chart_all_fans_check.toggled.connect(self._update_chart_series)
+        options_layout.addWidget(self.chart_span_combo)
+        options_layout.addWidget(self.chart_all_fans_check)
+        options_layout.addStretch(1)
+
+        self.chart = HistoryChart(span=self.CHART_SPANS[1][1])
+        self.chart.set_history(self._history)
+
+        chart_layout.addLayout(options_layout)
+        chart_layout.addWidget(self.chart, 1)
+        return chart_group
 
     def _populate_fan_list(self) -> None:
         self.fan_list.clear()
@@ -119,14 +300,224 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._fans:
             self.fan_list.setCurrentRow(0)
 
-    def _setup_timer(self) -> None:
-        self._rpm_timer = QtCore.QTimer(self)
-        self._rpm_timer.setInterval(self.RPM_UPDATE_INTERVAL_MS)
-        self._rpm_timer.timeout.connect(self._update_rpm_label)
-        self._rpm_timer.start()
+    def _setup_sampler(self) -> None:
+        # Tüm donanım okuma/yazmaları arka plandaki örnekleyicide yapılır;
+        # sonuçlar kuyruklu sinyallerle GUI iş parçacığına gelir.
+        self._bridge = _SamplerBridge(self)
+        self._bridge.snapshot_ready.connect(
+            self._on_snapshot, QtCore.Qt.QueuedConnection
+        )
+        self._bridge.command_finished.connect(
+            self._on_command_finished, QtCore.Qt.QueuedConnection
+        )
+        self._bridge.fans_changed.connect(
+            self._on_fans_changed, QtCore.Qt.QueuedConnection
+        )
+        self._bridge.faults_detected.connect(
+            self._on_faults, QtCore.Qt.QueuedConnection
+        )
+        # Arıza algılama ve güvenli duruma geçiş örnekleyici iş parçacığında yapılır.
+        self._faults = FaultDetector(self._scanner.sensors, self._fans)
+        self._fail_safe = FailSafe([], ACTION_AUTO, self._writes)
+        interval = self.RPM_UPDATE_INTERVAL_MS / 1000.0
+        if self._bus is not None:
+            # Yayıncı tüm sensörleri zaten okuyor; veri yolundan her turda okumak ucuz.
+            hotplug = self._bus.monitor()
+            schedule = None
+        else:
+            # Yalnızca gösterilen sensörler her turda, diğerleri değişim hızlarına göre okunur.
+            hotplug = HotplugMonitor(self._scanner.root)
+            schedule = SampleScheduler(self._scanner.sensors, ScheduleSettings(quantum=interval))
+            # Arıza algılayıcının izlediği sıcaklıklar her turda okunur.
+            schedule.set_demand("faults", self._faults.temp_slots(), interval)
+        self._sampler = Sampler(
+            self._scanner,
+            interval=interval,
+            on_snapshot=self._sampler_snapshot,
+            on_result=self._bridge.command_finished.emit,
+            hotplug=hotplug,
+            on_rescan=self._sampler_rescan,
+            schedule=schedule,
+        )
+        self._sampler.start()
+        # Alarm bildirimi gelince beklemeden yeni bir anlık görüntü alınır.
+        self._alarm_watcher = AlarmWatcher(self._scanner.index, self._sampler_alarm)
+        self._alarm_watcher.start()
+
+    def _sampler_snapshot(self, snapshot: Snapshot) -> None:
+        """Örnekleyici iş parçacığında çalışır: arızaları denetle, görüntüyü ilet."""
+        events = self._faults.update(snapshot, self._sampler.fresh_slots)
+        if events:
+            fail_safe = self._fail_safe
+            if not fail_safe.engaged:
+                # Yalnızca bu pencerenin manuel moda aldığı fanlar; diğerleri zaten sürücüde.
+                fail_safe.fans = [
+                    fan
+                    for fan in self._scanner.fans
+                    if fan.pwm_path is not None and self._writes.mode_of(fan) == MODE_MANUAL
+                ]
+            errors = fail_safe.handle(events)
+            denied = [fan for fan, exc in errors if isinstance(exc, PermissionError)]
+            if denied:
+                try:
+                    HELPER.write_batch([(fan.pwm_enable_path, 2) for fan in denied])
+                except (PrivilegedWriteError, HelperWriteError):
+                    pass
+                else:
+                    for fan in denied:
+                        self._writes.note_written(fan, MODE_AUTO)
+            self._bridge.faults_detected.emit(events)
+        self._bridge.snapshot_ready.emit(snapshot)
+
+    def _sampler_alarm(self, events: List[AlarmEvent]) -> None:
+        """Alarm izleyicisinin iş parçacığında çalışır."""
+        self._sampler.submit(list, events, tag="alarm")
+
+    def _sampler_rescan(self, fans: List[HwmonFan]) -> None:
+        # Sensör sıraları değişti; istatistikler yeni listeyle baştan başlar.
+        self._faults = FaultDetector(self._scanner.sensors, fans, self._faults.settings)
+        # Zamanlayıcı yeni sıralarla baştan kuruldu; istek yeniden bildirilmeli.
+        self._sampler.set_demand(
+            "faults", self._faults.temp_slots(), self.RPM_UPDATE_INTERVAL_MS / 1000.0
+        )
+        self._alarm_watcher.stop()
+        self._alarm_watcher = AlarmWatcher(self._scanner.index, self._sampler_alarm)
+        self._alarm_watcher.start()
+        self._bridge.fans_changed.emit(fans)
+
+    def _open_history(self) -> HistoryStore:
+        sensor_ids = [sensor.id for sensor in self._scanner.sensors]
+        if self._replay is not None:
+            # Oynatılan değerler kalıcı geçmişe karışmasın.
+            return HistoryStore(sensor_ids, self.HISTORY_CAPACITY)
+        try:
+            return HistoryStore(sensor_ids, self.HISTORY_CAPACITY, default_history_path())
+        except (OSError, ValueError):
+            # Dosya açılamazsa geçmiş yalnızca bellekte tutulur.
+            return HistoryStore(sensor_ids, self.HISTORY_CAPACITY)
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:  # noqa: N802
+        self._alarm_watcher.stop()
+        self._sampler.stop()
+        if self._bus is not None:
+            self._bus.close()
+        # Yetkili yardımcı pencereyle değil uygulamayla kapanır (app.py, aboutToQuit);
+        # tepsi kipinde pencere yeniden açılınca şifre sorulmasın.
+        self._history.close()
+        super().closeEvent(event)
 
     # --- Event handlers ---
 
+    def _on_snapshot(self, snapshot: Snapshot) -> None:
+        self._snapshot = snapshot
+        if len(snapshot.values) == self._history.columns:
+            self._history.append(snapshot)
+            if self.chart is not None:
+                self.chart.append(snapshot)
+        self._update_rpm_label()
+        if self._sync_on_next_snapshot:
+            self._sync_on_next_snapshot = False
+            self._sync_pwm_controls()
+
+    def _on_fans_changed(self, fans: List[HwmonFan]) -> None:
+        """Bir hwmon aygıtı eklendi/çıkarıldı; listeyi seçimi koruyarak yenile."""
+        selected_id = self._current_fan.id if self._current_fan else None
+        self._fans = fans
+        apply_calibration(fans, self._calibrations)
+        # Sensör listesi değişti; geçmişi yeni sütunlarla yeniden aç.
+        self._history.close()
+        self._history = self._open_history()
+        if self.chart is not None:
+            self.chart.set_history(self._history)
+        self.fan_list.blockSignals(True)
+        self.fan_list.clear()
+        for fan in fans:
+            self.fan_list.addItem(QtWidgets.QListWidgetItem(fan.label))
+        self.fan_list.blockSignals(False)
+
+        row = next((i for i, fan in enumerate(fans) if fan.id == selected_id), 0)
+        self.fan_list.setCurrentRow(row if fans else -1)
+        self._on_fan_selected(self.fan_list.currentRow())
+
+    def _on_faults(self, events: List[FaultEvent]) -> None:
+        for event in events:
+            # Süren arıza kalıcı, sona erme mesajı kısa süreli gösterilir.
+            self.statusBar().showMessage(event.message, 0 if event.active else 10000)
+        critical = [event for event in events if event.critical and event.active]
+        if not critical:
+            return
+        fan = self._current_fan
+        if fan is not None and fan in self._fail_safe.fans:
+            self.mode_auto_radio.blockSignals(True)
+            self.mode_auto_radio.setChecked(True)
+            self.mode_auto_radio.blockSignals(False)
+            self._sync_pwm_controls()
+        names = ", ".join(f.label for f in self._fail_safe.fans) or "-"
+        QtWidgets.QMessageBox.warning(
+            self,
+            "Kritik Arıza",
+            "\n".join(event.message for event in critical)
+            + f"\n\nManuel denetlenen fanlar otomatik moda alındı: {names}",
+        )
+
+    def _on_command_finished(self, result: CommandResult) -> None:
+        if result.tag == "alarm":
+            for alarm in result.value:
+                self.statusBar().showMessage(alarm.message, 0 if alarm.active else 10000)
+            return
+        # Komuttan hemen sonra yeni bir anlık görüntü alınır; kontrolleri onunla yenile.
+        self._sync_on_next_snapshot = True
+        error = result.error
+        if result.tag == "mode":
+            if isinstance(error, PermissionError):
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "İzin Gerekli",
+                    (
+                        "Bu fanın çalışma modunu değiştirmek için root yetkisi gerekiyor.\n"
+                        "Uygulamayı sudo ile çalıştırmayı veya uygun bir udev/polkit "
+                        "kuralı eklemeyi düşünebilirsiniz."
+                    ),
+                )
+            elif error is not None:
+                QtWidgets.QMessageBox.warning(
+                    self,
+                    "Hata",
+                    f"Fan modunu değiştirirken bir hata oluştu:\n{error}",
+                )
+        elif result.tag == "profile":
+            self.profile_apply_button.setEnabled(True)
+            if isinstance(error, ProfileError):
+                note = "" if error.rolled_back else "\n\nDeğiştirilen fanlar eski değerlerine döndürülemedi."
+                QtWidgets.QMessageBox.warning(
+                    self, "Profil Uygulanamadı", f"{error}{note}"
+                )
+            elif error is not None:
+                QtWidgets.QMessageBox.warning(self, "Hata", f"Profil uygulanamadı:\n{error}")
+            else:
+                self.statusBar().showMessage(
+                    f"{self.profile_combo.currentText()} profili uygulandı", 5000
+                )
+                fan = self._current_fan
+                for setting in result.value:
+                    if fan is not None and setting.fan.id == fan.id:
+                        radio = self.mode_auto_radio if setting.mode == MODE_AUTO else self.mode_manual_radio
+                        radio.blockSignals(True)
+                        radio.setChecked(True)
+                        radio.blockSignals(False)
+                        self._sync_pwm_controls()
+        elif result.tag == "pwm":
+            if isinstance(error, PrivilegedWriteError):
+                QtWidgets.QMessageBox.warning(self, error.title, error.message)
+            elif isinstance(error, RuntimeError):
+                QtWidgets.QMessageBox.information(self, "Desteklenmiyor", str(error))
+            elif error is not None:
+                QtWidgets.QMessageBox.critical(
+                    self,
+                    "Hata",
+                    f"PWM değeri ayarlanırken beklenmeyen bir hata oluştu:\n{error}",
+                )
+
     def _on_fan_selected(self, row: int) -> None:
         if row < 0 or row >= len(self._fans):
             self._current_fan = None
@@ -135,14 +526,55 @@ class MainWindow(QtWidgets.QMainWindow):
             self.pwm_slider.setEnabled(False)
             self.pwm_value_label.setText("PWM: -")
             self.info_label.setText("")
+            self._update_chart_series()
             return
 
         fan = self._fans[row]
         self._current_fan = fan
         self.fan_label.setText(f"Seçili fan: {fan.label}")
+        self._update_chart_series()
         self._sync_pwm_controls()
         self._update_rpm_label()
 
+    def _on_chart_span_changed(self, index: int) -> None:
+        self.chart.set_span(self.CHART_SPANS[index][1])
+
+    def _update_chart_series(self) -> None:
+        if self.chart is None:
+            return
+        series: List[ChartSeries] = []
+        colors = iter(SERIES_COLORS * 8)
+        if self.chart_all_fans_check.isChecked():
+            for fan in self._fans:
+                series.append(ChartSeries(fan.rpm_slot, fan.label, next(colors), "RPM"))
+        elif self._current_fan is not None:
+            fan = self._current_fan
+            series.append(ChartSeries(fan.rpm_slot, "RPM", next(colors)))
+            if fan.pwm_slot >= 0:
+                series.append(ChartSeries(fan.pwm_slot, "PWM", next(colors)))
+            for slot in self._related_temp_slots(fan):
+                sensor = self._scanner.sensors[slot]
+                label = sensor.label.split(" - ", 1)[-1]
+                series.append(ChartSeries(slot, label, next(colors), "°C", 1000.0))
+        self.chart.set_series(series)
+        # Grafikteki ve etiketlerdeki sensörler her turda okunsun.
+        slots = [item.slot for item in series]
+        if self._current_fan is not None:
+            slots += [self._current_fan.rpm_slot, self._current_fan.pwm_slot]
+        self._sampler.set_demand("view", slots, self.RPM_UPDATE_INTERVAL_MS / 1000.0)
+
+    def _related_temp_slots(self, fan: HwmonFan, limit: int = 2) -> List[int]:
+        """Fanla ilişkili sıcaklıklar: PWM'in izlediği kanallar, yoksa aynı çipinkiler."""
+        sensors = self._scanner.sensors
+        index = self._scanner.index
+        chip = sensors[fan.rpm_slot].chip
+        if fan.pwm_slot >= 0 and sensors[fan.pwm_slot].temp_channels:
+            slots = [index.slot(f"{chip}_temp{n}") for n in sensors[fan.pwm_slot].temp_channels]
+            slots = [slot for slot in slots if slot >= 0]
+        else:
+            slots = [slot for slot in index.temps if sensors[slot].chip == chip]
+        return slots[:limit]
+
     def _on_pwm_slider_changed(self, value: int) -> None:
         if self._current_fan is None:
             return
@@ -160,33 +592,37 @@ class MainWindow(QtWidgets.QMainWindow):
             self._sync_pwm_controls()
             return
 
-        try:
-            if self.mode_manual_radio.isChecked():
-                # Manuel moda geçmeye çalış (pwm_enable=1).
-                fan.set_manual_mode()
-            elif self.mode_auto_radio.isChecked():
-                # Otomatik moda dönmeye çalış (pwm_enable=2).
-                fan.set_auto_mode()
-        except PermissionError:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "İzin Gerekli",
-                (
-                    "Bu fanın çalışma modunu değiştirmek için root yetkisi gerekiyor.\n"
-                    "Uygulamayı sudo ile çalıştırmayı veya uygun bir udev/polkit "
-                    "kuralı eklemeyi düşünebilirsiniz."
-                ),
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Hata",
-                f"Fan modunu değiştirirken bir hata oluştu:\n{exc}",
-            )
+        if self.mode_manual_radio.isChecked():
+            # Manuel moda geçmeye çalış (pwm_enable=1).
+            self._sampler.submit(_set_mode_job, self._writes, fan, MODE_MANUAL, tag="mode")
+        elif self.mode_auto_radio.isChecked():
+            # Otomatik moda dönmeye çalış (pwm_enable=2).
+            self._sampler.submit(_set_mode_job, self._writes, fan, MODE_AUTO, tag="mode")
 
         self._sync_pwm_controls()
 
+    def _on_pwm_slider_moved(self, value: int) -> None:
+        """Sürüklenen değeri beklemeye al; pencerenin ilk isteğinde zamanlayıcıyı kur."""
+        fan = self._current_fan
+        if fan is None or fan.pwm_path is None:
+            return
+        if self._slider_fan is not None and self._slider_fan.id != fan.id:
+            self._flush_slider_write()
+        self._slider_fan = fan
+        self._sampler.submit(_request_pwm_job, self._writes, fan, value, tag="pwm", resample=False)
+        if not self._slider_timer.isActive():
+            self._slider_timer.start()
+
+    def _flush_slider_write(self) -> None:
+        self._slider_timer.stop()
+        fan, self._slider_fan = self._slider_fan, None
+        if fan is not None:
+            self._sampler.submit(_flush_pwm_job, self._writes, fan, tag="pwm")
+
     def _apply_pwm_from_slider(self) -> None:
+        # Bırakılan değer hemen yazılır; bekleyen sürükleme değerinin yerine geçer.
+        self._slider_timer.stop()
+        self._slider_fan = None
         if self._current_fan is None:
             return
         if self._current_fan.pwm_path is None:
@@ -196,130 +632,32 @@ class MainWindow(QtWidgets.QMainWindow):
         self._set_pwm_value(value)
 
     def _set_pwm_value(self, value: int) -> None:
-        """Ortak PWM yazma mantığı (slider veya seviye butonlarından çağrılır)."""
-        if self._current_fan is None or self._current_fan.pwm_path is None:
-            return
+        """Ortak PWM yazma mantığı (slider veya seviye butonlarından çağrılır).
 
-        try:
-            self._current_fan.set_pwm(value)
-            # Başarılı oldu - UI'yi güncelle
-            self._sync_pwm_controls()
-        except PermissionError:
-            # İzin yoksa pkexec ile helper script'i çalıştırmayı dene
-            self._set_pwm_with_pkexec(value)
-        except RuntimeError as exc:
-            QtWidgets.QMessageBox.information(self, "Desteklenmiyor", str(exc))
-        except Exception as exc:  # pylint: disable=broad-except
-            QtWidgets.QMessageBox.critical(
-                self,
-                "Hata",
-                f"PWM değeri ayarlanırken beklenmeyen bir hata oluştu:\n{exc}",
-            )
-
-    def _set_pwm_with_pkexec(self, value: int) -> None:
-        """pkexec ile PWM değerini yazmayı dener."""
+        Yazma örnekleyici iş parçacığında yapılır; izin yoksa orada pkexec
+        denenir. Sonuç `_on_command_finished` ile gelir.
+        """
         if self._current_fan is None or self._current_fan.pwm_path is None:
             return
 
-        script_dir = Path(__file__).parent.resolve()
-        write_pwm_script = script_dir / "write_pwm.py"
+        self._sampler.submit(
+            _write_pwm_job, self._writes, self._current_fan, value, tag="pwm"
+        )
 
-        if not write_pwm_script.exists():
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Hata",
-                "write_pwm.py helper script bulunamadı.",
-            )
+    def _on_profile_apply(self) -> None:
+        name = self.profile_combo.currentText()
+        if self._profiles is None or not name:
             return
-
-        # Mutlak yolu kullan (pkexec root olarak çalıştığı için göreli yol çalışmaz)
-        write_pwm_script_abs = str(write_pwm_script.resolve())
-
-        try:
-            # Önce pwm_enable'i manuel moda (1) çek (sessizce, başarısız olsa da devam et)
-            if self._current_fan.pwm_enable_path:
-                try:
-                    subprocess.run(
-                        [
-                            "pkexec",
-                            sys.executable,
-                            write_pwm_script_abs,
-                            str(self._current_fan.pwm_enable_path),
-                            "1",
-                        ],
-                        capture_output=True,
-                        text=True,
-                        timeout=10,
-                        check=False,
-                    )
-                    # pwm_enable başarısız olsa bile PWM'i denemeye devam et
-                except Exception:  # pylint: disable=broad-except
-                    pass  # pwm_enable başarısız olsa da PWM'i denemeye devam et
-
-            # Şimdi PWM değerini yaz
-            result = subprocess.run(
-                [
-                    "pkexec",
-                    sys.executable,
-                    write_pwm_script_abs,
-                    str(self._current_fan.pwm_path),
-                    str(value),
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=False,
-            )
-
-            # Debug: stdout ve stderr'i kontrol et
-            stdout_msg = result.stdout.strip()
-            stderr_msg = result.stderr.strip()
-
-            if result.returncode == 0:
-                # Başarılı - UI'yi güncelle
-                # stdout "OK" olmalı (write_pwm.py'den)
-                if stdout_msg == "OK" or not stderr_msg:
-                    self._sync_pwm_controls()
-                    self._update_rpm_label()
-                else:
-                    # Beklenmeyen durum
-                    QtWidgets.QMessageBox.warning(
-                        self,
-                        "Uyarı",
-                        f"PWM yazıldı ama beklenmeyen çıktı:\nstdout: {stdout_msg}\nstderr: {stderr_msg}",
-                    )
-            else:
-                # Hata durumu
-                error_msg = stderr_msg or stdout_msg or "Bilinmeyen hata"
-                QtWidgets.QMessageBox.warning(
-                    self,
-                    "İzin Hatası",
-                    (
-                        f"PWM değeri ayarlanamadı:\n"
-                        f"Return code: {result.returncode}\n"
-                        f"stderr: {error_msg}\n"
-                        f"stdout: {stdout_msg}\n\n"
-                        "Şifre girişi iptal edildi veya yetki verilmedi."
-                    ),
-                )
-        except subprocess.TimeoutExpired:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Zaman Aşımı",
-                "İşlem çok uzun sürdü, iptal edildi.",
-            )
-        except FileNotFoundError:
-            QtWidgets.QMessageBox.warning(
-                self,
-                "Hata",
-                "pkexec bulunamadı. Lütfen polkit paketinin kurulu olduğundan emin olun.",
-            )
-        except Exception as exc:  # pylint: disable=broad-except
-            QtWidgets.QMessageBox.critical(
-                self,
-                "Hata",
-                f"PWM ayarlanırken beklenmeyen bir hata oluştu:\n{exc}",
-            )
+        self.profile_apply_button.setEnabled(False)
+        self._sampler.submit(
+            _apply_profile_job,
+            self._writes,
+            self._profiles,
+            name,
+            list(self._fans),
+            self._calibrations,
+            tag="profile",
+        )
 
     def _on_level_clicked(self, level: int) -> None:
         """tp fancontrol'deki gibi 0–7 seviye butonuna basıldığında çağrılır."""
@@ -329,9 +667,9 @@ class MainWindow(QtWidgets.QMainWindow):
             # Otomatik modda manuel seviye uygulama.
             return
 
-        pwm = self._level_to_pwm(level, self._current_fan.max_pwm)
+        pwm = self._level_to_pwm(level, self._current_fan)
         self._set_pwm_value(pwm)
-        # UI güncellemesi _set_pwm_value içinde yapılıyor (pkexec başarılı olduğunda)
+        # UI güncellemesi yazma bittikten sonraki anlık görüntüde yapılıyor
 
     # --- Yardımcılar ---
 
@@ -365,21 +703,26 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.pwm_slider.setRange(fan.min_pwm, fan.max_pwm)
 
-        try:
-            current_pwm = fan.read_pwm()
-        except PermissionError:
-            current_pwm = None
+        if self._snapshot is None:
+            # İlk örnek henüz gelmedi; değer geldiğinde yeniden eşitlenecek.
+            self._sync_on_next_snapshot = True
+            self.pwm_value_label.setText("PWM: -")
+            return
+
+        current_pwm = self._snapshot.get(fan.pwm_slot)
 
         if current_pwm is not None:
-            self.pwm_slider.blockSignals(True)
-            self.pwm_slider.setValue(current_pwm)
-            self.pwm_slider.blockSignals(False)
+            if not self.pwm_slider.isSliderDown():
+                # Sürüklenirken kullanıcının değerini ezme.
+                self.pwm_slider.blockSignals(True)
+                self.pwm_slider.setValue(current_pwm)
+                self.pwm_slider.blockSignals(False)
             percent = int((current_pwm / max(1, fan.max_pwm)) * 100)
             self.pwm_value_label.setText(f"PWM: {current_pwm} ({percent}%)")
             self.info_label.setText("")
 
             # Mevcut PWM değerine en yakın seviye butonunu işaretle.
-            level = self._pwm_to_level(current_pwm, fan.max_pwm)
+            level = self._pwm_to_level(current_pwm, fan)
             self._update_level_buttons(level)
         else:
             self.pwm_value_label.setText("PWM: N/A")
@@ -392,16 +735,24 @@ class MainWindow(QtWidgets.QMainWindow):
         for idx, btn in enumerate(self.level_buttons):
             btn.setChecked(idx == active_level)
 
-    @staticmethod
-    def _level_to_pwm(level: int, max_pwm: int) -> int:
-        """0–7 seviye değerlerini PWM aralığına ölçekler."""
+    def _level_to_pwm(self, level: int, fan: HwmonFan) -> int:
+        """0–7 seviye değerlerini PWM aralığına ölçekler.
+
+        Kalibre edilmiş fanlarda seviyeler ölçülen devirde eşit aralıklıdır.
+        """
+        calibration = self._calibrations.get(fan.id)
+        if calibration is not None:
+            return calibration.level_to_pwm(level)
         level = max(0, min(7, level))
         # Basit lineer ölçekleme: 0 -> 0, 7 -> max_pwm
-        return int((level / 7.0) * max_pwm)
+        return int((level / 7.0) * fan.max_pwm)
 
-    @staticmethod
-    def _pwm_to_level(pwm: int, max_pwm: int) -> int:
+    def _pwm_to_level(self, pwm: int, fan: HwmonFan) -> int:
         """PWM değerinden yaklaşık seviye (0–7) hesaplar."""
+        calibration = self._calibrations.get(fan.id)
+        if calibration is not None:
+            return calibration.pwm_to_level(pwm)
+        max_pwm = fan.max_pwm
         if max_pwm <= 0:
             return 0
         ratio = pwm / max_pwm
@@ -414,12 +765,12 @@ class MainWindow(QtWidgets.QMainWindow):
             self.rpm_label.setText("RPM: -")
             return
 
-        try:
-            rpm = fan.read_rpm()
-        except PermissionError:
-            self.rpm_label.setText("RPM: izin yok")
+        if self._snapshot is None:
+            # İlk anlık görüntü henüz gelmedi.
+            self.rpm_label.setText("RPM: -")
             return
 
+        rpm = self._snapshot.get(fan.rpm_slot)
         if rpm is None:
             self.rpm_label.setText("RPM: N/A")
         else:
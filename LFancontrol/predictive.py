@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""Isıl modelle ileriye bakan, öngörülü fan denetleyicisi (Qt içermez).
+
+Eğriler ve PID sıcaklık ancak yükseldikten sonra tepki verir; yük
+arttığında önce aşım, ardından yüksek sesli bir devir patlaması olur. Bu
+denetleyici her bölge (izlenen sıcaklıklar + onları soğutan fan grubu) için
+birinci dereceden bir ısıl modeli çalışırken öğrenir:
+
+    dT/dt = α·(T − 50) + β·u + γ        (u = PWM / 255)
+
+α soğuma hızını, β fanların etkisini, γ o anki ısı yükünü temsil eder.
+α ve β her turda O(1) işlemle, unutma çarpanlı özyinelemeli en küçük
+kareler (RLS) ile fark biçiminde öğrenilir:
+
+    Δ(dT/dt) = α·ΔT + β·Δu
+
+Yük turdan tura yavaş değiştiğinden farklarda kaybolur; yük değişimleri
+sıcaklıkla birlikte geldiği hâlde α'yı saptırmaz. γ ise gözlenen değişimin
+α ve β ile açıklanamayan kısmıdır (`smoothing` saniyelik üstel ortalama);
+yük arttığında sıcaklık hedefe varmadan yükselir ve model hatası kalıcı bir
+sapma bırakmaz. Her turda, sabit tutulan PWM ile `horizon` saniye sonraki
+öngörülen sıcaklığı hedefin altında tutan en düşük PWM seçilir (birinci
+dereceden yanıt tekdüze olduğundan ufkun sonu yeterlidir). Çıkış PID'deki
+gibi fan sınırlarına ve saniyede `slew` PWM'lik değişime kısılır; düşüşte
+bu sınırın `fall` oranı geçerlidir, model hatası fanı inip kalkmaya
+zorlamaz.
+
+Model henüz güvenilir değilken (`min_samples` turdan az veri, β ≥ 0 ya da
+α > 0) hedefin `band` °C altından başlayan basit bir oransal kural
+kullanılır. Ölçüm yoksa fan güvenlik için üst sınıra çekilir.
+
+Model durumu izlenen sensörlerin kimlikleriyle (ör.
+`coretemp@coretemp.0_temp1,nct6775@nct6775.656_temp2`) anahtarlanıp root için
+`/var/lib/lfancontrol/thermal_models.json`, diğer kullanıcılar için
+`~/.cache/lfancontrol/thermal_models.json` dosyasına yazılır; servis yeniden
+başladığında denetleyici ısınmış olarak başlar. Kayıttaki fan grubu
+değiştiyse model sıfırdan öğrenilir.
+
+Benzetim (donanım gerektirmez; aynı yük değişiminde tepkisel eğri ve PID
+ile karşılaştırır):
+
+    python predictive.py --setpoint 60 --ramp 60
+
+Ani yük basamağında bu birinci dereceden benzetim ortamında modelin PID'e
+üstünlüğü yoktur: ikisi de aşım yapmaz, model daha yüksek bir PWM
+tepesiyle aynı sonuca varır. Yük yavaşça arttığında (rampa) PID sıcaklık
+hedefi geçtikten sonra yetişir; model artan yükü γ kestiriminde hemen
+gördüğünden fanı sıcaklık hedefe varmadan hızlandırır ve hedef aşılmaz.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from array import array
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend import MISSING, PWM_MAX, HwmonFan, Sensor, Snapshot
+from controller import MODE_TEMP, ControlTarget, PidBank
+from fan_curve import FanCurve
+
+SYSTEM_MODELS_PATH = Path("/var/lib/lfancontrol/thermal_models.json")
+_MODELS_VERSION = 1
+
+# Modelin sıcaklık ekseninin sıfırı (°C); hedef değişse de parametreler geçerli kalır.
+_CENTER = 50.0
+# Önsel model: ~30 s zaman sabiti, tam devirle ~20 °C düşüş.
+_PRIOR_THETA = (-1.0 / 30.0, -20.0 / 30.0)
+_PRIOR_P = (2.5e-3, 1.0)
+# Kovaryans izi bu sınırı aşarsa unutma durdurulur (uyarımsız dönemde şişmesin).
+_MAX_TRACE = 1e3
+_NAN = float("nan")
+
+
+def default_models_path() -> Path:
+    if os.geteuid() == 0:
+        return SYSTEM_MODELS_PATH
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(cache_home) / "lfancontrol" / "thermal_models.json"
+
+
+@dataclass
+class ModelSettings:
+    """Bir öngörülü kanalın ayarları."""
+
+    horizon: float = 10.0  # öngörü ufku (s)
+    forgetting: float = 0.995  # RLS unutma çarpanı (1: hiç unutma)
+    min_samples: int = 60  # modele güvenmeden önceki en az güncelleme sayısı
+    band: float = 10.0  # ısınma kuralının oransal bandı (°C)
+    smoothing: float = 5.0  # yük kestiriminin zaman sabiti (s)
+    fall: float = 0.25  # düşüşte izin verilen değişim, `slew`'in oranı olarak
+    max_gap: float = 30.0  # daha uzun aralıklı turlar (ör. uyku) modeli güncellemez
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ModelSettings":
+        """Yapılandırmadaki bilinen alanları al; bilinmeyen anahtar hata verir."""
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Bilinmeyen model ayarı: {', '.join(sorted(unknown))}")
+        settings = cls()
+        for name, value in data.items():
+            setattr(settings, name, type(getattr(settings, name))(value))
+        return settings
+
+
+def model_key(target: ControlTarget, sensors: Sequence[Sensor]) -> str:
+    """Kanalın kalıcı anahtarı: izlenen sensör kimlikleri, sıralı."""
+    return ",".join(sorted(sensors[slot].id for slot in target.sensors))
+
+
+def load_models(path: Optional[Path] = None) -> Dict[str, dict]:
+    """Kayıtlı model durumları (anahtar → durum); dosya yoksa veya bozuksa boş."""
+    path = path or default_models_path()
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != _MODELS_VERSION:
+        return {}
+    models = data.get("models", {})
+    return models if isinstance(models, dict) else {}
+
+
+def save_models(states: Dict[str, dict], path: Optional[Path] = None) -> None:
+    """Durumları dosyadaki diğer kayıtlarla birleştirip atomik olarak yaz."""
+    path = path or default_models_path()
+    models = load_models(path)
+    models.update(states)
+    data = {"version": _MODELS_VERSION, "models": dict(sorted(models.items()))}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+class ThermalModelBank:
+    """Öngörülü kanalların model ve çıkış durumunu sütunlar hâlinde tutar.
+
+    `PidBank` ile aynı arayüzü sunar (`step`, `pwm_requests`, `reset`);
+    denetim döngüsü iki bankayı aynı şekilde yürütür. Kanal i'nin (α, β)
+    parametreleri `theta[2i:2i+2]`, kovaryansı `p[4i:4i+4]` içindedir.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[ControlTarget],
+        sensors: Sequence[Sensor],
+        settings: Optional[Sequence[ModelSettings]] = None,
+        states: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        for target in targets:
+            if target.mode != MODE_TEMP:
+                raise ValueError(f"{target.name}: öngörülü denetim yalnızca sıcaklık hedefler.")
+            if not target.sensors:
+                raise ValueError(f"{target.name}: sıcaklık sensörü belirtilmemiş.")
+            if not target.fans:
+                raise ValueError(f"{target.name}: fan belirtilmemiş.")
+        self.targets = list(targets)
+        count = len(self.targets)
+        self.settings = list(settings) if settings is not None else [ModelSettings()] * count
+        if len(self.settings) != count:
+            raise ValueError("Her kanal için bir model ayarı verilmeli.")
+        self.keys = [model_key(target, sensors) for target in self.targets]
+        limits = [t.limits() for t in self.targets]
+        self.low = array("d", [lo for lo, _hi in limits])
+        self.high = array("d", [hi for _lo, hi in limits])
+        self.slew = array("d", [t.slew for t in self.targets])
+        self.setpoint = array("d", [t.setpoint for t in self.targets])
+        self.theta = array("d", [0.0]) * (2 * count)
+        self.p = array("d", [0.0]) * (4 * count)
+        self.samples = array("L", [0]) * count
+        self.load = array("d", [_NAN]) * count  # γ kestirimi (°C/s)
+        # Önceki turun sıcaklığı, ondan önceki tura göre artışı, değişim hızı ve PWM'i
+        self.previous = array("d", [_NAN]) * count
+        self.rise = array("d", [_NAN]) * count
+        self.rate = array("d", [_NAN]) * count
+        self.duty = array("d", [_NAN]) * count
+        self.output = array("d", [_NAN]) * count  # son uygulanan PWM
+        self.measured = array("d", [_NAN]) * count
+        self.predicted = array("d", [_NAN]) * count  # seçilen PWM ile ufuktaki sıcaklık
+        self._slots = [tuple(t.sensors) for t in self.targets]
+        # Kanalın fiilî PWM'i ilk fanın PWM dosyasından okunur.
+        self._pwm_slots = [t.fans[0].pwm_slot for t in self.targets]
+        self._fan_ids = [sorted(fan.id for fan in t.fans) for t in self.targets]
+        states = states or {}
+        for i in range(count):
+            self._restore(i, states.get(self.keys[i]))
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def _restore(self, i: int, state: Optional[dict]) -> None:
+        try:
+            if state is None or state.get("fans") != self._fan_ids[i]:
+                raise ValueError
+            theta = [float(v) for v in state["theta"]]
+            p = [float(v) for v in state["p"]]
+            samples = int(state["samples"])
+            load = float(state.get("load", _NAN))
+            if len(theta) != 2 or len(p) != 4 or not all(map(math.isfinite, theta + p)):
+                raise ValueError
+        except (KeyError, TypeError, ValueError):
+            theta = list(_PRIOR_THETA)
+            p = [_PRIOR_P[0], 0.0, 0.0, _PRIOR_P[1]]
+            samples = 0
+            load = _NAN
+        self.theta[2 * i : 2 * i + 2] = array("d", theta)
+        self.p[4 * i : 4 * i + 4] = array("d", p)
+        self.samples[i] = samples
+        self.load[i] = load
+
+    def states(self) -> Dict[str, dict]:
+        """Kalıcı olarak saklanacak model durumları (anahtar → durum)."""
+        now = time.time()
+        states = {}
+        for i, key in enumerate(self.keys):
+            state = {
+                "fans": self._fan_ids[i],
+                "theta": list(self.theta[2 * i : 2 * i + 2]),
+                "p": list(self.p[4 * i : 4 * i + 4]),
+                "samples": self.samples[i],
+                "updated": now,
+            }
+            if self.load[i] == self.load[i]:
+                state["load"] = self.load[i]
+            states[key] = state
+        return states
+
+    def ready(self, i: int) -> bool:
+        """Model kararlar için yeterince öğrenildi ve fiziksel olarak anlamlı mı."""
+        alpha, beta = self.theta[2 * i], self.theta[2 * i + 1]
+        return (
+            self.samples[i] >= self.settings[i].min_samples
+            and alpha < 0.0
+            and beta < 0.0
+            and self.load[i] == self.load[i]
+        )
+
+    def set_setpoint(self, i: int, value: float) -> None:
+        self.setpoint[i] = value
+
+    def reset(self) -> None:
+        """Çıkış ve geçmişi sıfırla; öğrenilen modeller korunur."""
+        for column in (self.previous, self.rise, self.rate, self.duty, self.output):
+            for i in range(len(column)):
+                column[i] = _NAN
+
+    def measure(self, snapshot: Snapshot) -> Tuple[array, List[float]]:
+        """Kanal sıcaklıkları (en yükseği, °C; okunamazsa NaN) ve fiilî PWM'ler (0–1)."""
+        values = snapshot.values
+        measured = self.measured
+        duties: List[float] = []
+        for i, slots in enumerate(self._slots):
+            best = MISSING
+            for slot in slots:
+                if 0 <= slot < len(values):
+                    raw = values[slot]
+                    if raw != MISSING and raw > best:
+                        best = raw
+            measured[i] = _NAN if best == MISSING else best / 1000.0
+            slot = self._pwm_slots[i]
+            raw = values[slot] if 0 <= slot < len(values) else MISSING
+            if raw == MISSING:
+                last = self.output[i]
+                duties.append(_NAN if last != last else last / PWM_MAX)
+            else:
+                duties.append(raw / PWM_MAX)
+        return measured, duties
+
+    def _learn(self, i: int, dx: float, du: float, target: float) -> None:
+        """Bir RLS adımı: φ = [ΔT, Δu], y = Δ(dT/dt)."""
+        lam = self.settings[i].forgetting
+        theta, p = self.theta, self.p
+        t = 2 * i
+        m = 4 * i
+        p00, p01, p10, p11 = p[m], p[m + 1], p[m + 2], p[m + 3]
+        # Pφ
+        q0 = p00 * dx + p01 * du
+        q1 = p10 * dx + p11 * du
+        denom = lam + dx * q0 + du * q1
+        error = target - (theta[t] * dx + theta[t + 1] * du)
+        k0 = q0 / denom
+        k1 = q1 / denom
+        theta[t] += k0 * error
+        theta[t + 1] += k1 * error
+        scale = 1.0 / lam if p00 + p11 < _MAX_TRACE else 1.0
+        # P ← (P − K·(Pφ)ᵀ) / λ
+        p[m] = (p00 - k0 * q0) * scale
+        p[m + 1] = (p01 - k0 * q1) * scale
+        p[m + 2] = (p10 - k1 * q0) * scale
+        p[m + 3] = (p11 - k1 * q1) * scale
+        self.samples[i] += 1
+
+    def _observe(self, i: int, value: float, duty: float, dt: float) -> None:
+        """Yeni ölçümle modeli ve yük kestirimini güncelle."""
+        settings = self.settings[i]
+        previous = self.previous[i]
+        if previous != previous or duty != duty or dt > settings.max_gap:
+            # Geçmiş yok ya da çok uzun ara: fark zinciri yeniden başlar.
+            self.rise[i] = self.rate[i] = _NAN
+            self.previous[i] = value
+            self.duty[i] = duty
+            return
+        rate = (value - previous) / dt
+        last_rate = self.rate[i]
+        if last_rate == last_rate and self.duty[i] == self.duty[i]:
+            self._learn(i, self.rise[i], duty - self.duty[i], rate - last_rate)
+        alpha, beta = self.theta[2 * i], self.theta[2 * i + 1]
+        residual = rate - alpha * (previous - _CENTER) - beta * duty
+        load = self.load[i]
+        if load != load:
+            self.load[i] = residual
+        else:
+            weight = min(1.0, dt / max(settings.smoothing, 1e-6))
+            self.load[i] = load + (residual - load) * weight
+        self.rise[i] = value - previous
+        self.rate[i] = rate
+        self.previous[i] = value
+        self.duty[i] = duty
+
+    def _required_duty(self, i: int, x: float) -> float:
+        """Ufuk sonunda öngörülen sıcaklığı hedefte tutan sabit görev oranı (sınırsız)."""
+        alpha, beta = self.theta[2 * i], self.theta[2 * i + 1]
+        gamma = self.load[i]
+        horizon = self.settings[i].horizon
+        goal = self.setpoint[i] - _CENTER
+        decay = math.exp(alpha * horizon)
+        # x(H) = x0·e^(αH) + (1 − e^(αH))·x∞,   x∞ = (βu + γ) / −α
+        steady = (goal - x * decay) / (1.0 - decay)
+        return (-alpha * steady - gamma) / beta
+
+    def _predict(self, i: int, x: float, u: float) -> float:
+        alpha, beta = self.theta[2 * i], self.theta[2 * i + 1]
+        decay = math.exp(alpha * self.settings[i].horizon)
+        return _CENTER + x * decay + (1.0 - decay) * (beta * u + self.load[i]) / -alpha
+
+    def update(self, measured: Sequence[float], duties: Sequence[float], dt: float) -> array:
+        """Modelleri güncelle ve kanal başına uygulanacak PWM'i (`output`) döndür."""
+        low, high, slew = self.low, self.high, self.slew
+        output = self.output
+        dt = max(dt, 1e-6)
+        for i in range(len(output)):
+            value = measured[i]
+            last = output[i]
+            if value != value:  # NaN: ölçüm yok
+                output[i] = high[i]
+                self.previous[i] = _NAN
+                self.predicted[i] = _NAN
+                continue
+
+            self._observe(i, value, duties[i], dt)
+            ready = self.ready(i)
+            if ready:
+                raw = self._required_duty(i, value - _CENTER) * PWM_MAX
+            else:
+                band = max(self.settings[i].band, 1e-6)
+                share = (value - (self.setpoint[i] - band)) / band
+                raw = low[i] + (high[i] - low[i]) * min(1.0, max(0.0, share))
+
+            applied = raw
+            if applied < low[i]:
+                applied = low[i]
+            elif applied > high[i]:
+                applied = high[i]
+            if last == last:
+                step = slew[i] * dt
+                if applied > last + step:
+                    applied = last + step
+                elif applied < last - step * self.settings[i].fall:
+                    applied = last - step * self.settings[i].fall
+            output[i] = applied
+            if ready:
+                self.predicted[i] = self._predict(i, value - _CENTER, applied / PWM_MAX)
+            else:
+                self.predicted[i] = _NAN
+        return output
+
+    def step(self, snapshot: Snapshot, dt: float) -> array:
+        measured, duties = self.measure(snapshot)
+        return self.update(measured, duties, dt)
+
+    def pwm_requests(self) -> List[Tuple[HwmonFan, int]]:
+        """Son çıkışın (fan, PWM) çiftleri; yazma katmanına verilmek üzere."""
+        requests: List[Tuple[HwmonFan, int]] = []
+        for target, value in zip(self.targets, self.output):
+            if value != value:
+                continue
+            pwm = int(round(value))
+            for fan in target.fans:
+                requests.append((fan, pwm))
+        return requests
+
+    def describe(self, i: int) -> str:
+        """Kanalın modelini okunur biçimde özetle."""
+        alpha, beta = self.theta[2 * i], self.theta[2 * i + 1]
+        state = "hazır" if self.ready(i) else "öğreniyor"
+        tau = f"{-1.0 / alpha:.0f} s" if alpha < 0 else "?"
+        cooling = f"{beta / alpha:.1f} °C" if alpha < 0 else "?"
+        load = f"{self.load[i]:+.3f} °C/s" if self.load[i] == self.load[i] else "?"
+        return (
+            f"{self.targets[i].name}: {state} ({self.samples[i]} örnek) "
+            f"zaman sabiti={tau} tam devir etkisi={cooling} yük={load}"
+        )
+
+
+# --- Benzetim ---
+
+
+@dataclass
+class LoadResponse:
+    """Yük basamağındaki davranışın özeti."""
+
+    name: str
+    peak: float  # en yüksek sıcaklık (°C)
+    overshoot: float  # hedefin en fazla ne kadar üstüne çıkıldı (°C)
+    above: float  # hedefin 0.5 °C'den fazla üstünde geçen süre (s)
+    peak_pwm: float
+    mean_pwm: float
+    trace: List[Tuple[float, float, float]]  # (zaman, sıcaklık, pwm)
+
+    def summary(self) -> str:
+        return (
+            f"{self.name:<10} en yüksek={self.peak:.1f} °C aşım={self.overshoot:.1f} °C "
+            f"hedef üstü={self.above:.0f} s en yüksek pwm={self.peak_pwm:.0f} "
+            f"ort pwm={self.mean_pwm:.0f}"
+        )
+
+
+def _steady_pwm(model, load: float, temp: float) -> int:
+    """`model` üzerinde `load` yükünde `temp` dengesini tutan PWM."""
+    rpm = (1.0 - (temp - model.ambient) / load) / model.cooling * model.max_rpm
+    for pwm in range(model.start_pwm, PWM_MAX + 1):
+        if model.target_rpm(pwm, True) >= rpm:
+            return pwm
+    return PWM_MAX
+
+
+def simulate_load(
+    controller: str,
+    setpoint: float = 60.0,
+    training: float = 900.0,
+    duration: float = 240.0,
+    dt: float = 1.0,
+    slew: float = 60.0,
+    settings: Optional[ModelSettings] = None,
+    seed: int = 1,
+    ramp: float = 0.0,
+) -> LoadResponse:
+    """`fake_hwmon.FanModel` üzerinde yük artışına yanıtı benzet.
+
+    İlk `training` saniyede yük rastgele basamaklarla değişir (öngörülü
+    model bu sürede öğrenir); ardından yük düşük değerden en yükseğe
+    sıçrar (`ramp` > 0 ise `ramp` saniyede doğrusal olarak çıkar) ve
+    `duration` saniye izlenir. `controller`: "model", "pid" veya
+    "curve" (tepkisel eğri: hedefin 10 °C altında durma noktası, hedefte
+    öğrenme sırasındaki en yüksek yükü dengeleyen PWM).
+    """
+    from fake_hwmon import FanModel
+
+    model = FanModel()
+    fan = HwmonFan(id="sim_fan1", label="sim", rpm_path=Path("/sim/fan1_input"))
+    fan.pwm_path = Path("/sim/pwm1")
+    fan.rpm_slot, fan.pwm_slot = 0, 2
+    # Kalibre edilmiş bir fandaki gibi: durma noktasının altına inilmez.
+    fan.min_pwm = model.start_pwm
+    target = ControlTarget(
+        name="sim", fans=[fan], mode=MODE_TEMP, setpoint=setpoint, sensors=[1], slew=slew
+    )
+    if controller == "model":
+        sensors = [
+            Sensor("sim_fan1", "fan", "", Path("/sim/fan1_input")),
+            Sensor("sim_temp1", "temp", "", Path("/sim/temp1_input")),
+            Sensor("sim_pwm1", "pwm", "", Path("/sim/pwm1")),
+        ]
+        bank = ThermalModelBank([target], sensors, [settings or ModelSettings()])
+    elif controller == "curve":
+        points = [
+            (setpoint - 10.0, model.start_pwm),
+            (setpoint, _steady_pwm(model, 45.0, setpoint)),
+            (setpoint + 20.0, PWM_MAX),
+        ]
+        curve = FanCurve(points, hysteresis=0.0)
+    else:
+        bank = PidBank([target])
+
+    rng = random.Random(seed)
+    pwm = 128
+    rpm = model.target_rpm(pwm, False)
+    temp = model.ambient + model.load * (1.0 - model.cooling * rpm / model.max_rpm)
+    snapshot = Snapshot(0.0, array("i", [int(rpm), int(temp * 1000), pwm]))
+    trace: List[Tuple[float, float, float]] = []
+    substeps = 10
+    t = 0.0
+    while t < training + duration:
+        if t < training:
+            if rng.random() < dt / 60.0:
+                model.load = rng.uniform(15.0, 45.0)
+        elif ramp > 0.0:
+            model.load = 20.0 + 30.0 * min(1.0, (t - training) / ramp)
+        elif not trace:
+            model.load = 50.0
+        if controller == "curve":
+            pwm = curve.evaluate(snapshot.values[1] / 1000.0)
+        else:
+            pwm = int(round(bank.step(snapshot, dt)[0]))
+        for _ in range(substeps):
+            h = dt / substeps
+            spinning = rpm >= model.idle_rpm / 2
+            rpm += (model.target_rpm(pwm, spinning) - rpm) * min(1.0, h / model.time_constant)
+            goal = model.ambient + model.load * (1.0 - model.cooling * rpm / model.max_rpm)
+            temp += (goal - temp) * min(1.0, h / model.thermal_time_constant)
+        t += dt
+        snapshot.values[0] = int(rpm)
+        snapshot.values[1] = int(temp * 1000)
+        snapshot.values[2] = pwm
+        snapshot.timestamp = t
+        if t > training:
+            trace.append((t - training, temp, float(pwm)))
+        elif t >= training - dt:
+            # Basamaktan hemen önce düşük yükte dengeye getir.
+            model.load = 20.0
+
+    temps = [v for _t, v, _p in trace]
+    pwms = [p for _t, _v, p in trace]
+    peak = max(temps)
+    return LoadResponse(
+        name=controller,
+        peak=peak,
+        overshoot=max(0.0, peak - setpoint),
+        above=sum(dt for v in temps if v > setpoint + 0.5),
+        peak_pwm=max(pwms),
+        mean_pwm=sum(pwms) / len(pwms),
+        trace=trace,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Öngörülü denetleyici benzetimi")
+    parser.add_argument("--setpoint", type=float, default=60.0)
+    parser.add_argument("--horizon", type=float, default=ModelSettings.horizon)
+    parser.add_argument("--training", type=float, default=900.0, help="Öğrenme süresi (s)")
+    parser.add_argument("--duration", type=float, default=240.0)
+    parser.add_argument("--slew", type=float, default=60.0, help="PWM/s")
+    parser.add_argument(
+        "--ramp", type=float, default=60.0, help="Rampa senaryosunda yükün çıkış süresi (s)"
+    )
+    parser.add_argument("--trace", action="store_true", help="Her adımı yazdır")
+    args = parser.parse_args(argv)
+
+    settings = ModelSettings(horizon=args.horizon)
+    for scenario, ramp in (("basamak", 0.0), (f"rampa {args.ramp:.0f} s", args.ramp)):
+        print(f"[{scenario}]")
+        for controller in ("curve", "pid", "model"):
+            result = simulate_load(
+                controller,
+                args.setpoint,
+                training=args.training,
+                duration=args.duration,
+                slew=args.slew,
+                settings=settings,
+                ramp=ramp,
+            )
+            if args.trace:
+                for t, value, pwm in result.trace:
+                    print(f"{controller:<5} {t:7.1f}  {value:6.2f}  pwm={pwm:.0f}")
+            print(result.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""İzin gerektiren PWM yazmaları için pkexec yardımcıları (Qt içermez).
+
+İlk yazmada `write_pwm.py --serve` pkexec ile bir kez başlatılır; sonraki tüm
+yazmalar bu kalıcı yardımcıya yerel Unix soketi üzerinden toplu olarak iletilir.
+"""
+from __future__ import annotations
+
+import os
+import select
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+from backend import HwmonFan
+
+# Mutlak yolu kullan (pkexec root olarak çalıştığı için göreli yol çalışmaz)
+HELPER_SCRIPT = Path(__file__).parent.resolve() / "write_pwm.py"
+
+PathLike = Union[str, Path]
+
+
+class PrivilegedWriteError(Exception):
+    """pkexec ile yazma başarısız olduğunda, GUI'de gösterilecek başlıkla fırlatılır."""
+
+    def __init__(self, title: str, message: str) -> None:
+        super().__init__(message)
+        self.title = title
+        self.message = message
+
+
+class HelperWriteError(Exception):
+    """Yardımcı bir toplu yazmadaki çiftlerden birini yazamadı.
+
+    `rolled_back`, işlem (`write_transaction`) kullanıldıysa önceki çiftlerin
+    eski değerlerine döndürülüp döndürülemediğini belirtir.
+    """
+
+    def __init__(self, index: int, message: str, rolled_back: bool = False) -> None:
+        super().__init__(f"{index}: {message}")
+        self.index = index
+        self.message = message
+        self.rolled_back = rolled_back
+
+
+def _private_runtime_dir() -> str:
+    """`XDG_RUNTIME_DIR` yoksa geçici dizinde kullanıcıya özel 0700 bir dizin.
+
+    Dizin başka bir kullanıcıya aitse, sembolik bağsa ya da başkalarına
+    açıksa `PrivilegedWriteError` fırlatılır; soket ortak bir dizinde açılmaz.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"lfancontrol-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as exc:
+        raise PrivilegedWriteError("Hata", f"Çalışma dizini oluşturulamadı: {exc}") from exc
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise PrivilegedWriteError(
+            "Güvenlik Hatası",
+            f"{path} bu kullanıcıya ait 0700 bir dizin değil; yardımcı başlatılmadı.",
+        )
+    return path
+
+
+def default_socket_path() -> str:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or _private_runtime_dir()
+    return os.path.join(runtime_dir, f"lfancontrol-helper-{os.getuid()}.sock")
+
+
+class PwmHelperClient:
+    """Kalıcı yetkili yardımcıya (`write_pwm.py --serve`) bağlanan istemci.
+
+    `command` verilmezse yardımcı pkexec ile başlatılır; sahte bir hwmon
+    ağacıyla denemek için pkexec'siz bir komut verilebilir.
+    """
+
+    START_TIMEOUT = 60.0
+    IO_TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        command: Optional[List[str]] = None,
+    ) -> None:
+        self._socket_path = socket_path
+        self.command = command
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def socket_path(self) -> str:
+        """Soket yolu; varsayılan yol ilk bağlantıda belirlenir (dizin denetimiyle)."""
+        if self._socket_path is None:
+            self._socket_path = default_socket_path()
+        return self._socket_path
+
+    def _helper_command(self) -> List[str]:
+        if self.command is not None:
+            return self.command + ["--socket", self.socket_path]
+        return [
+            "pkexec",
+            sys.executable,
+            str(HELPER_SCRIPT),
+            "--serve",
+            "--socket",
+            self.socket_path,
+            "--uid",
+            str(os.getuid()),
+        ]
+
+    def _try_connect(self) -> bool:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.IO_TIMEOUT)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+        return True
+
+    def _start_helper(self) -> None:
+        if self.command is None and not HELPER_SCRIPT.exists():
+            raise PrivilegedWriteError("Hata", "write_pwm.py helper script bulunamadı.")
+        try:
+            proc = subprocess.Popen(
+                self._helper_command(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except FileNotFoundError as exc:
+            raise PrivilegedWriteError(
+                "Hata",
+                "pkexec bulunamadı. Lütfen polkit paketinin kurulu olduğundan emin olun.",
+            ) from exc
+
+        # Kimlik doğrulama penceresi kapanana ve yardımcı "READY" yazana kadar bekle.
+        deadline = time.monotonic() + self.START_TIMEOUT
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.kill()
+                raise PrivilegedWriteError("Zaman Aşımı", "İşlem çok uzun sürdü, iptal edildi.")
+            ready, _, _ = select.select([proc.stdout], [], [], remaining)
+            if not ready:
+                continue
+            line = proc.stdout.readline()
+            if line.strip() == "READY":
+                break
+            if not line:
+                returncode = proc.wait()
+                stderr_msg = proc.stderr.read().strip() or "Bilinmeyen hata"
+                raise PrivilegedWriteError(
+                    "İzin Hatası",
+                    (
+                        f"Yetkili yardımcı başlatılamadı:\n"
+                        f"Return code: {returncode}\n"
+                        f"stderr: {stderr_msg}\n\n"
+                        "Şifre girişi iptal edildi veya yetki verilmedi."
+                    ),
+                )
+        self._proc = proc
+
+    def _ensure_connected(self) -> None:
+        if self._sock is not None:
+            return
+        if self._try_connect():
+            return
+        self._start_helper()
+        if not self._try_connect():
+            raise PrivilegedWriteError("Hata", "Yetkili yardımcıya bağlanılamadı.")
+
+    def _disconnect(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _request(self, line: bytes) -> bytes:
+        for attempt in (0, 1):
+            self._ensure_connected()
+            try:
+                self._sock.sendall(line)
+                reply = self._reader.readline()
+            except OSError:
+                reply = b""
+            if reply:
+                return reply.rstrip(b"\n")
+            # Yardımcı kapanmış olabilir (ör. boşta kalma süresi); yeniden başlat.
+            self._disconnect()
+            if attempt:
+                raise PrivilegedWriteError("Hata", "Yetkili yardımcı bağlantısı koptu.")
+        raise AssertionError("unreachable")
+
+    def _send_pairs(self, command: bytes, pairs: Sequence[Tuple[PathLike, int]]) -> bytes:
+        parts = [command]
+        for path, value in pairs:
+            parts.append(os.fsencode(os.fspath(path)))
+            parts.append(b"%d" % int(value))
+        line = b" ".join(parts) + b"\n"
+        with self._lock:
+            return self._request(line)
+
+    @staticmethod
+    def _raise_reply(reply: bytes, rolled_back: bool) -> None:
+        text = reply.decode("utf-8", "replace")
+        status, _, rest = text.partition(" ")
+        if status in ("ERR", "PARTIAL"):
+            index, _, message = rest.partition(" ")
+            if index.isdigit():
+                raise HelperWriteError(int(index), message.strip(), rolled_back and status == "ERR")
+        raise HelperWriteError(0, text)
+
+    def write_batch(self, pairs: Sequence[Tuple[PathLike, int]]) -> None:
+        """(yol, değer) çiftlerini tek istekte yaz; ilk hatada `HelperWriteError`."""
+        if not pairs:
+            return
+        reply = self._send_pairs(b"W", pairs)
+        if reply != b"OK":
+            self._raise_reply(reply, rolled_back=False)
+
+    def write_transaction(self, pairs: Sequence[Tuple[PathLike, int]]) -> None:
+        """Çiftleri tek istekte hep ya da hiç yaz.
+
+        Bir çift yazılamazsa yardımcı o ana kadar yazılanları eski
+        değerlerine döndürür ve `HelperWriteError(rolled_back=True)`
+        fırlatılır; geri alma da başarısız olduysa `rolled_back` False'tur.
+        """
+        if not pairs:
+            return
+        reply = self._send_pairs(b"T", pairs)
+        if reply != b"OK":
+            self._raise_reply(reply, rolled_back=True)
+
+    def shutdown(self) -> None:
+        """Bağlıysa yardımcıyı kapat."""
+        with self._lock:
+            if self._sock is None:
+                return
+            try:
+                self._sock.sendall(b"QUIT\n")
+                self._reader.readline()
+            except OSError:
+                pass
+            self._disconnect()
+        if self._proc is not None:
+            try:
+                self._proc.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                pass
+            self._proc = None
+
+
+# GUI'nin ve diğer istemcilerin paylaştığı varsayılan yardımcı bağlantısı.
+HELPER = PwmHelperClient()
+
+
+def pkexec_set_pwm(fan: HwmonFan, value: int) -> None:
+    """Yetkili yardımcı üzerinden önce pwm_enable=1, sonra PWM değerini yazar.
+
+    Yardımcı ilk çağrıda pkexec ile başlatılır. Başarısızlıkta
+    `PrivilegedWriteError` fırlatır. Bloklayan bir çağrıdır; GUI iş
+    parçacığından çağrılmamalıdır.
+    """
+    if fan.pwm_path is None:
+        return
+
+    clamped = max(fan.min_pwm, min(fan.max_pwm, value))
+    pairs: List[Tuple[PathLike, int]] = []
+    if fan.pwm_enable_path:
+        pairs.append((fan.pwm_enable_path, 1))
+    pairs.append((fan.pwm_path, clamped))
+
+    try:
+        HELPER.write_batch(pairs)
+    except HelperWriteError as exc:
+        if exc.index == 0 and len(pairs) == 2:
+            # pwm_enable başarısız olsa da PWM'i denemeye devam et
+            try:
+                HELPER.write_batch(pairs[1:])
+                return
+            except HelperWriteError as retry_exc:
+                exc = retry_exc
+        raise PrivilegedWriteError(
+            "İzin Hatası", f"PWM değeri ayarlanamadı:\n{exc.message}"
+        ) from exc
@@ -0,0 +1,291 @@
+"""Adlandırılmış fan grupları ve profiller; bir profilin tek işlemle uygulanması (Qt içermez).
+
+Yapılandırma `~/.config/lfancontrol/profiles.json` (yoksa
+`/etc/lfancontrol/profiles.json`) dosyasından okunur:
+
+    {
+      "groups": {
+        "işlemci": ["nct6775@nct6775.656_fan1"],
+        "kasa": ["nct6775@nct6775.656_fan2", "nct6775@nct6775.656_fan3"]
+      },
+      "profiles": {
+        "sessiz": {"işlemci": {"level": 2}, "kasa": "25%"},
+        "dengeli": {"işlemci": "auto", "kasa": {"level": 4}},
+        "tam": {"*": "100%"}
+      }
+    }
+
+Profil anahtarları grup adı, tek bir fan kimliği ya da PWM'i olan tüm
+fanlar için `*` olabilir; bir fan birden çok anahtarda geçiyorsa sonra gelen
+kazanır. Değerler: `"auto"` (pwm_enable=2), 0–255 PWM, `"NN%"` ya da
+`{"level": 0–7}` (kalibre edilmiş fanlarda devirde eşit aralıklı). Dosya
+yoksa yerleşik `sessiz`/`dengeli`/`tam` profilleri kullanılır.
+
+Uygulama iki adımdır: `plan_profile()` tüm fanların hedef modunu ve PWM'ini
+önceden hesaplar, `apply_plan()` bunları tek işlem olarak yazar. Yazmadan
+önce tüm dosyaların mevcut değerleri okunur; bir yazma başarısız olursa o
+ana kadar değiştirilen fanlar ters sırayla eski değerlerine döndürülür.
+Doğrudan yazma izni yoksa işlemin tamamı yetkili yardımcıya tek istekte
+gönderilir; fan sayısı ne olursa olsun tek gidiş-dönüş yapılır.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from backend import SENSOR_READER, HwmonFan
+from calibration import FanCalibration
+from write_scheduler import MODE_AUTO, MODE_MANUAL, PwmWriteScheduler
+
+SYSTEM_PROFILES_PATH = Path("/etc/lfancontrol/profiles.json")
+
+ALL_FANS = "*"
+VALUE_AUTO = "auto"
+
+# Seviyelerin üst sınırı (arayüzdeki 0–7 düğmeleri)
+TOP_LEVEL = 7
+
+DEFAULT_PROFILES: Dict[str, Dict[str, object]] = {
+    "sessiz": {ALL_FANS: {"level": 1}},
+    "dengeli": {ALL_FANS: {"level": 4}},
+    "tam": {ALL_FANS: "100%"},
+}
+
+ProfileValue = Union[str, int, Dict[str, int]]
+
+
+def default_profiles_path() -> Path:
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return Path(config_home) / "lfancontrol" / "profiles.json"
+
+
+class ProfileError(RuntimeError):
+    """Profil bulunamadı, geçersiz ya da uygulanamadı.
+
+    Uygulama hatalarında `rolled_back`, değiştirilen fanların eski
+    değerlerine döndürülüp döndürülemediğini belirtir.
+    """
+
+    def __init__(self, message: str, fan_id: Optional[str] = None, rolled_back: bool = True) -> None:
+        super().__init__(message)
+        self.fan_id = fan_id
+        self.rolled_back = rolled_back
+
+
+@dataclass
+class ProfileConfig:
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+    profiles: Dict[str, Dict[str, ProfileValue]] = field(default_factory=dict)
+    path: Optional[Path] = None  # yerleşik profillerde None
+
+    def profile_names(self) -> List[str]:
+        return list(self.profiles)
+
+
+def load_profiles(paths: Optional[Iterable[Path]] = None) -> ProfileConfig:
+    """İlk bulunan yapılandırma dosyasını oku; hiçbiri yoksa yerleşik profiller."""
+    if paths is None:
+        paths = (default_profiles_path(), SYSTEM_PROFILES_PATH)
+    for path in paths:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as exc:
+            raise ProfileError(f"{path} okunamadı: {exc}") from exc
+        groups = data.get("groups", {})
+        profiles = data.get("profiles", {})
+        if not isinstance(groups, dict) or not isinstance(profiles, dict):
+            raise ProfileError(f"{path}: 'groups' ve 'profiles' nesne olmalı.")
+        return ProfileConfig(
+            groups={name: list(ids) for name, ids in groups.items()},
+            profiles={name: dict(entries) for name, entries in profiles.items()},
+            path=path,
+        )
+    return ProfileConfig(profiles={name: dict(p) for name, p in DEFAULT_PROFILES.items()})
+
+
+@dataclass
+class FanSetting:
+    """Bir fanın profil uygulandıktan sonraki hedef durumu."""
+
+    fan: HwmonFan
+    mode: str  # MODE_MANUAL veya MODE_AUTO
+    pwm: Optional[int] = None
+
+    def pairs(self) -> List[Tuple[Path, int]]:
+        """Yazılacak (yol, değer) çiftleri; manuel modda önce pwm_enable=1."""
+        fan = self.fan
+        if self.mode == MODE_AUTO:
+            return [(fan.pwm_enable_path, 2)] if fan.pwm_enable_path is not None else []
+        pairs: List[Tuple[Path, int]] = []
+        if fan.pwm_enable_path is not None:
+            pairs.append((fan.pwm_enable_path, 1))
+        pairs.append((fan.pwm_path, self.pwm))
+        return pairs
+
+    def describe(self) -> str:
+        return "auto" if self.mode == MODE_AUTO else f"pwm={self.pwm}"
+
+
+def _resolve(
+    value: ProfileValue, fan: HwmonFan, calibration: Optional[FanCalibration]
+) -> FanSetting:
+    if value == VALUE_AUTO:
+        if fan.pwm_enable_path is None:
+            raise ProfileError(f"{fan.id}: pwm_enable yok, otomatik moda alınamaz.", fan.id)
+        return FanSetting(fan, MODE_AUTO)
+    try:
+        if isinstance(value, dict):
+            level = max(0, min(TOP_LEVEL, int(value["level"])))
+            if calibration is not None:
+                pwm = calibration.level_to_pwm(level, TOP_LEVEL)
+            else:
+                pwm = int(level / TOP_LEVEL * fan.max_pwm)
+        elif isinstance(value, str) and value.endswith("%"):
+            pwm = int(round(float(value[:-1]) / 100.0 * fan.max_pwm))
+        else:
+            pwm = int(value)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ProfileError(f"{fan.id}: geçersiz profil değeri: {value!r}", fan.id) from exc
+    return FanSetting(fan, MODE_MANUAL, max(fan.min_pwm, min(fan.max_pwm, pwm)))
+
+
+def plan_profile(
+    config: ProfileConfig,
+    name: str,
+    fans: List[HwmonFan],
+    calibrations: Optional[Dict[str, FanCalibration]] = None,
+) -> List[FanSetting]:
+    """Profildeki tüm fanların hedef durumlarını donanıma dokunmadan hesapla."""
+    profile = config.profiles.get(name)
+    if profile is None:
+        raise ProfileError(f"Profil bulunamadı: {name}")
+    calibrations = calibrations or {}
+    by_id = {fan.id: fan for fan in fans}
+    settings: Dict[str, FanSetting] = {}
+    for key, value in profile.items():
+        if key == ALL_FANS:
+            members = [fan for fan in fans if fan.pwm_path is not None]
+        elif key in config.groups:
+            members = []
+            for fan_id in config.groups[key]:
+                fan = by_id.get(fan_id)
+                if fan is None:
+                    raise ProfileError(f"{key} grubundaki fan bulunamadı: {fan_id}", fan_id)
+                members.append(fan)
+        elif key in by_id:
+            members = [by_id[key]]
+        else:
+            raise ProfileError(f"{name}: bilinmeyen grup veya fan: {key}")
+        for fan in members:
+            if fan.pwm_path is None:
+                raise ProfileError(f"{fan.id}: PWM kontrolü desteklenmiyor.", fan.id)
+            settings[fan.id] = _resolve(value, fan, calibrations.get(fan.id))
+    # Aynı çipe giden yazmalar art arda yapılsın.
+    return sorted(settings.values(), key=lambda s: str(s.fan.rpm_path.parent))
+
+
+def _write_value(path: Path, value: int) -> None:
+    recorder = SENSOR_READER.recorder
+    start = time.perf_counter() if recorder is not None else 0.0
+    try:
+        with path.open("w", encoding="utf-8") as f:
+            f.write(f"{value}\n")
+    finally:
+        if recorder is not None:
+            recorder.record_write(os.fspath(path), time.perf_counter() - start)
+
+
+def _rollback(undo: List[Tuple[Path, Optional[int]]]) -> bool:
+    """Yazılan dosyaları ters sırayla eski değerlerine döndür; hepsi başardıysa True."""
+    ok = True
+    for path, value in reversed(undo):
+        if value is None:
+            ok = False
+            continue
+        try:
+            _write_value(path, value)
+        except OSError:
+            ok = False
+    return ok
+
+
+def _apply_direct(pairs: List[Tuple[Path, int]], owners: List[HwmonFan]) -> None:
+    # Önce tüm eski değerler; yazma sırasında okuma hatası geri almayı bozmasın.
+    undo: List[Tuple[Path, Optional[int]]] = []
+    for path, _value in pairs:
+        try:
+            undo.append((path, SENSOR_READER.read_int(path)))
+        except OSError:
+            undo.append((path, None))
+
+    for index, (path, value) in enumerate(pairs):
+        try:
+            _write_value(path, value)
+        except PermissionError:
+            # İzin yoksa önceki yazmaları geri alıp çağıran yardımcıyı denesin.
+            _rollback(undo[:index])
+            raise
+        except OSError as exc:
+            # Başarısız dosya kısmen yazılmış olabilir; önce onu, sonra öncekileri geri al.
+            _rollback(undo[index : index + 1])
+            rolled_back = _rollback(undo[:index])
+            raise ProfileError(
+                f"{owners[index].id}: yazılamadı: {exc}", owners[index].id, rolled_back
+            ) from exc
+
+
+def _apply_helper(pairs: List[Tuple[Path, int]], owners: List[HwmonFan]) -> None:
+    from privileged import HELPER, HelperWriteError, PrivilegedWriteError
+
+    try:
+        HELPER.write_transaction(pairs)
+    except PrivilegedWriteError as exc:
+        # Yardımcıya ulaşılamadı; hiçbir şey yazılmadı.
+        raise ProfileError(f"{exc.title}: {exc.message}") from exc
+    except HelperWriteError as exc:
+        fan = owners[exc.index] if 0 <= exc.index < len(owners) else None
+        raise ProfileError(
+            f"{fan.id if fan else '?'}: yazılamadı: {exc.message}",
+            fan.id if fan else None,
+            exc.rolled_back,
+        ) from exc
+
+
+def apply_plan(plan: List[FanSetting], writes: Optional[PwmWriteScheduler] = None) -> bool:
+    """Planı tek işlem olarak uygula; yetkili yardımcı kullanıldıysa True döndür.
+
+    Hata durumunda `ProfileError` fırlatılır. `writes` verilirse
+    yeni durum zamanlayıcıya bildirilir; hata olursa fanların bilinen
+    durumu unutulur.
+    """
+    pairs: List[Tuple[Path, int]] = []
+    owners: List[HwmonFan] = []
+    for setting in plan:
+        for pair in setting.pairs():
+            pairs.append(pair)
+            owners.append(setting.fan)
+
+    used_helper = False
+    try:
+        try:
+            _apply_direct(pairs, owners)
+        except PermissionError:
+            used_helper = True
+            _apply_helper(pairs, owners)
+    except Exception:
+        if writes is not None:
+            for setting in plan:
+                writes.forget(setting.fan)
+        raise
+
+    if writes is not None:
+        for setting in plan:
+            writes.note_written(setting.fan, setting.mode, setting.pwm)
+    return used_helper
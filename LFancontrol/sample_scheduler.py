@@ -0,0 +1,297 @@
+"""Her sensöre kendi okuma aralığını veren uyarlamalı örnekleme zamanlayıcısı (Qt içermez).
+
+Sensörlerin bir sonraki okuma zamanları tek bir yığında (heap) tutulur; bir
+iş parçacığı binlerce son tarihi tur başına O(k log n) işlemle yürütür
+(k: o an okunacak sensör sayısı). Aralık sensör başına belirlenir:
+
+- Bir tüketicinin istediği sensörler (arayüzde gösterilen fan ve grafikteki
+  sıcaklıklar, denetleyicinin ölçtüğü sensörler) en az istenen sıklıkta
+  okunur (`set_demand`).
+- Diğerleri boşta sayılır: değer eşikten fazla değiştiyse aralık yarıya
+  (en az `idle_min`), değişmediyse `grow` katına (en fazla `idle_max`) çıkar.
+- Yavaş okunan sensörler zamanın `max_duty` oranından fazlasını almaz;
+  okunamayanlar, bir tüketici istese de, her ardışık hatada iki katına
+  çıkan aralıkla (en fazla `max_backoff`) yeniden denenir.
+
+Son tarihler `quantum` ızgarasına yuvarlanır; böylece aralıkları farklı
+sensörler aynı uyanışta okunur. Arayüz açıkken uyanma sıklığı eskisi gibi
+saniyede birdir ama her uyanışta yalnızca zamanı gelen sensörler okunur;
+dizüstülerde EC üzerinden geçen trafik ve yoğun sunucularda sysfs okumaları
+buna göre azalır.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend import MISSING, SENSOR_READER, HwmonScanner, Sensor, Snapshot
+
+_INF = float("inf")
+
+# Ardışık hata sayacının üst sınırı (2**16 s zaten `max_backoff`'u aşar)
+_MAX_FAILURES = 16
+
+
+@dataclass
+class ScheduleSettings:
+    """Örnekleme aralığı ayarları (saniye)."""
+
+    idle_min: float = 2.0
+    idle_max: float = 30.0
+    grow: float = 1.5  # değişmeyen boştaki sensörde aralık çarpanı
+    shrink: float = 0.5  # değişen boştaki sensörde aralık çarpanı
+    max_backoff: float = 60.0
+    max_duty: float = 0.02  # tek sensörün okunmasına ayrılabilecek en büyük zaman oranı
+    quantum: float = 1.0  # son tarihlerin yuvarlandığı ızgara
+    slack: float = 0.05  # bu kadar yakın son tarihler aynı uyanışta okunur
+    # Sensör türüne göre "değişti" sayılan en küçük fark (ham birimlerle)
+    thresholds: Dict[str, int] = field(
+        default_factory=lambda: {"temp": 500, "fan": 50, "pwm": 1}
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ScheduleSettings":
+        """Yapılandırmadaki bilinen alanları al; bilinmeyen anahtar hata verir."""
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Bilinmeyen örnekleme ayarı: {', '.join(sorted(unknown))}")
+        settings = cls()
+        for name, value in data.items():
+            current = getattr(settings, name)
+            if isinstance(current, dict):
+                current.update({str(k): int(v) for k, v in dict(value).items()})
+            else:
+                setattr(settings, name, type(current)(value))
+        return settings
+
+
+class SampleScheduler:
+    """Sensör başına son tarihleri yığında tutan örnekleme zamanlayıcısı.
+
+    Yalnızca tek bir iş parçacığından (örnekleyici veya denetim döngüsü)
+    kullanılmalıdır; başka iş parçacıklarından gelen istekler
+    `Sampler.set_demand()` gibi kuyruk üzerinden iletilir.
+
+    Yığındaki girdiler `(son tarih, sıra, kuşak)` üçlüleridir. Bir sensör
+    yeniden planlandığında kuşağı artar ve eski girdisi çıkarılırken atlanır;
+    yığından silme yapılmaz.
+    """
+
+    def __init__(
+        self,
+        sensors: Sequence[Sensor],
+        settings: Optional[ScheduleSettings] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        self.settings = settings or ScheduleSettings()
+        # Tüketici adı → (sıralar, aralık)
+        self._demands: Dict[str, Tuple[Tuple[int, ...], float]] = {}
+        self.reset(sensors, now)
+
+    def reset(self, sensors: Sequence[Sensor], now: Optional[float] = None) -> None:
+        """Sensör listesi değişti: tüm sensörleri hemen okunacak şekilde baştan planla.
+
+        Sıralar değiştiği için tüketici istekleri de silinir; tüketiciler
+        yeni listeye göre yeniden bildirmelidir.
+        """
+        now = time.monotonic() if now is None else now
+        settings = self.settings
+        count = len(sensors)
+        self.count = count
+        # Boştaki aralık (tüketici isteği ve yavaşlık sınırı uygulanmadan önce)
+        self.interval = array("d", [settings.idle_min]) * count
+        self.deadline = array("d", [now]) * count
+        self.demand = array("d", [_INF]) * count
+        self.cost = array("d", [0.0]) * count
+        self.failures = array("H", [0]) * count
+        self.last = array("q", [MISSING]) * count
+        self._threshold = array(
+            "q", [settings.thresholds.get(sensor.kind, 1) for sensor in sensors]
+        )
+        # Boştaki sensörlerin aralığı sıraya göre sabit bir %0–25 kısaltılır;
+        # aynı anda başlayan sensörler böylece zamanla farklı turlara dağılır.
+        self._spread = array(
+            "d", [1.0 - 0.25 * ((slot * 0.6180339887) % 1.0) for slot in range(count)]
+        )
+        self._generation = array("I", [0]) * count
+        # Eşit son tarihli girdiler sıraya göre dizildiğinden liste zaten bir yığındır.
+        self._heap: List[Tuple[float, int, int]] = [(now, slot, 0) for slot in range(count)]
+        # Izgaranın başlangıcı ilk okumada belirlenir; böylece çağıranın tur
+        # düzeniyle (ör. denetim döngüsünün son tarihleri) aynı fazda olur.
+        self._anchor: Optional[float] = None
+        self._demands.clear()
+        # Son `sample()` çağrısında okunan sıralar
+        self.fresh: List[int] = []
+        self.reads = 0
+        self.wakeups = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _quantize(self, deadline: float, now: float) -> float:
+        quantum = self.settings.quantum
+        if quantum <= 0:
+            return deadline
+        anchor = self._anchor
+        if anchor is None:
+            anchor = self._anchor = now
+        snapped = anchor + round((deadline - anchor) / quantum) * quantum
+        if snapped <= now:
+            snapped += quantum
+        return snapped
+
+    def _schedule(self, slot: int, deadline: float) -> None:
+        generation = (self._generation[slot] + 1) & 0xFFFFFFFF
+        self._generation[slot] = generation
+        self.deadline[slot] = deadline
+        heapq.heappush(self._heap, (deadline, slot, generation))
+
+    # --- Tüketici istekleri ---
+
+    def set_demand(
+        self, consumer: str, slots: Iterable[int], interval: float, now: Optional[float] = None
+    ) -> None:
+        """`consumer` için `slots` sensörlerini en az `interval` saniyede bir oku.
+
+        Aynı tüketicinin önceki isteğinin yerini alır. Bir sensörü birden çok
+        tüketici istiyorsa en kısa aralık geçerlidir.
+        """
+        count = self.count
+        self._demands[consumer] = (
+            tuple(slot for slot in slots if 0 <= slot < count),
+            interval,
+        )
+        self._apply_demands(now)
+
+    def clear_demand(self, consumer: str, now: Optional[float] = None) -> None:
+        if self._demands.pop(consumer, None) is not None:
+            self._apply_demands(now)
+
+    def _apply_demands(self, now: Optional[float]) -> None:
+        now = time.monotonic() if now is None else now
+        wanted = array("d", [_INF]) * self.count
+        for slots, interval in self._demands.values():
+            for slot in slots:
+                if interval < wanted[slot]:
+                    wanted[slot] = interval
+        demand = self.demand
+        for slot in range(self.count):
+            interval = wanted[slot]
+            if interval == demand[slot]:
+                continue
+            demand[slot] = interval
+            if interval < self.interval[slot]:
+                # Daha sık okuma istendi; mevcut son tarihi beklemeden yeni sıklığa geç.
+                if self._anchor is None:
+                    continue  # henüz okuma yapılmadı; tüm sensörler zaten hemen okunacak
+                deadline = self._quantize(now + interval, now)
+                if deadline < self.deadline[slot]:
+                    self._schedule(slot, deadline)
+
+    def expedite(self, slots: Iterable[int], now: Optional[float] = None) -> None:
+        """`slots` sensörlerini bir sonraki turda oku (ör. bir alarm bildirimi geldi)."""
+        now = time.monotonic() if now is None else now
+        for slot in slots:
+            if 0 <= slot < self.count and self.deadline[slot] > now:
+                self._schedule(slot, now)
+
+    # --- Yürütme ---
+
+    def next_deadline(self) -> Optional[float]:
+        """En yakın geçerli son tarih; planlanmış sensör yoksa None."""
+        heap = self._heap
+        generation = self._generation
+        while heap:
+            deadline, slot, gen = heap[0]
+            if gen == generation[slot]:
+                return deadline
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now: float) -> List[int]:
+        """Son tarihi `now + slack` anına kadar gelen sensörleri yığından çıkar.
+
+        Dönen her sıra için `record()` çağrılmalıdır; aksi halde sensör bir
+        daha planlanmaz.
+        """
+        limit = now + self.settings.slack
+        heap = self._heap
+        generation = self._generation
+        due: List[int] = []
+        while heap and heap[0][0] <= limit:
+            _deadline, slot, gen = heapq.heappop(heap)
+            if gen == generation[slot]:
+                due.append(slot)
+        return due
+
+    def record(self, slot: int, value: Optional[int], cost: float, now: float) -> None:
+        """Okuma sonucunu (`value`, hata ise None) ve süresini kaydet; sonraki okumayı planla."""
+        settings = self.settings
+        self.reads += 1
+        previous_cost = self.cost[slot]
+        cost = cost if previous_cost == 0.0 else 0.8 * previous_cost + 0.2 * cost
+        self.cost[slot] = cost
+        demand = self.demand[slot]
+
+        if value is None:
+            failures = min(self.failures[slot] + 1, _MAX_FAILURES)
+            self.failures[slot] = failures
+            base = demand if demand < settings.idle_min else settings.idle_min
+            interval = min(settings.max_backoff, base * (1 << failures))
+        else:
+            self.failures[slot] = 0
+            interval = self.interval[slot]
+            last = self.last[slot]
+            if last != MISSING and abs(value - last) >= self._threshold[slot]:
+                interval *= settings.shrink
+            else:
+                interval *= settings.grow
+            if interval < settings.idle_min:
+                interval = settings.idle_min
+            elif interval > settings.idle_max:
+                interval = settings.idle_max
+            self.last[slot] = value
+        self.interval[slot] = interval
+        if value is not None and demand < interval:
+            # Talep yalnızca başarılı okumaları hızlandırır; hatalı sensör geri çekilir.
+            interval = demand
+        else:
+            interval *= self._spread[slot]
+
+        # Yavaş sensör, okuma süresinin `1 / max_duty` katından sık okunmaz.
+        floor = cost / settings.max_duty
+        if interval < floor:
+            interval = floor
+        self._schedule(slot, self._quantize(now + interval, now))
+
+    def sample(
+        self, scanner: HwmonScanner, out: Optional[Snapshot] = None, now: Optional[float] = None
+    ) -> Snapshot:
+        """Zamanı gelen sensörleri `out` içine oku; diğerlerinin son değeri korunur.
+
+        `out` yoksa (veya boyutu tutmuyorsa) tüm değerleri `MISSING` olan yeni
+        bir anlık görüntü açılır. Okunan sıralar `fresh` içinde kalır.
+        """
+        now = time.monotonic() if now is None else now
+        paths = scanner.index.paths
+        if out is None or len(out.values) != len(paths):
+            out = Snapshot(0.0, array("i", [MISSING]) * len(paths))
+        values = out.values
+        read_int = SENSOR_READER.read_int
+        clock = time.perf_counter
+        due = self.pop_due(now)
+        for slot in due:
+            start = clock()
+            try:
+                value = read_int(paths[slot])
+            except OSError:
+                value = None
+            values[slot] = MISSING if value is None else value
+            self.record(slot, value, clock() - start, now)
+        out.timestamp = time.time()
+        self.fresh = due
+        self.wakeups += 1
+        return out
@@ -0,0 +1,205 @@
+"""Tüm sysfs G/Ç'sini GUI dışındaki tek bir iş parçacığında yürüten örnekleyici."""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple
+
+from backend import HwmonFan, HwmonScanner, Snapshot
+from hotplug import HotplugMonitor
+from sample_scheduler import SampleScheduler
+
+
+@dataclass
+class CommandResult:
+    """Kuyruğa gönderilen bir komutun sonucu."""
+
+    tag: str
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class SamplerStats:
+    """Örnekleme turlarının zamanlamaları (saniye).
+
+    `lateness`: turun planlanan son tarihten ne kadar sonra başladığı,
+    `duration`: turun (hotplug yoklaması, okuma ve geri çağırmalar) süresi.
+    """
+
+    ticks: int = 0
+    lateness_sum: float = 0.0
+    lateness_max: float = 0.0
+    duration_sum: float = 0.0
+    duration_max: float = 0.0
+    last_duration: float = 0.0
+
+    def record(self, lateness: float, duration: float) -> None:
+        self.ticks += 1
+        self.lateness_sum += lateness
+        self.duration_sum += duration
+        self.last_duration = duration
+        if lateness > self.lateness_max:
+            self.lateness_max = lateness
+        if duration > self.duration_max:
+            self.duration_max = duration
+
+
+_Command = Tuple[str, Callable[..., Any], tuple, bool]
+_STOP = object()
+
+
+class Sampler:
+    """Sabit aralıklarla `sample_all()` çağıran ve yazma komutlarını sırayla işleyen iş parçacığı.
+
+    Donanıma erişen her şey (okuma, PWM/mod yazma, pkexec) bu iş parçacığında
+    çalışır. Sonuçlar geri çağırmalarla iletilir; GUI bunları kuyruklu Qt
+    sinyallerine bağlar, böylece arayüz donanım gecikmesinden etkilenmez.
+
+    `hotplug` verilirse her turdan önce değişen hwmon aygıtları yalnızca
+    kendileri yeniden taranır ve yeni fan listesi `on_rescan` ile bildirilir.
+
+    `schedule` verilirse her turda tüm sensörler değil, yalnızca zamanı gelenler
+    okunur ve bir sonraki tur en yakın sensör son tarihinde başlar; diğer
+    sensörlerin son değerleri anlık görüntüde korunur. Bir turda okunan
+    sıralar `fresh_slots` içindedir (tüm sensörler okunduysa None).
+    """
+
+    def __init__(
+        self,
+        scanner: HwmonScanner,
+        interval: float = 1.0,
+        on_snapshot: Optional[Callable[[Snapshot], None]] = None,
+        on_result: Optional[Callable[[CommandResult], None]] = None,
+        hotplug: Optional[HotplugMonitor] = None,
+        on_rescan: Optional[Callable[[List[HwmonFan]], None]] = None,
+        schedule: Optional[SampleScheduler] = None,
+    ) -> None:
+        self.scanner = scanner
+        self.interval = interval
+        self.on_snapshot = on_snapshot
+        self.on_result = on_result
+        self.hotplug = hotplug
+        self.on_rescan = on_rescan
+        self.schedule = schedule
+        self.fresh_slots: Optional[List[int]] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._full_sample = False
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._next_deadline = 0.0
+        # Yalnızca örnekleyici iş parçacığında güncellenir.
+        self.stats = SamplerStats()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="hwmon-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(
+        self, func: Callable[..., Any], *args: Any, tag: str = "", resample: bool = True
+    ) -> None:
+        """`func(*args)` çağrısını örnekleyici iş parçacığında çalıştırmak üzere kuyruğa koy.
+
+        `resample` True ise komuttan hemen sonra yeni bir anlık görüntü alınır.
+        """
+        self._queue.put((tag, func, args, resample))
+
+    def set_interval(self, seconds: float) -> None:
+        self.submit(self._apply_interval, seconds, tag="interval", resample=False)
+
+    def _apply_interval(self, seconds: float) -> None:
+        self.interval = seconds
+        self._next_deadline = min(self._next_deadline, time.monotonic() + seconds)
+
+    def set_demand(self, consumer: str, slots: List[int], interval: float) -> None:
+        """`consumer` için `slots` sensörlerini en az `interval` saniyede bir oku (`schedule` varsa)."""
+        if self.schedule is not None:
+            self.submit(
+                self._apply_demand, consumer, list(slots), interval, tag="interval", resample=False
+            )
+
+    def _apply_demand(self, consumer: str, slots: List[int], interval: float) -> None:
+        self.schedule.set_demand(consumer, slots, interval)
+        deadline = self.schedule.next_deadline()
+        if deadline is not None and deadline < self._next_deadline:
+            self._next_deadline = deadline
+
+    def _following_deadline(self, now: float) -> float:
+        if self.schedule is not None:
+            deadline = self.schedule.next_deadline()
+            return now + self.interval if deadline is None else deadline
+        deadline = self._next_deadline + self.interval
+        if deadline <= now:
+            # Gecikme birikmesin; bir sonraki turu şimdiden say.
+            deadline = now + self.interval
+        return deadline
+
+    def _run(self) -> None:
+        self._next_deadline = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now >= self._next_deadline:
+                self._sample()
+                self.stats.record(now - self._next_deadline, time.monotonic() - now)
+                self._next_deadline = self._following_deadline(now)
+                continue
+
+            try:
+                item = self._queue.get(timeout=self._next_deadline - now)
+            except queue.Empty:
+                continue
+            if item is _STOP:
+                return
+            self._execute(item)
+
+    def _execute(self, command: _Command) -> None:
+        tag, func, args, resample = command
+        result = CommandResult(tag)
+        try:
+            result.value = func(*args)
+        except Exception as exc:  # pylint: disable=broad-except
+            result.error = exc
+        if self.on_result is not None and tag != "interval":
+            self.on_result(result)
+        if resample:
+            self._full_sample = True
+            self._next_deadline = time.monotonic()
+
+    def _sample(self) -> None:
+        if self.hotplug is not None:
+            changed = self.hotplug.poll()
+            if changed:
+                fans = self.scanner.rescan_entries(changed)
+                if self.schedule is not None:
+                    self.schedule.reset(self.scanner.sensors)
+                    self._snapshot = None
+                if self.on_rescan is not None:
+                    self.on_rescan(fans)
+        # Tüketici anlık görüntüyü başka bir iş parçacığında tutacağından her
+        # turda yeni bir nesne veriyoruz.
+        if self.schedule is None:
+            snapshot = self.scanner.sample_all()
+        else:
+            if self._full_sample and self._snapshot is not None:
+                # Komuttan sonra (ör. PWM yazıldı) tüm değerler güncel olsun.
+                self._snapshot = self.scanner.sample_all(self._snapshot)
+                self.fresh_slots = None
+            else:
+                self._snapshot = self.schedule.sample(self.scanner, self._snapshot)
+                self.fresh_slots = self.schedule.fresh
+            self._full_sample = False
+            snapshot = Snapshot(self._snapshot.timestamp, array("i", self._snapshot.values))
+        if self.on_snapshot is not None:
+            self.on_snapshot(snapshot)
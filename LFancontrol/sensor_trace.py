@@ -0,0 +1,610 @@
+"""Sensör turlarının yalnızca eklenen sıkıştırılmış ikili kaydı ve kayıttan oynatma (Qt içermez).
+
+Dosya biçimi (sayılar küçük sonlu):
+
+    [başlık 24 bayt][meta veri JSON, 8'e hizalı][blok][blok]...
+
+Meta veri, kaydın alındığı tarayıcının sensör ve fan listesidir. Her blok en
+fazla `block_ticks` tur tutar:
+
+    [blok başlığı 24 bayt: "LFTB", tur, yük boyu, ayrılmış, ilk zaman damgası]
+    [zaman ofsetleri uint32 × tur (µs, ilk zaman damgasına göre)]
+    [taban int32 × sütun][adım int32 × sütun][genişlik uint8 × sütun]   (8'e hizalı)
+    [sütun 0 farkları][sütun 1 farkları]...                             (her biri 8'e hizalı)
+
+Bir sütunun bloktaki değerleri ilk değer (taban) ve ardışık farklarla
+saklanır. Farklar ortak bölenlerine (adım) bölünüp sığdıkları en dar sabit
+genişlikte (0, 1, 2, 4 veya 8 bayt) yazılır; blok boyunca değişmeyen
+sütunlar (çoğu PWM, okunamayan sensörler) hiç yer kaplamaz. Sıcaklıklar
+çoğunlukla 1000 veya 250 milidereceli adımlarla değiştiğinden tipik bir tur
+sütun başına bir bayttan az tutar.
+
+Okuma `mmap` üzerinden yapılır; açılışta yalnızca blok başlıkları gezilir.
+`TraceBlock` alanları dosyanın kopyasız `memoryview` dilimleridir; örneğin
+NumPy ile bir sütunun farkları:
+
+    numpy.frombuffer(block.deltas(slot), dtype=f"i{block.widths[slot]}")
+
+Süreç yazarken kesilirse yarım kalan son blok okunurken yok sayılır, aynı
+dosyaya eklemeye devam edilirken de silinir. `ReplayScanner` kaydı
+`HwmonScanner` yerine sunar; eğriler, denetleyiciler ve arayüz kaydedilmiş
+veriyle (gerekirse gerçek zamandan hızlı) çalıştırılabilir.
+"""
+from __future__ import annotations
+
+import bisect
+import errno
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
+from dataclasses import dataclass, field
+from functools import reduce
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from backend import MISSING, SENSOR_READER, HwmonFan, Sensor, SensorIndex, Snapshot
+
+_MAGIC = b"LFTRACE\0"
+_VERSION = 1
+# sihirli sözcük, sürüm, blok başına tur, meta veri uzunluğu, ayrılmış
+_HEADER = struct.Struct("<8sIIII")
+_BLOCK_MAGIC = b"LFTB"
+# sihirli sözcük, tur, yük boyu, ayrılmış, ilk zaman damgası
+_BLOCK = struct.Struct("<4sIIId")
+# Fark genişliği (bayt) → array/memoryview tür kodu
+_TYPECODES = {1: "b", 2: "h", 4: "i", 8: "q"}
+# Zaman ofsetleri uint32 µs: bir blok en fazla ~71 dakikayı kapsar.
+_MAX_OFFSET_US = 0xFFFFFFFF
+_INT32_MAX = 0x7FFFFFFF
+
+DEFAULT_BLOCK_TICKS = 256
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _width(lo: int, hi: int) -> int:
+    """[lo, hi] aralığının sığdığı en dar işaretli tamsayı genişliği (bayt)."""
+    for width in (1, 2, 4):
+        limit = 1 << (8 * width - 1)
+        if -limit <= lo and hi < limit:
+            return width
+    return 8
+
+
+def _encode_block(timestamps: array, rows: array, columns: int) -> bytes:
+    """Satır sırasıyla biriken turları bir blok olarak kodla."""
+    ticks = len(timestamps)
+    t0 = timestamps[0]
+    offsets = array("I", [round((t - t0) * 1e6) for t in timestamps])
+    bases = array("i", rows[:columns])
+    steps = array("i", [1]) * columns
+    widths = bytearray(columns)
+    parts: List[bytes] = []
+    for col in range(columns):
+        values = rows[col::columns]
+        deltas = [b - a for a, b in zip(values, values[1:])]
+        step = reduce(math.gcd, deltas, 0)
+        if step == 0:
+            continue  # sütun blok boyunca değişmedi
+        if step > _INT32_MAX:
+            step = 1
+        if step > 1:
+            deltas = [d // step for d in deltas]
+        width = _width(min(deltas), max(deltas))
+        steps[col] = step
+        widths[col] = width
+        data = array(_TYPECODES[width], deltas).tobytes()
+        parts.append(data + bytes(_pad(len(data))))
+
+    table = bases.tobytes() + steps.tobytes() + bytes(widths)
+    head = offsets.tobytes()
+    payload = b"".join(
+        [head, bytes(_pad(len(head))), table, bytes(_pad(len(table)))] + parts
+    )
+    return _BLOCK.pack(_BLOCK_MAGIC, ticks, len(payload), 0, t0) + payload
+
+
+def _same_trace(existing: bytes, header: bytes) -> bool:
+    """İki başlık aynı biçimi ve sensör listesini mi tanımlıyor (blok boyu önemsiz)."""
+    # 8–12. baytlar sürüm, 12–16. baytlar blok başına tur sayısıdır.
+    return existing[:12] == header[:12] and existing[16:] == header[16:]
+
+
+def _valid_end(fd: int, start: int, size: int) -> int:
+    """Dosyadaki son tam bloğun bittiği ofset."""
+    offset = start
+    while offset + _BLOCK.size <= size:
+        magic, _ticks, length, _reserved, _t0 = _BLOCK.unpack(os.pread(fd, _BLOCK.size, offset))
+        if magic != _BLOCK_MAGIC or offset + _BLOCK.size + length > size:
+            break
+        offset += _BLOCK.size + length
+    return offset
+
+
+class TraceWriter:
+    """Anlık görüntüleri bloklar halinde bir kayıt dosyasının sonuna ekler.
+
+    Turlar bellekte biriktirilir ve `block_ticks` tura ulaşınca tek bir
+    `write` ile eklenir; `flush()` yarım bloğu hemen yazar. Dosya aynı
+    sensör listesiyle alınmış bir kayıtsa sonuna devam edilir, değilse
+    `ValueError` fırlatılır. Duvar saati geri atlarsa ya da bir blok
+    uint32 µs ofsetlerine sığmayacaksa yeni blok başlatılır.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sensors: Sequence[Sensor],
+        fans: Iterable[HwmonFan] = (),
+        block_ticks: int = DEFAULT_BLOCK_TICKS,
+    ) -> None:
+        if block_ticks <= 0:
+            raise ValueError("Blok başına tur sayısı pozitif olmalı.")
+        self.path = path
+        self.columns = len(sensors)
+        self.block_ticks = block_ticks
+        meta = json.dumps(
+            {
+                "sensors": [sensor.to_dict() for sensor in sensors],
+                "fans": [fan.to_dict() for fan in fans],
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        ).encode("utf-8")
+        header = _HEADER.pack(_MAGIC, _VERSION, block_ticks, len(meta), 0) + meta
+        header += bytes(_pad(len(header)))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                os.write(fd, header)
+                size = len(header)
+            elif not _same_trace(os.pread(fd, len(header), 0), header):
+                raise ValueError(f"{path} farklı bir sensör listesiyle kaydedilmiş.")
+            else:
+                end = _valid_end(fd, len(header), size)
+                if end < size:
+                    os.ftruncate(fd, end)
+                    size = end
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self.size = size
+        self._timestamps = array("d")
+        self._rows = array("i")
+
+    def append(self, snapshot: Snapshot) -> None:
+        values = snapshot.values
+        if len(values) != self.columns:
+            raise ValueError("Anlık görüntünün sütun sayısı kayıtla uyuşmuyor.")
+        timestamps = self._timestamps
+        t = snapshot.timestamp
+        if timestamps and (
+            t < timestamps[-1] or (t - timestamps[0]) * 1e6 > _MAX_OFFSET_US
+        ):
+            # Saat geri gitti ya da blok µs ofsetlerine sığmıyor: yeni blok.
+            # `flush()` dizileri değiştirdiğinden yenisine bağlan.
+            self.flush()
+            timestamps = self._timestamps
+        timestamps.append(t)
+        self._rows.extend(values)
+        if len(timestamps) >= self.block_ticks:
+            self.flush()
+
+    def flush(self) -> None:
+        """Biriken turları (yarım da olsa) blok olarak yaz."""
+        if not self._timestamps:
+            return
+        data = memoryview(_encode_block(self._timestamps, self._rows, self.columns))
+        self._timestamps = array("d")
+        self._rows = array("i")
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+            self.size += written
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+
+
+class TraceBlock:
+    """Bir bloğun dosyadan kopyasız görünümleri.
+
+    `offsets` (uint32 µs), `bases`/`steps` (int32) ve `widths` (uint8)
+    doğrudan mmap dilimleridir; `deltas(slot)` sütunun kodlanmış farklarıdır.
+    """
+
+    __slots__ = ("start", "t0", "offsets", "bases", "steps", "widths", "_payload", "_positions")
+
+    def __init__(self, start: int, t0: float, payload: memoryview, ticks: int, columns: int) -> None:
+        self.start = start
+        self.t0 = t0
+        pos = 4 * ticks
+        self.offsets = payload[:pos].cast("I")
+        pos += _pad(pos)
+        self.bases = payload[pos:pos + 4 * columns].cast("i")
+        pos += 4 * columns
+        self.steps = payload[pos:pos + 4 * columns].cast("i")
+        pos += 4 * columns
+        self.widths = payload[pos:pos + columns]
+        pos += columns
+        pos += _pad(pos)
+        # Sütun farklarının yük içindeki başlangıçları (genişliği 0 olanlar yer kaplamaz)
+        positions = []
+        count = ticks - 1
+        for width in self.widths:
+            positions.append(pos)
+            if width:
+                size = width * count
+                pos += size + _pad(size)
+        self._payload = payload
+        self._positions = positions
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def deltas(self, slot: int) -> Optional[memoryview]:
+        """Sütunun adıma bölünmüş farkları; sütun blokta değişmediyse None."""
+        width = self.widths[slot]
+        if not width:
+            return None
+        pos = self._positions[slot]
+        return self._payload[pos:pos + width * (len(self) - 1)].cast(_TYPECODES[width])
+
+    def timestamps(self) -> array:
+        t0 = self.t0
+        return array("d", [t0 + offset / 1e6 for offset in self.offsets])
+
+    def column(self, slot: int) -> array:
+        base = self.bases[slot]
+        deltas = self.deltas(slot)
+        if deltas is None:
+            return array("i", [base]) * len(self)
+        step = self.steps[slot]
+        if step != 1:
+            deltas = [d * step for d in deltas]
+        return array("i", list(accumulate(deltas, initial=base)))
+
+    def rows(self) -> array:
+        """Bloğun tüm değerleri satır sırasıyla (tur başına `sütun` değer)."""
+        columns = len(self.bases)
+        rows = array("i", [MISSING]) * (len(self) * columns)
+        for slot in range(columns):
+            rows[slot::columns] = self.column(slot)
+        return rows
+
+
+class TraceReader:
+    """Bir kayıt dosyasını salt okunur eşler; açılışta yalnızca blok başlıklarını gezer."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            size = os.fstat(fd).st_size
+            header = os.pread(fd, _HEADER.size, 0)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path}: sensör kaydı değil.")
+            magic, version, block_ticks, meta_size, _reserved = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{path}: sensör kaydı değil.")
+            if version != _VERSION:
+                raise ValueError(f"{path}: desteklenmeyen kayıt sürümü: {version}")
+            self._mm = mmap.mmap(fd, size, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self.block_ticks = block_ticks
+
+        start = _HEADER.size + meta_size
+        meta = json.loads(self._mm[_HEADER.size:start].decode("utf-8"))
+        self.sensors = [Sensor.from_dict(item) for item in meta["sensors"]]
+        self.fans: List[dict] = meta["fans"]
+        self.columns = len(self.sensors)
+
+        # Blok dizini: yük ofseti, ilk turun sırası ve ilk zaman damgası
+        self._view = memoryview(self._mm)
+        self._payloads: List[Tuple[int, int]] = []
+        self._starts = array("q")
+        self._t0 = array("d")
+        offset = start + _pad(start)
+        ticks = 0
+        while offset + _BLOCK.size <= size:
+            magic, count, length, _reserved, t0 = _BLOCK.unpack_from(self._mm, offset)
+            if magic != _BLOCK_MAGIC or offset + _BLOCK.size + length > size:
+                break  # yazarken kesilmiş son blok
+            self._payloads.append((offset + _BLOCK.size, length))
+            self._starts.append(ticks)
+            self._t0.append(t0)
+            ticks += count
+            offset += _BLOCK.size + length
+        self.ticks = ticks
+        self.size = offset
+
+    def __len__(self) -> int:
+        return self.ticks
+
+    @property
+    def block_count(self) -> int:
+        return len(self._payloads)
+
+    def block(self, number: int) -> TraceBlock:
+        offset, length = self._payloads[number]
+        start = self._starts[number]
+        end = self._starts[number + 1] if number + 1 < len(self._starts) else self.ticks
+        payload = self._view[offset:offset + length]
+        return TraceBlock(start, self._t0[number], payload, end - start, self.columns)
+
+    def blocks(self) -> Iterator[TraceBlock]:
+        for number in range(len(self._payloads)):
+            yield self.block(number)
+
+    def block_of(self, tick: int) -> int:
+        """`tick` sıralı turu içeren bloğun numarası."""
+        if not 0 <= tick < self.ticks:
+            raise IndexError(tick)
+        return bisect.bisect_right(self._starts, tick) - 1
+
+    def timestamps(self) -> array:
+        out = array("d")
+        for block in self.blocks():
+            out.extend(block.timestamps())
+        return out
+
+    def column(self, slot: int) -> array:
+        """Bir sensörün tüm kayıttaki değerleri (okunamayanlar `MISSING`)."""
+        if not 0 <= slot < self.columns:
+            raise IndexError(slot)
+        out = array("i")
+        for block in self.blocks():
+            out.extend(block.column(slot))
+        return out
+
+    def snapshots(self) -> Iterator[Snapshot]:
+        """Turları sırayla anlık görüntü olarak ver (her biri yeni bir nesne)."""
+        columns = self.columns
+        for block in self.blocks():
+            rows = block.rows()
+            for i, t in enumerate(block.timestamps()):
+                yield Snapshot(t, rows[i * columns:(i + 1) * columns])
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # Dışarıda hâlâ tutulan dilimler varsa eşleme onlarla birlikte kapanır.
+            pass
+
+
+@dataclass
+class ReplayFan(HwmonFan):
+    """Okumaları kayıttan yapan, yazmaları `ReplayScanner.writes`'a ekleyen fan."""
+
+    replay: Optional["ReplayScanner"] = field(default=None, repr=False, compare=False)
+
+    def _read_int_file(self, path: Path) -> Optional[int]:
+        try:
+            return self.replay.read_int(path)
+        except OSError:
+            return None
+
+    def _write_int_file(self, path: Path, value: int) -> None:
+        self.replay.write(path, value)
+
+
+class ReplayScanner:
+    """Kaydı `HwmonScanner` arayüzüyle sunan tarayıcı.
+
+    Sensör yolları kayıt dosyasının altına taşınır (ör.
+    `iz.lft/hwmon2/fan1_input`); böylece gözden kaçan bir doğrudan yazma
+    gerçek donanıma ulaşamaz. `install()` paylaşılan `SENSOR_READER`'ı bu
+    kaynağa bağlar; eğriler, örnekleme zamanlayıcısı ve denetleyiciler
+    okumalarını değiştirmeden kayıttan yapar.
+
+    `speed` None ise tur yalnızca `advance()`/`seek()` ile ilerler (denetim
+    döngüsünü beklemeden çalıştırmak için). Verilirse oynatma duvar saatini
+    bu hızla izler; kaydın sonunda son turda kalır. Fan yazmaları donanıma
+    gitmez, (kayıt zamanı, yol, değer) olarak `writes` listesine eklenir;
+    kaydedilmiş sensör değerlerini değiştirmez.
+    """
+
+    def __init__(self, reader: TraceReader, speed: Optional[float] = None) -> None:
+        if not len(reader):
+            raise ValueError(f"{reader.path}: kayıtta tur yok.")
+        self.reader = reader
+        self.root = Path(reader.path)
+        self.speed = speed
+        self.index = SensorIndex()
+        self.fans: List[ReplayFan] = []
+        self.position = -1
+        self.writes: List[Tuple[float, str, int]] = []
+        self._timestamps = reader.timestamps()
+        self._row = array("i", [MISSING]) * reader.columns
+        self._block_number = -1
+        self._block_start = 0
+        self._block_rows = array("i")
+        self._by_path: Dict[str, int] = {}
+        self._written: Dict[str, int] = {}
+        self._clock_start: Optional[float] = None
+        self._scanned = False
+
+    @property
+    def sensors(self) -> List[Sensor]:
+        return self.index.sensors
+
+    def slot(self, sensor_id: str) -> int:
+        return self.index.slot(sensor_id)
+
+    def _virtual(self, path: Union[str, Path]) -> Path:
+        parts = Path(path).parts
+        return self.root.joinpath(*parts[-2:])
+
+    def scan(self) -> List[ReplayFan]:
+        self._scanned = True
+        index = SensorIndex()
+        for sensor in self.reader.sensors:
+            index.add(
+                Sensor(
+                    id=sensor.id,
+                    kind=sensor.kind,
+                    label=sensor.label,
+                    path=self._virtual(sensor.path),
+                    chip=sensor.chip,
+                    index=sensor.index,
+                    min_value=sensor.min_value,
+                    max_value=sensor.max_value,
+                    temp_channels=sensor.temp_channels,
+                    alarms=sensor.alarms,
+                )
+            )
+        self.index = index
+        self._by_path = {path: slot for slot, path in enumerate(index.paths)}
+        # Yapılandırmada doğrudan dosya yoluyla verilen sensörler de okunabilsin.
+        for slot, sensor in enumerate(self.reader.sensors):
+            self._by_path.setdefault(os.fspath(sensor.path), slot)
+
+        fans: List[ReplayFan] = []
+        for item in self.reader.fans:
+            fan = ReplayFan(
+                id=item["id"],
+                label=item["label"],
+                rpm_path=self._virtual(item["rpm_path"]),
+                pwm_path=None if item["pwm_path"] is None else self._virtual(item["pwm_path"]),
+                pwm_enable_path=(
+                    None
+                    if item["pwm_enable_path"] is None
+                    else self._virtual(item["pwm_enable_path"])
+                ),
+                min_pwm=item["min_pwm"],
+                max_pwm=item["max_pwm"],
+                replay=self,
+            )
+            fan.rpm_slot = self._by_path.get(os.fspath(fan.rpm_path), -1)
+            if fan.pwm_path is not None:
+                fan.pwm_slot = self._by_path.get(os.fspath(fan.pwm_path), -1)
+            fans.append(fan)
+        self.fans = fans
+        if self.position < 0:
+            self.seek(0)
+        return fans
+
+    def rescan_entries(self, entries: Iterable[str]) -> List[ReplayFan]:
+        """Kayıtta çalışırken eklenen/çıkarılan aygıt olmaz; fan listesi aynı kalır."""
+        return self.fans
+
+    def entry_names(self) -> List[str]:
+        return []
+
+    def install(self) -> None:
+        """Paylaşılan `SENSOR_READER` okumalarını bu kayda yönlendir."""
+        SENSOR_READER.set_source(self)
+
+    def uninstall(self) -> None:
+        if SENSOR_READER.source is self:
+            SENSOR_READER.set_source(None)
+
+    # --- Konum ---
+
+    def __len__(self) -> int:
+        return len(self.reader)
+
+    @property
+    def duration(self) -> float:
+        """Kaydın ilk ve son turu arasındaki süre (saniye)."""
+        return self._timestamps[-1] - self._timestamps[0]
+
+    @property
+    def timestamp(self) -> float:
+        """Geçerli turun kayıttaki zaman damgası."""
+        return self._timestamps[self.position]
+
+    def seek(self, tick: int) -> None:
+        reader = self.reader
+        number = reader.block_of(tick)
+        if number != self._block_number:
+            block = reader.block(number)
+            self._block_rows = block.rows()
+            self._block_start = block.start
+            self._block_number = number
+        columns = reader.columns
+        first = (tick - self._block_start) * columns
+        self._row[:] = self._block_rows[first:first + columns]
+        self.position = tick
+
+    def advance(self) -> bool:
+        """Bir sonraki tura geç; kayıt bittiyse False."""
+        if self.position + 1 >= len(self.reader):
+            return False
+        self.seek(self.position + 1)
+        return True
+
+    def _follow_clock(self) -> None:
+        now = time.monotonic()
+        if self._clock_start is None:
+            self._clock_start = now
+        target = self._timestamps[0] + (now - self._clock_start) * self.speed
+        tick = bisect.bisect_right(self._timestamps, target) - 1
+        tick = max(0, min(tick, len(self.reader) - 1))
+        if tick != self.position:
+            self.seek(tick)
+
+    # --- Okuma ve yazma ---
+
+    def read_int(self, path: Union[str, Path]) -> Optional[int]:
+        """`SysfsReader.read_int` karşılığı; kayıtta olmayan dosyalar FileNotFoundError."""
+        if self.speed is not None:
+            self._follow_clock()
+        key = os.fspath(path)
+        slot = self._by_path.get(key)
+        if slot is None:
+            value = self._written.get(key)
+            if value is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+            return value
+        value = self._row[slot]
+        return None if value == MISSING else value
+
+    def write(self, path: Union[str, Path], value: int) -> None:
+        key = os.fspath(path)
+        self._written[key] = value
+        self.writes.append((self.timestamp, key, value))
+
+    def written(self, path: Union[str, Path]) -> array:
+        """`path` dosyasının her turun sonundaki yazılmış değeri (hiç yazılmadıysa `MISSING`)."""
+        key = os.fspath(path)
+        out = array("i", [MISSING]) * len(self)
+        timestamps = self._timestamps
+        changes = [
+            (bisect.bisect_right(timestamps, t) - 1, value)
+            for t, written, value in self.writes
+            if written == key
+        ]
+        for (tick, value), (end, _next) in zip(changes, changes[1:] + [(len(out), 0)]):
+            out[tick:end] = array("i", [value]) * (end - tick)
+        return out
+
+    def sample_all(self, out: Optional[Snapshot] = None) -> Snapshot:
+        """Geçerli turu `out` içine kopyala; zaman damgası kayıttakidir."""
+        if not self._scanned:
+            self.scan()
+        if self.speed is not None:
+            self._follow_clock()
+        count = len(self._row)
+        if out is None or len(out.values) != count:
+            out = Snapshot(0.0, array("i", [MISSING]) * count)
+        out.values[:] = self._row
+        out.timestamp = self.timestamp
+        return out
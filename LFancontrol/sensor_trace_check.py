@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Sensör kaydını yazıp geri okuyarak `TraceWriter`/`TraceReader` uyumunu sınar.
+
+Tekdüze 1 s turların yanında duvar saatinin geri atladığı ve bir bloğun
+µs ofsetlerine sığmadığı (ör. uykudan uyanan dizüstü) durumları da yazar;
+her durumda okunan zaman damgaları ve satırlar yazılanlarla aynı olmalıdır.
+
+Kullanım:
+
+    python sensor_trace_check.py     # her durum için bir satır, hata varsa 1 ile çık
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Callable, List, Sequence, Tuple
+
+from backend import MISSING, Sensor, Snapshot
+from sensor_trace import TraceReader, TraceWriter
+
+# Sütun genişlikleri karışık olsun: küçük adımlı sıcaklık, geniş aralıklı
+# devir ve okunamayan bir sensör.
+_SENSORS = [
+    Sensor("chk_temp1", "temp", "", Path("/chk/temp1_input")),
+    Sensor("chk_fan1", "fan", "", Path("/chk/fan1_input")),
+    Sensor("chk_temp2", "temp", "", Path("/chk/temp2_input")),
+]
+
+
+def _rows(count: int, seed: int = 0) -> List[array]:
+    rng = random.Random(seed)
+    return [
+        array("i", [40000 + rng.choice((-1000, 0, 250)) * i, rng.randint(0, 100000), MISSING])
+        for i in range(count)
+    ]
+
+
+def _round_trip(path: Path, times: Sequence[float], block_ticks: int = 8) -> None:
+    rows = _rows(len(times))
+    writer = TraceWriter(path, _SENSORS, block_ticks=block_ticks)
+    for t, values in zip(times, rows):
+        writer.append(Snapshot(t, values))
+    writer.close()
+
+    reader = TraceReader(path)
+    try:
+        got = [(snapshot.timestamp, list(snapshot.values)) for snapshot in reader.snapshots()]
+        columns = [list(reader.column(slot)) for slot in range(len(_SENSORS))]
+    finally:
+        reader.close()
+    assert len(got) == len(times), (len(got), len(times))
+    for i, ((t, values), expected_t, expected) in enumerate(zip(got, times, rows)):
+        # Zaman damgaları µs çözünürlükte saklanır.
+        assert abs(t - expected_t) < 1e-5, (i, t, expected_t)
+        assert values == list(expected), (i, values, list(expected))
+    for slot, column in enumerate(columns):
+        assert column == [row[slot] for row in rows], slot
+
+
+def check_monotonic(path: Path) -> None:
+    _round_trip(path, [1.7e9 + i for i in range(30)])
+
+
+def check_backwards(path: Path) -> None:
+    # NTP saati geri alır; yarım bloğun ortasında ve blok sınırında.
+    times = [1.7e9 + i for i in range(10)] + [1.7e9 + 5 + i for i in range(10)]
+    times += [1.7e9 + i for i in range(8)]
+    _round_trip(path, times)
+
+
+def check_long_gap(path: Path) -> None:
+    # İki saatlik uyku: bir bloğun uint32 µs ofsetlerine sığmaz.
+    times = [1.7e9 + i for i in range(5)] + [1.7e9 + 7200 + i for i in range(5)]
+    _round_trip(path, times)
+
+
+def check_append(path: Path) -> None:
+    # Aynı dosyaya ikinci bir yazarla devam edilir; boşluk araya girer.
+    _round_trip(path, [1.7e9 + i for i in range(5)])
+    times = [1.7e9 + 9000 + i for i in range(5)]
+    writer = TraceWriter(path, _SENSORS, block_ticks=8)
+    for t, values in zip(times, _rows(5, seed=1)):
+        writer.append(Snapshot(t, values))
+    writer.close()
+    reader = TraceReader(path)
+    try:
+        assert len(reader) == 10, len(reader)
+        assert list(reader.timestamps())[5:] == times
+    finally:
+        reader.close()
+
+
+CHECKS: List[Tuple[str, Callable[[Path], None]]] = [
+    ("monotonic", check_monotonic),
+    ("backwards", check_backwards),
+    ("long-gap", check_long_gap),
+    ("append", check_append),
+]
+
+
+def main() -> None:
+    failed = 0
+    for name, check in CHECKS:
+        with tempfile.TemporaryDirectory(prefix="lfc-trace-") as tmp:
+            try:
+                check(Path(tmp) / "check.lft")
+            except Exception as exc:  # pylint: disable=broad-except
+                failed += 1
+                print(f"{name:12s} HATA: {exc!r}")
+            else:
+                print(f"{name:12s} OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""Anlık görüntüleri paylaşılan bellekte yayınlayan veri yolu (Qt içermez).
+
+Yayıncı (`lfanctl publish` ya da `"publish": true` ile `fancontrold`) her
+turda tüm sensör değerlerini `/dev/shm/lfancontrol.bus` dosyasına yazar.
+Arayüz, `lfanctl list/watch` ve dışa aktarıcı gibi okuyucular dosyayı salt
+okunur eşler ve son değerleri kilitsiz, okuma başına hiç sistem çağrısı
+yapmadan alır; kaç tüketici çalışırsa çalışsın sysfs (ve dizüstülerde EC)
+turda yalnızca bir kez okunur.
+
+Dosya düzeni (küçük uçlu):
+
+    başlık (64 bayt)  sihirli sözcük, sürüm, sütun sayısı, meta veri uzunluğu,
+                      durum, yayıncının pid'i, son yayın numarası, aralık
+    meta veri         sensör dizini ve fanlar (JSON, 8 bayta hizalı)
+    yuva 0, yuva 1    sıra no (uint64), zaman damgası (float64), int32 × sütun
+
+Meta veri `Sensor`/`HwmonFan` alanlarını gerçek sysfs yollarıyla taşır;
+okuyucular adları ve sıraları taramadan çözer, fan yazmaları yine doğrudan
+sysfs'e gider.
+
+Yayın çift tamponlu bir seqlock'tur: n. görüntü `n % 2` yuvasına yazılır.
+Yazma boyunca yuvanın sıra numarası tektir, bitince çift olur; ardından
+başlıktaki son yayın numarası n yapılır. Okuyucu son numaranın yuvasını
+kopyalar ve sıra numarası kopyadan önce ve sonra aynı ve çiftse kabul eder.
+Okuyucu kopyalarken yazıcı öbür yuvaya yazdığından yeniden deneme ancak
+kopya iki tur boyunca sürerse gerekir.
+
+Sensör listesi değişirse (yeniden tarama) yayıncı yeni dosyayı yanında
+hazırlayıp `rename` ile yerine koyar ve eskisini kapalı işaretler. Yayıncı
+durursa ya da değerler bayatlarsa `BusScanner` sensörleri kendisi okur.
+"""
+from __future__ import annotations
+
+import errno
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import List, Optional, Sequence, Set, Tuple
+
+from backend import MISSING, SENSOR_READER, HwmonFan, Sensor, SensorIndex, Snapshot
+
+DEFAULT_BUS_PATH = Path(os.environ.get("LFANCONTROL_BUS", "/dev/shm/lfancontrol.bus"))
+
+BUS_VERSION = 1
+_MAGIC = b"LFSBUS\0\0"
+# sihirli sözcük, sürüm, sütun sayısı, meta veri uzunluğu, durum, pid, ayrılmış
+_HEADER = struct.Struct("<8sIIIIII")
+_STATE_OFFSET = 20
+_LATEST_OFFSET = 32  # uint64
+_INTERVAL_OFFSET = 40  # float64
+_HEADER_SIZE = 64
+_SLOT_HEAD = 16  # sıra no + zaman damgası
+
+STATE_LIVE = 0
+STATE_CLOSED = 1
+
+# Tutarlı bir kopya alınamazsa vazgeçmeden önceki deneme sayısı
+_READ_RETRIES = 64
+
+
+def _pad(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _slot_size(columns: int) -> int:
+    return _pad(_SLOT_HEAD + 4 * columns)
+
+
+def _slot_views(
+    buf: memoryview, base: int, columns: int
+) -> List[Tuple[memoryview, memoryview, memoryview]]:
+    """İki yuvanın (sıra no, zaman damgası, değerler) görünümleri."""
+    size = _slot_size(columns)
+    views = []
+    for n in range(2):
+        offset = base + n * size
+        views.append(
+            (
+                buf[offset : offset + 8].cast("Q"),
+                buf[offset + 8 : offset + 16].cast("d"),
+                buf[offset + _SLOT_HEAD : offset + _SLOT_HEAD + 4 * columns].cast("i"),
+            )
+        )
+    return views
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # başka kullanıcının süreci
+    return True
+
+
+class SnapshotPublisher:
+    """Anlık görüntüleri veri yoluna yazan tek yayıncı.
+
+    Aynı yolda canlı başka bir yayıncı varsa `FileExistsError` fırlatılır.
+    `publish()` yalnızca bir iş parçacığından çağrılmalıdır.
+    """
+
+    def __init__(
+        self,
+        sensors: Sequence[Sensor],
+        fans: Sequence[HwmonFan] = (),
+        interval: float = 1.0,
+        path: Path = DEFAULT_BUS_PATH,
+    ) -> None:
+        self.path = Path(path)
+        self.interval = interval
+        self._mm: Optional[mmap.mmap] = None
+        self._inode: Optional[int] = None
+        self.published = 0
+        try:
+            other = BusReader(self.path)
+        except (OSError, ValueError):
+            other = None
+        if other is not None:
+            try:
+                if other.pid != os.getpid() and other.live() and _pid_alive(other.pid):
+                    message = f"Başka bir yayıncı çalışıyor (pid {other.pid})"
+                    raise FileExistsError(errno.EEXIST, message, str(self.path))
+            finally:
+                other.close()
+        self.reset(sensors, fans)
+
+    def reset(self, sensors: Sequence[Sensor], fans: Sequence[HwmonFan] = ()) -> None:
+        """Sensör listesi değişti: yeni dosyayı hazırla, yerine koy ve eskisini kapat."""
+        meta = json.dumps(
+            {
+                "sensors": [sensor.to_dict() for sensor in sensors],
+                "fans": [fan.to_dict() for fan in fans],
+            },
+            ensure_ascii=False,
+        ).encode("utf-8")
+        columns = len(sensors)
+        base = _HEADER_SIZE + _pad(len(meta))
+        size = base + 2 * _slot_size(columns)
+
+        # Ortak bir dizinde (/dev/shm) tahmin edilebilir bir ad açılmaz: mkstemp
+        # dosyayı O_EXCL|O_NOFOLLOW ile yeni oluşturur, önceden konmuş bir
+        # dosya ya da sembolik bağ üzerinden yazılamaz. Yalnızca yayıncı
+        # gerektirir; okuyucuların (`lfanctl list`) başlangıcına eklenmesin.
+        import tempfile
+
+        fd, name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        tmp_path = Path(name)
+        try:
+            os.fchmod(fd, 0o644)  # umask'tan bağımsız: her kullanıcı okuyabilsin
+            os.ftruncate(fd, size)
+            mm = mmap.mmap(fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            inode = os.fstat(fd).st_ino
+        except OSError:
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+        os.close(fd)
+        mm[: _HEADER.size] = _HEADER.pack(
+            _MAGIC, BUS_VERSION, columns, len(meta), STATE_LIVE, os.getpid(), 0
+        )
+        struct.pack_into("<d", mm, _INTERVAL_OFFSET, self.interval)
+        mm[_HEADER_SIZE : _HEADER_SIZE + len(meta)] = meta
+        try:
+            os.replace(tmp_path, self.path)
+        except OSError:
+            mm.close()
+            os.unlink(tmp_path)
+            raise
+
+        self._release(unlink=False)
+        buf = memoryview(mm)
+        self._mm = mm
+        self._inode = inode
+        self._buf = buf
+        self._state = buf[_STATE_OFFSET : _STATE_OFFSET + 4].cast("I")
+        self._latest = buf[_LATEST_OFFSET : _LATEST_OFFSET + 8].cast("Q")
+        self._slots = _slot_views(buf, base, columns)
+        self.columns = columns
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Görüntüyü boştaki yuvaya yaz ve son yayın yap."""
+        if len(snapshot.values) != self.columns:
+            raise ValueError(
+                f"Sütun sayısı uyuşmuyor: {len(snapshot.values)} (beklenen {self.columns})"
+            )
+        latest = self._latest
+        number = latest[0] + 1
+        seq, stamp, values = self._slots[number & 1]
+        seq[0] += 1  # tek: yazılıyor
+        stamp[0] = snapshot.timestamp
+        values[:] = memoryview(snapshot.values)
+        seq[0] += 1
+        latest[0] = number
+        self.published += 1
+
+    def _release(self, unlink: bool) -> None:
+        if self._mm is None:
+            return
+        self._state[0] = STATE_CLOSED
+        if unlink:
+            # Yerimize başka bir yayıncı geçtiyse onun dosyasını silme.
+            try:
+                if os.stat(self.path).st_ino == self._inode:
+                    os.unlink(self.path)
+            except OSError:
+                pass
+        for view in (self._state, self._latest):
+            view.release()
+        for slot in self._slots:
+            for view in slot:
+                view.release()
+        self._buf.release()
+        self._mm.close()
+        self._mm = None
+
+    def close(self) -> None:
+        """Dosyayı kapalı işaretle ve (hâlâ bizimse) sil."""
+        self._release(unlink=True)
+
+
+class BusReader:
+    """Veri yolu dosyasını salt okunur eşler; `read()` sistem çağrısı yapmaz.
+
+    Dosya root'a ya da bu kullanıcıya ait değilse veya başkalarınca
+    yazılabiliyorsa `ValueError` fırlatılır; sahte değerlere güvenilmez.
+    """
+
+    def __init__(self, path: Path = DEFAULT_BUS_PATH) -> None:
+        self.path = Path(path)
+        fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            st = os.fstat(fd)
+            if st.st_uid not in (0, os.getuid()) or st.st_mode & 0o022:
+                raise ValueError(f"{self.path}: güvenilmeyen veri yolu dosyası (uid {st.st_uid}).")
+            if st.st_size < _HEADER_SIZE:
+                raise ValueError(f"{self.path}: veri yolu dosyası değil.")
+            mm = mmap.mmap(fd, st.st_size, mmap.MAP_SHARED, mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        self.inode = st.st_ino
+        try:
+            magic, version, columns, meta_size, _state, pid, _ = _HEADER.unpack_from(mm, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{self.path}: veri yolu dosyası değil.")
+            if version != BUS_VERSION:
+                raise ValueError(f"{self.path}: desteklenmeyen sürüm {version}.")
+            base = _HEADER_SIZE + _pad(meta_size)
+            if st.st_size < base + 2 * _slot_size(columns):
+                raise ValueError(f"{self.path}: dosya eksik.")
+            meta = json.loads(bytes(mm[_HEADER_SIZE : _HEADER_SIZE + meta_size]).decode("utf-8"))
+        except ValueError:
+            mm.close()
+            raise
+        self._mm = mm
+        self.pid = pid
+        self.columns = columns
+        self.interval = struct.unpack_from("<d", mm, _INTERVAL_OFFSET)[0]
+        self.sensors = [Sensor.from_dict(item) for item in meta["sensors"]]
+        self.fans = [HwmonFan.from_dict(item) for item in meta["fans"]]
+        buf = memoryview(mm)
+        self._buf = buf
+        self._state = buf[_STATE_OFFSET : _STATE_OFFSET + 4].cast("I")
+        self._latest = buf[_LATEST_OFFSET : _LATEST_OFFSET + 8].cast("Q")
+        self._slots = _slot_views(buf, base, columns)
+
+    @property
+    def closed(self) -> bool:
+        """Yayıncı bu dosyayı bıraktı (durdu ya da sensör listesi değişti)."""
+        return self._state[0] != STATE_LIVE
+
+    @property
+    def timestamp(self) -> Optional[float]:
+        """Son yayının zaman damgası; henüz yayın yoksa None."""
+        number = self._latest[0]
+        if number == 0:
+            return None
+        return self._slots[number & 1][1][0]
+
+    def max_age(self) -> float:
+        """Bu kadar eski değerler bayat sayılır (aralığın üç katı, en az 5 s)."""
+        return max(3.0 * self.interval, 5.0)
+
+    def live(self, now: Optional[float] = None) -> bool:
+        """Dosya açık ve son yayın bayat değil."""
+        if self.closed:
+            return False
+        stamp = self.timestamp
+        now = time.time() if now is None else now
+        return stamp is not None and now - stamp <= self.max_age()
+
+    def read(self, out: Optional[Snapshot] = None) -> Optional[Snapshot]:
+        """Son yayını `out` içine kopyala; yayın yoksa None."""
+        if out is None or len(out.values) != self.columns:
+            out = Snapshot(0.0, array("i", [MISSING]) * self.columns)
+        target = memoryview(out.values)
+        latest = self._latest
+        slots = self._slots
+        for _ in range(_READ_RETRIES):
+            number = latest[0]
+            if number == 0:
+                return None
+            seq, stamp, values = slots[number & 1]
+            before = seq[0]
+            if before & 1:
+                continue
+            timestamp = stamp[0]
+            target[:] = values
+            if seq[0] == before:
+                out.timestamp = timestamp
+                return out
+        return None
+
+    def close(self) -> None:
+        if self._mm is None:
+            return
+        for view in (self._state, self._latest):
+            view.release()
+        for slot in self._slots:
+            for view in slot:
+                view.release()
+        self._buf.release()
+        self._mm.close()
+        self._mm = None
+
+
+class BusScanner:
+    """Veri yolunu `HwmonScanner` arayüzüyle sunan tarayıcı.
+
+    `sample_all()` değerleri paylaşılan bellekten alır. Yayıncı durursa
+    ya da değerler bayatlarsa aynı sensörler `SENSOR_READER` ile doğrudan
+    okunur; yeni bir yayıncı başlayınca `monitor()` bunu bildirir ve
+    örnekleyicinin yeniden tarama yolu yeni dosyayı açar.
+    """
+
+    def __init__(self, path: Path = DEFAULT_BUS_PATH) -> None:
+        self.path = Path(path)
+        self.root = self.path
+        self.cache_path = None
+        self.reader = BusReader(self.path)
+        self._load()
+        # Doğrudan okunan (yayıncısız) tur sayısı
+        self.direct_reads = 0
+
+    def _load(self) -> None:
+        reader = self.reader
+        index = SensorIndex()
+        for sensor in reader.sensors:
+            index.add(sensor)
+        self.index = index
+        self.fans = reader.fans
+
+    @property
+    def sensors(self) -> List[Sensor]:
+        return self.index.sensors
+
+    def slot(self, sensor_id: str) -> int:
+        return self.index.slot(sensor_id)
+
+    def scan(self) -> List[HwmonFan]:
+        return self.fans
+
+    def rescan_entries(self, entries: Set[str]) -> List[HwmonFan]:
+        """Yeni yayıncının dosyasını aç; açılamazsa mevcut dizinle devam et."""
+        try:
+            reader = BusReader(self.path)
+        except (OSError, ValueError):
+            return self.fans
+        self.reader.close()
+        self.reader = reader
+        self._load()
+        return self.fans
+
+    def entry_names(self) -> List[str]:
+        return []
+
+    def replaced(self) -> bool:
+        """Kullanılan dosya bırakıldı ve yerinde başka bir dosya var."""
+        reader = self.reader
+        if reader.live():
+            return False
+        try:
+            return os.stat(self.path).st_ino != reader.inode
+        except OSError:
+            return False
+
+    def monitor(self) -> "BusMonitor":
+        """`HotplugMonitor` yerine örnekleyiciye verilecek izleyici."""
+        return BusMonitor(self)
+
+    def sample_all(self, out: Optional[Snapshot] = None) -> Snapshot:
+        reader = self.reader
+        if reader.live():
+            snapshot = reader.read(out)
+            if snapshot is not None:
+                return snapshot
+        return self._read_direct(out)
+
+    def _read_direct(self, out: Optional[Snapshot]) -> Snapshot:
+        paths = self.index.paths
+        if out is None or len(out.values) != len(paths):
+            out = Snapshot(0.0, array("i", [MISSING]) * len(paths))
+        values = out.values
+        read_int = SENSOR_READER.read_int
+        for slot, path in enumerate(paths):
+            try:
+                value = read_int(path)
+            except OSError:
+                value = None
+            values[slot] = MISSING if value is None else value
+        out.timestamp = time.time()
+        self.direct_reads += 1
+        return out
+
+    def close(self) -> None:
+        self.reader.close()
+
+
+class BusMonitor:
+    """Yayıncı dosyayı değiştirdiğinde bir kez `{"bus"}` döndüren izleyici."""
+
+    def __init__(self, scanner: BusScanner, check_interval: float = 1.0) -> None:
+        self.scanner = scanner
+        self.check_interval = check_interval
+        self._next_check = 0.0
+
+    def fileno(self) -> int:
+        return -1
+
+    def poll(self) -> Set[str]:
+        now = time.monotonic()
+        if now < self._next_check:
+            return set()
+        self._next_check = now + self.check_interval
+        return {"bus"} if self.scanner.replaced() else set()
+
+    def close(self) -> None:
+        pass
+
+
+def open_bus(path: Path = DEFAULT_BUS_PATH) -> Optional[BusScanner]:
+    """Canlı bir yayıncı varsa veri yolu tarayıcısı, yoksa None."""
+    try:
+        scanner = BusScanner(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not scanner.reader.live() or not _pid_alive(scanner.reader.pid):
+        scanner.close()
+        return None
+    return scanner
@@ -0,0 +1,241 @@
+"""Pencere kapalıyken sistem tepsisinde az kaynakla çalışan simge.
+
+Tepsi kipinde ana pencereyi kapatmak uygulamayı bitirmez: pencere,
+örnekleyicisi, alarm izleyicisi, geçmişi ve grafiğiyle birlikte tamamen
+silinir (`WA_DeleteOnClose`), boşalan bellek işletim sistemine geri
+verilir. Geriye yalnızca en sıcak sensörü (ya da en hızlı fanı) gösteren
+bir simge kalır. Simge, GUI iş parçacığında `interval_ms` aralıklı kaba bir
+zamanlayıcıyla yalnızca sıcaklık ve devir dosyalarını okur; ayrı bir iş
+parçacığı yoktur. Canlı bir veri yolu yayıncısı varsa değerler oradan
+kopyalanır. Simgeye tıklamak pencereyi taranmış önbellekten yeniden kurar.
+
+Bütçe (`python bench.py tray`, sahte ağaç, offscreen): tepside tüm iş
+parçacıklarında saniyede en fazla 1 uyanma; kapanan pencere, hiç açılmamış
+bir tepsi sürecine göre en fazla 4 MiB özel bellek (`RssAnon`) bırakır;
+pencere 250 ms'den kısa sürede yeniden kurulur.
+"""
+from __future__ import annotations
+
+import ctypes
+import gc
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+from PySide6 import QtCore, QtGui, QtWidgets
+
+from backend import MISSING, SENSOR_READER, HwmonScanner, Snapshot
+from snapshot_bus import BusScanner, open_bus
+
+SHOW_TEMP = "temp"
+SHOW_FAN = "fan"
+
+TRAY_INTERVAL_MS = 5000
+
+
+def _trim_heap() -> None:
+    """Serbest kalan yığın belleğini işletim sistemine geri ver (yalnızca glibc)."""
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class TrayController(QtCore.QObject):
+    """Tepsi simgesini ve isteğe bağlı olarak kurulan ana pencereyi yönetir.
+
+    `window_factory` her çağrıda yeni bir pencere döndürmelidir; pencere
+    kapandığında silinir ve denetleyici tepsi kipine geçer.
+    """
+
+    def __init__(
+        self,
+        window_factory: Callable[[], QtWidgets.QMainWindow],
+        root: Optional[Path] = None,
+        show: str = SHOW_TEMP,
+        interval_ms: int = TRAY_INTERVAL_MS,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        super().__init__(parent)
+        self._factory = window_factory
+        self._root = root
+        self._show = show
+        self._window: Optional[QtWidgets.QMainWindow] = None
+        self._scanner: Optional[Union[HwmonScanner, BusScanner]] = None
+        self._snapshot: Optional[Snapshot] = None
+        self._quitting = False
+        # Son çizilen simge metni ve rengi; değişmedikçe simge yeniden çizilmez.
+        self._drawn: Optional[Tuple[str, bool]] = None
+        # Tepsideyken yapılan yenileme sayısı
+        self.refreshes = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.refresh)
+
+        self._menu = QtWidgets.QMenu()
+        self._menu.addAction("Pencereyi Aç", self.show_window)
+        self._menu.addSeparator()
+        group = QtGui.QActionGroup(self._menu)
+        choices = (("Simge: En Sıcak Sensör", SHOW_TEMP), ("Simge: En Hızlı Fan", SHOW_FAN))
+        for label, value in choices:
+            action = self._menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(value == show)
+            action.triggered.connect(lambda _checked, v=value: self.set_show(v))
+            group.addAction(action)
+        self._menu.addSeparator()
+        self._menu.addAction("Çık", self.quit)
+
+        self._icon = QtWidgets.QSystemTrayIcon(self)
+        self._icon.setContextMenu(self._menu)
+        self._icon.activated.connect(self._on_activated)
+        self._icon.setIcon(self._render("…", False))
+        self._icon.setToolTip("Linux Fan Control")
+
+    @property
+    def window(self) -> Optional[QtWidgets.QMainWindow]:
+        return self._window
+
+    def start(self, hidden: bool = False) -> None:
+        """Simgeyi göster; `hidden` değilse pencereyi de aç."""
+        self._icon.show()
+        if hidden:
+            self._enter_tray()
+        else:
+            self.show_window()
+
+    def show_window(self) -> None:
+        if self._window is None:
+            self._leave_tray()
+            window = self._factory()
+            window.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+            window.destroyed.connect(self._on_window_destroyed)
+            self._window = window
+        self._window.show()
+        self._window.raise_()
+        self._window.activateWindow()
+
+    def set_show(self, show: str) -> None:
+        self._show = show
+        if self._scanner is not None:
+            self.refresh()
+
+    def quit(self) -> None:
+        self._quitting = True
+        if self._window is not None:
+            self._window.close()
+        self._leave_tray()
+        self._icon.hide()
+        QtWidgets.QApplication.quit()
+
+    def _on_activated(self, reason: QtWidgets.QSystemTrayIcon.ActivationReason) -> None:
+        if reason not in (
+            QtWidgets.QSystemTrayIcon.Trigger,
+            QtWidgets.QSystemTrayIcon.DoubleClick,
+        ):
+            return
+        if self._window is not None and self._window.isVisible():
+            self._window.close()
+        else:
+            self.show_window()
+
+    def _on_window_destroyed(self) -> None:
+        self._window = None
+        if not self._quitting:
+            self._enter_tray()
+
+    # --- Tepsi kipi ---
+
+    def _enter_tray(self) -> None:
+        # Pencerenin Python tarafındaki döngüsel başvuruları da (bağlantılar,
+        # lambdalar) toplansın; ardından boşalan yığın geri verilsin.
+        gc.collect()
+        _trim_heap()
+        scanner = open_bus()
+        if scanner is None:
+            scanner = HwmonScanner(self._root) if self._root else HwmonScanner()
+        scanner.scan()
+        self._scanner = scanner
+        self._snapshot = None
+        self._drawn = None
+        self.refresh()
+        self._timer.start()
+
+    def _leave_tray(self) -> None:
+        self._timer.stop()
+        if isinstance(self._scanner, BusScanner):
+            self._scanner.close()
+        self._scanner = None
+        self._snapshot = None
+
+    def _read(self, slot: int) -> int:
+        """Sensörün güncel ham değeri; okunamazsa `MISSING`."""
+        if self._snapshot is not None:
+            return self._snapshot.values[slot]
+        try:
+            value = SENSOR_READER.read_int(self._scanner.index.paths[slot])
+        except OSError:
+            value = None
+        return MISSING if value is None else value
+
+    def _peak(self, slots: Sequence[int]) -> Tuple[int, int]:
+        """`slots` içinde en yüksek değerli sensörün (sırası, değeri); yoksa (-1, MISSING)."""
+        best_slot, best = -1, MISSING
+        for slot in slots:
+            value = self._read(slot)
+            if value != MISSING and value > best:
+                best_slot, best = slot, value
+        return best_slot, best
+
+    def refresh(self) -> None:
+        """Sıcaklıkları ve devirleri okuyup simgeyi ve ipucunu güncelle."""
+        scanner = self._scanner
+        if scanner is None:
+            return
+        self.refreshes += 1
+        if isinstance(scanner, BusScanner):
+            if scanner.replaced():
+                scanner.rescan_entries(set())
+            # Veri yolundan tüm tur tek kopyayla gelir.
+            self._snapshot = scanner.sample_all(self._snapshot)
+        index = scanner.index
+        sensors = index.sensors
+        temp_slot, temp = self._peak(index.temps)
+        fan_slot, rpm = self._peak(index.fans)
+
+        lines = []
+        if temp_slot >= 0:
+            lines.append(f"En sıcak: {sensors[temp_slot].label} {temp / 1000:.1f} °C")
+        if fan_slot >= 0:
+            lines.append(f"En hızlı fan: {sensors[fan_slot].label} {rpm} RPM")
+        self._icon.setToolTip("\n".join(lines) or "Okunabilen sensör yok")
+
+        if self._show == SHOW_FAN or temp_slot < 0:
+            text = "-" if fan_slot < 0 else (f"{rpm / 1000:.1f}k" if rpm >= 1000 else str(rpm))
+            hot = False
+        else:
+            text = f"{temp / 1000:.0f}°"
+            limit = sensors[temp_slot].max_value
+            hot = limit is not None and temp >= limit
+        if (text, hot) != self._drawn:
+            self._drawn = (text, hot)
+            self._icon.setIcon(self._render(text, hot))
+
+    def _render(self, text: str, hot: bool) -> QtGui.QIcon:
+        size = 64
+        pixmap = QtGui.QPixmap(size, size)
+        pixmap.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(pixmap)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor("#d62728" if hot else "#303030"))
+        painter.drawRoundedRect(0, 0, size, size, 12, 12)
+        font = painter.font()
+        font.setBold(True)
+        font.setPixelSize(30 if len(text) <= 3 else 22)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor("white"))
+        painter.drawText(pixmap.rect(), QtCore.Qt.AlignCenter, text)
+        painter.end()
+        return QtGui.QIcon(pixmap)
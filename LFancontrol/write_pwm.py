@@ -1,18 +1,378 @@
 #!/usr/bin/env python3
-"""PWM değerini yazmak için pkexec ile çalıştırılacak helper script."""
+"""PWM değerini yazmak için pkexec ile çalıştırılacak helper script.
+
+İki kullanım şekli vardır:
+
+    write_pwm.py <pwm_dosya_yolu> <değer>
+        Tek bir değeri yazar ve çıkar (eski davranış).
+
+    write_pwm.py --serve --socket <yol> [--uid <uid>] [--root <hwmon_kökü>]
+        Bir kez yetkilendirilip kalıcı olarak çalışan yardımcı. Yerel bir Unix
+        soketi üzerinden satır tabanlı protokolle toplu yazma isteklerini kabul
+        eder. Yalnızca `--root` altındaki hwmonN dizinlerinde bulunan `pwmN` ve
+        `pwmN_enable` dosyalarına yazılabilir.
+
+Protokol (her istek ve yanıt tek satırdır):
+
+    W <yol> <değer> [<yol> <değer> ...]   -> OK | ERR <sıra> <mesaj>
+    T <yol> <değer> [<yol> <değer> ...]   -> OK | ERR <sıra> <mesaj> | PARTIAL <sıra> <mesaj>
+    PING                                   -> OK
+    QUIT                                   -> OK (yardımcı kapanır)
+
+`W` çiftleri sırayla yazar ve ilk hatada durur; `<sıra>` başarısız çiftin
+0 tabanlı numarasıdır, ondan önceki çiftler yazılmıştır.
+
+`T` aynı çiftleri bir işlem olarak yazar: önce tüm dosyaların mevcut
+değerleri okunur, bir yazma başarısız olursa o ana kadar yazılanlar ters
+sırayla eski değerlerine döndürülür (`ERR`). Geri alma da başarısız olursa
+yanıt `PARTIAL` olur.
+"""
+import argparse
+import os
+import re
+import selectors
+import socket
+import stat
+import struct
 import sys
+import time
+
+HWMON_ROOT = "/sys/class/hwmon"
+_WRITABLE_NAME = re.compile(r"pwm\d+(_enable)?\Z")
+_MAX_LINE = 64 * 1024
+_PEERCRED = struct.Struct("3i")
+
+
+def _write_once(pwm_path, value):
+    try:
+        with open(pwm_path, "w", encoding="utf-8") as f:
+            f.write(f"{value}\n")
+        print("OK")
+    except Exception as e:
+        print(f"HATA: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def build_whitelist(root):
+    """`root` altındaki hwmonN dizinlerinde yazılabilecek dosyaların kümesi."""
+    allowed = set()
+    try:
+        entries = sorted(os.listdir(root))
+    except OSError:
+        return allowed
+    for entry in entries:
+        if not entry.startswith("hwmon"):
+            continue
+        hwmon_dir = os.path.join(root, entry)
+        try:
+            names = os.listdir(hwmon_dir)
+        except OSError:
+            continue
+        for name in names:
+            if _WRITABLE_NAME.match(name):
+                path = os.path.join(hwmon_dir, name)
+                allowed.add(path)
+                allowed.add(os.path.realpath(path))
+    return allowed
+
+
+class PwmWriter:
+    """Beyaz listedeki dosyalara açık tutulan tanımlayıcılarla yazar."""
+
+    def __init__(self, root):
+        self.root = root
+        self.allowed = build_whitelist(root)
+        self._fds = {}
+
+    def _open(self, path):
+        entry = self._fds.get(path)
+        if entry is None:
+            fd = os.open(path, os.O_WRONLY | os.O_CLOEXEC)
+            # sysfs dışındaki (ör. sahte ağaçtaki) normal dosyalarda eski içerik
+            # kısaltılmalı; sysfs öznitelikleri ise her yazmayı baştan okur.
+            truncate = not os.path.realpath(path).startswith("/sys/")
+            entry = self._fds[path] = (fd, truncate)
+        return entry
+
+    def _drop(self, path):
+        entry = self._fds.pop(path, None)
+        if entry is not None:
+            try:
+                os.close(entry[0])
+            except OSError:
+                pass
+
+    def write(self, path, value):
+        if path not in self.allowed:
+            # Sonradan eklenmiş bir hwmon aygıtı olabilir; listeyi bir kez yenile.
+            self.allowed = build_whitelist(self.root)
+        if path not in self.allowed:
+            raise PermissionError(f"izin verilmeyen yol: {path}")
+        if not 0 <= value <= 255:
+            raise ValueError(f"geçersiz değer: {value}")
+        data = b"%d\n" % value
+        for attempt in (0, 1):
+            fd, truncate = self._open(path)
+            try:
+                os.pwrite(fd, data, 0)
+                if truncate:
+                    os.ftruncate(fd, len(data))
+                return
+            except OSError:
+                # Sürücü yeniden yüklenmiş olabilir; bir kez yeniden aç.
+                self._drop(path)
+                if attempt:
+                    raise
+
+    def read(self, path):
+        """Beyaz listedeki dosyanın mevcut değerini oku (işlem geri alması için)."""
+        if path not in self.allowed:
+            self.allowed = build_whitelist(self.root)
+        if path not in self.allowed:
+            raise PermissionError(f"izin verilmeyen yol: {path}")
+        with open(path, "rb") as f:
+            return int(f.read(32).strip() or b"0")
+
+    def close(self):
+        for path in list(self._fds):
+            self._drop(path)
+
+
+def _transaction(writer, pairs):
+    """Çiftleri hep ya da hiç yaz; yanıt satırını döndür."""
+    previous = []
+    try:
+        for path, _value in pairs:
+            previous.append(writer.read(path))
+    except Exception as exc:  # pylint: disable=broad-except
+        message = str(exc).replace("\n", " ")
+        return f"ERR {len(previous)} {message}\n".encode("utf-8", "replace")
+
+    for index, (path, value) in enumerate(pairs):
+        try:
+            writer.write(path, value)
+        except Exception as exc:  # pylint: disable=broad-except
+            message = str(exc).replace("\n", " ")
+            status = "ERR"
+            # Başarısız çift de kısmen yazılmış olabilir; onu da geri al.
+            for undo in range(index, -1, -1):
+                try:
+                    writer.write(pairs[undo][0], previous[undo])
+                except Exception:  # pylint: disable=broad-except
+                    if undo < index:
+                        status = "PARTIAL"
+            return f"{status} {index} {message}\n".encode("utf-8", "replace")
+    return b"OK\n"
+
+
+def handle_line(writer, line):
+    """Tek bir istek satırını işle; (yanıt, kapat_mı) döndür."""
+    parts = line.split()
+    if not parts:
+        return b"ERR 0 bos istek\n", False
+    cmd = parts[0]
+    if cmd == b"PING":
+        return b"OK\n", False
+    if cmd == b"QUIT":
+        return b"OK\n", True
+    if cmd not in (b"W", b"T") or len(parts) % 2 != 1:
+        return b"ERR 0 gecersiz istek\n", False
+
+    args = parts[1:]
+    if cmd == b"T":
+        try:
+            pairs = [
+                (os.fsdecode(args[i]), int(args[i + 1])) for i in range(0, len(args), 2)
+            ]
+        except ValueError:
+            return b"ERR 0 gecersiz istek\n", False
+        return _transaction(writer, pairs), False
+    for i in range(0, len(args), 2):
+        index = i // 2
+        try:
+            path = os.fsdecode(args[i])
+            writer.write(path, int(args[i + 1]))
+        except Exception as exc:  # pylint: disable=broad-except
+            message = str(exc).replace("\n", " ")
+            return f"ERR {index} {message}\n".encode("utf-8", "replace"), False
+    return b"OK\n", False
+
+
+class Connection:
+    """Bir istemci bağlantısının satır tamponu; hem `serve` hem `serve_connection` kullanır."""
+
+    def __init__(self, sock, writer):
+        self.sock = sock
+        self.writer = writer
+        self.requests = 0
+        self._buf = b""
+
+    def feed(self, data):
+        """Soketten gelen veriyi işle.
+
+        None: bağlantı sürer; True: istemci QUIT gönderdi; False: bağlantı
+        kapandı ya da satır `_MAX_LINE` sınırını aştı, kapatılmalı.
+        """
+        if not data:
+            return False
+        buf = self._buf + data
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            self.requests += 1
+            reply, quit_requested = handle_line(self.writer, line)
+            self.sock.sendall(reply)
+            if quit_requested:
+                return True
+        if len(buf) > _MAX_LINE:
+            return False
+        self._buf = buf
+        return None
+
+
+def serve_connection(conn, writer):
+    """Tek bir bağlı soketi kapanana kadar işle (test/mock soketler için de kullanılabilir).
+
+    İstemci QUIT gönderdiyse True döndürür.
+    """
+    connection = Connection(conn, writer)
+    while True:
+        result = connection.feed(conn.recv(4096))
+        if result is not None:
+            return result
+
+
+def _peer_uid(conn):
+    creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _PEERCRED.size)
+    _pid, uid, _gid = _PEERCRED.unpack(creds)
+    return uid
+
+
+def _check_socket_dir(socket_path, uid):
+    """Soketin dizini `uid`'e ya da root'a ait olmalı ve başkalarınca yazılamamalı.
+
+    Aksi hâlde başka bir kullanıcı soketi değiştirebilir ya da root olarak
+    çalışan yardımcıya keyfi bir yolu sildirebilirdi.
+    """
+    parent = os.path.dirname(os.path.abspath(socket_path))
+    info = os.lstat(parent)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid not in (0, uid) or info.st_mode & 0o022:
+        print(f"HATA: {parent} güvenli bir çalışma dizini değil", file=sys.stderr)
+        sys.exit(1)
+
+
+def _bind_listener(socket_path, uid):
+    """Soketi `uid` kullanıcısına ait ve yalnızca ona açık (0600) oluştur.
+
+    Dizin `uid`'e ait olabileceğinden root sokete sonradan `chown` uygulamaz:
+    kullanıcı `bind` ile `chown` arasında yolu başka bir dosyaya bağlayıp
+    root'a onu devrettirebilirdi. Bunun yerine eski soketin silinmesi ve
+    `bind` geçici olarak `uid` kimliğiyle yapılır; dosya doğru sahiple doğar
+    ve yol üzerindeki her işlem o kullanıcının yetkisiyle sınırlı kalır.
+    """
+    switch = os.geteuid() == 0 and uid != 0
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        if switch:
+            os.seteuid(uid)
+        try:
+            try:
+                os.unlink(socket_path)
+            except FileNotFoundError:
+                pass
+            listener.bind(socket_path)
+        finally:
+            if switch:
+                os.seteuid(0)
+    except BaseException:
+        listener.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    return listener
+
+
+def serve(socket_path, uid, root, idle_timeout):
+    _check_socket_dir(socket_path, uid)
+    writer = PwmWriter(root)
+    listener = _bind_listener(socket_path, uid)
+    listener.listen(4)
+
+    sel = selectors.DefaultSelector()
+    sel.register(listener, selectors.EVENT_READ)
+    connections = {}
+    # Boşta kalma süresi son istekten ölçülür; açık duran ama istek
+    # göndermeyen bir bağlantı yardımcıyı ayakta tutmaz.
+    last_request = time.monotonic()
+
+    # İstemci bu satırı görünce bağlanabilir.
+    print("READY", flush=True)
+
+    try:
+        while True:
+            remaining = idle_timeout - (time.monotonic() - last_request)
+            if remaining <= 0:
+                return
+            events = sel.select(timeout=remaining)
+            for key, _mask in events:
+                sock = key.fileobj
+                if sock is listener:
+                    conn, _addr = listener.accept()
+                    if _peer_uid(conn) not in (0, uid):
+                        conn.close()
+                        continue
+                    sel.register(conn, selectors.EVENT_READ)
+                    connections[conn] = Connection(conn, writer)
+                    continue
+
+                connection = connections[sock]
+                handled = connection.requests
+                try:
+                    result = connection.feed(sock.recv(4096))
+                except OSError:
+                    result = False
+                if connection.requests != handled:
+                    last_request = time.monotonic()
+                if result is True:
+                    return
+                if result is False:
+                    sel.unregister(sock)
+                    del connections[sock]
+                    sock.close()
+    finally:
+        for sock in list(connections):
+            sock.close()
+        listener.close()
+        writer.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] != "--serve":
+        if len(argv) != 2:
+            print("Kullanım: write_pwm.py <pwm_dosya_yolu> <değer>", file=sys.stderr)
+            sys.exit(1)
+        _write_once(argv[0], argv[1])
+        return
 
-if len(sys.argv) != 3:
-    print("Kullanım: write_pwm.py <pwm_dosya_yolu> <değer>", file=sys.stderr)
-    sys.exit(1)
+    parser = argparse.ArgumentParser(prog="write_pwm.py")
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--socket", required=True)
+    parser.add_argument(
+        "--uid",
+        type=int,
+        default=int(os.environ.get("PKEXEC_UID", os.getuid())),
+        help="Bağlanmasına izin verilen kullanıcı (varsayılan: pkexec'i çağıran)",
+    )
+    parser.add_argument("--root", default=HWMON_ROOT)
+    parser.add_argument("--idle-timeout", type=float, default=600.0)
+    args = parser.parse_args(argv)
+    serve(args.socket, args.uid, args.root, args.idle_timeout)
 
-pwm_path = sys.argv[1]
-value = sys.argv[2]
 
-try:
-    with open(pwm_path, "w", encoding="utf-8") as f:
-        f.write(f"{value}\n")
-    print("OK")
-except Exception as e:
-    print(f"HATA: {e}", file=sys.stderr)
-    sys.exit(1)
+if __name__ == "__main__":
+    main()
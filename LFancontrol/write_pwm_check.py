@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Yetkili yardımcının protokolünü sahte bir hwmon ağacı üzerinde sınar.
+
+`write_pwm.serve_connection()` bir socketpair üzerinden ayrı bir iş
+parçacığında çalıştırılır; istemci tarafı gerçek istek satırlarını gönderip
+yanıtları ve dosya içeriklerini denetler. Sunucuya özgü davranışlar (yabancı
+kullanıcının reddi, boşta kapanma, birden çok istemci, çok uzun satır)
+geçici bir dizindeki gerçek `write_pwm.serve()` soketine karşı denetlenir.
+Root veya pkexec gerekmez.
+
+Kullanım:
+
+    python write_pwm_check.py        # her durum için bir satır, hata varsa 1 ile çık
+"""
+from __future__ import annotations
+
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import write_pwm
+from fake_hwmon import build_fake_hwmon
+from write_pwm import _MAX_LINE, PwmWriter, serve_connection
+
+
+class _Session:
+    """socketpair'in bir ucunda `serve_connection`, diğer ucunda istemci."""
+
+    def __init__(self, root: Path) -> None:
+        self.writer = PwmWriter(str(root))
+        self.client, server = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.client.settimeout(5.0)
+        self._reader = self.client.makefile("rb")
+        self.result: Optional[bool] = None
+        self._thread = threading.Thread(target=self._serve, args=(server,), daemon=True)
+        self._thread.start()
+
+    def _serve(self, server: socket.socket) -> None:
+        try:
+            self.result = serve_connection(server, self.writer)
+        finally:
+            server.close()
+
+    def request(self, line: str) -> str:
+        self.client.sendall(line.encode() + b"\n")
+        return self._reader.readline().decode().rstrip("\n")
+
+    def finish(self) -> Optional[bool]:
+        """İstemciyi kapat; `serve_connection`'ın dönüş değerini döndür."""
+        self._reader.close()
+        self.client.close()
+        self._thread.join(5.0)
+        self.writer.close()
+        return self.result
+
+
+class _Server:
+    """`write_pwm.serve()`'i geçici bir dizindeki soketle ayrı bir iş parçacığında çalıştırır."""
+
+    def __init__(self, root: Path, idle_timeout: float = 5.0, uid: Optional[int] = None) -> None:
+        self._tmp = tempfile.TemporaryDirectory(prefix="lfc-serve-")
+        self.path = os.path.join(self._tmp.name, "helper.sock")
+        self.uid = os.getuid() if uid is None else uid
+        self.error: Optional[BaseException] = None
+        # `serve()` hazır olduğunu stdout'a "READY" yazarak bildirir; stdout
+        # süreç genelinde olduğundan yalnızca modülün `print`'i yakalanır.
+        self._ready = threading.Event()
+        write_pwm.print = lambda *args, **kwargs: self._ready.set()
+        self._thread = threading.Thread(
+            target=self._serve, args=(str(root), idle_timeout), daemon=True
+        )
+        self._thread.start()
+        if not self._ready.wait(5.0):
+            del write_pwm.print
+            self._tmp.cleanup()
+            raise RuntimeError(f"yardımcı başlamadı: {self.error!r}")
+
+    def _serve(self, root: str, idle_timeout: float) -> None:
+        try:
+            write_pwm.serve(self.path, self.uid, root, idle_timeout)
+        except BaseException as exc:  # pylint: disable=broad-except
+            self.error = exc
+
+    def connect(self) -> Tuple[socket.socket, io.BufferedReader]:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5.0)
+        client.connect(self.path)
+        return client, client.makefile("rb")
+
+    def wait(self, timeout: float) -> bool:
+        """Sunucu `timeout` saniye içinde kapandıysa True."""
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            client, reader = self.connect()
+            client.sendall(b"QUIT\n")
+            reader.readline()
+            reader.close()
+            client.close()
+            self._thread.join(5.0)
+        del write_pwm.print
+        self._tmp.cleanup()
+
+
+def _request(client: socket.socket, reader: io.BufferedReader, line: str) -> str:
+    client.sendall(line.encode() + b"\n")
+    return reader.readline().decode().rstrip("\n")
+
+
+def _closed_by_server(reader: io.BufferedReader) -> bool:
+    """Sunucu bağlantıyı yanıt vermeden kapattıysa True."""
+    try:
+        return reader.readline() == b""
+    except ConnectionResetError:
+        return True
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8").strip()
+
+
+def check_write(root: Path) -> None:
+    pwm = root / "hwmon0" / "pwm1"
+    session = _Session(root)
+    reply = session.request(f"W {root}/hwmon0/pwm1_enable 1 {pwm} 77")
+    session.finish()
+    assert reply == "OK", reply
+    assert _read(pwm) == "77", _read(pwm)
+    assert _read(root / "hwmon0" / "pwm1_enable") == "1"
+
+
+def check_whitelist(root: Path) -> None:
+    outside = root / "outside"
+    outside.write_text("5\n", encoding="utf-8")
+    session = _Session(root)
+    replies = [
+        session.request(f"W {root}/hwmon0/fan1_input 10"),
+        session.request(f"W {outside} 10"),
+        session.request(f"W {root}/hwmon0/../outside 10"),
+    ]
+    session.finish()
+    for reply in replies:
+        assert reply.startswith("ERR 0 izin verilmeyen yol"), reply
+    assert _read(outside) == "5"
+    assert _read(root / "hwmon0" / "fan1_input") != "10"
+
+
+def check_err_index(root: Path) -> None:
+    pwm1, pwm2 = root / "hwmon0" / "pwm1", root / "hwmon0" / "pwm2"
+    pwm1.write_text("128\n", encoding="utf-8")
+    session = _Session(root)
+    reply = session.request(f"W {pwm1} 60 {root}/hwmon0/fan2_input 60 {pwm2} 60")
+    invalid = session.request(f"W {pwm1} 61 {pwm2} 300")
+    session.finish()
+    # İlk çift yazılır, ikinci reddedilir, üçüncüye hiç geçilmez.
+    assert reply.startswith("ERR 1 "), reply
+    assert _read(pwm1) == "61" and _read(pwm2) == "128", (_read(pwm1), _read(pwm2))
+    assert invalid.startswith("ERR 1 geçersiz değer"), invalid
+
+
+def check_transaction(root: Path) -> None:
+    pwm1, pwm2 = root / "hwmon1" / "pwm1", root / "hwmon1" / "pwm2"
+    session = _Session(root)
+    reply = session.request(f"T {pwm1} 10 {pwm2} 20 {root}/hwmon1/fan1_input 30")
+    session.finish()
+    # Okuma aşamasında reddedilir; hiçbir şey yazılmaz.
+    assert reply.startswith("ERR 2 "), reply
+    session = _Session(root)
+    reply = session.request(f"T {pwm1} 10 {pwm2} 300")
+    session.finish()
+    # Yazma aşamasında başarısız olur; ilk çift eski değerine döner.
+    assert reply.startswith("ERR 1 "), reply
+    assert _read(pwm1) == "128" and _read(pwm2) == "128", (_read(pwm1), _read(pwm2))
+
+
+def check_malformed(root: Path) -> None:
+    session = _Session(root)
+    replies = [
+        session.request(""),
+        session.request("X"),
+        session.request(f"W {root}/hwmon0/pwm1"),
+        session.request(f"T {root}/hwmon0/pwm1 abc"),
+        session.request("PING"),
+    ]
+    session.finish()
+    assert replies[:4] == ["ERR 0 bos istek"] + ["ERR 0 gecersiz istek"] * 3, replies
+    assert replies[4] == "OK", replies
+
+
+def check_quit(root: Path) -> None:
+    session = _Session(root)
+    reply = session.request("QUIT")
+    assert reply == "OK", reply
+    assert session.finish() is True
+
+
+def check_disconnect(root: Path) -> None:
+    session = _Session(root)
+    assert session.request("PING") == "OK"
+    # QUIT olmadan kapanan istemci yardımcıyı kapatmaz.
+    assert session.finish() is False
+
+
+def check_serve_clients(root: Path) -> None:
+    pwm1, pwm2 = root / "hwmon0" / "pwm1", root / "hwmon0" / "pwm2"
+    server = _Server(root)
+    try:
+        first, first_reader = server.connect()
+        second, second_reader = server.connect()
+        # İki istemcinin istekleri iç içe işlenir.
+        assert _request(first, first_reader, f"W {pwm1} 70") == "OK"
+        assert _request(second, second_reader, f"W {pwm2} 80") == "OK"
+        assert _request(first, first_reader, "PING") == "OK"
+        # Satır sonu olmadan sınırı aşan istemci düşürülür; diğeri etkilenmez.
+        first.sendall(b"W " + b"x" * (_MAX_LINE + 1))
+        assert _closed_by_server(first_reader), "uzun satır bağlantıyı kapatmadı"
+        assert _request(second, second_reader, "PING") == "OK"
+        for stream in (first_reader, first, second_reader, second):
+            stream.close()
+    finally:
+        server.close()
+    assert _read(pwm1) == "70" and _read(pwm2) == "80", (_read(pwm1), _read(pwm2))
+    assert server.error is None, server.error
+
+
+def check_serve_peer(root: Path) -> None:
+    server = _Server(root)
+    real_peer_uid = write_pwm._peer_uid
+    # Başka bir kullanıcıyı taklit et: izin verilen ne kendimiz ne root.
+    write_pwm._peer_uid = lambda conn: 0x7FFF0000
+    try:
+        client, reader = server.connect()
+        client.sendall(b"PING\n")
+        assert _closed_by_server(reader), "yabancı kullanıcının bağlantısı kabul edildi"
+        reader.close()
+        client.close()
+    finally:
+        write_pwm._peer_uid = real_peer_uid
+    try:
+        client, reader = server.connect()
+        assert _request(client, reader, "PING") == "OK"
+        reader.close()
+        client.close()
+    finally:
+        server.close()
+
+
+def check_serve_idle(root: Path) -> None:
+    server = _Server(root, idle_timeout=0.3)
+    client, reader = server.connect()
+    try:
+        assert _request(client, reader, "PING") == "OK"
+        # Açık ama sessiz bir bağlantı yardımcıyı ayakta tutmaz.
+        assert server.wait(3.0), "yardımcı boşta kapanmadı"
+        assert not os.path.exists(server.path), "soket silinmedi"
+        assert server.error is None, server.error
+    finally:
+        reader.close()
+        client.close()
+        server.close()
+
+
+CHECKS: List[Tuple[str, Callable[[Path], None]]] = [
+    ("write", check_write),
+    ("whitelist", check_whitelist),
+    ("err-index", check_err_index),
+    ("transaction", check_transaction),
+    ("malformed", check_malformed),
+    ("quit", check_quit),
+    ("disconnect", check_disconnect),
+    ("serve-clients", check_serve_clients),
+    ("serve-peer", check_serve_peer),
+    ("serve-idle", check_serve_idle),
+]
+
+
+def main() -> None:
+    failed = 0
+    for name, check in CHECKS:
+        with tempfile.TemporaryDirectory(prefix="lfc-helper-") as tmp:
+            root = build_fake_hwmon(Path(tmp), chips=2, fans=2, temps=1)
+            try:
+                check(root)
+            except Exception as exc:  # pylint: disable=broad-except
+                failed += 1
+                print(f"{name:14s} HATA: {exc!r}")
+            else:
+                print(f"{name:14s} OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
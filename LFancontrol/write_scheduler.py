@@ -0,0 +1,184 @@
+"""PWM yazmalarını birleştiren ve gereksizlerini ayıklayan katman (Qt içermez)."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from backend import HwmonFan
+
+MODE_MANUAL = "manual"
+MODE_AUTO = "auto"
+
+
+@dataclass
+class WriteStats:
+    """Yazma sayaçları.
+
+    `issued`: donanıma giden yazmalar (pwm_enable dahil), `coalesced`: aynı
+    pencere içinde daha yeni bir değerle ezilen istekler, `suppressed`: fanın
+    zaten o durumda olduğu bilindiği için hiç yazılmayan istekler.
+    """
+
+    issued: int = 0
+    coalesced: int = 0
+    suppressed: int = 0
+
+
+@dataclass
+class _Pending:
+    fan: HwmonFan
+    mode: str
+    value: Optional[int]
+    due: float
+
+
+class PwmWriteScheduler:
+    """`set_pwm`/`set_auto_mode` önüne konan birleştirme katmanı.
+
+    Her fan için en son yazılan PWM değeri ve mod tutulur; aynı değeri
+    yeniden yazan istekler düşürülür. İlk istekten itibaren `window` saniye
+    içinde gelen istekler tek yazmaya indirgenir (en son değer kazanır).
+    `flush()` bekleyen yazmaları çip dizinine göre sıralayıp tek tek uygular;
+    "gruplama" yalnızca aynı çipe giden yazmaların art arda yapılmasıdır,
+    yazmalar tek bir çağrıda birleştirilmez. İzin hatası alan yazmalar
+    yetkili yardımcıya da gönderilmez; çağıran taraf döndürülen hatalardan
+    toplu bir `HELPER.write_batch` isteği kurar (ör. `main_window`, `lfanctl`).
+
+    BIOS/sürücü modu kendiliğinden geri alabileceği için bilinen durum
+    `resync` saniye sonra eskimiş sayılır ve değer yeniden yazılır.
+    """
+
+    def __init__(self, window: float = 0.0, resync: float = 30.0) -> None:
+        self.window = window
+        self.resync = resync
+        self.stats = WriteStats()
+        self._pending: Dict[str, _Pending] = {}
+        self._mode: Dict[str, str] = {}
+        self._pwm: Dict[str, int] = {}
+        self._known_at: Dict[str, float] = {}
+
+    def _clamp(self, fan: HwmonFan, value: int) -> int:
+        return max(fan.min_pwm, min(fan.max_pwm, value))
+
+    def _is_current(self, fan: HwmonFan, mode: str, value: Optional[int], now: float) -> bool:
+        if self._mode.get(fan.id) != mode:
+            return False
+        if now - self._known_at.get(fan.id, now) > self.resync:
+            return False
+        return mode == MODE_AUTO or self._pwm.get(fan.id) == value
+
+    def _request(self, fan: HwmonFan, mode: str, value: Optional[int], now: Optional[float]) -> None:
+        now = time.monotonic() if now is None else now
+        pending = self._pending.get(fan.id)
+        if pending is not None:
+            self.stats.coalesced += 1
+            if self._is_current(fan, mode, value, now):
+                # Bekleyen değişiklik geri alındı; hiçbir şey yazmaya gerek yok.
+                del self._pending[fan.id]
+                return
+            pending.mode = mode
+            pending.value = value
+            return
+
+        if self._is_current(fan, mode, value, now):
+            self.stats.suppressed += 1
+            return
+        self._pending[fan.id] = _Pending(fan, mode, value, now + self.window)
+
+    def request_pwm(self, fan: HwmonFan, value: int, now: Optional[float] = None) -> None:
+        if fan.pwm_path is None:
+            raise RuntimeError("Bu fan için PWM kontrolü desteklenmiyor.")
+        self._request(fan, MODE_MANUAL, self._clamp(fan, value), now)
+
+    def request_auto(self, fan: HwmonFan, now: Optional[float] = None) -> None:
+        self._request(fan, MODE_AUTO, None, now)
+
+    def next_due(self) -> Optional[float]:
+        """En yakın bekleyen yazmanın zamanı (time.monotonic); yoksa None."""
+        if not self._pending:
+            return None
+        return min(p.due for p in self._pending.values())
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def pending_pwm(self, fan: HwmonFan) -> Optional[int]:
+        """Fanın bekleyen (henüz yazılmamış) manuel PWM değeri; yoksa None."""
+        pending = self._pending.get(fan.id)
+        if pending is None or pending.mode != MODE_MANUAL:
+            return None
+        return pending.value
+
+    def note_written(
+        self, fan: HwmonFan, mode: str, value: Optional[int] = None, now: Optional[float] = None
+    ) -> None:
+        """Başka bir yoldan (ör. yetkili yardımcı) yapılan yazmayı kaydet."""
+        self._mode[fan.id] = mode
+        self._known_at[fan.id] = time.monotonic() if now is None else now
+        if value is None:
+            self._pwm.pop(fan.id, None)
+        else:
+            self._pwm[fan.id] = value
+
+    def mode_of(self, fan: HwmonFan) -> Optional[str]:
+        """Fanın bu katmanca bilinen modu (`MODE_MANUAL`/`MODE_AUTO`); bilinmiyorsa None."""
+        return self._mode.get(fan.id)
+
+    def forget(self, fan: HwmonFan) -> None:
+        """Fanın bilinen durumunu unut; bir sonraki istek mutlaka yazılır."""
+        self._mode.pop(fan.id, None)
+        self._pwm.pop(fan.id, None)
+        self._known_at.pop(fan.id, None)
+
+    def flush(
+        self, now: Optional[float] = None, force: bool = False, fan: Optional[HwmonFan] = None
+    ) -> List[Tuple[HwmonFan, Exception]]:
+        """Zamanı gelmiş (veya `force` ile tüm) bekleyen yazmaları uygula.
+
+        `fan` verilirse yalnızca o fanın bekleyen yazmasına bakılır. Yazmalar
+        çip dizinine göre sıralanır ve her biri ayrı bir sysfs yazmasıdır.
+        Hatalar fırlatılmaz; (fan, hata) çiftleri olarak döndürülür ve o fanın
+        bilinen durumu unutulur.
+        """
+        if not self._pending:
+            return []
+        now = time.monotonic() if now is None else now
+        if fan is not None:
+            candidates = [self._pending[fan.id]] if fan.id in self._pending else []
+        else:
+            candidates = list(self._pending.values())
+        due = [p for p in candidates if force or p.due <= now]
+        # Yalnızca sıralama: aynı çipe giden yazmalar art arda yapılır.
+        due.sort(key=lambda p: str(p.fan.rpm_path.parent))
+
+        errors: List[Tuple[HwmonFan, Exception]] = []
+        for pending in due:
+            del self._pending[pending.fan.id]
+            try:
+                self._apply(pending, now)
+            except (OSError, RuntimeError) as exc:
+                self.forget(pending.fan)
+                errors.append((pending.fan, exc))
+        return errors
+
+    def _apply(self, pending: _Pending, now: float) -> None:
+        fan = pending.fan
+        stats = self.stats
+        if pending.mode == MODE_AUTO:
+            if fan.pwm_enable_path is not None:
+                fan.set_auto_mode()
+                stats.issued += 1
+            self.note_written(fan, MODE_AUTO, now=now)
+            return
+
+        known_manual = fan.id in self._known_at and self._is_current(
+            fan, MODE_MANUAL, self._pwm.get(fan.id), now
+        )
+        if not known_manual and fan.pwm_enable_path is not None:
+            # Mod bilinmiyorsa (veya eskidiyse) pwm_enable okunup gerekirse yazılır.
+            fan.set_manual_mode()
+            stats.issued += 1
+        fan.set_pwm(pending.value, ensure_manual=False)
+        stats.issued += 1
+        self.note_written(fan, MODE_MANUAL, pending.value, now)